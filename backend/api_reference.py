@@ -0,0 +1,152 @@
+"""
+eXBuilder6 API 참고 정보 검색 (LLM 프롬프트용)
+
+exbuilder6.yaml 전체를 프롬프트에 넣으면 LM Studio 토큰 제한(3500)을 넘기 때문에
+컨트롤 타입/메서드별 인덱스를 만들어 두고, 정적 분석(check_exbuilder6_apis)이 찾은
+컨트롤과 메서드에 관련된 부분만 API_REFERENCE_TOKENS 예산 안에서 프롬프트에 넣습니다.
+
+우선순위 (예산이 부족하면 뒤쪽부터 생략):
+1. 카탈로그에 없는 메서드 호출과 유사한 메서드 (LLM이 잘못된 API를 그대로 인정하지 않도록)
+2. 사용된 컨트롤의 메서드 목록 (호출된 메서드 먼저)
+3. 컨트롤 없이 호출된 메서드가 속한 공통/메시지/데이터 API 목록
+4. 사용된 컨트롤의 속성/이벤트 목록
+"""
+
+import difflib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import yaml
+from metrics import REGISTRY
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent / "config" / "exbuilder6.yaml"
+
+CONTROL_LABELS = {
+    "grd": "Grid", "button": "Button", "btn": "Button", "cmb": "ComboBox",
+    "cbx": "CheckBox", "ipb": "InputBox", "cal": "Calendar", "tre": "Tree", "txa": "TextArea",
+}
+GROUP_LABELS = {"common_apis": "공통 API", "message_apis": "메시지 API", "data_apis": "데이터 API"}
+KIND_LABELS = {"methods": "메서드", "properties": "속성", "events": "이벤트"}
+
+api_reference_requests = REGISTRY.counter(
+    "api_reference_requests_total", "프롬프트에 API 참고 정보를 넣은 요청 수 (예산 초과로 생략된 항목 여부)", ("truncated",))
+api_reference_tokens = REGISTRY.counter(
+    "api_reference_tokens_total", "프롬프트에 넣은 API 참고 정보 토큰 수 (추정)")
+
+def estimate_tokens(text: str) -> int:
+    """request_llm의 프롬프트 길이 검사와 같은 기준 (1토큰 = 4글자)"""
+    return len(text) // 4
+
+class APIReferenceIndex:
+    def __init__(self, catalog: Dict, version: str = "6.0"):
+        controls = (catalog.get("versions") or {}).get(version) or {}
+        # 컨트롤 타입 → {methods/properties/events → 이름 목록}
+        self.controls: Dict[str, Dict[str, List[str]]] = {
+            control_type: {kind: list(entries.get(kind) or []) for kind in KIND_LABELS}
+            for control_type, entries in controls.items() if isinstance(entries, dict)
+        }
+        # 컨트롤과 무관한 API 그룹 → 메서드 목록
+        self.groups: Dict[str, List[str]] = {
+            group: list((catalog.get(group) or {}).get("methods") or []) for group in GROUP_LABELS
+        }
+        # 메서드 → 속한 컨트롤 타입/그룹
+        self.method_index: Dict[str, List[str]] = {}
+        for control_type, entries in self.controls.items():
+            for method in entries["methods"]:
+                self.method_index.setdefault(method, []).append(control_type)
+        for group, methods in self.groups.items():
+            for method in methods:
+                self.method_index.setdefault(method, []).append(group)
+
+    @classmethod
+    def from_yaml(cls, path: Path = DEFAULT_CATALOG_PATH) -> "APIReferenceIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def control_label(self, control_type: str) -> str:
+        label = CONTROL_LABELS.get(control_type)
+        return f"{label} 컨트롤 ({control_type})" if label else f"{control_type} 컨트롤"
+
+    def similar_methods(self, method: str, candidates: Iterable[str]) -> List[str]:
+        return difflib.get_close_matches(method, list(candidates), n=3, cutoff=0.75)
+
+    def _tiers(self, controls: Dict[str, List[str]], unbound_methods: List[str]) -> List[List[tuple]]:
+        """우선순위 순 참고 정보 항목 묶음, 항목은 (머리말, 이름 목록, 꼬리말)"""
+        common = self.groups.get("common_apis", [])
+        corrections, method_lists, group_lists, others = [], [], [], []
+        for control_type, called in controls.items():
+            entries = self.controls.get(control_type)
+            if entries is None:
+                continue
+            called = list(dict.fromkeys(called))
+            for method in called:
+                if method not in entries["methods"] and method not in common:
+                    similar = self.similar_methods(method, entries["methods"] + common)
+                    prefix = f"{control_type}.{method}: 존재하지 않는 메서드"
+                    corrections.append((prefix + " (유사: ", similar, ")") if similar else (prefix, [], ""))
+            used_first = [method for method in called if method in entries["methods"]]
+            method_lists.append((f"{self.control_label(control_type)} 메서드: ",
+                                 used_first + [m for m in entries["methods"] if m not in used_first], ""))
+            for kind in ("properties", "events"):
+                if entries[kind]:
+                    others.append((f"{self.control_label(control_type)} {KIND_LABELS[kind]}: ", entries[kind], ""))
+        groups = dict.fromkeys(scope for method in unbound_methods
+                               for scope in self.method_index.get(method, []) if scope in self.groups)
+        for group in groups:
+            group_lists.append((f"{GROUP_LABELS[group]}: ", self.groups[group], ""))
+        return [tier for tier in (corrections, method_lists, group_lists, others) if tier]
+
+    def render(self, controls: Dict[str, List[str]], unbound_methods: Iterable[str] = (),
+               budget_tokens: Optional[int] = None) -> Optional[str]:
+        """감지된 컨트롤(타입 → 호출된 메서드)과 컨트롤 없이 호출된 메서드에 관련된 참고 정보
+
+        같은 우선순위의 항목(예: 컨트롤별 메서드 목록)은 남은 예산을 나눠 쓰고,
+        몫을 넘는 목록은 앞쪽 이름만 남깁니다. 관련 항목이 없으면 None.
+        """
+        budget = api_reference_budget() if budget_tokens is None else budget_tokens
+        tiers = self._tiers(controls, list(unbound_methods))
+        if budget <= 0 or not tiers:
+            return None
+        lines = ["**eXBuilder6 API 참고 (이 코드와 관련된 부분, 목록에 없는 API를 지어내지 마세요):**"]
+        used = estimate_tokens(lines[0])
+        truncated = False
+        for tier in tiers:
+            for index, (prefix, names, suffix) in enumerate(tier):
+                limit = used + (budget - used) // (len(tier) - index)
+                line = f"- {prefix}"
+                kept: List[str] = []
+                for name in names:
+                    if estimate_tokens(line + ", ".join(kept + [name]) + suffix) + 1 > limit - used:
+                        break
+                    kept.append(name)
+                if estimate_tokens(line + suffix) + 1 > limit - used or (names and not kept):
+                    truncated = True
+                    continue
+                if len(kept) < len(names):
+                    truncated = True
+                    suffix = "..." + suffix
+                line += ", ".join(kept) + suffix
+                lines.append(line)
+                used += estimate_tokens(line) + 1
+        if len(lines) == 1:
+            return None
+        context = "\n".join(lines)
+        api_reference_requests.inc(truncated=str(truncated).lower())
+        api_reference_tokens.inc(estimate_tokens(context))
+        return context
+
+def api_reference_budget() -> int:
+    """프롬프트에 넣을 API 참고 정보 토큰 예산 (0이면 사용 안 함)"""
+    return int(os.getenv("API_REFERENCE_TOKENS", "400"))
+
+_index: Optional[APIReferenceIndex] = None
+_index_lock = threading.Lock()
+
+def get_api_reference() -> APIReferenceIndex:
+    """exbuilder6.yaml 인덱스 (프로세스당 한 번 로드)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = APIReferenceIndex.from_yaml()
+        return _index
@@ -0,0 +1,227 @@
+"""
+분석기 벤치마크 (합성 eXBuilder6 코퍼스)
+
+exb_corpus로 만든 크기별 화면 스크립트로 각 분석 경로를 프로세스 안에서 실행해
+최소 시간, 처리량(줄/초), Python 할당 최대치(tracemalloc)를 기록하고, 저장된 기준선과 비교해
+처리량이 허용 범위보다 떨어진 경로를 회귀로 표시합니다 (회귀가 있으면 종료 코드 1).
+기계 속도 차이는 고정 작업의 보정 시간(calibration)으로 나눠 맞춥니다.
+
+    python backend/benchmark.py --save-baseline benchmarks/baseline.json
+    python backend/benchmark.py --baseline benchmarks/baseline.json
+    python backend/benchmark.py --sizes 1k,10k,100k,1m,10m --paths enhanced.analyze_async
+"""
+
+import asyncio
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from exb_corpus import DEFAULT_SEED, format_size, generate_screen_script, parse_size
+
+DEFAULT_SIZES = ("1k", "10k", "100k", "1m")
+# 기준선 대비 이만큼 이상 처리량이 떨어지거나 메모리가 늘면 회귀
+DEFAULT_TOLERANCE = 0.25
+# 한 번 실행이 이보다 오래 걸린 경로는 더 큰 크기를 건너뜀 (10MB에서 수 분씩 걸리지 않도록)
+DEFAULT_MAX_SECONDS = 30.0
+# 이보다 짧은 측정은 잡음이 커서 기준선 비교에서 제외
+NOISE_FLOOR_SECONDS = 0.005
+
+# ============================================================================
+# 측정할 분석 경로 (지연 import)
+# ============================================================================
+
+def _basic(name: str) -> Callable[[str], object]:
+    import js_analyzer
+    return getattr(js_analyzer, name)
+
+def _enhanced(method: str) -> Callable[[str], object]:
+    from enhanced_js_analyzer import PerformanceOptimizedAnalyzer
+    analyzer = PerformanceOptimizedAnalyzer()
+    if method == "analyze_async":
+        return lambda code: asyncio.run(analyzer.analyze_async(code))
+    return getattr(analyzer, method)
+
+def _review_split() -> Callable[[str], object]:
+    from review import split_code_by_functions
+    return split_code_by_functions
+
+def _compact() -> Callable[[str], object]:
+    from prompt_compactor import compact_code
+    return compact_code
+
+def _api_reference() -> Callable[[str], object]:
+    from enhanced_js_analyzer import build_api_reference
+    return build_api_reference
+
+PATHS: Dict[str, Callable[[], Callable[[str], object]]] = {
+    "basic.check_javascript_issues": lambda: _basic("check_javascript_issues"),
+    "basic.check_exbuilder6_apis": lambda: _basic("check_exbuilder6_apis"),
+    "basic.check_errors": lambda: _basic("check_errors"),
+    "basic.analyze_execution_flow": lambda: _basic("analyze_execution_flow"),
+    "basic.run_static_analysis": lambda: _basic("run_static_analysis"),
+    "enhanced.check_javascript_syntax": lambda: _enhanced("check_javascript_syntax"),
+    "enhanced.check_exbuilder6_apis": lambda: _enhanced("check_exbuilder6_apis"),
+    "enhanced.check_errors_optimized": lambda: _enhanced("check_errors_optimized"),
+    "enhanced.analyze_execution_flow": lambda: _enhanced("analyze_execution_flow"),
+    "enhanced.analyze_async": lambda: _enhanced("analyze_async"),
+    "review.split_code_by_functions": _review_split,
+    "prompt.compact_code": _compact,
+    "prompt.build_api_reference": _api_reference,
+}
+
+# ============================================================================
+# 측정
+# ============================================================================
+
+def calibrate(rounds: int = 5) -> float:
+    """기계 속도 보정용 고정 작업(문자열/정규식/딕셔너리)의 최소 시간(초)"""
+    import re
+    text = "var grdMain = app.lookup('grdMain'); grdMain.addRow();\n" * 10000
+    pattern = re.compile(r"(\w+)\.(\w+)\(")
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        counts: Dict[str, int] = {}
+        for match in pattern.finditer(text):
+            counts[match.group(2)] = counts.get(match.group(2), 0) + 1
+        "".join(line.strip() for line in text.splitlines()).lower()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def measure(run: Callable[[str], object], code: str, repeat: int = 3, trace_memory: bool = True) -> Dict:
+    """repeat회 실행 중 최소 시간과 (trace_memory면) 별도 1회 실행의 할당 최대치"""
+    lines = code.count("\n") + 1
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(code)
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            run(code)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "seconds": round(best, 6),
+        "lines": lines,
+        "lines_per_second": round(lines / best, 1) if best > 0 else None,
+        "peak_mb": round(peak / 1024 / 1024, 2) if peak is not None else None,
+    }
+
+def run_benchmarks(paths: Optional[List[str]] = None, sizes=DEFAULT_SIZES, seed: int = DEFAULT_SEED,
+                   repeat: int = 3, trace_memory: bool = True, max_seconds: float = DEFAULT_MAX_SECONDS,
+                   on_result: Callable[[Dict], None] = None) -> Dict:
+    """경로 x 크기 측정 결과 {"calibration_seconds", "environment", "results": {"경로@크기": {...}}}
+
+    보정 시간은 측정 전후에 한 번씩 재서 작은 값을 씁니다 (일시적인 부하에 덜 민감하도록).
+    """
+    sizes = [parse_size(str(size)) for size in sizes]
+    corpus = {size: generate_screen_script(size, seed) for size in sizes}
+    report = {
+        "seed": seed,
+        "calibration_seconds": calibrate(),
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "results": {},
+    }
+    for name in paths or PATHS:
+        run = PATHS[name]()
+        run(corpus[sizes[0]])  # 첫 실행의 import/캐시 비용 제외
+        for size in sizes:
+            key = f"{name}@{format_size(size)}"
+            result = measure(run, corpus[size], repeat, trace_memory)
+            result.update(path=name, size=format_size(size))
+            report["results"][key] = result
+            if on_result:
+                on_result(result)
+            if result["seconds"] > max_seconds:
+                break
+    report["calibration_seconds"] = round(min(report["calibration_seconds"], calibrate()), 6)
+    return report
+
+# ============================================================================
+# 기준선 비교
+# ============================================================================
+
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """두 보고서에 모두 있는 항목마다 보정된 처리량/메모리 변화율과 회귀 여부
+
+    처리량에 보정 시간 비율(현재/기준선)을 곱해 기계 속도 차이를 상쇄하고,
+    기준선 측정이 NOISE_FLOOR_SECONDS보다 짧은 항목은 제외합니다.
+    """
+    scale = current["calibration_seconds"] / baseline["calibration_seconds"]
+    rows = []
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None or before["seconds"] < NOISE_FLOOR_SECONDS or not result.get("lines_per_second"):
+            continue
+        throughput_change = result["lines_per_second"] * scale / before["lines_per_second"] - 1
+        memory_change = None
+        if result.get("peak_mb") is not None and before.get("peak_mb"):
+            memory_change = result["peak_mb"] / before["peak_mb"] - 1
+        rows.append({
+            "key": key,
+            "throughput_change": round(throughput_change, 3),
+            "memory_change": round(memory_change, 3) if memory_change is not None else None,
+            "regression": throughput_change < -tolerance or (memory_change is not None and memory_change > tolerance),
+        })
+    return rows
+
+def format_result(result: Dict) -> str:
+    peak = "-" if result["peak_mb"] is None else f"{result['peak_mb']:.2f}"
+    return (f"{result['path']:<34} {result['size']:>6} {result['lines']:>9,}줄 {result['seconds'] * 1000:>10.1f}ms "
+            f"{result['lines_per_second'] or 0:>12,.0f}줄/s  peak {peak}MB")
+
+def format_comparison(row: Dict) -> str:
+    mark = "❌" if row["regression"] else "✅"
+    memory = "-" if row["memory_change"] is None else f"{row['memory_change']:+.0%}"
+    return f"{mark} {row['key']:<42} 처리량 {row['throughput_change']:+.0%}  메모리 {memory}"
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="합성 eXBuilder6 코퍼스 분석기 벤치마크")
+    parser.add_argument("--paths", help=f"쉼표로 구분 (기본: 전체 {','.join(PATHS)})")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help="쉼표로 구분한 크기 (예: 1k,10k,100k,1m,10m)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS,
+                        help="한 번 실행이 이보다 오래 걸리면 해당 경로의 더 큰 크기 생략")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--save-baseline", help="결과를 기준선 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 기준선 파일")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 변화율 (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    split = lambda value: [item.strip() for item in value.split(",") if item.strip()] if value else None
+    paths = split(args.paths)
+    unknown = [name for name in paths or [] if name not in PATHS]
+    if unknown:
+        parser.error(f"알 수 없는 경로: {', '.join(unknown)}")
+
+    report = run_benchmarks(paths, split(args.sizes), args.seed, args.repeat, not args.no_memory,
+                            args.max_seconds, on_result=lambda result: print(format_result(result), flush=True))
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("seed") != report["seed"]:
+        print(f"⚠️ 기준선 seed({baseline.get('seed')})가 현재 seed({report['seed']})와 달라 입력이 다릅니다")
+    rows = compare(report, baseline, args.tolerance)
+    print()
+    for row in rows:
+        print(format_comparison(row))
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{len(rows)}개 항목 중 {len(regressions)}개 회귀 (허용 {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,29 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
 import re
+import json
 import yaml
 import logging
 from pathlib import Path
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import contextvars
 from contextlib import contextmanager
-from llm_client import request_llm, request_llm_fast
+from llm_output import extract_json
+from prompt_templates import request_llm_template
+from llm_resilience import StaticFallback
+from api_reference import DEFAULT_CATALOG_PATH, get_api_reference
+from js_tokenizer import Token, check_structure, tokenize
+from metrics import analyzer_phase_duration
+from rule_engine import LineIndex, Rule, RuleSet
+from rule_registry import get_rule_registry
+from regex_guard import GuardedPattern, ScanResult, rule_budget_ms
+from memory_profiler import current_memory_profile, memory_phase
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -37,10 +50,51 @@ class AnalysisIssue(BaseModel):
     suggestion: Optional[str] = None
     code_snippet: Optional[str] = None
     priority: Optional[str] = None  # 'LOW', 'MEDIUM', 'HIGH'
+    source: Optional[str] = None  # 'llm' (LLM 구조화 응답에서 변환된 이슈)
+
+# 심각도에 따른 우선순위
+SEVERITY_PRIORITY = {
+    IssueSeverity.CRITICAL: 'HIGH',
+    IssueSeverity.HIGH: 'HIGH',
+    IssueSeverity.MEDIUM: 'MEDIUM',
+    IssueSeverity.LOW: 'LOW',
+    IssueSeverity.INFO: 'LOW'
+}
+
+# 정적 분석 카테고리 → LLM findings 카테고리 (enhanced_findings 템플릿: syntax, api, security, performance, logic)
+# 목록에 없는 카테고리는 그대로 비교
+LLM_FINDING_CATEGORIES = {
+    'syntax_errors': 'syntax',
+    'variable_scope_issues': 'syntax',
+    'code_style': 'syntax',
+    'unnecessary_code': 'syntax',
+    'xss_security': 'security',
+    'performance_issues': 'performance',
+    'memory_leaks': 'performance',
+    'null_reference': 'logic',
+    'json_parsing': 'logic',
+    'array_operations': 'logic',
+    'string_operations': 'logic',
+    'comparison_issues': 'logic',
+    'error_handling': 'logic',
+    'async_issues': 'logic',
+    'type_safety': 'logic',
+}
 
 class JavaScriptAnalysisRequest(BaseModel):
     code: str
     fast_mode: bool = False
+    compact_prompt: Optional[bool] = None  # 주석/공백 제거 후 LLM 전송 (None이면 PROMPT_COMPACTION 환경변수)
+    llm_output: str = "markdown"  # 'markdown' (서술형) 또는 'findings' (간결한 JSON → AnalysisIssue)
+    rule_profile: Optional[str] = None  # 규칙 프로필 (None이면 RULE_PROFILE 환경변수, 기본 default)
+    rules: Optional[List[str]] = None  # 실행할 규칙 id/카테고리/팩 (지정하면 프로필 대신 사용)
+    disabled_rules: Optional[List[str]] = None  # 제외할 규칙 id/카테고리/팩
+
+class ExplainRequest(BaseModel):
+    code: str
+    fast_mode: bool = False
+    compact_prompt: Optional[bool] = None
+    issue: Optional[AnalysisIssue] = None  # 지정하면 해당 이슈만 설명
 
 class EnhancedJavaScriptAnalysisResponse(BaseModel):
     issues: List[AnalysisIssue]
@@ -48,111 +102,22 @@ class EnhancedJavaScriptAnalysisResponse(BaseModel):
     execution_flow: List[str]
     recommendations: List[str]
     llm_analysis: Optional[str] = None
+    llm_fallback: Optional[str] = None  # 'static'이면 LLM 백엔드 장애로 정적 분석 결과만 제공 (LLM_FALLBACK=static)
+    llm_notice: Optional[str] = None
 
 # ============================================================================
-# 에러 패턴 정의 (카테고리별로 정리)
+# 에러 패턴 정의 (config/rules/*.yaml 규칙 팩 → rule_registry)
 # ============================================================================
 
-ERROR_PATTERNS = {
-    'syntax_errors': [
-        (r'\bar\s+\w+', '변수 선언 오류: "ar" → "var"로 수정하세요', IssueSeverity.HIGH),
-        (r'\blet\s+\w+', '변수 선언 확인: "let" 사용을 권장합니다', IssueSeverity.LOW),
-        (r'\bconst\s+\w+', '상수 선언 확인: "const" 사용을 권장합니다', IssueSeverity.LOW),
-        (r'function\s+(\w+)\s*\([^)]*\)\s*\{[^}]*\1\s*\(', '재귀 함수 호출이 무한 루프를 일으킬 수 있습니다', IssueSeverity.HIGH),
-        (r'var\s+(\w+)\s*=\s*\1', '변수가 자기 자신을 참조하고 있습니다', IssueSeverity.HIGH),
-        (r'(\w+)\s*=\s*\1\s*[+\-*/]', '변수가 자기 자신과 연산하고 있습니다', IssueSeverity.MEDIUM),
-    ],
-    'variable_scope_issues': [
-        (r'var\s+\w+\s*=\s*function\s*\([^)]*\)\s*\{[^}]*var\s+\w+', '함수 내부에서 var 재선언은 호이스팅 문제를 일으킬 수 있습니다', IssueSeverity.MEDIUM),
-        (r'for\s*\(\s*var\s+\w+\s+in\s+', 'for...in 루프에서 var 사용시 스코프 문제가 발생할 수 있습니다', IssueSeverity.MEDIUM),
-        (r'var\s+\w+\s*=\s*[^;]*\|\|[^;]*;', '논리 OR 연산자로 기본값 설정시 falsy 값 처리를 확인하세요', IssueSeverity.LOW),
-    ],
-    'null_reference': [
-        (r'\.getElementById\([^)]*\)\.', 'getElementById 결과가 null일 수 있습니다', IssueSeverity.HIGH),
-        (r'\.querySelector\([^)]*\)\.', 'querySelector 결과가 null일 수 있습니다', IssueSeverity.HIGH),
-        (r'\.length\s*[<>=]', 'length 속성 접근시 null/undefined 오류 가능성', IssueSeverity.MEDIUM),
-        (r'\.\w+\([^)]*\)\.', '메서드 체이닝시 중간 결과가 null일 수 있습니다', IssueSeverity.HIGH),
-        (r'\[\d+\]\.', '배열 인덱스 접근시 해당 인덱스가 존재하지 않을 수 있습니다', IssueSeverity.MEDIUM),
-    ],
-    'xss_security': [
-        (r'\.innerHTML\s*=', 'innerHTML 사용시 XSS 위험이 있습니다', IssueSeverity.CRITICAL),
-        (r'eval\(', 'eval() 사용은 보안상 위험합니다', IssueSeverity.CRITICAL),
-        (r'Function\s*\(', 'Function 생성자 사용은 보안상 위험합니다', IssueSeverity.CRITICAL),
-        (r'\.outerHTML\s*=', 'outerHTML 사용시 XSS 위험이 있습니다', IssueSeverity.CRITICAL),
-        (r'document\.write\s*\(', 'document.write 사용은 보안상 위험합니다', IssueSeverity.CRITICAL),
-    ],
-    'json_parsing': [
-        (r'JSON\.parse\([^)]*\)', 'JSON.parse는 try-catch로 감싸야 합니다', IssueSeverity.HIGH),
-        (r'\.parseInt\([^)]*\)', 'parseInt 호출시 잘못된 문자열일 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.parseFloat\([^)]*\)', 'parseFloat 호출시 잘못된 문자열일 수 있습니다', IssueSeverity.MEDIUM),
-        (r'Number\s*\([^)]*\)', 'Number() 변환시 NaN이 반환될 수 있습니다', IssueSeverity.MEDIUM),
-    ],
-    'array_operations': [
-        (r'\.split\([^)]*\)\[', 'split 결과가 빈 배열일 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.push\([^)]*\)', 'push 메서드 호출시 배열이 null일 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.pop\(\)', 'pop 메서드 호출시 빈 배열일 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.shift\(\)', 'shift 메서드 호출시 빈 배열일 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.splice\([^)]*\)', 'splice 메서드 호출시 배열 범위를 벗어날 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.slice\([^)]*\)', 'slice 메서드 호출시 잘못된 인덱스일 수 있습니다', IssueSeverity.LOW),
-        (r'\.indexOf\([^)]*\)\s*[<>=]', 'indexOf 결과가 -1일 수 있습니다', IssueSeverity.MEDIUM),
-    ],
-    'string_operations': [
-        (r'\.charAt\([^)]*\)', 'charAt 인덱스가 문자열 길이를 초과할 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.substring\([^)]*\)', 'substring 인덱스가 잘못될 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.substr\([^)]*\)', 'substr 인덱스가 잘못될 수 있습니다', IssueSeverity.MEDIUM),
-        (r'\.replace\([^)]*\)', 'replace 메서드 호출시 정규식 오류가 발생할 수 있습니다', IssueSeverity.LOW),
-        (r'\.match\([^)]*\)', 'match 메서드 호출시 정규식 오류가 발생할 수 있습니다', IssueSeverity.LOW),
-    ],
-    'comparison_issues': [
-        (r'==\s*null', 'null 비교시 === 사용을 권장합니다', IssueSeverity.LOW),
-        (r'==\s*undefined', 'undefined 비교시 === 사용을 권장합니다', IssueSeverity.LOW),
-        (r'[^=!<>]=[^=]', '할당 연산자 확인 필요 (= vs ==)', IssueSeverity.MEDIUM),
-        (r'[^=!<>]!=[^=]', '불일치 연산자 확인 필요 (!= vs !==)', IssueSeverity.LOW),
-        (r'[^=!<>]=[^=]', '할당 연산자 확인 필요 (= vs ==)', IssueSeverity.MEDIUM),
-        (r'typeof\s+\w+\s*==\s*["\']string["\']', 'typeof 비교시 === 사용을 권장합니다', IssueSeverity.LOW),
-    ],
-    'performance_issues': [
-        (r'console\.log\(', 'console.log는 프로덕션에서 제거해야 합니다', IssueSeverity.LOW),
-        (r'for\s*\(\s*;\s*;\s*\)', '무한 루프 위험이 있습니다', IssueSeverity.HIGH),
-        (r'while\s*\(\s*true\s*\)', '무한 루프 위험이 있습니다', IssueSeverity.HIGH),
-        (r'for\s*\(\s*var\s+\w+\s*=\s*0;\s*\w+\s*<\s*\w+\.length;\s*\w+\+\+\)', 'for 루프에서 length를 매번 계산하고 있습니다', IssueSeverity.MEDIUM),
-        (r'\.innerHTML\s*\+=', 'innerHTML += 사용시 성능 저하가 발생할 수 있습니다', IssueSeverity.MEDIUM),
-        (r'setInterval\s*\([^,]+,\s*[0-9]+\)', 'setInterval 사용시 메모리 누수가 발생할 수 있습니다', IssueSeverity.MEDIUM),
-    ],
-    'error_handling': [
-        (r'try\s*\{[^}]*\}\s*catch\s*\([^)]*\)\s*\{[^}]*\}', 'catch 블록이 비어있거나 적절한 처리가 없습니다', IssueSeverity.MEDIUM),
-        (r'throw\s+new\s+Error\s*\([^)]*\)', 'Error 객체 생성시 적절한 메시지를 포함하세요', IssueSeverity.LOW),
-        (r'\.catch\s*\([^)]*\)\s*\{[^}]*\}', 'Promise catch 블록이 비어있거나 적절한 처리가 없습니다', IssueSeverity.MEDIUM),
-    ],
-    'unnecessary_code': [
-        (r'var\s+\w+\s*=\s*undefined', 'undefined 할당은 불필요합니다', IssueSeverity.LOW),
-        (r'var\s+\w+\s*=\s*null', 'null 할당이 필요한지 확인하세요', IssueSeverity.LOW),
-        (r'return\s*;', 'return 문이 값을 반환하지 않습니다', IssueSeverity.LOW),
-        (r'if\s*\([^)]*\)\s*\{[^}]*\}\s*else\s*\{[^}]*\}', 'if-else 블록이 비어있습니다', IssueSeverity.LOW),
-    ],
-    'async_issues': [
-        (r'async\s+function\s+\w+\s*\([^)]*\)\s*\{[^}]*await\s+', 'async 함수에서 await 사용시 try-catch로 감싸세요', IssueSeverity.MEDIUM),
-        (r'Promise\s*\.\s*resolve\s*\([^)]*\)', 'Promise.resolve 사용시 적절한 에러 처리가 필요합니다', IssueSeverity.LOW),
-        (r'Promise\s*\.\s*reject\s*\([^)]*\)', 'Promise.reject 사용시 적절한 에러 처리가 필요합니다', IssueSeverity.LOW),
-    ],
-    'memory_leaks': [
-        (r'addEventListener\s*\([^)]*\)', 'addEventListener 사용시 removeEventListener로 정리해야 합니다', IssueSeverity.MEDIUM),
-        (r'setTimeout\s*\([^)]*\)', 'setTimeout 사용시 clearTimeout으로 정리해야 합니다', IssueSeverity.MEDIUM),
-        (r'setInterval\s*\([^)]*\)', 'setInterval 사용시 clearInterval로 정리해야 합니다', IssueSeverity.MEDIUM),
-        (r'new\s+Date\s*\([^)]*\)', 'Date 객체 생성이 반복적으로 발생하고 있습니다', IssueSeverity.LOW),
-    ],
-    'type_safety': [
-        (r'typeof\s+\w+\s*!==\s*["\']string["\']', '타입 체크 후 적절한 처리가 필요합니다', IssueSeverity.LOW),
-        (r'instanceof\s+\w+', 'instanceof 체크 후 적절한 처리가 필요합니다', IssueSeverity.LOW),
-        (r'Array\.isArray\s*\([^)]*\)', 'Array.isArray 체크 후 적절한 처리가 필요합니다', IssueSeverity.LOW),
-    ],
-    'code_style': [
-        (r'function\s+\w+\s*\([^)]*\)\s*\{[^}]{0,10}\}', '함수가 너무 짧습니다. 의미있는 로직이 있는지 확인하세요', IssueSeverity.LOW),
-        (r'var\s+\w+\s*,\s*\w+', '여러 변수를 한 줄에 선언하는 것은 가독성을 떨어뜨립니다', IssueSeverity.LOW),
-        (r'[^;]\s*$', '문장 끝에 세미콜론이 없습니다', IssueSeverity.LOW),
-        (r'[^}]\s*else\s*\{', 'else 앞에 중괄호가 없습니다', IssueSeverity.LOW),
-    ]
-}
+def error_patterns(rules: List[Rule]) -> Dict[str, List[Tuple[str, str, IssueSeverity]]]:
+    """규칙 목록 → 카테고리별 (정규식, 메시지, 심각도) 목록 (토큰 규칙은 변환된 정규식)"""
+    patterns: Dict[str, List[Tuple[str, str, IssueSeverity]]] = {}
+    for rule in rules:
+        patterns.setdefault(rule.category, []).append((rule.pattern, rule.message, IssueSeverity(rule.severity)))
+    return patterns
+
+# 기존 dict 형식이 필요한 코드(테스트, 비교 하네스)를 위한 호환용 보기 (모듈 로드 시점의 규칙 팩 기준)
+ERROR_PATTERNS = error_patterns(get_rule_registry().rules)
 
 # ============================================================================
 # eXBuilder6 API 설정 (YAML 파일로 분리 가능)
@@ -283,8 +248,9 @@ EXBUILDER6_CONTROL_APIS = {
 # ============================================================================
 
 class ConfigManager:
-    def __init__(self, config_path: str = "config/exbuilder6.yaml"):
-        self.config_path = Path(config_path)
+    def __init__(self, config_path: Optional[str] = None):
+        # 실행 위치와 관계없이 backend/config/exbuilder6.yaml 사용
+        self.config_path = Path(config_path) if config_path else DEFAULT_CATALOG_PATH
         self.config = self._load_config()
     
     def _load_config(self) -> Dict:
@@ -302,7 +268,7 @@ class ConfigManager:
                     'current_apis': {}
                 }
         except Exception as e:
-            logger.warning(f"설정 파일 로드 실패: {e}, 기본 설정 사용")
+            logger.warning("Config load failed, using defaults", extra={"error": str(e)})
             return {
                 'versions': {
                     '6.0': {}
@@ -341,6 +307,11 @@ class JavaScriptParser:
         
         return '\n'.join(cleaned_lines)
     
+    def tokenize(self, code: str) -> List[Token]:
+        """주석/문자열을 구분한 토큰 목록 반환"""
+        with analyzer_phase_duration.time(analyzer="enhanced", phase="tokenize"):
+            return list(tokenize(code))
+    
     def _clean_line(self, line: str) -> str:
         """라인별 정리 (주석 제거, 문자열 보호)"""
         result = []
@@ -427,6 +398,30 @@ class EXBuilder6APIValidator:
         # 3. 동적 컨트롤 검사
         return self._check_dynamic_control(control_id)
     
+    def detect_usage(self, code: str) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
+        """app.lookup으로 찾은 컨트롤 변수(변수명 → 타입)와 메서드 호출(변수명, 메서드) 목록"""
+        # app.lookup으로 찾은 컨트롤들의 변수명과 타입 매핑
+        variable_controls = {}
+        
+        # app.lookup 패턴 찾기 (ar, var, let, const 모두 포함)
+        lookup_patterns = [
+            r'(?:ar|var|let|const)\s+(\w+)\s*=\s*app\.lookup\([\'"]([^\'"]+)[\'"]\)',
+            r'(\w+)\s*=\s*app\.lookup\([\'"]([^\'"]+)[\'"]\)'
+        ]
+        
+        for pattern in lookup_patterns:
+            lookup_matches = re.findall(pattern, code)
+            for var_name, control_id in lookup_matches:
+                control_type = self.identify_control_type(control_id)
+                if control_type != 'unknown':
+                    variable_controls[var_name] = control_type
+        
+        # 메서드 호출 패턴 찾기 (오타 감지 포함)
+        method_pattern = r'(\w+)\.(\w+)\('
+        method_calls = [(var_name, method_name) for var_name, method_name in re.findall(method_pattern, code)
+                        if method_name != 'lookup']
+        return variable_controls, method_calls
+    
     def _check_dynamic_control(self, control_id: str) -> str:
         """동적 컨트롤 검사"""
         # 동적으로 생성된 컨트롤 ID 패턴 검사
@@ -506,129 +501,82 @@ class EXBuilder6APIValidator:
 # 성능 최적화된 분석기 클래스
 # ============================================================================
 
+# 요청마다 스레드를 만들지 않도록 정적 분석 검사를 공유 스레드 풀에서 실행
+STATIC_ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="static-analysis")
+
+# 세미콜론 누락 검사 (긴 공백 구간에서 역추적이 커질 수 있어 예산 초과 시 선형 시간 대체 구현으로 전환)
+SEMICOLON_RULE = GuardedPattern("semicolon", r'([^;{}])\s*\n\s*([a-zA-Z_$])')
+
 class PerformanceOptimizedAnalyzer:
-    def __init__(self):
-        self.compiled_patterns = self._compile_patterns()
+    def __init__(self, rule_set: Optional[RuleSet] = None):
+        # 규칙 팩은 레지스트리가 한 번만 컴파일하고, 프로필/요청별 선택 결과도 캐시해 공유
+        self.rule_set = rule_set if rule_set is not None else get_rule_registry().select()
         self.config_manager = ConfigManager()
         self.api_validator = EXBuilder6APIValidator(self.config_manager)
         self.js_parser = JavaScriptParser()
     
-    @lru_cache(maxsize=1000)
-    def _compile_patterns(self):
-        """정규표현식 패턴 사전 컴파일"""
-        compiled = {}
-        for category, patterns in ERROR_PATTERNS.items():
-            compiled[category] = [
-                (re.compile(pattern), message, severity) 
-                for pattern, message, severity in patterns
-            ]
-        return compiled
-    
     def create_issue(self, category: str, severity: IssueSeverity, message: str,
                     line_number: int = None, suggestion: str = None) -> AnalysisIssue:
         """이슈 객체 생성 헬퍼"""
-        # 심각도에 따른 우선순위 설정
-        priority_map = {
-            IssueSeverity.CRITICAL: 'HIGH',
-            IssueSeverity.HIGH: 'HIGH',
-            IssueSeverity.MEDIUM: 'MEDIUM',
-            IssueSeverity.LOW: 'LOW',
-            IssueSeverity.INFO: 'LOW'
-        }
-        
         return AnalysisIssue(
             category=category,
             severity=severity,
             message=message,
             line_number=line_number,
             suggestion=suggestion,
-            priority=priority_map.get(severity, 'MEDIUM')
+            priority=SEVERITY_PRIORITY.get(severity, 'MEDIUM')
+        )
+    
+    def create_partial_issue(self, code: str, rule: GuardedPattern, result: ScanResult) -> AnalysisIssue:
+        """시간 예산 초과로 중단된 규칙 검사를 부분 결과로 알리는 이슈"""
+        line_number = code.count('\n', 0, result.scanned) + 1
+        return self.create_issue(
+            category='analysis_limits',
+            severity=IssueSeverity.INFO,
+            message=f"규칙 {rule.name} 검사가 시간 예산({rule_budget_ms(len(code)):.0f}ms)을 초과해 "
+                    f"{line_number}행 이후는 검사하지 않았습니다 (부분 결과)",
+            line_number=line_number,
+            suggestion='파일을 나누거나 압축(minify)되지 않은 원본 코드로 다시 분석하세요.'
         )
     
     def check_errors_optimized(self, code: str) -> List[AnalysisIssue]:
-        """최적화된 오류 검사"""
+        """최적화된 오류 검사 (공용 규칙 엔진으로 선택된 규칙 팩 규칙 실행)"""
         issues = []
+        line_index = LineIndex(code)
         
-        for category, patterns in self.compiled_patterns.items():
-            for pattern, message, severity in patterns:
-                matches = pattern.finditer(code)
-                for match in matches:
-                    # 라인 번호 계산
-                    line_number = code[:match.start()].count('\n') + 1
-                    column = match.start() - code.rfind('\n', 0, match.start()) - 1
-                    
-                    issues.append(self.create_issue(
-                        category=category,
-                        severity=severity,
-                        message=message,
-                        line_number=line_number,
-                        suggestion=self._get_suggestion(category, message)
-                    ))
+        for hit in self.rule_set.scan(code):
+            rule = hit.rule
+            if hit.result.partial:
+                issues.append(self.create_partial_issue(code, hit.guard, hit.result))
+            for start, _ in hit.result.spans:
+                issues.append(self.create_issue(
+                    category=rule.category,
+                    severity=IssueSeverity(rule.severity),
+                    message=rule.message,
+                    line_number=line_index.line(start),
+                    suggestion=rule.suggestion or '코드를 검토하고 개선하세요.'
+                ))
         
         return issues
     
-    def _get_suggestion(self, category: str, message: str) -> str:
-        """카테고리별 제안사항"""
-        suggestions = {
-            'syntax_errors': '변수 선언 키워드를 올바르게 사용하고, 재귀 함수나 자기 참조를 피하세요.',
-            'variable_scope_issues': 'let/const를 사용하고, 스코프 문제를 방지하세요.',
-            'null_reference': 'null 체크를 추가하거나 옵셔널 체이닝(?.)을 사용하세요.',
-            'xss_security': 'innerText나 textContent를 사용하거나 입력값을 sanitize하세요.',
-            'json_parsing': 'try-catch 블록으로 감싸서 예외 처리를 하세요.',
-            'array_operations': '배열이 null이 아닌지 확인하거나 기본값을 설정하세요.',
-            'string_operations': '인덱스 범위를 확인하거나 안전한 메서드를 사용하세요.',
-            'comparison_issues': '엄격한 비교 연산자(===, !==)를 사용하세요.',
-            'performance_issues': '프로덕션에서는 console.log를 제거하고 무한 루프를 방지하세요.',
-            'error_handling': '적절한 에러 처리 로직을 추가하세요.',
-            'unnecessary_code': '불필요한 코드를 제거하세요.',
-            'async_issues': 'async/await 사용시 try-catch로 감싸고 적절한 에러 처리를 하세요.',
-            'memory_leaks': '이벤트 리스너나 타이머를 적절히 정리하세요.',
-            'type_safety': '타입 체크 후 적절한 처리를 추가하세요.',
-            'code_style': '코드 스타일 가이드를 따르고 가독성을 높이세요.',
-            'api': 'eXBuilder6 API 문서를 확인하고 올바른 메서드명을 사용하세요.'
-        }
-        return suggestions.get(category, '코드를 검토하고 개선하세요.')
-    
     def check_javascript_syntax(self, code: str) -> List[AnalysisIssue]:
         """JavaScript 문법 검사"""
         issues = []
-        lines = code.split('\n')
-        
-        # 괄호 균형 검사
-        brackets = {'(': ')', '{': '}', '[': ']'}
-        stack = []
         
-        for line_num, line in enumerate(lines, 1):
-            for char_pos, char in enumerate(line):
-                if char in brackets:
-                    stack.append((char, line_num, char_pos + 1))
-                elif char in brackets.values():
-                    if not stack:
-                        issues.append(self.create_issue(
-                            category='syntax',
-                            severity=IssueSeverity.HIGH,
-                            message=f"닫는 괄호 '{char}'가 열리는 괄호보다 많습니다",
-                            line_number=line_num
-                        ))
-                        break
-                    open_bracket, open_line, open_pos = stack.pop()
-                    if brackets[open_bracket] != char:
-                        issues.append(self.create_issue(
-                            category='syntax',
-                            severity=IssueSeverity.HIGH,
-                            message=f"괄호 '{char}'가 라인 {open_line}의 '{open_bracket}'와 매칭되지 않습니다",
-                            line_number=line_num
-                        ))
-                        break
-        
-        if stack:
-            for bracket, line_num, char_pos in stack:
-                issues.append(self.create_issue(
-                    category='syntax',
-                    severity=IssueSeverity.HIGH,
-                    message=f"열린 괄호 '{bracket}'가 닫히지 않았습니다",
-                    line_number=line_num
-                ))
+        # 괄호 균형 검사 (토크나이저 기준이라 문자열/주석 안의 괄호는 제외)
+        for bracket in check_structure(code).brackets:
+            if bracket.kind == 'unexpected_close':
+                message = f"닫는 괄호 '{bracket.char}'가 열리는 괄호보다 많습니다"
+            elif bracket.kind == 'mismatch':
+                message = f"괄호 '{bracket.char}'가 라인 {bracket.open_line}의 '{bracket.open_char}'와 매칭되지 않습니다"
+            else:
+                message = f"열린 괄호 '{bracket.char}'가 닫히지 않았습니다"
+            issues.append(self.create_issue(
+                category='syntax',
+                severity=IssueSeverity.HIGH,
+                message=message,
+                line_number=bracket.line
+            ))
         
         # 추가 문법 검사
         issues.extend(self._check_additional_syntax(code))
@@ -638,11 +586,14 @@ class PerformanceOptimizedAnalyzer:
     def _check_additional_syntax(self, code: str) -> List[AnalysisIssue]:
         """추가 문법 검사"""
         issues = []
+        line_index = LineIndex(code)
         
         # 세미콜론 누락 검사
-        semicolon_pattern = r'([^;{}])\s*\n\s*([a-zA-Z_$])'
-        for match in re.finditer(semicolon_pattern, code):
-            line_num = code[:match.start()].count('\n') + 1
+        semicolon_result = SEMICOLON_RULE.scan(code)
+        if semicolon_result.partial:
+            issues.append(self.create_partial_issue(code, SEMICOLON_RULE, semicolon_result))
+        for start, _ in semicolon_result.spans:
+            line_num = line_index.line(start)
             issues.append(self.create_issue(
                 category='code_style',
                 severity=IssueSeverity.LOW,
@@ -659,7 +610,7 @@ class PerformanceOptimizedAnalyzer:
             for var_match in re.finditer(r'\bvar\s+(\w+)\b', func_body):
                 var_name = var_match.group(1)
                 abs_pos = func_body_start + var_match.start()
-                line_num = code[:abs_pos].count('\n') + 1
+                line_num = line_index.line(abs_pos)
                 if var_name in seen_in_function:
                     issues.append(self.create_issue(
                         category='variable_scope_issues',
@@ -675,7 +626,7 @@ class PerformanceOptimizedAnalyzer:
         for match in re.finditer(r'\bvar\s+(\w+)\b', code):
             var_name = match.group(1)
             if var_name not in declared_vars:
-                declared_vars[var_name] = code[:match.start()].count('\n') + 1
+                declared_vars[var_name] = line_index.line(match.start())
         for var_name, decl_line in declared_vars.items():
             usage_pattern = rf'\b{var_name}\b(?!\s*=)'
             # 선언 이후 영역에서의 사용 여부만 간단히 확인
@@ -693,31 +644,9 @@ class PerformanceOptimizedAnalyzer:
     def check_exbuilder6_apis(self, code: str) -> List[AnalysisIssue]:
         """eXBuilder6 API 검사"""
         issues = []
+        variable_controls, method_calls = self.api_validator.detect_usage(code)
         
-        # app.lookup으로 찾은 컨트롤들의 변수명과 타입 매핑
-        variable_controls = {}
-        
-        # app.lookup 패턴 찾기 (ar, var, let, const 모두 포함)
-        lookup_patterns = [
-            r'(?:ar|var|let|const)\s+(\w+)\s*=\s*app\.lookup\([\'"]([^\'"]+)[\'"]\)',
-            r'(\w+)\s*=\s*app\.lookup\([\'"]([^\'"]+)[\'"]\)'
-        ]
-        
-        for pattern in lookup_patterns:
-            lookup_matches = re.findall(pattern, code)
-            for var_name, control_id in lookup_matches:
-                control_type = self.api_validator.identify_control_type(control_id)
-                if control_type != 'unknown':
-                    variable_controls[var_name] = control_type
-        
-        # 메서드 호출 패턴 찾기 (오타 감지 포함)
-        method_pattern = r'(\w+)\.(\w+)\('
-        method_matches = re.findall(method_pattern, code)
-        
-        for var_name, method_name in method_matches:
-            if method_name == 'lookup':
-                continue
-                
+        for var_name, method_name in method_calls:
             if var_name in variable_controls:
                 control_type = variable_controls[var_name]
                 api_issues = self.api_validator.validate_api_usage(var_name, method_name, control_type)
@@ -740,22 +669,35 @@ class PerformanceOptimizedAnalyzer:
         
         return issues
     
+    def _timed_phase(self, phase: str, check, code: str):
+        """분석 단계 실행 시간을 analyzer_phase_seconds에 기록 (메모리 계측 중이면 단계별 할당도 기록)"""
+        with analyzer_phase_duration.time(analyzer="enhanced", phase=phase), memory_phase(phase, analyzer="enhanced"):
+            return check(code)
+    
     async def analyze_async(self, code: str) -> Dict:
         """비동기 분석"""
-        tasks = []
-        
-        # 병렬로 각 분석 수행
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            tasks.extend([
-                loop.run_in_executor(executor, self.check_javascript_syntax, code),
-                loop.run_in_executor(executor, self.check_exbuilder6_apis, code),
-                loop.run_in_executor(executor, self.check_errors_optimized, code),
-                loop.run_in_executor(executor, self.analyze_execution_flow, code)
+        phases = [
+            ("syntax", self.check_javascript_syntax),
+            ("api_validation", self.check_exbuilder6_apis),
+            ("rules", self.check_errors_optimized),
+            ("flow", self.analyze_execution_flow),
+        ]
+        loop = asyncio.get_running_loop()
+        executor = STATIC_ANALYSIS_EXECUTOR
+        
+        if current_memory_profile() is not None:
+            # 메모리 계측 중인 요청은 단계별 할당을 구분하도록 순서대로 실행
+            # (run_in_executor는 컨텍스트를 넘기지 않으므로 계측 컨텍스트를 복사해 실행)
+            results = []
+            for phase, check in phases:
+                results.append(await loop.run_in_executor(
+                    executor, contextvars.copy_context().run, self._timed_phase, phase, check, code))
+        else:
+            # 병렬로 각 분석 수행 (공유 스레드 풀 사용, 대기 중에도 이벤트 루프는 다른 작업(LLM 요청 등) 처리)
+            results = await asyncio.gather(*[
+                loop.run_in_executor(executor, self._timed_phase, phase, check, code) for phase, check in phases
             ])
         
-        results = await asyncio.gather(*tasks)
-        
         return {
             'syntax': results[0],
             'apis': results[1], 
@@ -1020,11 +962,11 @@ class PerformanceOptimizedAnalyzer:
 def error_context(operation: str):
     """에러 컨텍스트 관리"""
     try:
-        logger.info(f"Starting {operation}")
+        logger.debug("Starting %s", operation)
         yield
-        logger.info(f"Completed {operation}")
+        logger.debug("Completed %s", operation)
     except Exception as e:
-        logger.error(f"Error in {operation}: {str(e)}")
+        logger.error("Error in %s: %s", operation, e)
         raise HTTPException(
             status_code=500, 
             detail=f"{operation} 중 오류 발생: {str(e)}"
@@ -1034,11 +976,26 @@ def error_context(operation: str):
 # API 엔드포인트
 # ============================================================================
 
+def select_rules(profile: Optional[str] = None, rules: Optional[List[str]] = None,
+                 disabled_rules: Optional[List[str]] = None) -> RuleSet:
+    """요청의 규칙 선택 → RuleSet (알 수 없는 프로필/선택자는 400, error_context 밖에서 호출)"""
+    try:
+        return get_rule_registry().select(profile, rules, disabled_rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _split_selectors(value: Optional[str]) -> Optional[List[str]]:
+    """쿼리 파라미터의 쉼표 구분 선택자 목록"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
 @router.post("/analyze", response_model=EnhancedJavaScriptAnalysisResponse)
 async def analyze_javascript_enhanced(request: JavaScriptAnalysisRequest):
     """향상된 JavaScript 분석"""
+    rule_set = select_rules(request.rule_profile, request.rules, request.disabled_rules)
     with error_context("JavaScript 분석"):
-        analyzer = PerformanceOptimizedAnalyzer()
+        analyzer = PerformanceOptimizedAnalyzer(rule_set)
         results = await analyzer.analyze_async(request.code)
         
         # 모든 이슈 통합
@@ -1081,16 +1038,20 @@ async def analyze_javascript_enhanced(request: JavaScriptAnalysisRequest):
         )
 
 @router.post("/analyze/file")
-async def analyze_javascript_file_enhanced(file: UploadFile = File(...), fast_mode: bool = False):
-    """향상된 JavaScript 파일 분석"""
+async def analyze_javascript_file_enhanced(file: UploadFile = File(...), fast_mode: bool = False,
+                                          rule_profile: Optional[str] = None, rules: Optional[str] = None,
+                                          disabled_rules: Optional[str] = None):
+    """향상된 JavaScript 파일 분석 (rules/disabled_rules는 쉼표로 구분)"""
+    rule_set = select_rules(rule_profile, _split_selectors(rules), _split_selectors(disabled_rules))
     with error_context("파일 분석"):
         if not file.filename.endswith('.js'):
             raise HTTPException(status_code=400, detail="JavaScript 파일(.js)만 업로드 가능합니다.")
         
         content = await file.read()
-        code = content.decode('utf-8')
+        with memory_phase("decode"):
+            code = content.decode('utf-8')
         
-        analyzer = PerformanceOptimizedAnalyzer()
+        analyzer = PerformanceOptimizedAnalyzer(rule_set)
         results = await analyzer.analyze_async(code)
         
         # 결과 통합
@@ -1108,78 +1069,235 @@ async def analyze_javascript_file_enhanced(file: UploadFile = File(...), fast_mo
 
 @router.post("/analyze/detailed")
 async def analyze_javascript_detailed_enhanced(request: JavaScriptAnalysisRequest):
-    """상세한 JavaScript 코드 분석 (LLM 포함)"""
+    """상세한 JavaScript 코드 분석 (LLM 포함)
+
+    정적 분석과 LLM 요청을 동시에 실행하므로 응답 시간은 두 단계 중 느린 쪽에 맞춰집니다.
+    """
+    rule_set = select_rules(request.rule_profile, request.rules, request.disabled_rules)
     with error_context("상세 분석"):
-        # 기본 분석
-        analyzer = PerformanceOptimizedAnalyzer()
-        basic_results = await analyzer.analyze_async(request.code)
-        
-        # 결과 통합
-        all_issues = []
-        all_issues.extend(basic_results['syntax'])
-        all_issues.extend(basic_results['apis'])
-        all_issues.extend(basic_results['errors'])
-        
-        # 통계 생성
-        statistics = {
-            'total_issues': len(all_issues),
-            'syntax_issues': len(basic_results['syntax']),
-            'api_issues': len(basic_results['apis']),
-            'error_issues': len(basic_results['errors']),
-            'critical_issues': len([i for i in all_issues if i.severity == IssueSeverity.CRITICAL]),
-            'high_priority_issues': len([i for i in all_issues if i.severity == IssueSeverity.HIGH]),
-            'medium_priority_issues': len([i for i in all_issues if i.severity == IssueSeverity.MEDIUM]),
-            'low_priority_issues': len([i for i in all_issues if i.severity == IssueSeverity.LOW])
-        }
-        
-        # 권장사항 생성
-        recommendations = []
-        if statistics['critical_issues'] > 0:
-            recommendations.append("보안 위험이 있는 코드를 즉시 수정하세요.")
-        if statistics['high_priority_issues'] > 0:
-            recommendations.append("높은 우선순위 이슈들을 우선적으로 해결하세요.")
-        if statistics['syntax_issues'] > 0:
-            recommendations.append("문법 오류를 수정하여 코드 실행을 보장하세요.")
-        if statistics['api_issues'] > 0:
-            recommendations.append("eXBuilder6 API 사용법을 확인하고 올바른 메서드를 사용하세요.")
-        
-        if not recommendations:
-            recommendations.append("코드 품질이 양호합니다. 계속해서 좋은 코딩 관례를 유지하세요.")
-        
-        # LLM 분석
+        llm_task = asyncio.create_task(run_llm_analysis(request))
         try:
-            llm_result = analyze_with_llm(request.code, request.fast_mode)
-            llm_analysis = llm_result.get("llm_analysis", "LLM 분석 결과를 가져올 수 없습니다.")
+            basic_results = await PerformanceOptimizedAnalyzer(rule_set).analyze_async(request.code)
+        except BaseException:
+            llm_task.cancel()
+            raise
+        llm_analysis, llm_issues, llm_notice = await llm_task
+        return build_detailed_response(basic_results, llm_analysis, llm_issues, llm_notice)
+
+@router.post("/analyze/detailed/stream")
+async def analyze_javascript_detailed_stream(request: JavaScriptAnalysisRequest):
+    """상세 분석 스트리밍 (NDJSON)
+
+    정적 분석 결과를 준비되는 즉시 첫 줄({"phase": "static", ...})로 보내고,
+    LLM 분석이 끝나면 병합된 최종 결과({"phase": "llm", ...})를 보냅니다.
+    """
+    rule_set = select_rules(request.rule_profile, request.rules, request.disabled_rules)
+    llm_task = asyncio.create_task(run_llm_analysis(request))
+    
+    async def generate():
+        try:
+            basic_results = await PerformanceOptimizedAnalyzer(rule_set).analyze_async(request.code)
+            static_response = build_detailed_response(basic_results)
+            with analyzer_phase_duration.time(analyzer="enhanced", phase="serialize"):
+                line = json.dumps({"phase": "static", **jsonable_encoder(static_response)}, ensure_ascii=False) + "\n"
+            yield line
+            llm_analysis, llm_issues, llm_notice = await llm_task
+            final_response = build_detailed_response(basic_results, llm_analysis, llm_issues, llm_notice)
+            with analyzer_phase_duration.time(analyzer="enhanced", phase="serialize"):
+                line = json.dumps({"phase": "llm", **jsonable_encoder(final_response)}, ensure_ascii=False) + "\n"
+            yield line
         except Exception as e:
-            llm_analysis = f"LLM 분석 실패: {str(e)}"
-        
-        return EnhancedJavaScriptAnalysisResponse(
-            issues=all_issues,
-            statistics=statistics,
-            execution_flow=basic_results['flow'],
-            recommendations=recommendations,
-            llm_analysis=llm_analysis
-        )
+            logger.error("Detailed analysis stream failed", extra={"error": str(e)})
+            yield json.dumps({"phase": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+        finally:
+            llm_task.cancel()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
-def analyze_with_llm(code: str, fast_mode: bool = False) -> Dict[str, Any]:
-    """LM Studio를 사용한 고급 분석"""
-    prompt = f"""JavaScript 코드를 다음 4가지 항목으로 분석해주세요:
+async def run_llm_analysis(
+        request: JavaScriptAnalysisRequest) -> Tuple[Optional[str], List[AnalysisIssue], Optional[str]]:
+    """LLM 분석 (findings 모드는 이슈 목록, markdown 모드는 서술형 결과 반환)
+
+    세 번째 값은 LLM_FALLBACK=static으로 LLM 결과 없이 정적 분석만 제공할 때의 안내 문구입니다.
+    """
+    if request.llm_output == "findings":
+        try:
+            llm_issues = await asyncio.to_thread(analyze_with_llm_findings, request.code, request.fast_mode,
+                                                 request.compact_prompt)
+        except StaticFallback as e:
+            return None, [], str(e)
+        return None, llm_issues, None
+    try:
+        llm_result = await asyncio.to_thread(analyze_with_llm, request.code, request.fast_mode,
+                                             request.compact_prompt)
+        if llm_result.get("llm_fallback"):
+            return None, [], llm_result["llm_notice"]
+        return llm_result.get("llm_analysis", "LLM 분석 결과를 가져올 수 없습니다."), [], None
+    except Exception as e:
+        return f"LLM 분석 실패: {str(e)}", [], None
+
+def build_detailed_response(basic_results: Dict, llm_analysis: Optional[str] = None,
+                            llm_issues: List[AnalysisIssue] = (),
+                            llm_notice: Optional[str] = None) -> EnhancedJavaScriptAnalysisResponse:
+    """정적 분석 결과와 LLM 결과로 상세 분석 응답 구성 (LLM 이슈는 정적 분석 이슈와 병합)
+
+    llm_notice: LLM_FALLBACK=static으로 LLM 결과 없이 응답할 때의 안내 (llm_fallback='static')
+    """
+    # 결과 통합
+    all_issues = []
+    all_issues.extend(basic_results['syntax'])
+    all_issues.extend(basic_results['apis'])
+    all_issues.extend(basic_results['errors'])
+    
+    # findings 모드는 간결한 JSON을 받아 정적 분석 이슈와 병합
+    if llm_issues:
+        all_issues = merge_llm_issues(all_issues, list(llm_issues))
+    
+    # 통계 생성
+    statistics = {
+        'total_issues': len(all_issues),
+        'syntax_issues': len(basic_results['syntax']),
+        'api_issues': len(basic_results['apis']),
+        'error_issues': len(basic_results['errors']),
+        'llm_issues': len([i for i in all_issues if i.source == 'llm']),
+        'critical_issues': len([i for i in all_issues if i.severity == IssueSeverity.CRITICAL]),
+        'high_priority_issues': len([i for i in all_issues if i.severity == IssueSeverity.HIGH]),
+        'medium_priority_issues': len([i for i in all_issues if i.severity == IssueSeverity.MEDIUM]),
+        'low_priority_issues': len([i for i in all_issues if i.severity == IssueSeverity.LOW])
+    }
+    
+    # 권장사항 생성
+    recommendations = []
+    if statistics['critical_issues'] > 0:
+        recommendations.append("보안 위험이 있는 코드를 즉시 수정하세요.")
+    if statistics['high_priority_issues'] > 0:
+        recommendations.append("높은 우선순위 이슈들을 우선적으로 해결하세요.")
+    if statistics['syntax_issues'] > 0:
+        recommendations.append("문법 오류를 수정하여 코드 실행을 보장하세요.")
+    if statistics['api_issues'] > 0:
+        recommendations.append("eXBuilder6 API 사용법을 확인하고 올바른 메서드를 사용하세요.")
+    
+    if not recommendations:
+        recommendations.append("코드 품질이 양호합니다. 계속해서 좋은 코딩 관례를 유지하세요.")
+    
+    return EnhancedJavaScriptAnalysisResponse(
+        issues=all_issues,
+        statistics=statistics,
+        execution_flow=basic_results['flow'],
+        recommendations=recommendations,
+        llm_analysis=llm_analysis,
+        llm_fallback="static" if llm_notice else None,
+        llm_notice=llm_notice
+    )
+
+@lru_cache(maxsize=1)
+def _shared_api_validator() -> EXBuilder6APIValidator:
+    return EXBuilder6APIValidator(ConfigManager())
 
-**분석할 코드:**
-```javascript
-{code}
-```
+def detect_file_controls(full_code: str) -> Dict[str, str]:
+    """파일 전체의 app.lookup 선언 (변수명 → 컨트롤 타입)
 
-**분석 요청:**
-1. JavaScript 문법/로직 문제점 (구체적인 라인 번호와 함께)
-2. eXBuilder6 API 사용 여부 (사용된 API 목록 및 잘못된 사용 여부)
-3. 잠재적 오류 및 보안 위험 요소
-4. 실행 흐름 (단계별 상세 과정 - 스토리텔링 방식)
+    파일을 함수/청크로 나눠 리뷰할 때 한 번만 계산해 build_api_reference에 전달합니다.
+    """
+    return _shared_api_validator().detect_usage(full_code)[0]
 
-발견된 문제가 없으면 "발견된 문제점 없음"으로 표시하세요."""
+def build_api_reference(code: str, file_controls: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """정적 분석이 감지한 컨트롤/메서드에 관련된 eXBuilder6 API 참고 정보 (LLM 프롬프트용)
+
+    file_controls: code가 파일의 일부(함수/청크)일 때 파일 전체의 app.lookup 선언 (detect_file_controls)
+    """
+    variable_controls, method_calls = _shared_api_validator().detect_usage(code)
+    controls: Dict[str, List[str]] = {control_type: [] for control_type in variable_controls.values()}
+    if file_controls is not None:
+        variable_controls = {**file_controls, **variable_controls}
+    unbound_methods = []
+    for var_name, method_name in method_calls:
+        if var_name in variable_controls:
+            controls.setdefault(variable_controls[var_name], []).append(method_name)
+        else:
+            unbound_methods.append(method_name)
+    return get_api_reference().render(controls, unbound_methods)
 
+def analyze_with_llm(code: str, fast_mode: bool = False, compact_prompt: Optional[bool] = None) -> Dict[str, Any]:
+    """LM Studio를 사용한 고급 분석"""
     try:
-        result = request_llm_fast(prompt) if fast_mode else request_llm(prompt)
+        result = request_llm_template("enhanced_analysis", code, fast_mode, compact_prompt,
+                                      api_context=build_api_reference(code))
         return {"llm_analysis": result}
+    except StaticFallback as e:
+        return e.result()
     except Exception as e:
         return {"llm_analysis": f"LLM 분석 중 오류 발생: {str(e)}"}
+
+def analyze_with_llm_findings(code: str, fast_mode: bool = False,
+                              compact_prompt: Optional[bool] = None) -> List[AnalysisIssue]:
+    """LLM에 간결한 JSON 이슈 목록을 요청하고 AnalysisIssue로 변환"""
+    try:
+        result = request_llm_template("enhanced_findings", code, fast_mode, compact_prompt,
+                                      api_context=build_api_reference(code))
+    except StaticFallback:
+        raise
+    except Exception as e:
+        logger.warning("LLM findings request failed", extra={"error": str(e)})
+        return []
+    if result.startswith("[ERROR]"):
+        logger.warning("LLM findings request failed", extra={"error": result.splitlines()[0]})
+        return []
+    return parse_llm_findings(result)
+
+def parse_llm_findings(text: str) -> List[AnalysisIssue]:
+    """LLM findings 응답(JSON 배열)을 AnalysisIssue 목록으로 변환"""
+    findings = extract_json(text)
+    if isinstance(findings, dict):
+        findings = findings.get("findings", [])
+    if not isinstance(findings, list):
+        return []
+    
+    issues = []
+    for finding in findings:
+        if not isinstance(finding, dict) or not finding.get("message"):
+            continue
+        try:
+            severity = IssueSeverity(str(finding.get("severity", "")).lower())
+        except ValueError:
+            severity = IssueSeverity.MEDIUM
+        line = finding.get("line")
+        issues.append(AnalysisIssue(
+            category=str(finding.get("category") or "llm"),
+            severity=severity,
+            message=str(finding["message"]),
+            line_number=line if isinstance(line, int) and line > 0 else None,
+            priority=SEVERITY_PRIORITY[severity],
+            source='llm'
+        ))
+    return issues
+
+def merge_llm_issues(static_issues: List[AnalysisIssue], llm_issues: List[AnalysisIssue]) -> List[AnalysisIssue]:
+    """정적 분석 이슈와 같은 라인/카테고리의 LLM 이슈는 제외하고 병합
+
+    정적 분석 카테고리(xss_security 등)는 LLM_FINDING_CATEGORIES로 LLM 카테고리(security 등)에 맞춰 비교합니다.
+    """
+    key = lambda issue: (issue.line_number, LLM_FINDING_CATEGORIES.get(issue.category, issue.category))
+    seen = {key(issue) for issue in static_issues}
+    merged = list(static_issues)
+    for issue in llm_issues:
+        if key(issue) not in seen:
+            seen.add(key(issue))
+            merged.append(issue)
+    return merged
+
+@router.post("/analyze/explain")
+async def explain_javascript(request: ExplainRequest):
+    """서술형 LLM 설명 (findings 모드 사용 시 필요할 때만 요청)"""
+    with error_context("LLM 설명"):
+        if request.issue is None:
+            return await asyncio.to_thread(analyze_with_llm, request.code, request.fast_mode, request.compact_prompt)
+        issue = request.issue
+        try:
+            result = await asyncio.to_thread(request_llm_template, "enhanced_explain_issue", request.code,
+                                             request.fast_mode, request.compact_prompt,
+                                             api_context=build_api_reference(request.code),
+                                             line=issue.line_number or "-", message=issue.message)
+        except StaticFallback as e:
+            return e.result()
+        return {"llm_analysis": result}
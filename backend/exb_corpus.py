@@ -0,0 +1,181 @@
+"""
+eXBuilder6 화면 스크립트 합성 코퍼스 생성기
+
+벤치마크가 실제 업무 화면과 비슷한 입력을 쓰도록 app.lookup으로 찾은 그리드/콤보/입력박스를
+다루는 이벤트 핸들러, 서브미션 전송/콜백, 입력 검증, 파일 업로드, 유틸 함수를 섞어
+원하는 크기(1KB ~ 10MB)의 스크립트를 만듭니다. 같은 seed와 크기는 항상 같은 코드를 만들므로
+저장된 기준선과 비교할 수 있습니다. 일부 블록에는 분석기가 찾아야 할 문제(innerHTML,
+try 없는 JSON.parse, 오타 API, == 비교)를 일정 비율로 넣습니다.
+
+    python backend/exb_corpus.py --sizes 1k,100k,10m --out corpus/
+"""
+
+import random
+from typing import Callable, List, Optional
+
+DEFAULT_SEED = 6
+# 문제를 포함한 블록 비율
+ISSUE_RATE = 0.1
+
+SUBJECTS = ["User", "Order", "Product", "Dept", "Notice", "Code", "Menu", "Approval", "Claim", "Stock"]
+
+def parse_size(text: str) -> int:
+    """'1k', '10KB', '2m', '4096' 형태의 크기를 문자 수로 변환"""
+    value = text.strip().lower().rstrip("b")
+    units = {"k": 1024, "m": 1024 * 1024}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+def format_size(size: int) -> str:
+    for unit, scale in (("MB", 1024 * 1024), ("KB", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return f"{size}B"
+
+# ============================================================================
+# 블록 생성기 (rng, 블록 번호 → 코드 조각)
+# ============================================================================
+
+def _control(rng: random.Random, prefix: str, index: int) -> str:
+    return f"{prefix}{rng.choice(SUBJECTS)}{index}"
+
+def _on_load(rng: random.Random, index: int) -> str:
+    controls = [_control(rng, prefix, index) for prefix in ("grd", "cmb", "ipb", "btn")]
+    lookups = "".join(f"    var {name} = app.lookup(\"{name}\");\n" for name in controls)
+    return (f"/**\n * 화면 초기화 {index}\n */\n"
+            f"function onBodyLoad{index}(e) {{\n{lookups}"
+            f"    {controls[1]}.setSelected(0);\n"
+            f"    {controls[2]}.setValue(\"\");\n"
+            f"    {controls[3]}.disable();\n"
+            f"    app.lookup(\"smsSearch{index}\").send();\n}}\n\n")
+
+def _grid_handler(rng: random.Random, index: int) -> str:
+    grid = _control(rng, "grd", index)
+    target = _control(rng, "ipb", index)
+    column = rng.choice(["userId", "orderNo", "amount", "status", "deptCode"])
+    issue = rng.random() < ISSUE_RATE
+    method = "getCelValue" if issue else "getCellValue"
+    return (f"function {grid}_onCellClick(e) {{\n"
+            f"    var grid = app.lookup(\"{grid}\");\n"
+            f"    var rowIndex = grid.getSelectedRowIndex();\n"
+            f"    if (rowIndex < 0) {{\n        return;\n    }}\n"
+            f"    var value = grid.{method}(rowIndex, \"{column}\");\n"
+            f"    app.lookup(\"{target}\").setValue(value);\n"
+            f"    for (var i = 0; i < grid.getRowCount(); i++) {{\n"
+            f"        if (grid.getCellValue(i, \"status\") === \"D\") {{\n"
+            f"            grid.setCellValue(i, \"checked\", false);\n        }}\n    }}\n}}\n\n")
+
+def _combo_handler(rng: random.Random, index: int) -> str:
+    combo = _control(rng, "cmb", index)
+    grid = _control(rng, "grd", index)
+    compare = "==" if rng.random() < ISSUE_RATE else "==="
+    return (f"function {combo}_onSelectionChanged(e) {{\n"
+            f"    var combo = app.lookup(\"{combo}\");\n"
+            f"    var selected = combo.getSelected();\n"
+            f"    if (selected {compare} null) {{\n"
+            f"        app.lookup(\"{grid}\").clear();\n        return;\n    }}\n"
+            f"    var submission = app.lookup(\"smsList{index}\");\n"
+            f"    submission.setParameters(\"code\", selected.value);\n"
+            f"    submission.send();\n}}\n\n")
+
+def _submission_callback(rng: random.Random, index: int) -> str:
+    grid = _control(rng, "grd", index)
+    if rng.random() < ISSUE_RATE:
+        parse = "    var data = JSON.parse(e.control.getResponseText());\n"
+    else:
+        parse = ("    var data;\n    try {\n        data = JSON.parse(e.control.getResponseText());\n"
+                 "    } catch (error) {\n        console.error(\"응답 파싱 실패\", error);\n        return;\n    }\n")
+    return (f"function smsList{index}_onSubmitSuccess(e) {{\n{parse}"
+            f"    var grid = app.lookup(\"{grid}\");\n"
+            f"    grid.setData(data.list || []);\n"
+            f"    app.lookup(\"optTotal{index}\").value = data.totalCount + \"건\";\n}}\n\n"
+            f"function smsList{index}_onSubmitError(e) {{\n"
+            f"    showMessage(\"조회 중 오류가 발생했습니다: \" + e.control.getResponseText());\n}}\n\n")
+
+def _validation(rng: random.Random, index: int) -> str:
+    fields = [_control(rng, rng.choice(("ipb", "cal", "txa")), index + offset) for offset in range(rng.randint(2, 5))]
+    checks = "".join(
+        f"    if (!app.lookup(\"{name}\").getValue()) {{\n"
+        f"        showMessage(\"{name} 항목은 필수입니다.\");\n"
+        f"        app.lookup(\"{name}\").focus();\n        return false;\n    }}\n" for name in fields)
+    return f"function validateForm{index}() {{\n{checks}    return true;\n}}\n\n"
+
+def _save_handler(rng: random.Random, index: int) -> str:
+    button = _control(rng, "btn", index)
+    output = ("    document.getElementById(\"result\").innerHTML = message;\n" if rng.random() < ISSUE_RATE
+              else "    app.lookup(\"optResult\").value = message;\n")
+    return (f"function {button}_onClick(e) {{\n"
+            f"    if (!validateForm{index}()) {{\n        return;\n    }}\n"
+            f"    var button = app.lookup(\"{button}\");\n"
+            f"    button.disable();\n"
+            f"    var submission = app.lookup(\"smsSave{index}\");\n"
+            f"    submission.addRequestData(app.lookup(\"dsSave{index}\"));\n"
+            f"    submission.send();\n"
+            f"    var message = \"저장 요청: \" + new Date().toISOString();\n{output}"
+            f"    button.enable();\n}}\n\n")
+
+def _file_upload(rng: random.Random, index: int) -> str:
+    return (f"function btnUpload{index}_onClick(e) {{\n"
+            f"    var fileInput = app.lookup(\"fileInput{index}\");\n"
+            f"    var files = fileInput.files;\n"
+            f"    if (!files || files.length === 0) {{\n"
+            f"        showMessage(\"파일을 선택하세요.\");\n        return;\n    }}\n"
+            f"    var submission = app.lookup(\"smsUpload{index}\");\n"
+            f"    for (var i = 0; i < files.length; i++) {{\n"
+            f"        submission.addFileParameter(\"file\" + i, files[i]);\n    }}\n"
+            f"    submission.send();\n}}\n\n")
+
+def _utility(rng: random.Random, index: int) -> str:
+    combo = _control(rng, "cmb", index)
+    tree = _control(rng, "tre", index)
+    return (f"// 공통 코드 조회 결과를 콤보/트리에 반영\n"
+            f"function bindCodes{index}(codes) {{\n"
+            f"    var combo = app.lookup(\"{combo}\");\n"
+            f"    combo.clear();\n"
+            f"    codes.forEach(function(code) {{\n"
+            f"        combo.addItem(code.label, code.value);\n    }});\n"
+            f"    var tree = app.lookup(\"{tree}\");\n"
+            f"    tree.setData(codes.filter(function(code) {{ return code.parent; }}));\n"
+            f"    tree.refresh();\n}}\n\n")
+
+BLOCKS: List[Callable[[random.Random, int], str]] = [
+    _on_load, _grid_handler, _combo_handler, _submission_callback,
+    _validation, _save_handler, _file_upload, _utility,
+]
+
+def generate_screen_script(size: int, seed: int = DEFAULT_SEED) -> str:
+    """size 문자 이상(마지막 블록까지)의 화면 스크립트 (seed와 size가 같으면 같은 결과)"""
+    rng = random.Random(f"{seed}:{size}")
+    parts = [f"/************************************************\n"
+             f" * 합성 화면 스크립트 (seed={seed}, size={format_size(size)})\n"
+             f" ************************************************/\n\n"]
+    length, index = len(parts[0]), 0
+    while length < size:
+        part = rng.choice(BLOCKS)(rng, index)
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return "".join(parts)
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="eXBuilder6 합성 화면 스크립트 생성")
+    parser.add_argument("--sizes", default="1k,10k,100k,1m", help="쉼표로 구분한 크기 (예: 1k,10k,10m)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", default="corpus", help="출력 디렉토리")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for text in args.sizes.split(","):
+        size = parse_size(text)
+        path = os.path.join(args.out, f"screen_{format_size(size).lower()}_seed{args.seed}.js")
+        code = generate_screen_script(size, args.seed)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(code)
+        print(f"{path}: {len(code):,}자, {code.count(chr(10)):,}줄")
+
+if __name__ == "__main__":
+    main()
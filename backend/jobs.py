@@ -0,0 +1,255 @@
+"""
+비동기 작업 API (오래 걸리는 분석을 작업으로 실행하고 진행 상황 조회)
+
+POST /api/jobs 는 작업 ID를 바로 반환하고, 제한된 수의 워커가 대기열의 작업을 실행합니다.
+GET /api/jobs/{id} 로 진행률과 부분 결과를, 완료 후에는 전체 결과를 조회합니다.
+결과는 JOB_RESULT_TTL_SECONDS 동안 메모리에 보관됩니다.
+작업은 HTTP 요청과 분리된 취소 토큰으로 실행되므로 클라이언트가 연결을 끊어도 계속 진행되고,
+DELETE /api/jobs/{id} 로 취소할 수 있습니다.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from metrics import REGISTRY
+from llm_cancel import CancelToken, LLMCancelled, set_current_token
+from llm_resilience import StaticFallback
+from review import ReviewRequest, plan_review
+from js_analyzer import JavaScriptAnalysisRequest, run_batch_analysis
+from enhanced_js_analyzer import (
+    JavaScriptAnalysisRequest as EnhancedAnalysisRequest,
+    analyze_javascript_detailed_enhanced,
+)
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+jobs_total = REGISTRY.counter(
+    "jobs_total", "종류/최종 상태별 작업 수", ("kind", "status"))
+
+class JobRequest(BaseModel):
+    kind: str                # review, js_batch, enhanced_detailed
+    payload: Dict[str, Any]  # 각 종류의 요청 본문 (ReviewRequest 등)
+
+class Job:
+    def __init__(self, kind: str, request: BaseModel, timeout: Optional[float]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.request = request
+        self.status = "queued"  # queued → running → completed / failed / cancelled
+        self.done = 0
+        self.total = 0
+        self.current: Optional[str] = None
+        self.partial_result: Any = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished_at: Optional[float] = None
+        self.token = CancelToken(time.monotonic() + timeout if timeout else None)
+
+    def progress(self, done: int, total: int, partial_result: Any = None, current: Optional[str] = None):
+        self.done = done
+        self.total = total
+        self.current = current
+        if partial_result is not None:
+            self.partial_result = partial_result
+        self.updated_at = time.time()
+
+    def finish(self, status: str, result: Any = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.current = None
+        self.updated_at = self.finished_at = time.time()
+        jobs_total.inc(kind=self.kind, status=status)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return jsonable_encoder({
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {"done": self.done, "total": self.total, "current": self.current},
+            "partial_result": self.partial_result if self.status in ("running", "cancelled", "failed") else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        })
+
+class JobStore:
+    """완료 후 TTL이 지난 작업을 조회 시점에 정리하는 메모리 저장소"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: Job):
+        with self._lock:
+            self._purge()
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def count(self, *statuses: str) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status in statuses)
+
+    def _purge(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and now - job.finished_at > self.ttl_seconds]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+# ============================================================================
+# 작업 종류별 실행 함수
+# ============================================================================
+
+async def run_review_job(job: Job) -> Dict[str, Any]:
+    sections: List[str] = []
+    units = plan_review(job.request)
+    for index, unit in enumerate(units):
+        job.progress(index, len(units), current=unit.label)
+        try:
+            sections.extend(await asyncio.to_thread(unit.run))
+        except StaticFallback as e:
+            return e.result("result")
+        job.progress(index + 1, len(units), {"result": "\n\n".join(sections)})
+    return {"result": "\n\n".join(sections)}
+
+async def run_js_batch_job(job: Job) -> Any:
+    job.progress(0, 1, current="배치 분석")
+    return await run_batch_analysis(job.request, on_progress=lambda done, total, partial_result:
+                                    job.progress(done, total, partial_result))
+
+async def run_enhanced_detailed_job(job: Job) -> Any:
+    job.progress(0, 1, current="상세 분석")
+    result = await analyze_javascript_detailed_enhanced(job.request)
+    job.progress(1, 1)
+    return result
+
+JOB_KINDS: Dict[str, tuple] = {
+    "review": (ReviewRequest, run_review_job),
+    "js_batch": (JavaScriptAnalysisRequest, run_js_batch_job),
+    "enhanced_detailed": (EnhancedAnalysisRequest, run_enhanced_detailed_job),
+}
+
+# ============================================================================
+# 워커
+# ============================================================================
+
+class JobRunner:
+    def __init__(self, workers: int, queue_limit: int, ttl_seconds: float):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.store = JobStore(ttl_seconds)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._tasks and self._tasks[0].get_loop() is loop:
+            return
+        self._queue = asyncio.Queue()
+        # 요청 컨텍스트(취소 토큰)를 물려받지 않도록 빈 컨텍스트에서 워커 시작
+        self._tasks = [loop.create_task(self._worker(), context=contextvars.Context())
+                       for _ in range(self.workers)]
+
+    def submit(self, job: Job):
+        self._ensure_workers()
+        if self.store.count("queued") >= self.queue_limit:
+            raise HTTPException(status_code=429, detail=f"대기 중인 작업이 {self.queue_limit}개를 초과했습니다. 잠시 후 다시 시도하세요.")
+        self.store.add(job)
+        self._queue.put_nowait(job)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        if job.status == "cancelled":
+            return
+        if job.token.cancelled:
+            job.finish("cancelled", error=job.token.reason)
+            return
+        job.status = "running"
+        _, run = JOB_KINDS[job.kind]
+        # LLM 호출(asyncio.to_thread)까지 작업별 취소 토큰 전달
+        set_current_token(job.token)
+        try:
+            result = await run(job)
+        except LLMCancelled as e:
+            job.finish("cancelled", error=e.reason)
+        except HTTPException as e:
+            job.finish("failed", error=str(e.detail))
+        except Exception as e:
+            logger.exception("Job failed", extra={"job_id": job.id, "kind": job.kind})
+            job.finish("failed", error=str(e))
+        else:
+            job.finish("completed", result)
+        finally:
+            set_current_token(None)
+        logger.info("Job finished", extra={"job_id": job.id, "kind": job.kind, "status": job.status})
+
+runner = JobRunner(
+    workers=int(os.getenv("JOB_WORKERS", "2")),
+    queue_limit=int(os.getenv("JOB_QUEUE_LIMIT", "100")),
+    ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600")),
+)
+
+# ============================================================================
+# API 엔드포인트
+# ============================================================================
+
+@router.post("")
+async def create_job(request: JobRequest):
+    """작업 등록 후 ID 즉시 반환"""
+    if request.kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 작업 종류입니다: {request.kind} (지원: {', '.join(JOB_KINDS)})")
+    request_model, _ = JOB_KINDS[request.kind]
+    try:
+        job_request = request_model(**request.payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    timeout = float(os.getenv("JOB_TIMEOUT_SECONDS", "0")) or None
+    job = Job(request.kind, job_request, timeout)
+    runner.submit(job)
+    logger.info("Job queued", extra={"job_id": job.id, "kind": job.kind})
+    return job.to_dict()
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """진행률, 부분 결과, 완료 시 결과 조회"""
+    job = runner.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 존재하지 않음)")
+    return job.to_dict()
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """대기 중이거나 실행 중인 작업 취소 (진행 중인 LLM 생성도 중단)"""
+    job = runner.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 존재하지 않음)")
+    job.token.cancel("job_cancelled")
+    if job.status == "queued":
+        job.finish("cancelled", error="job_cancelled")
+    return job.to_dict()
@@ -1,7 +1,16 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from llm_client import request_llm, request_llm_fast
+from typing import Callable, List, Dict, Any, Optional
+from prompt_templates import request_llm_template
+from llm_resilience import StaticFallback
+from enhanced_js_analyzer import build_api_reference
+from metrics import analyzer_phase_duration
+from rule_engine import LineIndex, Rule, RuleSet
+from js_tokenizer import check_structure
+from memory_profiler import memory_phase
+import asyncio
+import json
 import re
 
 router = APIRouter()
@@ -9,12 +18,17 @@ router = APIRouter()
 class JavaScriptAnalysisRequest(BaseModel):
     code: str
     fast_mode: bool = False
+    compact_prompt: Optional[bool] = None  # 주석/공백 제거 후 LLM 전송 (None이면 PROMPT_COMPACTION 환경변수)
+    include_llm: bool = False  # /analyze에서 LLM 분석 포함 여부 (기본은 정적 분석만 수행하는 빠른 경로)
 
 class JavaScriptAnalysisResponse(BaseModel):
     javascript_issues: List[str]
     exbuilder6_apis: List[str]
     errors: List[str]
     execution_flow: List[str]
+    llm_analysis: Optional[str] = None
+    llm_fallback: Optional[str] = None  # 'static'이면 LLM 백엔드 장애로 정적 분석 결과만 제공 (LLM_FALLBACK=static)
+    llm_notice: Optional[str] = None
 
 # eXBuilder6 API 목록 (eXBuilder6_HelpContents.pdf 기반)
 # 각 컨트롤 타입별로 정확한 메서드, 속성, 이벤트를 정의
@@ -265,6 +279,31 @@ EXBUILDER6_DATA_APIS = {
     ]
 }
 
+# 라인 단위 규칙 (한 라인 안에서만 매치되도록 \s 대신 [^\S\n] 사용) - 전체 코드에 규칙마다 한 번씩만 검사
+_LINE_SPACE = r'[^\S\n]'
+JS_ISSUE_RULES = RuleSet("basic", [
+    Rule("issues.undefined_assign", rf'var{_LINE_SPACE}+\w+{_LINE_SPACE}*={_LINE_SPACE}*undefined',
+         "undefined 할당은 불필요합니다"),
+    Rule("issues.null_compare", rf'=={_LINE_SPACE}*null', "null 비교시 === 사용을 권장합니다"),
+    Rule("issues.undefined_compare", rf'=={_LINE_SPACE}*undefined', "undefined 비교시 === 사용을 권장합니다"),
+    Rule("issues.console_log", r'console\.log\(', "console.log는 프로덕션에서 제거해야 합니다"),
+    Rule("issues.eval", r'eval\(', "eval() 사용은 보안상 위험합니다"),
+    Rule("issues.infinite_for", rf'for{_LINE_SPACE}*\({_LINE_SPACE}*;{_LINE_SPACE}*;{_LINE_SPACE}*\)',
+         "무한 루프 위험이 있습니다"),
+    Rule("issues.infinite_while", rf'while{_LINE_SPACE}*\({_LINE_SPACE}*true{_LINE_SPACE}*\)', "무한 루프 위험이 있습니다"),
+])
+
+_INCOMPLETE_FUNCTION = re.compile(r'function\s+\w+\s*\([^)]*\)\s*\{[^}]*$')
+_INCOMPLETE_DECLARATION = re.compile(r'^(?:var|let|const)\s+\w+\s*[^;]*$')
+_DECLARATION_ASSIGNMENT = re.compile(r'^(?:var|let|const)\s+\w+\s*=')
+_OPEN_OBJECT = re.compile(r'\{[^}]*$')
+_OPEN_ARRAY = re.compile(r'\[[^\]]*$')
+_ASSIGNMENT = re.compile(r'[^=!<>]=[^=]')
+_MEMBER_ASSIGNMENT = re.compile(r'\.\w+\s*=\s*[^=]')
+_INDEX_ASSIGNMENT = re.compile(r'\[\s*\w+\s*\]\s*=\s*[^=]')
+# 세미콜론 누락 검사에서 제외하는 라인 끝 문자
+_CONTINUATION_ENDINGS = tuple(';{}([,:')
+
 def check_javascript_issues(code: str) -> List[str]:
     """
     JavaScript 문법/로직 문제점 검사 (라인별 정확한 위치 표시)
@@ -277,171 +316,90 @@ def check_javascript_issues(code: str) -> List[str]:
     5. 변수 선언 문제 - 정확한 라인 위치 표시
     6. 객체/배열 리터럴 문제 - 정확한 라인 위치 표시
     7. 일반적인 JavaScript 문제점들 - 정확한 라인 위치 표시
+
+    괄호/따옴표는 향상된 분석기와 같은 토크나이저 규칙(js_tokenizer.check_structure)으로 한 번에
+    검사하므로 문자열/주석 안의 괄호와 따옴표는 세지 않습니다. 일반적인 문제점은 공용 규칙 엔진(JS_ISSUE_RULES)으로 검사합니다.
     """
     issues = []
+    structure = check_structure(code)
+    
+    # 괄호 균형 검사
+    for issue in structure.brackets:
+        if issue.kind == 'unexpected_close':
+            issues.append(f"라인 {issue.line} 위치 {issue.column}: 닫는 괄호 '{issue.char}'가 열리는 괄호보다 많습니다")
+        elif issue.kind == 'mismatch':
+            issues.append(f"라인 {issue.line} 위치 {issue.column}: 괄호 '{issue.char}'가 라인 {issue.open_line} "
+                          f"위치 {issue.open_column}의 '{issue.open_char}'와 매칭되지 않습니다")
+        else:
+            issues.append(f"라인 {issue.line} 위치 {issue.column}: 열린 괄호 '{issue.char}'가 닫히지 않았습니다")
     
-    # 라인별로 코드를 분할하여 정확한 위치 찾기
+    # 라인별 검사 결과 (라인, 검사 순서, 메시지) - 라인 순서, 같은 라인은 검사 순서대로 출력
+    line_issues = []
     lines = code.split('\n')
-    
-    # 괄호 균형 검사 (라인별)
-    brackets = {'(': ')', '{': '}', '[': ']'}
-    stack = []
+    skipped_lines = set()
+    # 이 라인보다 뒤에 닫는 중괄호/대괄호가 있는지 (라인마다 뒷부분 전체를 다시 찾지 않도록 마지막 위치만 계산)
+    last_brace_line = code.count('\n', 0, code.rfind('}')) + 1 if '}' in code else 0
+    last_bracket_line = code.count('\n', 0, code.rfind(']')) + 1 if ']' in code else 0
     
-    for line_num, line in enumerate(lines, 1):
-        for char_pos, char in enumerate(line):
-            if char in brackets:
-                stack.append((char, line_num, char_pos + 1))
-            elif char in brackets.values():
-                if not stack:
-                    issues.append(f"라인 {line_num} 위치 {char_pos + 1}: 닫는 괄호 '{char}'가 열리는 괄호보다 많습니다")
-                    break
-                open_bracket, open_line, open_pos = stack.pop()
-                if brackets[open_bracket] != char:
-                    issues.append(f"라인 {line_num} 위치 {char_pos + 1}: 괄호 '{char}'가 라인 {open_line} 위치 {open_pos}의 '{open_bracket}'와 매칭되지 않습니다")
-                    break
-    
-    if stack:
-        for bracket, line_num, char_pos in stack:
-            issues.append(f"라인 {line_num} 위치 {char_pos}: 열린 괄호 '{bracket}'가 닫히지 않았습니다")
-    
-    # 라인별 문법 검사
     for line_num, line in enumerate(lines, 1):
         line_stripped = line.strip()
         
         # 빈 줄이나 주석은 건너뛰기
-        if not line_stripped or line_stripped.startswith('//') or line_stripped.startswith('/*') or line_stripped.startswith('*'):
+        if not line_stripped or line_stripped.startswith(('//', '/*', '*')):
+            skipped_lines.add(line_num)
             continue
         
-        # 세미콜론 누락 검사 (더 정확한 패턴)
-        if (re.search(r'[^;{}]\s*$', line_stripped) and 
-            line_stripped and 
-            not line_stripped.endswith('{') and 
-            not line_stripped.endswith('}') and 
-            not line_stripped.endswith('(') and 
-            not line_stripped.endswith('[') and
-            not line_stripped.endswith(';') and
-            not line_stripped.endswith(',') and
-            not line_stripped.endswith(':')):
-            
-            next_line_idx = line_num
-            if next_line_idx < len(lines):
-                next_line = lines[next_line_idx].strip()
-                if next_line and next_line[0].isalpha() and '=' in next_line:
-                    issues.append(f"라인 {line_num}: 세미콜론 누락 가능성")
-        
-        # 따옴표 불일치 검사 (문자열 리터럴만)
-        # 주석 내부의 따옴표는 제외
-        if not line_stripped.startswith('//') and not line_stripped.startswith('/*') and not line_stripped.startswith('*'):
-            # 큰따옴표 검사
-            quote_count = 0
-            in_string = False
-            escape_next = False
-            
-            for char in line:
-                if escape_next:
-                    escape_next = False
-                    continue
-                if char == '\\':
-                    escape_next = True
-                    continue
-                if char == '"':
-                    if not in_string:
-                        in_string = True
-                    else:
-                        in_string = False
-                    quote_count += 1
-            
-            if quote_count % 2 != 0:
-                issues.append(f"라인 {line_num}: 큰따옴표가 닫히지 않았습니다")
-            
-            # 작은따옴표 검사
-            quote_count = 0
-            in_string = False
-            escape_next = False
-            
-            for char in line:
-                if escape_next:
-                    escape_next = False
-                    continue
-                if char == '\\':
-                    escape_next = True
-                    continue
-                if char == "'":
-                    if not in_string:
-                        in_string = True
-                    else:
-                        in_string = False
-                    quote_count += 1
-            
-            if quote_count % 2 != 0:
-                issues.append(f"라인 {line_num}: 작은따옴표가 닫히지 않았습니다")
-        
-        # 함수 선언 문제 검사 (정확한 패턴)
-        if re.search(r'function\s+\w+\s*\([^)]*\)\s*\{[^}]*$', line_stripped):
-            # 다음 라인에서 닫는 중괄호가 있는지 확인
-            has_closing_brace = False
-            for next_line in lines[line_num:]:
-                if '}' in next_line:
-                    has_closing_brace = True
-                    break
-            if not has_closing_brace:
-                issues.append(f"라인 {line_num}: 함수 정의가 완료되지 않았습니다")
+        # 세미콜론 누락 검사
+        if not line_stripped.endswith(_CONTINUATION_ENDINGS) and line_num < len(lines):
+            next_line = lines[line_num].strip()
+            if next_line and next_line[0].isalpha() and '=' in next_line:
+                line_issues.append((line_num, 0, "세미콜론 누락 가능성"))
         
-        # 변수 선언 문제 검사 (정확한 패턴)
-        if re.search(r'^(?:var|let|const)\s+\w+\s*[^;]*$', line_stripped) and not line_stripped.endswith(';'):
-            # 다음 라인에서 세미콜론이나 다른 문장이 있는지 확인
-            next_line_idx = line_num
-            if next_line_idx < len(lines):
-                next_line = lines[next_line_idx].strip()
-                if next_line and not next_line.startswith('//') and not next_line.startswith('/*'):
-                    issues.append(f"라인 {line_num}: 변수 선언이 완료되지 않았습니다")
+        # 함수 선언 문제 검사
+        if _INCOMPLETE_FUNCTION.search(line_stripped) and last_brace_line <= line_num:
+            line_issues.append((line_num, 3, "함수 정의가 완료되지 않았습니다"))
         
-        # 객체/배열 리터럴 문제 검사 (정확한 패턴)
-        if re.search(r'\{[^}]*$', line_stripped) and not line_stripped.endswith('}'):
-            # 다음 라인에서 닫는 중괄호가 있는지 확인
-            has_closing_brace = False
-            for next_line in lines[line_num:]:
-                if '}' in next_line:
-                    has_closing_brace = True
-                    break
-            if not has_closing_brace:
-                issues.append(f"라인 {line_num}: 객체 리터럴이 완료되지 않았습니다")
+        # 변수 선언 문제 검사
+        if _INCOMPLETE_DECLARATION.search(line_stripped) and not line_stripped.endswith(';') and line_num < len(lines):
+            next_line = lines[line_num].strip()
+            if next_line and not next_line.startswith(('//', '/*')):
+                line_issues.append((line_num, 4, "변수 선언이 완료되지 않았습니다"))
         
-        if re.search(r'\[[^\]]*$', line_stripped) and not line_stripped.endswith(']'):
-            # 다음 라인에서 닫는 대괄호가 있는지 확인
-            has_closing_bracket = False
-            for next_line in lines[line_num:]:
-                if ']' in next_line:
-                    has_closing_bracket = True
-                    break
-            if not has_closing_bracket:
-                issues.append(f"라인 {line_num}: 배열 리터럴이 완료되지 않았습니다")
-        
-        # 할당 연산자 확인 (더 정확한 패턴)
-        # var x = y 형태는 제외
-        if re.search(r'[^=!<>]=[^=]', line_stripped) and not re.search(r'^(?:var|let|const)\s+\w+\s*=', line_stripped):
-            # 함수 호출이나 객체 속성 할당은 제외
-            if not re.search(r'\.\w+\s*=\s*[^=]', line_stripped) and not re.search(r'\[\s*\w+\s*\]\s*=\s*[^=]', line_stripped):
-                issues.append(f"라인 {line_num}: 할당 연산자 확인 필요 (= vs ==)")
+        # 객체/배열 리터럴 문제 검사
+        if _OPEN_OBJECT.search(line_stripped) and not line_stripped.endswith('}') and last_brace_line <= line_num:
+            line_issues.append((line_num, 5, "객체 리터럴이 완료되지 않았습니다"))
+        if _OPEN_ARRAY.search(line_stripped) and not line_stripped.endswith(']') and last_bracket_line <= line_num:
+            line_issues.append((line_num, 6, "배열 리터럴이 완료되지 않았습니다"))
         
-        # 일반적인 JavaScript 문제점들
-        if re.search(r'var\s+\w+\s*=\s*undefined', line_stripped):
-            issues.append(f"라인 {line_num}: undefined 할당은 불필요합니다")
-        if re.search(r'==\s*null', line_stripped):
-            issues.append(f"라인 {line_num}: null 비교시 === 사용을 권장합니다")
-        if re.search(r'==\s*undefined', line_stripped):
-            issues.append(f"라인 {line_num}: undefined 비교시 === 사용을 권장합니다")
-        if re.search(r'console\.log\(', line_stripped):
-            issues.append(f"라인 {line_num}: console.log는 프로덕션에서 제거해야 합니다")
-        if re.search(r'eval\(', line_stripped):
-            issues.append(f"라인 {line_num}: eval() 사용은 보안상 위험합니다")
-        if re.search(r'for\s*\(\s*;\s*;\s*\)', line_stripped):
-            issues.append(f"라인 {line_num}: 무한 루프 위험이 있습니다")
-        if re.search(r'while\s*\(\s*true\s*\)', line_stripped):
-            issues.append(f"라인 {line_num}: 무한 루프 위험이 있습니다")
+        # 할당 연산자 확인 (var x = y, 객체 속성/인덱스 할당은 제외)
+        if (_ASSIGNMENT.search(line_stripped) and not _DECLARATION_ASSIGNMENT.search(line_stripped)
+                and not _MEMBER_ASSIGNMENT.search(line_stripped) and not _INDEX_ASSIGNMENT.search(line_stripped)):
+            line_issues.append((line_num, 7, "할당 연산자 확인 필요 (= vs ==)"))
+    
+    # 따옴표 불일치 검사 (라인 끝까지 닫히지 않은 문자열)
+    for line_num, quote in structure.unterminated_strings:
+        if line_num not in skipped_lines:
+            if quote == '"':
+                line_issues.append((line_num, 1, "큰따옴표가 닫히지 않았습니다"))
+            else:
+                line_issues.append((line_num, 2, "작은따옴표가 닫히지 않았습니다"))
+    
+    # 일반적인 JavaScript 문제점들 (규칙마다 라인당 한 번)
+    line_index = LineIndex(code)
+    for order, hit in enumerate(JS_ISSUE_RULES.scan(code), 8):
+        reported = set()
+        for start, _ in hit.result.spans:
+            line_num = line_index.line(start)
+            if line_num not in reported and line_num not in skipped_lines:
+                reported.add(line_num)
+                line_issues.append((line_num, order, hit.rule.message))
+    
+    line_issues.sort(key=lambda item: (item[0], item[1]))
+    issues.extend(f"라인 {line_num}: {message}" for line_num, _, message in line_issues)
     
     return issues if issues else ['JavaScript 문법에 문제없음']
 
+
 def check_exbuilder6_apis(code: str) -> List[str]:
     """
     eXBuilder6 API 사용 여부 검사 - 잘못된 API 사용만 보고
@@ -532,125 +490,179 @@ def check_exbuilder6_apis(code: str) -> List[str]:
                 if property_name not in EXBUILDER6_COMMON_APIS['properties']:
                     incorrect_apis.append(f"존재하지 않는 속성: {property_name}")
     
-    # 이벤트 핸들러 찾기 (API Reference 기반) - 잘못된 이벤트만 보고
-    event_patterns = [
-        # 기본 이벤트
-        (r'onLoad\s*=', 'onLoad'),
-        (r'onClick\s*=', 'onClick'),
-        (r'onDoubleClick\s*=', 'onDoubleClick'),
-        (r'onRightClick\s*=', 'onRightClick'),
-        (r'onChange\s*=', 'onChange'),
-        (r'onSelect\s*=', 'onSelect'),
-        (r'onFocus\s*=', 'onFocus'),
-        (r'onBlur\s*=', 'onBlur'),
-        
-        # 키보드 이벤트
-        (r'onKeyDown\s*=', 'onKeyDown'),
-        (r'onKeyUp\s*=', 'onKeyUp'),
-        (r'onKeyPress\s*=', 'onKeyPress'),
-        
-        # 마우스 이벤트
-        (r'onMouseDown\s*=', 'onMouseDown'),
-        (r'onMouseUp\s*=', 'onMouseUp'),
-        (r'onMouseOver\s*=', 'onMouseOver'),
-        (r'onMouseOut\s*=', 'onMouseOut'),
-        (r'onMouseMove\s*=', 'onMouseMove'),
-        
-        # 컨트롤별 특화 이벤트
-        (r'onCellClick\s*=', 'onCellClick'),
-        (r'onCellDoubleClick\s*=', 'onCellDoubleClick'),
-        (r'onCellRightClick\s*=', 'onCellRightClick'),
-        (r'onHeaderClick\s*=', 'onHeaderClick'),
-        (r'onRowClick\s*=', 'onRowClick'),
-        (r'onRowDoubleClick\s*=', 'onRowDoubleClick'),
-        (r'onRowRightClick\s*=', 'onRowRightClick'),
-        (r'onSelectionChanged\s*=', 'onSelectionChanged'),
-        (r'onDataChanged\s*=', 'onDataChanged'),
-        
-        # 날짜 관련 이벤트
-        (r'onDateChanged\s*=', 'onDateChanged'),
-        (r'onDateSelected\s*=', 'onDateSelected'),
-        (r'onMonthChanged\s*=', 'onMonthChanged'),
-        (r'onYearChanged\s*=', 'onYearChanged'),
-        
-        # 체크박스/라디오 이벤트
-        (r'onCheckedChanged\s*=', 'onCheckedChanged'),
-        
-        # 콤보박스 이벤트
-        (r'onDropdownOpened\s*=', 'onDropdownOpened'),
-        (r'onDropdownClosed\s*=', 'onDropdownClosed'),
-        
-        # 파일 관련 이벤트
-        (r'onFileSelected\s*=', 'onFileSelected'),
-        (r'onFileChanged\s*=', 'onFileChanged'),
-        (r'onFileAdded\s*=', 'onFileAdded'),
-        (r'onFileRemoved\s*=', 'onFileRemoved'),
-        (r'onUploadStarted\s*=', 'onUploadStarted'),
-        (r'onUploadCompleted\s*=', 'onUploadCompleted'),
-        (r'onUploadFailed\s*=', 'onUploadFailed'),
-        
-        # 값 변경 이벤트
-        (r'onValueChanged\s*=', 'onValueChanged'),
-        (r'onTextChanged\s*=', 'onTextChanged'),
-        
-        # 검색 이벤트
-        (r'onSearch\s*=', 'onSearch'),
-        
-        # 진행률 이벤트
-        (r'onProgressCompleted\s*=', 'onProgressCompleted'),
-        (r'onSliderMoved\s*=', 'onSliderMoved'),
-        
-        # 탭 이벤트
-        (r'onTabAdded\s*=', 'onTabAdded'),
-        (r'onTabRemoved\s*=', 'onTabRemoved'),
-        (r'onTabChanged\s*=', 'onTabChanged'),
-        
-        # 트리 이벤트
-        (r'onNodeClick\s*=', 'onNodeClick'),
-        (r'onNodeDoubleClick\s*=', 'onNodeDoubleClick'),
-        (r'onNodeRightClick\s*=', 'onNodeRightClick'),
-        (r'onNodeSelected\s*=', 'onNodeSelected'),
-        (r'onNodeExpanded\s*=', 'onNodeExpanded'),
-        (r'onNodeCollapsed\s*=', 'onNodeCollapsed'),
-        
-        # 데이터 관련 이벤트
-        (r'onRowAdded\s*=', 'onRowAdded'),
-        (r'onRowDeleted\s*=', 'onRowDeleted'),
-        (r'onRowUpdated\s*=', 'onRowUpdated')
-    ]
-    
-    # 잘못된 이벤트 핸들러 찾기 (eXBuilder6에 존재하지 않는 이벤트)
-    invalid_events = ['onInvalidEvent', 'onCustomEvent', 'onUnknownEvent']  # 예시
-    for pattern, event_name in event_patterns:
-        if re.search(pattern, code):
-            # 실제로는 eXBuilder6에 존재하는 이벤트이므로 잘못된 것으로 보고하지 않음
-            pass
-    
-    # 메시지 관련 - 잘못된 사용만 보고
-    message_patterns = [
-        (r'showMessage\(', 'showMessage'),
-        (r'showConfirm\(', 'showConfirm'),
-        (r'showAlert\(', 'showAlert'),
-        (r'showError\(', 'showError'),
-        (r'showWarning\(', 'showWarning'),
-        (r'showInfo\(', 'showInfo'),
-        (r'showSuccess\(', 'showSuccess'),
-        (r'showQuestion\(', 'showQuestion'),
-        (r'showInput\(', 'showInput'),
-        (r'showSelect\(', 'showSelect')
-    ]
-    
-    # 잘못된 메시지 함수 찾기 (eXBuilder6에 존재하지 않는 메시지 함수)
-    invalid_messages = ['showInvalidMessage', 'showCustomMessage']  # 예시
-    for pattern, message_name in message_patterns:
-        if re.search(pattern, code):
-            # 실제로는 eXBuilder6에 존재하는 메시지 함수이므로 잘못된 것으로 보고하지 않음
-            pass
-    
+    # 이벤트 핸들러(onClick 등)와 메시지 함수(showMessage 등)는 보고할 잘못된 사용이 없으므로 검사하지 않음
     # app.lookup은 올바른 사용이므로 보고하지 않음
     
     return incorrect_apis if incorrect_apis else ['eXBuilder6 API 사용에 문제없음']
 
+# check_errors 오류 패턴 (정규식, 메시지)
+CHECK_ERRORS_PATTERNS = [
+    (r'\.getElementById\([^)]*\)\.', 'getElementById 결과가 null일 수 있습니다'),
+    (r'\.querySelector\([^)]*\)\.', 'querySelector 결과가 null일 수 있습니다'),
+    (r'\.innerHTML\s*=', 'innerHTML 사용시 XSS 위험이 있습니다'),
+    (r'JSON\.parse\([^)]*\)', 'JSON.parse는 try-catch로 감싸야 합니다'),
+    (r'\.split\([^)]*\)\[', 'split 결과가 빈 배열일 수 있습니다'),
+    (r'\.charAt\([^)]*\)', 'charAt 인덱스가 문자열 길이를 초과할 수 있습니다'),
+    (r'\.substring\([^)]*\)', 'substring 인덱스가 잘못될 수 있습니다'),
+    (r'\.substr\([^)]*\)', 'substr 인덱스가 잘못될 수 있습니다'),
+    (r'\.indexOf\([^)]*\)\s*[<>=]', 'indexOf 결과가 -1일 수 있습니다'),
+    (r'\.length\s*[<>=]', 'length 속성 접근시 null/undefined 오류 가능성'),
+    (r'\.push\([^)]*\)', 'push 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.pop\(\)', 'pop 메서드 호출시 빈 배열일 수 있습니다'),
+    (r'\.shift\(\)', 'shift 메서드 호출시 빈 배열일 수 있습니다'),
+    (r'\.unshift\([^)]*\)', 'unshift 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.splice\([^)]*\)', 'splice 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.slice\([^)]*\)', 'slice 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.join\([^)]*\)', 'join 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.reverse\(\)', 'reverse 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.sort\([^)]*\)', 'sort 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.filter\([^)]*\)', 'filter 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.map\([^)]*\)', 'map 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.reduce\([^)]*\)', 'reduce 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.forEach\([^)]*\)', 'forEach 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.find\([^)]*\)', 'find 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.findIndex\([^)]*\)', 'findIndex 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.includes\([^)]*\)', 'includes 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.some\([^)]*\)', 'some 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.every\([^)]*\)', 'every 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.flat\([^)]*\)', 'flat 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.flatMap\([^)]*\)', 'flatMap 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.entries\(\)', 'entries 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.keys\(\)', 'keys 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.values\(\)', 'values 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.copyWithin\([^)]*\)', 'copyWithin 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.fill\([^)]*\)', 'fill 메서드 호출시 배열이 null일 수 있습니다'),
+    (r'\.from\([^)]*\)', 'Array.from 호출시 잘못된 인자일 수 있습니다'),
+    (r'\.isArray\([^)]*\)', 'Array.isArray 호출시 잘못된 인자일 수 있습니다'),
+    (r'\.of\([^)]*\)', 'Array.of 호출시 잘못된 인자일 수 있습니다'),
+    (r'\.parse\([^)]*\)', 'JSON.parse 호출시 잘못된 JSON 문자열일 수 있습니다'),
+    (r'\.stringify\([^)]*\)', 'JSON.stringify 호출시 순환 참조일 수 있습니다'),
+    (r'\.parseInt\([^)]*\)', 'parseInt 호출시 잘못된 문자열일 수 있습니다'),
+    (r'\.parseFloat\([^)]*\)', 'parseFloat 호출시 잘못된 문자열일 수 있습니다'),
+    (r'\.isNaN\([^)]*\)', 'isNaN 호출시 잘못된 인자일 수 있습니다'),
+    (r'\.isFinite\([^)]*\)', 'isFinite 호출시 잘못된 인자일 수 있습니다'),
+    (r'\.encodeURI\([^)]*\)', 'encodeURI 호출시 잘못된 URI일 수 있습니다'),
+    (r'\.encodeURIComponent\([^)]*\)', 'encodeURIComponent 호출시 잘못된 URI 컴포넌트일 수 있습니다'),
+    (r'\.decodeURI\([^)]*\)', 'decodeURI 호출시 잘못된 인코딩된 URI일 수 있습니다'),
+    (r'\.decodeURIComponent\([^)]*\)', 'decodeURIComponent 호출시 잘못된 인코딩된 URI 컴포넌트일 수 있습니다'),
+    (r'\.escape\([^)]*\)', 'escape 호출시 잘못된 문자열일 수 있습니다'),
+    (r'\.unescape\([^)]*\)', 'unescape 호출시 잘못된 인코딩된 문자열일 수 있습니다'),
+    (r'\.btoa\([^)]*\)', 'btoa 호출시 잘못된 문자열일 수 있습니다'),
+    (r'\.atob\([^)]*\)', 'atob 호출시 잘못된 Base64 문자열일 수 있습니다'),
+    (r'\.setTimeout\([^)]*\)', 'setTimeout 호출시 잘못된 콜백 함수일 수 있습니다'),
+    (r'\.setInterval\([^)]*\)', 'setInterval 호출시 잘못된 콜백 함수일 수 있습니다'),
+    (r'\.clearTimeout\([^)]*\)', 'clearTimeout 호출시 잘못된 타이머 ID일 수 있습니다'),
+    (r'\.clearInterval\([^)]*\)', 'clearInterval 호출시 잘못된 타이머 ID일 수 있습니다'),
+    (r'\.requestAnimationFrame\([^)]*\)', 'requestAnimationFrame 호출시 잘못된 콜백 함수일 수 있습니다'),
+    (r'\.cancelAnimationFrame\([^)]*\)', 'cancelAnimationFrame 호출시 잘못된 프레임 ID일 수 있습니다'),
+    (r'\.addEventListener\([^)]*\)', 'addEventListener 호출시 잘못된 이벤트 타입일 수 있습니다'),
+    (r'\.removeEventListener\([^)]*\)', 'removeEventListener 호출시 잘못된 이벤트 타입일 수 있습니다'),
+    (r'\.dispatchEvent\([^)]*\)', 'dispatchEvent 호출시 잘못된 이벤트 객체일 수 있습니다'),
+    (r'\.preventDefault\(\)', 'preventDefault 호출시 이벤트 객체가 null일 수 있습니다'),
+    (r'\.stopPropagation\(\)', 'stopPropagation 호출시 이벤트 객체가 null일 수 있습니다'),
+    (r'\.stopImmediatePropagation\(\)', 'stopImmediatePropagation 호출시 이벤트 객체가 null일 수 있습니다'),
+    (r'\.getAttribute\([^)]*\)', 'getAttribute 호출시 요소가 null일 수 있습니다'),
+    (r'\.setAttribute\([^)]*\)', 'setAttribute 호출시 요소가 null일 수 있습니다'),
+    (r'\.removeAttribute\([^)]*\)', 'removeAttribute 호출시 요소가 null일 수 있습니다'),
+    (r'\.hasAttribute\([^)]*\)', 'hasAttribute 호출시 요소가 null일 수 있습니다'),
+    (r'\.getAttributeNode\([^)]*\)', 'getAttributeNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.setAttributeNode\([^)]*\)', 'setAttributeNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.removeAttributeNode\([^)]*\)', 'removeAttributeNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.getElementsByTagName\([^)]*\)', 'getElementsByTagName 호출시 요소가 null일 수 있습니다'),
+    (r'\.getElementsByClassName\([^)]*\)', 'getElementsByClassName 호출시 요소가 null일 수 있습니다'),
+    (r'\.getElementsByName\([^)]*\)', 'getElementsByName 호출시 요소가 null일 수 있습니다'),
+    (r'\.querySelector\([^)]*\)', 'querySelector 호출시 요소가 null일 수 있습니다'),
+    (r'\.querySelectorAll\([^)]*\)', 'querySelectorAll 호출시 요소가 null일 수 있습니다'),
+    (r'\.closest\([^)]*\)', 'closest 호출시 요소가 null일 수 있습니다'),
+    (r'\.matches\([^)]*\)', 'matches 호출시 요소가 null일 수 있습니다'),
+    (r'\.contains\([^)]*\)', 'contains 호출시 요소가 null일 수 있습니다'),
+    (r'\.compareDocumentPosition\([^)]*\)', 'compareDocumentPosition 호출시 요소가 null일 수 있습니다'),
+    (r'\.isSameNode\([^)]*\)', 'isSameNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.isEqualNode\([^)]*\)', 'isEqualNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.lookupPrefix\([^)]*\)', 'lookupPrefix 호출시 요소가 null일 수 있습니다'),
+    (r'\.lookupNamespaceURI\([^)]*\)', 'lookupNamespaceURI 호출시 요소가 null일 수 있습니다'),
+    (r'\.isDefaultNamespace\([^)]*\)', 'isDefaultNamespace 호출시 요소가 null일 수 있습니다'),
+    (r'\.insertBefore\([^)]*\)', 'insertBefore 호출시 요소가 null일 수 있습니다'),
+    (r'\.appendChild\([^)]*\)', 'appendChild 호출시 요소가 null일 수 있습니다'),
+    (r'\.replaceChild\([^)]*\)', 'replaceChild 호출시 요소가 null일 수 있습니다'),
+    (r'\.removeChild\([^)]*\)', 'removeChild 호출시 요소가 null일 수 있습니다'),
+    (r'\.cloneNode\([^)]*\)', 'cloneNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.normalize\(\)', 'normalize 호출시 요소가 null일 수 있습니다'),
+    (r'\.isSupported\([^)]*\)', 'isSupported 호출시 요소가 null일 수 있습니다'),
+    (r'\.hasChildNodes\(\)', 'hasChildNodes 호출시 요소가 null일 수 있습니다'),
+    (r'\.getFeature\([^)]*\)', 'getFeature 호출시 요소가 null일 수 있습니다'),
+    (r'\.getUserData\([^)]*\)', 'getUserData 호출시 요소가 null일 수 있습니다'),
+    (r'\.setUserData\([^)]*\)', 'setUserData 호출시 요소가 null일 수 있습니다'),
+    (r'\.adoptNode\([^)]*\)', 'adoptNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.importNode\([^)]*\)', 'importNode 호출시 요소가 null일 수 있습니다'),
+    (r'\.createElement\([^)]*\)', 'createElement 호출시 잘못된 태그명일 수 있습니다'),
+    (r'\.createElementNS\([^)]*\)', 'createElementNS 호출시 잘못된 네임스페이스일 수 있습니다'),
+    (r'\.createTextNode\([^)]*\)', 'createTextNode 호출시 잘못된 텍스트일 수 있습니다'),
+    (r'\.createComment\([^)]*\)', 'createComment 호출시 잘못된 주석일 수 있습니다'),
+    (r'\.createCDATASection\([^)]*\)', 'createCDATASection 호출시 잘못된 CDATA일 수 있습니다'),
+    (r'\.createProcessingInstruction\([^)]*\)', 'createProcessingInstruction 호출시 잘못된 처리 지시어일 수 있습니다'),
+    (r'\.createAttribute\([^)]*\)', 'createAttribute 호출시 잘못된 속성명일 수 있습니다'),
+    (r'\.createAttributeNS\([^)]*\)', 'createAttributeNS 호출시 잘못된 네임스페이스일 수 있습니다'),
+    (r'\.createEntityReference\([^)]*\)', 'createEntityReference 호출시 잘못된 엔티티 참조일 수 있습니다'),
+    (r'\.createRange\(\)', 'createRange 호출시 문서가 null일 수 있습니다'),
+    (r'\.createNodeIterator\([^)]*\)', 'createNodeIterator 호출시 잘못된 루트일 수 있습니다'),
+    (r'\.createTreeWalker\([^)]*\)', 'createTreeWalker 호출시 잘못된 루트일 수 있습니다'),
+    (r'\.getElementById\([^)]*\)', 'getElementById 호출시 잘못된 ID일 수 있습니다'),
+    (r'\.getElementsByTagName\([^)]*\)', 'getElementsByTagName 호출시 잘못된 태그명일 수 있습니다'),
+    (r'\.getElementsByTagNameNS\([^)]*\)', 'getElementsByTagNameNS 호출시 잘못된 네임스페이스일 수 있습니다'),
+    (r'\.getElementsByClassName\([^)]*\)', 'getElementsByClassName 호출시 잘못된 클래스명일 수 있습니다'),
+    (r'\.querySelector\([^)]*\)', 'querySelector 호출시 잘못된 선택자일 수 있습니다'),
+    (r'\.querySelectorAll\([^)]*\)', 'querySelectorAll 호출시 잘못된 선택자일 수 있습니다'),
+    (r'\.open\([^)]*\)', 'open 호출시 잘못된 URL일 수 있습니다'),
+    (r'\.write\([^)]*\)', 'write 호출시 잘못된 HTML일 수 있습니다'),
+    (r'\.writeln\([^)]*\)', 'writeln 호출시 잘못된 HTML일 수 있습니다'),
+    (r'\.close\(\)', 'close 호출시 문서가 null일 수 있습니다'),
+    (r'\.getSelection\(\)', 'getSelection 호출시 윈도우가 null일 수 있습니다'),
+    (r'\.find\([^)]*\)', 'find 호출시 잘못된 검색어일 수 있습니다'),
+    (r'\.getComputedStyle\([^)]*\)', 'getComputedStyle 호출시 요소가 null일 수 있습니다'),
+    (r'\.getBoundingClientRect\(\)', 'getBoundingClientRect 호출시 요소가 null일 수 있습니다'),
+    (r'\.scrollIntoView\([^)]*\)', 'scrollIntoView 호출시 요소가 null일 수 있습니다'),
+    (r'\.scrollTo\([^)]*\)', 'scrollTo 호출시 잘못된 좌표일 수 있습니다'),
+    (r'\.scrollBy\([^)]*\)', 'scrollBy 호출시 잘못된 좌표일 수 있습니다'),
+    (r'\.scroll\([^)]*\)', 'scroll 호출시 잘못된 좌표일 수 있습니다'),
+    (r'\.scrollTop\s*=', 'scrollTop 설정시 잘못된 값일 수 있습니다'),
+    (r'\.scrollLeft\s*=', 'scrollLeft 설정시 잘못된 값일 수 있습니다'),
+    (r'\.scrollWidth', 'scrollWidth 접근시 요소가 null일 수 있습니다'),
+    (r'\.scrollHeight', 'scrollHeight 접근시 요소가 null일 수 있습니다'),
+    (r'\.clientWidth', 'clientWidth 접근시 요소가 null일 수 있습니다'),
+    (r'\.clientHeight', 'clientHeight 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetWidth', 'offsetWidth 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetHeight', 'offsetHeight 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetTop', 'offsetTop 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetLeft', 'offsetLeft 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetParent', 'offsetParent 접근시 요소가 null일 수 있습니다'),
+    (r'\.getBoundingClientRect\(\)', 'getBoundingClientRect 호출시 요소가 null일 수 있습니다'),
+    (r'\.getClientRects\(\)', 'getClientRects 호출시 요소가 null일 수 있습니다'),
+    (r'\.scrollIntoViewIfNeeded\([^)]*\)', 'scrollIntoViewIfNeeded 호출시 요소가 null일 수 있습니다'),
+    (r'\.scrollIntoView\([^)]*\)', 'scrollIntoView 호출시 요소가 null일 수 있습니다'),
+    (r'\.scrollTo\([^)]*\)', 'scrollTo 호출시 잘못된 좌표일 수 있습니다'),
+    (r'\.scrollBy\([^)]*\)', 'scrollBy 호출시 잘못된 좌표일 수 있습니다'),
+    (r'\.scroll\([^)]*\)', 'scroll 호출시 잘못된 좌표일 수 있습니다'),
+    (r'\.scrollTop\s*=', 'scrollTop 설정시 잘못된 값일 수 있습니다'),
+    (r'\.scrollLeft\s*=', 'scrollLeft 설정시 잘못된 값일 수 있습니다'),
+    (r'\.scrollWidth', 'scrollWidth 접근시 요소가 null일 수 있습니다'),
+    (r'\.scrollHeight', 'scrollHeight 접근시 요소가 null일 수 있습니다'),
+    (r'\.clientWidth', 'clientWidth 접근시 요소가 null일 수 있습니다'),
+    (r'\.clientHeight', 'clientHeight 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetWidth', 'offsetWidth 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetHeight', 'offsetHeight 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetTop', 'offsetTop 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetLeft', 'offsetLeft 접근시 요소가 null일 수 있습니다'),
+    (r'\.offsetParent', 'offsetParent 접근시 요소가 null일 수 있습니다'),
+    (r'\.getBoundingClientRect\(\)', 'getBoundingClientRect 호출시 요소가 null일 수 있습니다'),
+    (r'\.getClientRects\(\)', 'getClientRects 호출시 요소가 null일 수 있습니다'),
+    (r'\.scrollIntoViewIfNeeded\([^)]*\)', 'scrollIntoViewIfNeeded 호출시 요소가 null일 수 있습니다')
+]
+
+# 향상된 분석기와 같은 규칙 엔진으로 한 번만 컴파일 (같은 정규식이 여러 번 등록된 규칙은 한 번만 검사)
+CHECK_ERRORS_RULES = RuleSet("basic", [Rule(f"errors[{index}]", pattern, message)
+                                       for index, (pattern, message) in enumerate(CHECK_ERRORS_PATTERNS)])
+
 def check_errors(code: str) -> List[str]:
     """
     잠재적 오류 검사
@@ -665,172 +677,12 @@ def check_errors(code: str) -> List[str]:
     """
     errors = []
     
-    error_patterns = [
-        (r'\.getElementById\([^)]*\)\.', 'getElementById 결과가 null일 수 있습니다'),
-        (r'\.querySelector\([^)]*\)\.', 'querySelector 결과가 null일 수 있습니다'),
-        (r'\.innerHTML\s*=', 'innerHTML 사용시 XSS 위험이 있습니다'),
-        (r'JSON\.parse\([^)]*\)', 'JSON.parse는 try-catch로 감싸야 합니다'),
-        (r'\.split\([^)]*\)\[', 'split 결과가 빈 배열일 수 있습니다'),
-        (r'\.charAt\([^)]*\)', 'charAt 인덱스가 문자열 길이를 초과할 수 있습니다'),
-        (r'\.substring\([^)]*\)', 'substring 인덱스가 잘못될 수 있습니다'),
-        (r'\.substr\([^)]*\)', 'substr 인덱스가 잘못될 수 있습니다'),
-        (r'\.indexOf\([^)]*\)\s*[<>=]', 'indexOf 결과가 -1일 수 있습니다'),
-        (r'\.length\s*[<>=]', 'length 속성 접근시 null/undefined 오류 가능성'),
-        (r'\.push\([^)]*\)', 'push 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.pop\(\)', 'pop 메서드 호출시 빈 배열일 수 있습니다'),
-        (r'\.shift\(\)', 'shift 메서드 호출시 빈 배열일 수 있습니다'),
-        (r'\.unshift\([^)]*\)', 'unshift 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.splice\([^)]*\)', 'splice 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.slice\([^)]*\)', 'slice 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.join\([^)]*\)', 'join 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.reverse\(\)', 'reverse 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.sort\([^)]*\)', 'sort 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.filter\([^)]*\)', 'filter 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.map\([^)]*\)', 'map 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.reduce\([^)]*\)', 'reduce 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.forEach\([^)]*\)', 'forEach 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.find\([^)]*\)', 'find 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.findIndex\([^)]*\)', 'findIndex 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.includes\([^)]*\)', 'includes 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.some\([^)]*\)', 'some 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.every\([^)]*\)', 'every 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.flat\([^)]*\)', 'flat 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.flatMap\([^)]*\)', 'flatMap 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.entries\(\)', 'entries 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.keys\(\)', 'keys 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.values\(\)', 'values 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.copyWithin\([^)]*\)', 'copyWithin 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.fill\([^)]*\)', 'fill 메서드 호출시 배열이 null일 수 있습니다'),
-        (r'\.from\([^)]*\)', 'Array.from 호출시 잘못된 인자일 수 있습니다'),
-        (r'\.isArray\([^)]*\)', 'Array.isArray 호출시 잘못된 인자일 수 있습니다'),
-        (r'\.of\([^)]*\)', 'Array.of 호출시 잘못된 인자일 수 있습니다'),
-        (r'\.parse\([^)]*\)', 'JSON.parse 호출시 잘못된 JSON 문자열일 수 있습니다'),
-        (r'\.stringify\([^)]*\)', 'JSON.stringify 호출시 순환 참조일 수 있습니다'),
-        (r'\.parseInt\([^)]*\)', 'parseInt 호출시 잘못된 문자열일 수 있습니다'),
-        (r'\.parseFloat\([^)]*\)', 'parseFloat 호출시 잘못된 문자열일 수 있습니다'),
-        (r'\.isNaN\([^)]*\)', 'isNaN 호출시 잘못된 인자일 수 있습니다'),
-        (r'\.isFinite\([^)]*\)', 'isFinite 호출시 잘못된 인자일 수 있습니다'),
-        (r'\.encodeURI\([^)]*\)', 'encodeURI 호출시 잘못된 URI일 수 있습니다'),
-        (r'\.encodeURIComponent\([^)]*\)', 'encodeURIComponent 호출시 잘못된 URI 컴포넌트일 수 있습니다'),
-        (r'\.decodeURI\([^)]*\)', 'decodeURI 호출시 잘못된 인코딩된 URI일 수 있습니다'),
-        (r'\.decodeURIComponent\([^)]*\)', 'decodeURIComponent 호출시 잘못된 인코딩된 URI 컴포넌트일 수 있습니다'),
-        (r'\.escape\([^)]*\)', 'escape 호출시 잘못된 문자열일 수 있습니다'),
-        (r'\.unescape\([^)]*\)', 'unescape 호출시 잘못된 인코딩된 문자열일 수 있습니다'),
-        (r'\.btoa\([^)]*\)', 'btoa 호출시 잘못된 문자열일 수 있습니다'),
-        (r'\.atob\([^)]*\)', 'atob 호출시 잘못된 Base64 문자열일 수 있습니다'),
-        (r'\.setTimeout\([^)]*\)', 'setTimeout 호출시 잘못된 콜백 함수일 수 있습니다'),
-        (r'\.setInterval\([^)]*\)', 'setInterval 호출시 잘못된 콜백 함수일 수 있습니다'),
-        (r'\.clearTimeout\([^)]*\)', 'clearTimeout 호출시 잘못된 타이머 ID일 수 있습니다'),
-        (r'\.clearInterval\([^)]*\)', 'clearInterval 호출시 잘못된 타이머 ID일 수 있습니다'),
-        (r'\.requestAnimationFrame\([^)]*\)', 'requestAnimationFrame 호출시 잘못된 콜백 함수일 수 있습니다'),
-        (r'\.cancelAnimationFrame\([^)]*\)', 'cancelAnimationFrame 호출시 잘못된 프레임 ID일 수 있습니다'),
-        (r'\.addEventListener\([^)]*\)', 'addEventListener 호출시 잘못된 이벤트 타입일 수 있습니다'),
-        (r'\.removeEventListener\([^)]*\)', 'removeEventListener 호출시 잘못된 이벤트 타입일 수 있습니다'),
-        (r'\.dispatchEvent\([^)]*\)', 'dispatchEvent 호출시 잘못된 이벤트 객체일 수 있습니다'),
-        (r'\.preventDefault\(\)', 'preventDefault 호출시 이벤트 객체가 null일 수 있습니다'),
-        (r'\.stopPropagation\(\)', 'stopPropagation 호출시 이벤트 객체가 null일 수 있습니다'),
-        (r'\.stopImmediatePropagation\(\)', 'stopImmediatePropagation 호출시 이벤트 객체가 null일 수 있습니다'),
-        (r'\.getAttribute\([^)]*\)', 'getAttribute 호출시 요소가 null일 수 있습니다'),
-        (r'\.setAttribute\([^)]*\)', 'setAttribute 호출시 요소가 null일 수 있습니다'),
-        (r'\.removeAttribute\([^)]*\)', 'removeAttribute 호출시 요소가 null일 수 있습니다'),
-        (r'\.hasAttribute\([^)]*\)', 'hasAttribute 호출시 요소가 null일 수 있습니다'),
-        (r'\.getAttributeNode\([^)]*\)', 'getAttributeNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.setAttributeNode\([^)]*\)', 'setAttributeNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.removeAttributeNode\([^)]*\)', 'removeAttributeNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.getElementsByTagName\([^)]*\)', 'getElementsByTagName 호출시 요소가 null일 수 있습니다'),
-        (r'\.getElementsByClassName\([^)]*\)', 'getElementsByClassName 호출시 요소가 null일 수 있습니다'),
-        (r'\.getElementsByName\([^)]*\)', 'getElementsByName 호출시 요소가 null일 수 있습니다'),
-        (r'\.querySelector\([^)]*\)', 'querySelector 호출시 요소가 null일 수 있습니다'),
-        (r'\.querySelectorAll\([^)]*\)', 'querySelectorAll 호출시 요소가 null일 수 있습니다'),
-        (r'\.closest\([^)]*\)', 'closest 호출시 요소가 null일 수 있습니다'),
-        (r'\.matches\([^)]*\)', 'matches 호출시 요소가 null일 수 있습니다'),
-        (r'\.contains\([^)]*\)', 'contains 호출시 요소가 null일 수 있습니다'),
-        (r'\.compareDocumentPosition\([^)]*\)', 'compareDocumentPosition 호출시 요소가 null일 수 있습니다'),
-        (r'\.isSameNode\([^)]*\)', 'isSameNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.isEqualNode\([^)]*\)', 'isEqualNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.lookupPrefix\([^)]*\)', 'lookupPrefix 호출시 요소가 null일 수 있습니다'),
-        (r'\.lookupNamespaceURI\([^)]*\)', 'lookupNamespaceURI 호출시 요소가 null일 수 있습니다'),
-        (r'\.isDefaultNamespace\([^)]*\)', 'isDefaultNamespace 호출시 요소가 null일 수 있습니다'),
-        (r'\.insertBefore\([^)]*\)', 'insertBefore 호출시 요소가 null일 수 있습니다'),
-        (r'\.appendChild\([^)]*\)', 'appendChild 호출시 요소가 null일 수 있습니다'),
-        (r'\.replaceChild\([^)]*\)', 'replaceChild 호출시 요소가 null일 수 있습니다'),
-        (r'\.removeChild\([^)]*\)', 'removeChild 호출시 요소가 null일 수 있습니다'),
-        (r'\.cloneNode\([^)]*\)', 'cloneNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.normalize\(\)', 'normalize 호출시 요소가 null일 수 있습니다'),
-        (r'\.isSupported\([^)]*\)', 'isSupported 호출시 요소가 null일 수 있습니다'),
-        (r'\.hasChildNodes\(\)', 'hasChildNodes 호출시 요소가 null일 수 있습니다'),
-        (r'\.getFeature\([^)]*\)', 'getFeature 호출시 요소가 null일 수 있습니다'),
-        (r'\.getUserData\([^)]*\)', 'getUserData 호출시 요소가 null일 수 있습니다'),
-        (r'\.setUserData\([^)]*\)', 'setUserData 호출시 요소가 null일 수 있습니다'),
-        (r'\.adoptNode\([^)]*\)', 'adoptNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.importNode\([^)]*\)', 'importNode 호출시 요소가 null일 수 있습니다'),
-        (r'\.createElement\([^)]*\)', 'createElement 호출시 잘못된 태그명일 수 있습니다'),
-        (r'\.createElementNS\([^)]*\)', 'createElementNS 호출시 잘못된 네임스페이스일 수 있습니다'),
-        (r'\.createTextNode\([^)]*\)', 'createTextNode 호출시 잘못된 텍스트일 수 있습니다'),
-        (r'\.createComment\([^)]*\)', 'createComment 호출시 잘못된 주석일 수 있습니다'),
-        (r'\.createCDATASection\([^)]*\)', 'createCDATASection 호출시 잘못된 CDATA일 수 있습니다'),
-        (r'\.createProcessingInstruction\([^)]*\)', 'createProcessingInstruction 호출시 잘못된 처리 지시어일 수 있습니다'),
-        (r'\.createAttribute\([^)]*\)', 'createAttribute 호출시 잘못된 속성명일 수 있습니다'),
-        (r'\.createAttributeNS\([^)]*\)', 'createAttributeNS 호출시 잘못된 네임스페이스일 수 있습니다'),
-        (r'\.createEntityReference\([^)]*\)', 'createEntityReference 호출시 잘못된 엔티티 참조일 수 있습니다'),
-        (r'\.createRange\(\)', 'createRange 호출시 문서가 null일 수 있습니다'),
-        (r'\.createNodeIterator\([^)]*\)', 'createNodeIterator 호출시 잘못된 루트일 수 있습니다'),
-        (r'\.createTreeWalker\([^)]*\)', 'createTreeWalker 호출시 잘못된 루트일 수 있습니다'),
-        (r'\.getElementById\([^)]*\)', 'getElementById 호출시 잘못된 ID일 수 있습니다'),
-        (r'\.getElementsByTagName\([^)]*\)', 'getElementsByTagName 호출시 잘못된 태그명일 수 있습니다'),
-        (r'\.getElementsByTagNameNS\([^)]*\)', 'getElementsByTagNameNS 호출시 잘못된 네임스페이스일 수 있습니다'),
-        (r'\.getElementsByClassName\([^)]*\)', 'getElementsByClassName 호출시 잘못된 클래스명일 수 있습니다'),
-        (r'\.querySelector\([^)]*\)', 'querySelector 호출시 잘못된 선택자일 수 있습니다'),
-        (r'\.querySelectorAll\([^)]*\)', 'querySelectorAll 호출시 잘못된 선택자일 수 있습니다'),
-        (r'\.open\([^)]*\)', 'open 호출시 잘못된 URL일 수 있습니다'),
-        (r'\.write\([^)]*\)', 'write 호출시 잘못된 HTML일 수 있습니다'),
-        (r'\.writeln\([^)]*\)', 'writeln 호출시 잘못된 HTML일 수 있습니다'),
-        (r'\.close\(\)', 'close 호출시 문서가 null일 수 있습니다'),
-        (r'\.getSelection\(\)', 'getSelection 호출시 윈도우가 null일 수 있습니다'),
-        (r'\.find\([^)]*\)', 'find 호출시 잘못된 검색어일 수 있습니다'),
-        (r'\.getComputedStyle\([^)]*\)', 'getComputedStyle 호출시 요소가 null일 수 있습니다'),
-        (r'\.getBoundingClientRect\(\)', 'getBoundingClientRect 호출시 요소가 null일 수 있습니다'),
-        (r'\.scrollIntoView\([^)]*\)', 'scrollIntoView 호출시 요소가 null일 수 있습니다'),
-        (r'\.scrollTo\([^)]*\)', 'scrollTo 호출시 잘못된 좌표일 수 있습니다'),
-        (r'\.scrollBy\([^)]*\)', 'scrollBy 호출시 잘못된 좌표일 수 있습니다'),
-        (r'\.scroll\([^)]*\)', 'scroll 호출시 잘못된 좌표일 수 있습니다'),
-        (r'\.scrollTop\s*=', 'scrollTop 설정시 잘못된 값일 수 있습니다'),
-        (r'\.scrollLeft\s*=', 'scrollLeft 설정시 잘못된 값일 수 있습니다'),
-        (r'\.scrollWidth', 'scrollWidth 접근시 요소가 null일 수 있습니다'),
-        (r'\.scrollHeight', 'scrollHeight 접근시 요소가 null일 수 있습니다'),
-        (r'\.clientWidth', 'clientWidth 접근시 요소가 null일 수 있습니다'),
-        (r'\.clientHeight', 'clientHeight 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetWidth', 'offsetWidth 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetHeight', 'offsetHeight 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetTop', 'offsetTop 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetLeft', 'offsetLeft 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetParent', 'offsetParent 접근시 요소가 null일 수 있습니다'),
-        (r'\.getBoundingClientRect\(\)', 'getBoundingClientRect 호출시 요소가 null일 수 있습니다'),
-        (r'\.getClientRects\(\)', 'getClientRects 호출시 요소가 null일 수 있습니다'),
-        (r'\.scrollIntoViewIfNeeded\([^)]*\)', 'scrollIntoViewIfNeeded 호출시 요소가 null일 수 있습니다'),
-        (r'\.scrollIntoView\([^)]*\)', 'scrollIntoView 호출시 요소가 null일 수 있습니다'),
-        (r'\.scrollTo\([^)]*\)', 'scrollTo 호출시 잘못된 좌표일 수 있습니다'),
-        (r'\.scrollBy\([^)]*\)', 'scrollBy 호출시 잘못된 좌표일 수 있습니다'),
-        (r'\.scroll\([^)]*\)', 'scroll 호출시 잘못된 좌표일 수 있습니다'),
-        (r'\.scrollTop\s*=', 'scrollTop 설정시 잘못된 값일 수 있습니다'),
-        (r'\.scrollLeft\s*=', 'scrollLeft 설정시 잘못된 값일 수 있습니다'),
-        (r'\.scrollWidth', 'scrollWidth 접근시 요소가 null일 수 있습니다'),
-        (r'\.scrollHeight', 'scrollHeight 접근시 요소가 null일 수 있습니다'),
-        (r'\.clientWidth', 'clientWidth 접근시 요소가 null일 수 있습니다'),
-        (r'\.clientHeight', 'clientHeight 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetWidth', 'offsetWidth 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetHeight', 'offsetHeight 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetTop', 'offsetTop 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetLeft', 'offsetLeft 접근시 요소가 null일 수 있습니다'),
-        (r'\.offsetParent', 'offsetParent 접근시 요소가 null일 수 있습니다'),
-        (r'\.getBoundingClientRect\(\)', 'getBoundingClientRect 호출시 요소가 null일 수 있습니다'),
-        (r'\.getClientRects\(\)', 'getClientRects 호출시 요소가 null일 수 있습니다'),
-        (r'\.scrollIntoViewIfNeeded\([^)]*\)', 'scrollIntoViewIfNeeded 호출시 요소가 null일 수 있습니다')
-    ]
-    
-    for pattern, message in error_patterns:
-        if re.search(pattern, code):
-            errors.append(message)
+    for hit in CHECK_ERRORS_RULES.scan(code, first_only=True):
+        if hit.result.spans:
+            errors.append(hit.rule.message)
+        elif hit.result.partial:
+            line_number = code.count('\n', 0, hit.result.scanned) + 1
+            errors.append(f"[부분 결과] 규칙 {hit.rule.name} 검사가 시간 제한으로 {line_number}행 이후 중단되었습니다")
     
     return errors if errors else ['발견된 오류 없음']
 
@@ -962,7 +814,7 @@ def analyze_function_purpose(func_name: str) -> str:
     else:
         return "일반 처리"
 
-def analyze_with_llm(code: str, fast_mode: bool = False) -> Dict[str, Any]:
+def analyze_with_llm(code: str, fast_mode: bool = False, compact_prompt: Optional[bool] = None) -> Dict[str, Any]:
     """
     LM Studio를 사용한 고급 분석
     
@@ -971,70 +823,14 @@ def analyze_with_llm(code: str, fast_mode: bool = False) -> Dict[str, Any]:
     2. eXBuilder6 API 사용 여부 분석
     3. 잠재적 오류 및 보안 위험 요소 분석
     4. 실행 흐름 분석 (단계별 상세 과정)
-    5. eXBuilder6_HelpContents.pdf 기반의 정확한 API 정보 제공
+    5. 코드에서 사용된 컨트롤/메서드에 관련된 eXBuilder6 API 참고 정보 제공 (api_reference)
     """
-    prompt = f"""JavaScript 코드를 다음 4가지 항목으로 분석해주세요:
-
-**분석할 코드:**
-```javascript
-{code}
-```
-
-**분석 요청:**
-1. JavaScript 문법/로직 문제점 (구체적인 라인 번호와 함께)
-2. eXBuilder6 API 사용 여부 (사용된 API 목록 및 잘못된 사용 여부)
-3. 잠재적 오류 및 보안 위험 요소
-4. 실행 흐름 (단계별 상세 과정 - 스토리텔링 방식)
-
-**eXBuilder6 API 참고 정보:**
-- Grid 컨트롤 (grd): addRow, deleteRow, updateRow, getRow, getData, setData, clear, refresh, getSelected, setSelected, getChecked, setChecked, getExpanded, setExpanded, scrollTo, scrollIntoView, insertRowData, removeRowData, getRowCount, getColumnCount, getSelectedRows, setSelectedRows, getCellValue, setCellValue, getCellText, setCellText, getCellStyle, setCellStyle, getColumnWidth, setColumnWidth, getRowHeight, setRowHeight, getVisibleRows, setVisibleRows, getVisibleColumns, setVisibleColumns, getSortColumn, setSortColumn, getSortOrder, setSortOrder, getFilterData, setFilterData, getGroupData, setGroupData, getSummaryData, setSummaryData, getPagingData, setPagingData, getPageSize, setPageSize, getCurrentPage, setCurrentPage, getTotalCount, setTotalCount, getPageCount, setPageCount, getPageInfo, setPageInfo
-
-- Button 컨트롤 (button, btn): setText, getText, enable, disable, show, hide, focus, blur, click, setIcon, getIcon, setIconAlign, getIconAlign, setButtonType, getButtonType, setImage, getImage, setImageAlign, getImageAlign, setTooltip, getTooltip
-
-- Calendar 컨트롤 (calendar, cal): setDate, getDate, setValue, getValue, enable, disable, show, hide, focus, blur, setMinDate, getMinDate, setMaxDate, getMaxDate, setFirstDayOfWeek, getFirstDayOfWeek, setCalendarType, getCalendarType, setDateFormat, getDateFormat, setTimeFormat, getTimeFormat, setShowTime, getShowTime, setShowToday, getShowToday, setShowWeekNumbers, getShowWeekNumbers
-
-- ComboBox 컨트롤 (cmb): addItem, deleteItem, updateItem, getItem, getData, setData, clear, refresh, getSelected, setSelected, getChecked, setChecked, enable, disable, show, hide, focus, blur, openDropdown, closeDropdown, getSelectedIndex, setSelectedIndex, getSelectedValue, setSelectedValue, getSelectedText, setSelectedText, getItemCount, getItemText, setItemText, getItemValue, setItemValue, getItemData, setItemData, getItemIndex, setItemIndex, getItemByValue, getItemByText, getItemByIndex
-
-- CheckBox 컨트롤 (cbx): setChecked, getChecked, setText, getText, enable, disable, show, hide, focus, blur, setCheckType, getCheckType, setTextAlign, getTextAlign, setGroupName, getGroupName
-
-- Tree 컨트롤 (tre): addNode, deleteNode, updateNode, getNode, getData, setData, clear, refresh, getSelected, setSelected, getChecked, setChecked, getExpanded, setExpanded, scrollTo, scrollIntoView, enable, disable, show, hide, focus, blur, expandAll, collapseAll, getRootNode, getChildNodes, getParentNode, getSiblingNodes, getNodeByText, getNodeByValue, getNodeByIndex, getNodePath, setNodePath, getNodeLevel, setNodeLevel, getNodeIcon, setNodeIcon, getNodeTooltip, setNodeTooltip
-
-- InputBox 컨트롤 (ipb): setValue, getValue, setText, getText, enable, disable, show, hide, focus, blur, setMaxLength, getMaxLength, setPlaceholder, getPlaceholder, setInputType, getInputType, setPattern, getPattern, setRequired, getRequired, setReadOnly, getReadOnly, setAutoComplete, getAutoComplete, setAutoFocus, getAutoFocus, setSpellCheck, getSpellCheck
-
-- TextArea 컨트롤 (txa): setValue, getValue, setText, getText, enable, disable, show, hide, focus, blur, setMaxLength, getMaxLength, setPlaceholder, getPlaceholder, setRows, getRows, setCols, getCols, setWrap, getWrap, setResize, getResize, setSpellCheck, getSpellCheck
-
-**공통 API (모든 컨트롤에서 사용 가능):**
-- 메서드: setValue, getValue, setText, getText, enable, disable, show, hide, focus, blur, setVisible, getVisible, setEnabled, getEnabled, setReadOnly, getReadOnly, setWidth, getWidth, setHeight, getHeight, setStyle, getStyle, setData, getData, refresh, clear, reset, validate, isValid, getParent, getChild, getChildren, getSibling, getSiblings, getRoot, getAncestor, getDescendant, getFirstChild, getLastChild, getNextSibling, getPreviousSibling, addChild, removeChild, insertChild
-
-- 속성: text, value, visible, enabled, readOnly, width, height, style, data, name, id, className, tagName, parentNode, childNodes, firstChild, lastChild, nextSibling, previousSibling, nodeType, nodeValue, nodeName, attributes
-
-- 이벤트: onLoad, onUnload, onClick, onDoubleClick, onRightClick, onMouseDown, onMouseUp, onMouseOver, onMouseOut, onMouseMove, onMouseEnter, onMouseLeave, onFocus, onBlur, onKeyDown, onKeyUp, onKeyPress, onChange, onSelect, onInput, onInvalid, onReset, onSubmit, onError, onAbort, onLoad, onUnload, onResize, onScroll, onContextMenu
-
-**메시지 API:**
-- showMessage, showConfirm, showAlert, showError, showWarning, showInfo, showSuccess, showQuestion, showInput, showSelect, showFileDialog, showColorDialog, showFontDialog, openPopup, closePopup, showPopup, hidePopup, setPopupPosition, getPopupPosition, setPopupSize, getPopupSize, setPopupTitle, getPopupTitle, setPopupContent, getPopupContent
-
-**데이터 API:**
-- getData, setData, getJsonData, setJsonData, getXmlData, setXmlData, getCsvData, setCsvData, loadData, saveData, exportData, importData, validateData, transformData, filterData, sortData, groupData, aggregateData, calculateData, mergeData, splitData, cloneData
-
-**응답 형식:**
-## 1. JavaScript 문법/로직 문제점
-- **라인 X**: 구체적 문제점
-
-## 2. eXBuilder6 API 사용 여부
-- 사용된 API: this.form.setValue, this.grid.addRow 등
-- 잘못된 API 사용: 존재하지 않는 메서드/속성
-
-## 3. 오류 검사
-- **라인 X**: 구체적 오류
-
-## 4. 실행 흐름
-- 단계별 상세 동작 과정 (스토리텔링 방식)
-
-발견된 문제가 없으면 "발견된 문제점 없음"으로 표시하세요."""
-
     try:
-        result = request_llm_fast(prompt) if fast_mode else request_llm(prompt)
+        result = request_llm_template("legacy_analysis", code, fast_mode, compact_prompt,
+                                      api_context=build_api_reference(code))
         return {"llm_analysis": result}
+    except StaticFallback as e:
+        return e.result()
     except Exception as e:
         return {"llm_analysis": f"LLM 분석 중 오류 발생: {str(e)}"}
 
@@ -1060,36 +856,42 @@ async def analyze_javascript(request: JavaScriptAnalysisRequest):
         HTTPException: 분석 중 오류 발생시
     """
     try:
-        # 기본 분석 (한글 설명: JavaScript 코드의 기본적인 분석을 수행)
-        javascript_issues = check_javascript_issues(request.code)
-        exbuilder6_apis = check_exbuilder6_apis(request.code)
-        errors = check_errors(request.code)
-        execution_flow = analyze_execution_flow(request.code)
+        if not request.include_llm:
+            # 빠른 경로: 정적 분석만 수행
+            return await asyncio.to_thread(run_static_analysis, request.code)
         
-        # LM Studio를 사용한 고급 분석 (한글 설명: LM Studio를 사용하여 더 정교한 분석을 수행)
-        llm_result = analyze_with_llm(request.code, request.fast_mode)
+        # 정적 분석과 LM Studio 고급 분석을 동시에 실행 (응답 시간 = 두 작업 중 느린 쪽)
+        basic_analysis, llm_result = await asyncio.gather(
+            asyncio.to_thread(run_static_analysis, request.code),
+            asyncio.to_thread(analyze_with_llm, request.code, request.fast_mode, request.compact_prompt)
+        )
         
+        if llm_result.get("llm_fallback"):
+            # LLM_FALLBACK=static: 정적 분석 결과와 폴백 안내만 반환
+            return {**basic_analysis, **llm_result}
         # LLM 분석 결과를 기본 분석에 통합 (한글 설명: LM Studio 분석 결과를 기본 분석 결과와 통합)
         if "llm_analysis" in llm_result and "LLM 분석 중 오류 발생" not in llm_result["llm_analysis"]:
             # LLM 분석이 성공한 경우, 기본 분석 결과에 추가 정보 포함
-            return {
-                "javascript_issues": javascript_issues,
-                "exbuilder6_apis": exbuilder6_apis,
-                "errors": errors,
-                "execution_flow": execution_flow,
-                "llm_analysis": llm_result["llm_analysis"]
-            }
-        else:
-            # LLM 분석이 실패한 경우, 기본 분석만 반환
-            return JavaScriptAnalysisResponse(
-                javascript_issues=javascript_issues,
-                exbuilder6_apis=exbuilder6_apis,
-                errors=errors,
-                execution_flow=execution_flow
-            )
+            return {**basic_analysis, "llm_analysis": llm_result["llm_analysis"]}
+        # LLM 분석이 실패한 경우, 기본 분석만 반환
+        return basic_analysis
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
+def run_static_analysis(code: str) -> Dict[str, List[str]]:
+    """정적 분석 (한글 설명: JavaScript 코드의 기본적인 분석을 수행)"""
+    phases = [
+        ("javascript_issues", "syntax", check_javascript_issues),
+        ("exbuilder6_apis", "api_validation", check_exbuilder6_apis),
+        ("errors", "rules", check_errors),
+        ("execution_flow", "flow", analyze_execution_flow),
+    ]
+    result = {}
+    for key, phase, check in phases:
+        with analyzer_phase_duration.time(analyzer="basic", phase=phase), memory_phase(phase, analyzer="basic"):
+            result[key] = check(code)
+    return result
+
 @router.post("/analyze/file")
 async def analyze_javascript_file(file: UploadFile = File(...), fast_mode: bool = False):
     """
@@ -1116,20 +918,11 @@ async def analyze_javascript_file(file: UploadFile = File(...), fast_mode: bool
             raise HTTPException(status_code=400, detail="JavaScript 파일(.js)만 업로드 가능합니다.")
         
         content = await file.read()
-        code = content.decode('utf-8')
+        with memory_phase("decode"):
+            code = content.decode('utf-8')
         
         # 기본 분석 (한글 설명: 업로드된 JavaScript 파일의 기본적인 분석을 수행)
-        javascript_issues = check_javascript_issues(code)
-        exbuilder6_apis = check_exbuilder6_apis(code)
-        errors = check_errors(code)
-        execution_flow = analyze_execution_flow(code)
-        
-        return {
-            "javascript_issues": javascript_issues,
-            "exbuilder6_apis": exbuilder6_apis,
-            "errors": errors,
-            "execution_flow": execution_flow
-        }
+        return await asyncio.to_thread(run_static_analysis, code)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 분석 중 오류 발생: {str(e)}")
 
@@ -1154,16 +947,11 @@ async def analyze_javascript_detailed(request: JavaScriptAnalysisRequest):
         HTTPException: 분석 중 오류 발생시
     """
     try:
-        # 기본 분석 (한글 설명: JavaScript 코드의 기본적인 분석을 수행)
-        basic_analysis = {
-            "javascript_issues": check_javascript_issues(request.code),
-            "exbuilder6_apis": check_exbuilder6_apis(request.code),
-            "errors": check_errors(request.code),
-            "execution_flow": analyze_execution_flow(request.code)
-        }
-        
-        # LM Studio를 사용한 고급 분석 (한글 설명: LM Studio를 사용하여 더 정교한 분석을 수행)
-        llm_analysis = analyze_with_llm(request.code, request.fast_mode)
+        # 기본 분석과 LM Studio 고급 분석을 동시에 실행 (응답 시간 = 두 작업 중 느린 쪽)
+        basic_analysis, llm_analysis = await asyncio.gather(
+            asyncio.to_thread(run_static_analysis, request.code),
+            asyncio.to_thread(analyze_with_llm, request.code, request.fast_mode, request.compact_prompt)
+        )
         
         return {
             "basic_analysis": basic_analysis,
@@ -1172,6 +960,33 @@ async def analyze_javascript_detailed(request: JavaScriptAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
+@router.post("/analyze/detailed/stream")
+async def analyze_javascript_detailed_stream(request: JavaScriptAnalysisRequest):
+    """
+    상세한 JavaScript 코드 분석 스트리밍 (NDJSON)
+    
+    정적 분석 결과를 준비되는 즉시 첫 줄로 보내고, LLM 분석이 끝나면 두 번째 줄로 보냅니다.
+    - {"phase": "static", "basic_analysis": {...}}
+    - {"phase": "llm", "llm_analysis": {...}}
+    """
+    llm_task = asyncio.create_task(
+        asyncio.to_thread(analyze_with_llm, request.code, request.fast_mode, request.compact_prompt))
+    
+    async def generate():
+        try:
+            basic_analysis = await asyncio.to_thread(run_static_analysis, request.code)
+            with analyzer_phase_duration.time(analyzer="basic", phase="serialize"):
+                line = json.dumps({"phase": "static", "basic_analysis": basic_analysis}, ensure_ascii=False) + "\n"
+            yield line
+            llm_analysis = await llm_task
+            yield json.dumps({"phase": "llm", "llm_analysis": llm_analysis}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"phase": "error", "detail": f"분석 중 오류 발생: {str(e)}"}, ensure_ascii=False) + "\n"
+        finally:
+            llm_task.cancel()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @router.post("/analyze/batch")
 async def analyze_javascript_batch(request: JavaScriptAnalysisRequest):
     """
@@ -1193,48 +1008,66 @@ async def analyze_javascript_batch(request: JavaScriptAnalysisRequest):
         HTTPException: 분석 중 오류 발생시
     """
     try:
-        code = request.code
-        code_length = len(code)
-        
-        # 코드 크기에 따른 배치 크기 결정
-        if code_length <= 1000:
-            # 작은 코드는 일반 분석 사용
-            return await analyze_javascript(request)
-        elif code_length <= 10000:
-            batch_size = 1000
-        elif code_length <= 50000:
-            batch_size = 2000
-        else:
-            batch_size = 5000
-        
-        # 코드를 배치로 분할
-        batches = split_code_into_batches(code, batch_size)
-        
-        # 배치별 분석 결과 수집
-        batch_results = []
-        for i, batch in enumerate(batches):
-            batch_request = JavaScriptAnalysisRequest(code=batch, fast_mode=request.fast_mode)
-            batch_result = await analyze_javascript(batch_request)
-            batch_results.append({
-                'batch_index': i,
-                'batch_size': len(batch),
-                'result': batch_result
-            })
-        
-        # 결과 통합
-        combined_result = combine_batch_results(batch_results)
+        return await run_batch_analysis(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"배치 분석 중 오류 발생: {str(e)}")
+
+async def run_batch_analysis(request: JavaScriptAnalysisRequest,
+                             on_progress: Optional[Callable[[int, int, dict], None]] = None):
+    """
+    배치 분석 실행
+    
+    Args:
+        request (JavaScriptAnalysisRequest): 분석할 JavaScript 코드와 분석 모드
+        on_progress (Callable): 배치마다 (완료 배치 수, 전체 배치 수, 부분 결과)로 호출 (작업 API 진행률 보고용)
         
+    Returns:
+        dict: 배치 분석 결과
+    """
+    code = request.code
+    code_length = len(code)
+    
+    # 코드 크기에 따른 배치 크기 결정
+    if code_length <= 1000:
+        # 작은 코드는 일반 분석 사용
+        return await analyze_javascript(request)
+    elif code_length <= 10000:
+        batch_size = 1000
+    elif code_length <= 50000:
+        batch_size = 2000
+    else:
+        batch_size = 5000
+    
+    # 코드를 배치로 분할
+    batches = split_code_into_batches(code, batch_size)
+    
+    def build_result(batch_results: List[dict]) -> dict:
         return {
             "analysis_type": "batch",
             "total_code_length": code_length,
             "batch_count": len(batches),
             "batch_size": batch_size,
-            "combined_result": combined_result,
+            "combined_result": combine_batch_results(batch_results),
             "batch_results": batch_results
         }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"배치 분석 중 오류 발생: {str(e)}")
+    
+    # 배치별 분석 결과 수집
+    batch_results = []
+    for i, batch in enumerate(batches):
+        batch_request = JavaScriptAnalysisRequest(code=batch, fast_mode=request.fast_mode,
+                                                  compact_prompt=request.compact_prompt,
+                                                  include_llm=request.include_llm)
+        batch_result = await analyze_javascript(batch_request)
+        batch_results.append({
+            'batch_index': i,
+            'batch_size': len(batch),
+            'result': batch_result
+        })
+        if on_progress:
+            on_progress(i + 1, len(batches), build_result(batch_results))
+    
+    # 결과 통합
+    return build_result(batch_results)
 
 def split_code_into_batches(code: str, batch_size: int) -> List[str]:
     """
@@ -0,0 +1,160 @@
+"""
+JavaScript 토크나이저
+
+주석, 문자열, 템플릿 리터럴, 정규식 리터럴을 구분하는 단일 패스 정규식 스캐너입니다.
+프롬프트 압축, 괄호/따옴표 검사 등 코드 구조가 필요한 곳에서 공통으로 사용합니다.
+
+'/'는 피연산자 자리(같은 라인에서 공백만 사이에 둔 앞 토큰이 ( , = : [ ! & | ? { } ; 또는 return, typeof)일 때만
+정규식 리터럴로 보고, 그 밖에는 나눗셈 연산자로 봅니다. 따라서 /\\/*/g, /^https?:\\/\\//의
+/*, //, 따옴표는 주석/문자열을 열지 않습니다.
+"""
+
+import re
+from typing import Iterator, List, NamedTuple, Tuple
+
+class Token(NamedTuple):
+    kind: str   # 'comment', 'string', 'regex', 'newline', 'space', 'ident', 'number', 'punct'
+    value: str
+    line: int   # 토큰이 시작하는 라인 번호 (1부터 시작)
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:\\.|[^"\\\n])*(?:"|$)
+             |'(?:\\.|[^'\\\n])*(?:'|$)
+             |`(?:\\.|[^`\\])*(?:`|\Z))
+  | (?P<newline>\n)
+  | (?P<space>[ \t\r\f\v]+)
+  | (?P<ident>[^\W\d][\w$]*|\$[\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>.)
+""", re.DOTALL | re.MULTILINE | re.VERBOSE)
+
+# 정규식 리터럴 본문 (문자 클래스 안의 /는 닫는 구분자가 아님, 줄바꿈 없음)
+_REGEX_BODY = r"/(?![/*])(?:\\[^\n]|\[(?:\\[^\n]|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*"
+_REGEX_LITERAL = re.compile(_REGEX_BODY)
+
+# 뒤에 오는 '/'가 정규식 리터럴을 여는 토큰
+_REGEX_PRECEDING_PUNCT = frozenset('(,=:[!&|?{};')
+_REGEX_PRECEDING_KEYWORDS = frozenset(('return', 'typeof'))
+
+def tokenize(code: str) -> Iterator[Token]:
+    """코드를 토큰 단위로 분리 (여러 줄에 걸친 토큰은 시작 라인 기준)"""
+    line = 1
+    pos = 0
+    previous = None  # 같은 라인에서 공백만 사이에 둔 직전 토큰
+    while pos < len(code):
+        match = _TOKEN_PATTERN.match(code, pos)
+        kind = match.lastgroup
+        value = match.group()
+        if value == '/' and previous is not None and (
+                (previous.kind == 'punct' and previous.value in _REGEX_PRECEDING_PUNCT)
+                or (previous.kind == 'ident' and previous.value in _REGEX_PRECEDING_KEYWORDS)):
+            regex = _REGEX_LITERAL.match(code, pos)
+            if regex is not None:
+                kind, value = 'regex', regex.group()
+        token = Token(kind, value, line)
+        yield token
+        pos += len(value)
+        if kind == 'newline':
+            line += 1
+        elif kind in ('comment', 'string'):
+            line += value.count('\n')
+        if kind in ('newline', 'comment'):
+            previous = None  # 스킵 스캐너와 같게 공백만 사이에 둔 앞 토큰을 봄
+        elif kind != 'space':
+            previous = token
+
+# 스킵 스캐너용: 피연산자 자리의 정규식 리터럴 (앞 토큰과 사이 공백까지 함께 매칭하고, 리터럴은 regex 그룹)
+_REGEX_IN_CONTEXT = (r"(?:(?P<regex_after>[(,=:\[!&|?{};])|(?<![\w$])(?:return|typeof))"
+                     r"[^\S\n]*(?P<regex>" + _REGEX_BODY + ")")
+
+BRACKETS = {'(': ')', '{': '}', '[': ']'}
+
+# 괄호/따옴표 검사용: 주석, 문자열, 정규식 리터럴, 줄바꿈, 괄호만 찾고 나머지(식별자, 공백 등)는 정규식 엔진이 건너뜀
+# (따옴표와 괄호는 식별자/숫자/공백 토큰 안에 나올 수 없으므로 tokenize와 같은 경계를 얻음)
+_STRUCTURE_PATTERN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:\\.|[^"\\\n])*(?:"|$)
+             |'(?:\\.|[^'\\\n])*(?:'|$)
+             |`(?:\\.|[^`\\])*(?:`|\Z))
+  | """ + _REGEX_IN_CONTEXT + r"""
+  | (?P<newline>\n)
+  | (?P<bracket>[()\[\]{}])
+""", re.DOTALL | re.MULTILINE | re.VERBOSE)
+
+_LITERAL_PATTERN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:\\.|[^"\\\n])*(?:"|$)
+             |'(?:\\.|[^'\\\n])*(?:'|$)
+             |`(?:\\.|[^`\\])*(?:`|\Z))
+  | """ + _REGEX_IN_CONTEXT + r"""
+""", re.DOTALL | re.MULTILINE | re.VERBOSE)
+
+def literal_spans(code: str) -> List[Tuple[int, int]]:
+    """문자열/주석/정규식 리터럴 토큰의 (시작, 끝) 위치 목록 (tokenize와 같은 경계, 시작 위치 순서)"""
+    return [match.span('regex') if match.start('regex') >= 0 else match.span()
+            for match in _LITERAL_PATTERN.finditer(code)]
+
+class BracketIssue(NamedTuple):
+    kind: str         # 'unexpected_close' (여는 괄호 없음), 'mismatch' (짝이 다름), 'unclosed' (닫히지 않음)
+    char: str
+    line: int
+    column: int       # 1부터 시작
+    open_char: str = ''
+    open_line: int = 0
+    open_column: int = 0
+
+class StructureIssues(NamedTuple):
+    brackets: List[BracketIssue]
+    unterminated_strings: List[Tuple[int, str]]  # 라인 끝까지 닫히지 않은 문자열의 (라인, 따옴표)
+
+def _unterminated(value: str) -> bool:
+    body = value[1:]
+    escapes = len(body[:-1]) - len(body[:-1].rstrip('\\'))
+    return not body.endswith(value[0]) or escapes % 2 == 1
+
+def check_structure(code: str) -> StructureIssues:
+    """문자열/주석 밖의 괄호 균형과 닫히지 않은 작은따옴표/큰따옴표 문자열 검사 (단일 패스)
+
+    괄호 오류가 난 라인의 나머지 괄호는 건너뛰고 다음 라인부터 계속 검사하며,
+    끝까지 닫히지 않은 괄호는 여는 순서대로 보고합니다.
+    """
+    brackets: List[BracketIssue] = []
+    unterminated: List[Tuple[int, str]] = []
+    stack: List[Tuple[str, int, int]] = []
+    line, line_start, skip_line = 1, 0, 0
+    for match in _STRUCTURE_PATTERN.finditer(code):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'regex':
+            # 정규식 리터럴 앞의 토큰이 여는/닫는 괄호면 괄호로 처리하고 리터럴 안은 건너뜀
+            value = match.group('regex_after')
+            if value is None or value not in '()[]{}':
+                continue
+            kind = 'bracket'
+        if kind == 'bracket':
+            if line == skip_line:
+                continue
+            column = match.start() - line_start + 1
+            if value in BRACKETS:
+                stack.append((value, line, column))
+            elif not stack:
+                brackets.append(BracketIssue('unexpected_close', value, line, column))
+                skip_line = line
+            else:
+                open_char, open_line, open_column = stack.pop()
+                if BRACKETS[open_char] != value:
+                    brackets.append(BracketIssue('mismatch', value, line, column, open_char, open_line, open_column))
+                    skip_line = line
+        elif kind == 'newline':
+            line += 1
+            line_start = match.end()
+        else:
+            if kind == 'string' and value[0] != '`' and _unterminated(value):
+                unterminated.append((line, value[0]))
+            newlines = value.count('\n')
+            if newlines:
+                line += newlines
+                line_start = match.start() + value.rfind('\n') + 1
+    brackets.extend(BracketIssue('unclosed', char, open_line, column) for char, open_line, column in stack)
+    return StructureIssues(brackets, unterminated)
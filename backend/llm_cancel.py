@@ -0,0 +1,193 @@
+"""
+요청 취소 전파 (클라이언트 연결 종료, 요청별 데드라인)
+
+HTTP 요청마다 CancelToken을 만들어 contextvar로 LLM 클라이언트까지 전달합니다.
+- 클라이언트가 연결을 끊거나 X-Request-Timeout(초)이 지나면 토큰이 취소됨
+- 취소 시 등록된 콜백(스트리밍 응답 close 등)을 호출해 업스트림 생성을 중단
+- LLM 호출 지점에서 check_cancelled()로 남은 작업을 건너뜀
+
+엔드포인트는 블로킹 LLM 호출을 asyncio.to_thread로 실행해야 합니다.
+(to_thread는 contextvar를 복사하므로 워커 스레드에서도 같은 토큰을 사용)
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+from metrics import REGISTRY
+
+DEADLINE_HEADER = b"x-request-timeout"
+
+logger = logging.getLogger(__name__)
+
+cancelled_requests = REGISTRY.counter(
+    "http_requests_cancelled_total", "클라이언트 연결 종료/데드라인으로 취소된 요청 수", ("path", "reason"))
+cancelled_llm_calls = REGISTRY.counter(
+    "llm_requests_cancelled_total", "취소로 중단되거나 건너뛴 LLM 호출 수", ("reason",))
+
+class LLMCancelled(BaseException):
+    """요청이 취소됨
+
+    asyncio.CancelledError와 같은 이유로 BaseException을 상속합니다.
+    분석 코드의 except Exception 블록에서 오류 결과로 바뀌지 않고 엔드포인트까지 전달됩니다.
+    """
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+class CancelToken:
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline  # time.monotonic() 기준
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str):
+        """취소 표시 후 등록된 콜백 호출 (최초 1회만)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Cancel callback failed", extra={"error": str(e)})
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline")
+        return self._event.is_set()
+
+    def check(self):
+        if self.cancelled:
+            raise LLMCancelled(self.reason)
+
+    def wait(self, seconds: float):
+        """seconds 동안 대기하되 취소되면 즉시 LLMCancelled"""
+        if self.deadline is not None:
+            seconds = min(seconds, max(0.0, self.deadline - time.monotonic()))
+        self._event.wait(seconds)
+        self.check()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """취소 시 호출할 콜백 등록 (이미 취소됐으면 즉시 호출), 등록 해제 함수 반환"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+_current_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "llm_cancel_token", default=None)
+
+def current_token() -> Optional[CancelToken]:
+    return _current_token.get()
+
+def set_current_token(token: Optional[CancelToken]):
+    """현재 컨텍스트의 취소 토큰 지정 (HTTP 요청과 분리된 작업 실행용)"""
+    _current_token.set(token)
+
+def check_cancelled():
+    """현재 요청이 취소됐으면 LLMCancelled 발생"""
+    token = current_token()
+    if token is not None:
+        token.check()
+
+def cancellable_sleep(seconds: float):
+    token = current_token()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.wait(seconds)
+
+def parse_deadline(headers: list) -> Optional[float]:
+    """X-Request-Timeout 헤더 또는 LLM_REQUEST_TIMEOUT_SECONDS 기본값으로 데드라인 계산"""
+    timeout = os.getenv("LLM_REQUEST_TIMEOUT_SECONDS")
+    for name, value in headers:
+        if name.lower() == DEADLINE_HEADER:
+            timeout = value.decode("latin-1")
+    try:
+        seconds = float(timeout) if timeout else 0
+    except ValueError:
+        return None
+    return time.monotonic() + seconds if seconds > 0 else None
+
+class CancellationMiddleware:
+    """요청별 CancelToken 생성, 연결 종료 감시, 데드라인 타이머 (ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = CancelToken(parse_deadline(scope.get("headers", [])))
+        loop = asyncio.get_running_loop()
+        timer = loop.call_later(token.deadline - time.monotonic(), token.cancel, "deadline") \
+            if token.deadline is not None else None
+        disconnected = asyncio.Event()
+        watcher: Optional[asyncio.Task] = None
+        response_started = False
+
+        async def watch_disconnect():
+            # 본문을 모두 읽은 뒤의 receive()는 연결 종료 시에만 반환됨
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    token.cancel("client_disconnected")
+                    disconnected.set()
+                    return
+
+        async def wrapped_receive():
+            nonlocal watcher
+            if watcher is not None:
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                watcher = asyncio.create_task(watch_disconnect())
+            elif message["type"] == "http.disconnect":
+                token.cancel("client_disconnected")
+            return message
+
+        async def wrapped_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        context_token = _current_token.set(token)
+        try:
+            await self.app(scope, wrapped_receive, wrapped_send)
+        except LLMCancelled as e:
+            cancelled_requests.inc(path=scope.get("path", ""), reason=e.reason)
+            logger.info("Request cancelled", extra={"reason": e.reason, "path": scope.get("path")})
+            if not response_started and e.reason != "client_disconnected":
+                body = json.dumps({"detail": "요청 처리 시간이 X-Request-Timeout을 초과했습니다."},
+                                  ensure_ascii=False).encode()
+                await send({"type": "http.response.start", "status": 504,
+                            "headers": [(b"content-type", b"application/json")]})
+                await send({"type": "http.response.body", "body": body})
+        finally:
+            _current_token.reset(context_token)
+            if timer is not None:
+                timer.cancel()
+            if watcher is not None:
+                watcher.cancel()
@@ -1,71 +1,251 @@
+import json
+import logging
 import os
+import time
 import openai
 import requests
 from dotenv import load_dotenv
+from metrics import REGISTRY
+from llm_routing import route_request
+from llm_pool import NoEndpointAvailable, get_lmstudio_pool
+from llm_resilience import CircuitOpenError, StaticFallback, execute_with_policy
+from llm_cancel import LLMCancelled, cancelled_llm_calls, check_cancelled, current_token
+from llm_local import LocalBackendUnavailable, LocalPromptTooLong, get_local_llm
 
 load_dotenv()
 
-def request_llm_fast(prompt: str, mode: str = None) -> str:
-    """빠른 응답을 위한 LLM 요청 (토큰 수 제한)"""
-    return request_llm(prompt, mode, max_tokens=1024)  # 256 → 1024로 증가
+logger = logging.getLogger(__name__)
 
-def request_llm(prompt: str, mode: str = None, max_tokens: int = 2048) -> str:  # 1024 → 2048로 증가
-    # mode: 'openai' or 'lmstudio' (기본: 환경변수 LLM_MODE, 없으면 openai)
+prompt_tokens_total = REGISTRY.counter(
+    "llm_prompt_tokens_total", "백엔드별 프롬프트 토큰 수", ("backend",))
+cached_prompt_tokens_total = REGISTRY.counter(
+    "llm_cached_prompt_tokens_total", "백엔드 프롬프트 캐시에서 재사용된 토큰 수", ("backend",))
+completion_tokens_total = REGISTRY.counter(
+    "llm_completion_tokens_total", "백엔드별 생성(출력) 토큰 수", ("backend",))
+llm_request_duration = REGISTRY.histogram(
+    "llm_request_duration_seconds", "백엔드별 LLM 요청 시간 (슬롯 대기 포함)", ("backend", "result"))
+llm_time_to_first_token = REGISTRY.histogram(
+    "llm_time_to_first_token_seconds", "요청 전송부터 첫 생성 토큰 수신까지 걸린 시간 (스트리밍 백엔드)", ("backend",))
+
+def build_messages(prompt: str, system: str = None) -> list:
+    """시스템 접두부(불변)와 사용자 메시지(가변)로 메시지 구성"""
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+def record_prompt_cache_usage(backend: str, usage: dict):
+    """응답 usage에서 프롬프트 캐시 적중 토큰 수 기록
+
+    OpenAI 호환 응답은 usage.prompt_tokens_details.cached_tokens,
+    llama.cpp 계열 서버는 timings.cache_n 으로 캐시 적중 토큰을 알려줍니다.
+    """
+    if not usage:
+        return
+    prompt_tokens_total.inc(usage.get("prompt_tokens") or 0, backend=backend)
+    completion_tokens_total.inc(usage.get("completion_tokens") or 0, backend=backend)
+    details = usage.get("prompt_tokens_details") or {}
+    cached_tokens = details.get("cached_tokens") or usage.get("cache_n") or 0
+    cached_prompt_tokens_total.inc(cached_tokens, backend=backend)
+
+def request_llm_fast(prompt: str, mode: str = None, system: str = None) -> str:
+    """빠른 응답을 위한 LLM 요청 (작은 모델, 토큰 수 제한)"""
+    return request_llm_routed(prompt, fast_mode=True, mode=mode, system=system)
+
+def request_llm_routed(prompt: str, fast_mode: bool = False, mode: str = None, system: str = None,
+                       sections: int = 4, max_tokens_cap: int = None) -> str:
+    """입력 크기/모드에 따라 모델과 max_tokens를 정해 LLM 요청"""
+    prompt_chars = len(prompt) + len(system or "")
+    decision = route_request(prompt_chars, fast_mode, mode, sections, max_tokens_cap)
+    logger.debug("LLM route", extra={"mode": decision.mode, "tier": decision.tier,
+                                     "model": decision.model or "default", "max_tokens": decision.max_tokens,
+                                     "reason": decision.reason})
+    return request_llm(prompt, decision.mode, decision.max_tokens, system, decision.model)
+
+class LLMResponseFormatError(Exception):
+    """choices가 없는 응답"""
+    def __init__(self, data):
+        super().__init__(f"LLM 응답 포맷 오류: {data}")
+        self.data = data
+
+def read_completion(response: requests.Response, started: float = None, backend: str = "lmstudio") -> dict:
+    """스트리밍(SSE) 응답을 비스트리밍 응답 형태로 합침 (JSON으로 응답하는 서버는 그대로 사용)
+
+    started(time.perf_counter)가 주어지면 첫 생성 토큰까지의 시간을 기록하고,
+    usage가 없는 서버를 위해 내용이 있는 델타 수를 stream_chunks로 남깁니다.
+    """
+    if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+        return response.json()
+    data = {}
+    content = []
+    received = False
+    chunks = 0
+    for line in response.iter_lines():
+        # 청크 사이마다 취소 여부 확인 (취소 시 연결을 닫아 서버의 생성도 중단됨)
+        check_cancelled()
+        line = line.decode('utf-8').strip()
+        if not line.startswith('data:'):
+            continue
+        chunk = line[5:].strip()
+        if chunk == '[DONE]':
+            break
+        event = json.loads(chunk)
+        for choice in event.get('choices') or []:
+            received = True
+            delta = (choice.get('delta') or {}).get('content') or ''
+            if delta:
+                if chunks == 0 and started is not None:
+                    llm_time_to_first_token.observe(time.perf_counter() - started, backend=backend)
+                chunks += 1
+            content.append(delta)
+        for key in ('usage', 'timings'):
+            if event.get(key):
+                data[key] = event[key]
+    if received:
+        data['choices'] = [{'message': {'content': ''.join(content)}}]
+        data['stream_chunks'] = chunks
+    return data
+
+def call_lmstudio(messages: list, max_tokens: int, model: str = None) -> str:
+    """LM Studio 요청 (실패 시 예외 발생)
+
+    스트리밍으로 요청해 요청이 취소되면 응답 연결을 닫고 생성을 중단합니다.
+    """
+    payload = {
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": 0.2,
+        "stream": True
+    }
+    if model:
+        payload["model"] = model
+    token = current_token()
+    # 여러 LM Studio 인스턴스 중 진행 중 요청이 가장 적은 엔드포인트 사용
+    with get_lmstudio_pool().lease() as endpoint:
+        # 페이로드(전체 코드 포함)는 DEBUG에서만 출력 (LOG_MAX_FIELD_CHARS로 잘림)
+        logger.debug("Sending request to LM Studio", extra={"endpoint": endpoint.chat_url, "payload": payload})
+        # 연결 실패는 빠르게 감지하고, 응답 생성은 5분까지 대기
+        connect_timeout = float(os.getenv("LMSTUDIO_CONNECT_TIMEOUT", "3"))
+        started = time.perf_counter()
+        response = requests.post(endpoint.chat_url, json=payload, timeout=(connect_timeout, 300), stream=True)
+        unregister = token.on_cancel(response.close) if token else (lambda: None)
+        try:
+            logger.debug("LM Studio response", extra={"endpoint": endpoint.chat_url, "status": response.status_code})
+            response.raise_for_status()
+            data = read_completion(response, started)
+        except Exception:
+            # 취소로 연결을 닫아 생긴 읽기 오류는 엔드포인트 장애가 아님
+            if token is not None and token.cancelled:
+                raise LLMCancelled(token.reason) from None
+            raise
+        finally:
+            unregister()
+            response.close()
+    usage = dict(data.get('usage') or {})
+    if 'timings' in data:
+        usage.setdefault('cache_n', data['timings'].get('cache_n'))
+    if 'stream_chunks' in data:
+        # usage를 보내지 않는 서버는 스트리밍 델타 수로 생성 토큰 수 추정
+        usage.setdefault('completion_tokens', data['stream_chunks'])
+    record_prompt_cache_usage("lmstudio", usage)
+    if 'choices' in data and data['choices']:
+        return data['choices'][0]['message']['content'].strip()
+    raise LLMResponseFormatError(data)
+
+def call_openai(messages: list, max_tokens: int, model: str = None) -> str:
+    """OpenAI 요청 (실패 시 예외 발생)"""
+    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    response = client.chat.completions.create(
+        model=model or "gpt-3.5-turbo",
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=0.2,
+    )
+    if response.usage:
+        record_prompt_cache_usage("openai", response.usage.model_dump())
+    return response.choices[0].message.content.strip()
+
+def call_local(messages: list, max_tokens: int, model: str = None) -> str:
+    """프로세스 내 로컬 모델 요청 (model은 LOCAL_LLM_MODEL로 고정이므로 무시)"""
+    return get_local_llm().generate(messages, max_tokens)
+
+def format_llm_error(mode: str, e: Exception) -> str:
+    """백엔드 예외를 사용자 안내가 포함된 [ERROR] 메시지로 변환"""
+    if isinstance(e, CircuitOpenError):
+        return f"[ERROR] LLM 요청 실패: {e}\n최근 연속으로 실패한 백엔드라 요청을 보내지 않았습니다. 잠시 후 다시 시도하거나 LLM_FALLBACK=openai 설정을 고려하세요."
+    if isinstance(e, LLMResponseFormatError):
+        return f"[ERROR] LLM 응답 포맷 오류: {e.data}"
+    if isinstance(e, LocalBackendUnavailable):
+        return f"[ERROR] 로컬 모델을 사용할 수 없습니다: {e}\n\n해결 방법:\n1. pip install transformers torch\n2. LOCAL_LLM_MODEL에 지정한 모델을 내려받을 수 있는지 확인하세요\n3. 또는 환경변수 LLM_MODE=lmstudio/openai로 설정하세요"
+    if isinstance(e, LocalPromptTooLong):
+        return f"[ERROR] {e}\n해결 방법:\n1. 코드를 더 작은 단위로 나누어 분석\n2. LOCAL_LLM_MAX_CONTEXT_TOKENS를 늘리기"
+    if mode == "local":
+        return f"[ERROR] LLM 요청 실패 (로컬 모델): {e}"
+    if mode != "lmstudio":
+        return f"[ERROR] LLM 요청 실패 (OpenAI): {e}"
+    if isinstance(e, NoEndpointAvailable):
+        return f"[ERROR] 사용 가능한 LM Studio 엔드포인트가 없습니다: {e}\n\n해결 방법:\n1. LMSTUDIO_ENDPOINTS에 지정한 서버가 실행 중인지 확인하세요\n2. 동시 요청이 많다면 LMSTUDIO_ENDPOINT_CONCURRENCY를 늘리거나 서버를 추가하세요"
+    if isinstance(e, requests.exceptions.ReadTimeout):
+        return "[ERROR] LLM 요청 실패 (LM Studio): 응답이 5분 내에 오지 않았습니다.\n해결 방법:\n1. LM Studio에서 더 빠른 모델 사용 (7B 이하 권장)\n2. GPU 가속이 활성화되어 있는지 확인\n3. max_tokens를 512 이하로 줄이기\n4. 프롬프트 길이 단축\n5. PC 사양 업그레이드 고려"
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return f"[ERROR] LM Studio 연결 실패: {e}\n\n해결 방법:\n1. LM Studio가 실행 중인지 확인하세요\n2. LM Studio에서 모델이 로드되어 있는지 확인하세요\n3. LM Studio가 LMSTUDIO_ENDPOINTS(기본: 포트 1234)에서 실행 중인지 확인하세요\n4. 또는 환경변수 LLM_MODE=openai로 설정하여 OpenAI API를 사용하세요"
+    if isinstance(e, requests.exceptions.HTTPError):
+        if e.response is not None and e.response.status_code == 400:
+            try:
+                error_detail = e.response.json()
+            except ValueError:
+                error_detail = e
+            return f"[ERROR] LM Studio 400 오류: {error_detail}\n\n해결 방법:\n1. LM Studio에서 모델이 제대로 로드되었는지 확인\n2. 프롬프트 길이를 줄여보세요\n3. max_tokens를 512 이하로 줄여보세요\n4. LM Studio 서버를 재시작해보세요"
+        return f"[ERROR] LM Studio HTTP 오류: {e}"
+    return f"[ERROR] LLM 요청 실패 (LM Studio): {e}\n(응답 내용: {getattr(e, 'response', None)})"
+
+LLM_BACKENDS = {
+    "lmstudio": call_lmstudio,
+    "openai": call_openai,
+    "local": call_local,
+}
+
+def request_llm(prompt: str, mode: str = None, max_tokens: int = 2048, system: str = None,
+                model: str = None) -> str:  # 1024 → 2048로 증가
+    # mode: 'openai', 'lmstudio' or 'local' (기본: 환경변수 LLM_MODE, 없으면 openai)
+    # system: 요청 간 동일한 지시 접두부 (백엔드 프롬프트 캐시 재사용 대상)
+    # model: 라우팅으로 선택된 모델 (없으면 LM Studio 로드 모델 / gpt-3.5-turbo)
     mode = mode or os.getenv("LLM_MODE", "openai").lower()
-    print(f"[LOG] LLM Mode: {mode}")
+    logger.debug("LLM request", extra={"mode": mode, "prompt_chars": len(prompt)})
+    messages = build_messages(prompt, system)
     if mode == "lmstudio":
-        url = "http://localhost:1234/v1/chat/completions"
         # 프롬프트 길이 제한 (토큰 기반으로 계산)
         # 대략적으로 1토큰 = 4글자로 계산하여 3500 토큰 이하로 제한
-        estimated_tokens = len(prompt) // 4
+        estimated_tokens = sum(len(message["content"]) for message in messages) // 4
         if estimated_tokens > 3500:
             return f"[ERROR] 프롬프트가 너무 깁니다. (예상 토큰: {estimated_tokens}, 제한: 3500)\n해결 방법:\n1. 코드를 더 작은 단위로 나누어 분석\n2. 불필요한 주석 제거\n3. LM Studio에서 더 큰 컨텍스트 모델 사용"
-        payload = {
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": 0.2,
-            "stream": False
-        }
-        try:
-            print(f"[LOG] Sending request to LM Studio: {url}")
-            print(f"[LOG] Payload: {payload}")
-            response = requests.post(url, json=payload, timeout=300)  # 5분으로 증가
-            print(f"[LOG] Response status: {response.status_code}")
-            response.raise_for_status()
-            data = response.json()
-            if 'choices' in data and data['choices']:
-                return data['choices'][0]['message']['content'].strip()
-            else:
-                return f"[ERROR] LLM 응답 포맷 오류: {data}"
-        except requests.exceptions.Timeout:
-            return "[ERROR] LLM 요청 실패 (LM Studio): 응답이 5분 내에 오지 않았습니다.\n해결 방법:\n1. LM Studio에서 더 빠른 모델 사용 (7B 이하 권장)\n2. GPU 가속이 활성화되어 있는지 확인\n3. max_tokens를 512 이하로 줄이기\n4. 프롬프트 길이 단축\n5. PC 사양 업그레이드 고려"
-        except requests.exceptions.ConnectionError as e:
-            return f"[ERROR] LM Studio 연결 실패: {e}\n\n해결 방법:\n1. LM Studio가 실행 중인지 확인하세요\n2. LM Studio에서 모델이 로드되어 있는지 확인하세요\n3. LM Studio가 포트 1234에서 실행 중인지 확인하세요\n4. 또는 환경변수 LLM_MODE=openai로 설정하여 OpenAI API를 사용하세요"
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 400:
-                try:
-                    error_detail = e.response.json()
-                    return f"[ERROR] LM Studio 400 오류: {error_detail}\n\n해결 방법:\n1. LM Studio에서 모델이 제대로 로드되었는지 확인\n2. 프롬프트 길이를 줄여보세요\n3. max_tokens를 512 이하로 줄여보세요\n4. LM Studio 서버를 재시작해보세요"
-                except:
-                    return f"[ERROR] LM Studio 400 오류: {e}\n\n해결 방법:\n1. LM Studio에서 모델이 제대로 로드되었는지 확인\n2. 프롬프트 길이를 줄여보세요\n3. max_tokens를 512 이하로 줄여보세요\n4. LM Studio 서버를 재시작해보세요"
-            else:
-                return f"[ERROR] LM Studio HTTP 오류: {e}"
-        except Exception as e:
-            return f"[ERROR] LLM 요청 실패 (LM Studio): {e}\n(응답 내용: {getattr(e, 'response', None)})"
-    else:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+    elif mode != "local":
+        mode = "openai"
+        if not os.getenv("OPENAI_API_KEY"):
             return "[ERROR] OPENAI_API_KEY 환경변수가 설정되어 있지 않습니다."
-        client = openai.OpenAI(api_key=api_key)
+
+    def call(backend: str) -> str:
+        # 라우팅된 모델은 주 백엔드에만 적용 (폴백/헤지 백엔드는 기본 모델)
+        started = time.perf_counter()
+        result = "error"
         try:
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=0.2,
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            return f"[ERROR] LLM 요청 실패 (OpenAI): {e}"
\ No newline at end of file
+            content = LLM_BACKENDS[backend](messages, max_tokens, model if backend == mode else None)
+            result = "success"
+            return content
+        except LLMCancelled:
+            result = "cancelled"
+            raise
+        finally:
+            llm_request_duration.observe(time.perf_counter() - started, backend=backend, result=result)
+
+    try:
+        check_cancelled()
+        return execute_with_policy(mode, call)
+    except LLMCancelled as e:
+        cancelled_llm_calls.inc(reason=e.reason)
+        logger.info("LLM request cancelled", extra={"reason": e.reason})
+        raise
+    except StaticFallback:
+        # LLM_FALLBACK=static: 호출한 엔드포인트가 정적 분석 결과만 반환하도록 그대로 전달
+        raise
+    except Exception as e:
+        return format_llm_error(mode, e)
@@ -0,0 +1,188 @@
+"""
+LLM 백엔드 워밍업 / 유휴 시 모델 유지 (콜드 스타트 대응)
+
+LM Studio는 한동안 요청이 없으면 모델을 내리거나 메모리에서 밀어내므로
+유휴 후 첫 리뷰가 크게 느려집니다.
+- 서버 시작 시 엔드포인트마다 짧은 완료 요청(max_tokens=1)을 보내 모델을 미리 로드
+- LLM_KEEPALIVE_SECONDS 동안 요청이 없던 엔드포인트에 같은 요청을 다시 보내 모델 유지
+- 엔드포인트별 준비 상태(cold/warming/ready)를 기록하고, 풀은 워밍업 중인 엔드포인트를 피함
+- 헬스 체크로 복구된(cold) 엔드포인트도 다음 점검 때 워밍업
+- 로컬 모델(LLM_MODE=local)은 LOCAL_LLM_WARMUP=true 일 때 같은 방식으로 준비 상태 추적
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import requests
+from metrics import REGISTRY
+from llm_pool import COLD, READY, WARMING, LLMEndpoint, get_lmstudio_pool
+from llm_local import get_local_llm, is_local_warmup_enabled
+
+WARMUP_MESSAGES = [{"role": "user", "content": "ping"}]
+
+logger = logging.getLogger(__name__)
+
+llm_warmups = REGISTRY.counter(
+    "llm_warmups_total", "백엔드 워밍업 요청 수 (시작/유휴/복구)와 결과", ("backend", "reason", "result"))
+
+def warmup_models() -> List[Optional[str]]:
+    """워밍업할 모델 (티어 모델이 지정되어 있으면 각각, 없으면 로드된 기본 모델)"""
+    models = [os.getenv("LMSTUDIO_SMALL_MODEL"), os.getenv("LMSTUDIO_LARGE_MODEL")]
+    configured = list(dict.fromkeys(model for model in models if model))
+    return configured or [None]
+
+class LLMLifecycle:
+    def __init__(self, keepalive_seconds: float = 300.0, warmup_timeout: float = 120.0):
+        self.keepalive_seconds = keepalive_seconds
+        self.warmup_timeout = warmup_timeout
+        self.local_state = COLD
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def check_interval(self) -> float:
+        """유휴/복구 점검 주기 (유지 간격의 1/4, 최대 30초)"""
+        return max(0.1, min(30.0, self.keepalive_seconds / 4))
+
+    # ------------------------------------------------------------------
+    # LM Studio 엔드포인트
+    # ------------------------------------------------------------------
+
+    def warm_endpoint(self, endpoint: LLMEndpoint, reason: str) -> bool:
+        """엔드포인트에 짧은 완료 요청을 보내 모델 로드 (풀 슬롯은 사용하지 않음)"""
+        pool = get_lmstudio_pool()
+        pool.set_warm_state(endpoint, WARMING)
+        connect_timeout = float(os.getenv("LMSTUDIO_CONNECT_TIMEOUT", "3"))
+        started = time.perf_counter()
+        try:
+            for model in warmup_models():
+                payload = {"messages": WARMUP_MESSAGES, "max_tokens": 1, "temperature": 0}
+                if model:
+                    payload["model"] = model
+                response = requests.post(endpoint.chat_url, json=payload,
+                                         timeout=(connect_timeout, self.warmup_timeout))
+                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            pool.set_warm_state(endpoint, COLD, time.perf_counter() - started)
+            llm_warmups.inc(backend="lmstudio", reason=reason, result="failure")
+            logger.warning("LLM warm-up failed", extra={"endpoint": endpoint.base_url, "reason": reason, "error": str(e)})
+            return False
+        elapsed = time.perf_counter() - started
+        pool.set_warm_state(endpoint, READY, elapsed)
+        llm_warmups.inc(backend="lmstudio", reason=reason, result="success")
+        logger.info("LLM warm-up finished", extra={"endpoint": endpoint.base_url, "reason": reason,
+                                                    "seconds": round(elapsed, 2)})
+        return True
+
+    def _warm_endpoints(self, targets: List[tuple]):
+        """(엔드포인트, 이유) 목록을 동시에 워밍업 (느린 서버가 다른 서버를 막지 않도록)"""
+        if not targets:
+            return
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="llm-warmup") as executor:
+            list(executor.map(lambda target: self.warm_endpoint(*target), targets))
+
+    def warm_all(self, reason: str = "startup"):
+        self._warm_endpoints([(endpoint, reason) for endpoint in get_lmstudio_pool().endpoints])
+
+    def due_endpoints(self, now: Optional[float] = None) -> List[tuple]:
+        """워밍업이 필요한 엔드포인트: 복구 후 cold 상태이거나 유지 간격 이상 유휴"""
+        now = time.monotonic() if now is None else now
+        due = []
+        for endpoint in get_lmstudio_pool().endpoints:
+            if not endpoint.is_available(now) or endpoint.outstanding > 0:
+                continue
+            if endpoint.warm_state == COLD:
+                due.append((endpoint, "cold"))
+            elif endpoint.warm_state == READY and now - endpoint.last_used >= self.keepalive_seconds:
+                due.append((endpoint, "idle"))
+        return due
+
+    def keep_alive(self):
+        self._warm_endpoints(self.due_endpoints())
+
+    # ------------------------------------------------------------------
+    # 로컬 모델
+    # ------------------------------------------------------------------
+
+    def warm_local(self) -> bool:
+        self.local_state = WARMING
+        try:
+            get_local_llm().warm_up()
+        except Exception as e:
+            self.local_state = COLD
+            llm_warmups.inc(backend="local", reason="startup", result="failure")
+            logger.warning("Local model warm-up failed", extra={"error": str(e)})
+            return False
+        self.local_state = READY
+        llm_warmups.inc(backend="local", reason="startup", result="success")
+        return True
+
+    # ------------------------------------------------------------------
+    # 실행 / 상태
+    # ------------------------------------------------------------------
+
+    def start(self, mode: str):
+        """백그라운드에서 시작 워밍업 후 유휴 점검 반복 (이미 실행 중이면 무시)"""
+        if self._thread and self._thread.is_alive():
+            return
+        if mode == "local":
+            if not is_local_warmup_enabled():
+                return
+            target = self.warm_local
+        elif mode == "lmstudio":
+            target = self._run_lmstudio
+        else:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, name="llm-lifecycle", daemon=True)
+        self._thread.start()
+
+    def _run_lmstudio(self):
+        if os.getenv("LLM_WARMUP", "true").lower() in ("1", "true", "yes"):
+            self.warm_all("startup")
+        if self.keepalive_seconds <= 0:
+            return
+        while not self._stop.wait(self.check_interval):
+            self.keep_alive()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_warming(self, backend: str) -> bool:
+        """백엔드 전체가 워밍업 중이라 지금 요청하면 모델 로드를 기다리게 되는지"""
+        if backend == "lmstudio":
+            return get_lmstudio_pool().all_warming()
+        if backend == "local":
+            return self.local_state == WARMING
+        return False
+
+    def status(self) -> Dict:
+        """백엔드별 준비 상태 (LM Studio는 엔드포인트 중 하나라도 ready면 ready, 상세는 풀 상태 참고)"""
+        states = {endpoint.warm_state for endpoint in get_lmstudio_pool().endpoints}
+        lmstudio = READY if READY in states else WARMING if WARMING in states else COLD
+        return {"lmstudio": lmstudio, "local": self.local_state, "keepalive_seconds": self.keepalive_seconds}
+
+_lifecycle: Optional[LLMLifecycle] = None
+_lifecycle_lock = threading.Lock()
+
+def get_lifecycle() -> LLMLifecycle:
+    """환경변수 설정으로 만든 워밍업/유지 관리자 (프로세스당 하나)"""
+    global _lifecycle
+    with _lifecycle_lock:
+        if _lifecycle is None:
+            _lifecycle = LLMLifecycle(
+                keepalive_seconds=float(os.getenv("LLM_KEEPALIVE_SECONDS", "300")),
+                warmup_timeout=float(os.getenv("LLM_WARMUP_TIMEOUT_SECONDS", "120")),
+            )
+        return _lifecycle
+
+def reset_lifecycle():
+    """관리자 재생성 (환경변수 변경 후 또는 테스트용)"""
+    global _lifecycle
+    with _lifecycle_lock:
+        if _lifecycle is not None:
+            _lifecycle.stop()
+        _lifecycle = None
@@ -0,0 +1,238 @@
+"""
+프로세스 내 CPU 추론 백엔드 (LLM_MODE=local)
+
+requirements.txt의 transformers/torch로 작은 코드 모델을 직접 실행합니다.
+외부 서비스 없이 동작하며 요청마다 HTTP/직렬화 비용이 없습니다.
+- 첫 요청 시 모델 로드 (transformers/torch import도 이때 수행)
+- 동시에 들어온 프롬프트를 짧은 대기 시간 안에 모아 한 번에 generate (동적 배칭)
+- 배치의 KV 캐시 크기(패딩 포함 배치 크기 x 토큰 수)를 LOCAL_LLM_MAX_BATCH_TOKENS 이하로 제한
+- LOCAL_LLM_WARMUP=true 이면 서버 시작 시 모델 로드 및 짧은 생성으로 준비
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+from metrics import REGISTRY, llm_queue_wait
+from llm_cancel import LLMCancelled, current_token
+
+DEFAULT_LOCAL_MODEL = "Qwen/Qwen2.5-Coder-0.5B-Instruct"
+
+logger = logging.getLogger(__name__)
+
+local_batches = REGISTRY.counter(
+    "local_llm_batches_total", "로컬 모델 generate 호출(배치) 수")
+local_batched_requests = REGISTRY.counter(
+    "local_llm_batched_requests_total", "배치로 처리된 로컬 모델 요청 수")
+local_generated_tokens = REGISTRY.counter(
+    "local_llm_generated_tokens_total", "로컬 모델이 생성한 토큰 수")
+# llm_client와 같은 백엔드별 토큰 카운터 (이름으로 같은 카운터를 공유)
+prompt_tokens_total = REGISTRY.counter(
+    "llm_prompt_tokens_total", "백엔드별 프롬프트 토큰 수", ("backend",))
+completion_tokens_total = REGISTRY.counter(
+    "llm_completion_tokens_total", "백엔드별 생성(출력) 토큰 수", ("backend",))
+
+class LocalBackendUnavailable(Exception):
+    """transformers/torch가 설치되지 않았거나 모델을 불러오지 못함"""
+
+class LocalPromptTooLong(Exception):
+    """프롬프트가 LOCAL_LLM_MAX_CONTEXT_TOKENS를 초과함"""
+
+class _PendingRequest:
+    def __init__(self, input_ids: List[int], max_new_tokens: int):
+        self.input_ids = input_ids
+        self.max_new_tokens = max_new_tokens
+        self.enqueued_at = time.monotonic()
+        self.future: Future = Future()
+        self.token = current_token()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token is not None and self.token.cancelled
+
+class LocalLLM:
+    def __init__(self, model_name: str, max_batch: int = 4, batch_wait_ms: float = 20,
+                 max_context_tokens: int = 4096, max_batch_tokens: int = 8192, threads: int = 0):
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self.max_context_tokens = max_context_tokens
+        self.max_batch_tokens = max_batch_tokens
+        self.threads = threads
+        self.model = None
+        self.tokenizer = None
+        self._torch = None
+        self._stopping_criteria = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._carry: Optional[_PendingRequest] = None  # KV 예산 초과로 다음 배치로 넘긴 요청
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self):
+        """모델/토크나이저 로드 (최초 1회)"""
+        with self._load_lock:
+            if self.model is not None:
+                return
+            try:
+                import torch
+                from transformers import AutoModelForCausalLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList
+            except ImportError as e:
+                raise LocalBackendUnavailable(f"transformers/torch를 불러올 수 없습니다: {e}")
+
+            started = time.perf_counter()
+            logger.info("Loading local model", extra={"model": self.model_name})
+            if self.threads:
+                torch.set_num_threads(self.threads)
+            try:
+                tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                model = AutoModelForCausalLM.from_pretrained(self.model_name, torch_dtype=torch.float32)
+            except Exception as e:
+                raise LocalBackendUnavailable(f"로컬 모델 로드 실패 ({self.model_name}): {e}")
+            # 배치 생성 시 프롬프트 끝이 맞도록 왼쪽 패딩
+            tokenizer.padding_side = "left"
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            model.eval()
+
+            class AllCancelled(StoppingCriteria):
+                """배치의 모든 요청이 취소되면 생성 중단"""
+                def __init__(self, pending: List[_PendingRequest]):
+                    self.pending = pending
+
+                def __call__(self, input_ids, scores, **kwargs) -> bool:
+                    return all(request.cancelled for request in self.pending)
+
+            self._torch = torch
+            self._stopping_criteria = lambda pending: StoppingCriteriaList([AllCancelled(pending)])
+            self.tokenizer = tokenizer
+            self.model = model
+            logger.info("Local model loaded", extra={"model": self.model_name,
+                                                     "seconds": round(time.perf_counter() - started, 1)})
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_batches, name="local-llm-batcher", daemon=True)
+            self._worker.start()
+
+    def generate(self, messages: list, max_tokens: int) -> str:
+        """채팅 메시지로 생성 (다른 요청과 배치로 묶여 실행될 수 있음)"""
+        self.load()
+        self._ensure_worker()
+
+        if getattr(self.tokenizer, "chat_template", None):
+            input_ids = self.tokenizer.apply_chat_template(messages, add_generation_prompt=True)
+        else:
+            input_ids = self.tokenizer.encode("\n\n".join(message["content"] for message in messages))
+        budget = self.max_context_tokens - len(input_ids)
+        if budget <= 0:
+            raise LocalPromptTooLong(
+                f"프롬프트가 너무 깁니다. (토큰: {len(input_ids)}, 제한: {self.max_context_tokens})")
+        request = _PendingRequest(input_ids, min(max_tokens, budget))
+        self._queue.put(request)
+
+        # 결과를 기다리는 동안 취소되면 배치에서 제외되도록 표시만 하고 즉시 반환
+        while True:
+            try:
+                return request.future.result(timeout=0.1)
+            except TimeoutError:
+                if request.cancelled:
+                    raise LLMCancelled(request.token.reason)
+
+    def _collect_batch(self) -> List[_PendingRequest]:
+        """첫 요청 후 batch_wait 동안 도착한 요청을 KV 예산 안에서 묶음"""
+        first, self._carry = self._carry or self._queue.get(), None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                candidate = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            longest_prompt = max(len(request.input_ids) for request in batch + [candidate])
+            longest_new = max(request.max_new_tokens for request in batch + [candidate])
+            if (len(batch) + 1) * (longest_prompt + longest_new) > self.max_batch_tokens:
+                # 예산 초과 요청은 다음 배치의 첫 요청으로
+                self._carry = candidate
+                break
+            batch.append(candidate)
+        return [request for request in batch if not request.cancelled]
+
+    def _run_batches(self):
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            started = time.monotonic()
+            for request in batch:
+                llm_queue_wait.observe(started - request.enqueued_at, backend="local")
+            try:
+                outputs = self._generate_batch(batch)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, text in zip(batch, outputs):
+                request.future.set_result(text)
+
+    def _generate_batch(self, batch: List[_PendingRequest]) -> List[str]:
+        torch = self._torch
+        encoded = self.tokenizer.pad({"input_ids": [request.input_ids for request in batch]},
+                                     return_tensors="pt")
+        max_new_tokens = max(request.max_new_tokens for request in batch)
+        with torch.inference_mode():
+            generated = self.model.generate(
+                **encoded,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=self.tokenizer.pad_token_id,
+                stopping_criteria=self._stopping_criteria(batch),
+            )
+        local_batches.inc()
+        local_batched_requests.inc(len(batch))
+
+        prompt_length = encoded["input_ids"].shape[1]
+        outputs = []
+        for request, sequence in zip(batch, generated):
+            new_tokens = sequence[prompt_length:prompt_length + request.max_new_tokens]
+            local_generated_tokens.inc(len(new_tokens))
+            prompt_tokens_total.inc(len(request.input_ids), backend="local")
+            completion_tokens_total.inc(len(new_tokens), backend="local")
+            outputs.append(self.tokenizer.decode(new_tokens, skip_special_tokens=True).strip())
+        return outputs
+
+    def warm_up(self):
+        """모델 로드 후 짧은 생성으로 첫 요청 지연 제거"""
+        started = time.perf_counter()
+        self.generate([{"role": "user", "content": "ping"}], max_tokens=1)
+        logger.info("Local model warm-up finished", extra={"seconds": round(time.perf_counter() - started, 1)})
+
+_local_llm: Optional[LocalLLM] = None
+_local_lock = threading.Lock()
+
+def get_local_llm() -> LocalLLM:
+    """환경변수 설정으로 만든 로컬 모델 백엔드 (프로세스당 하나, 모델은 첫 사용 시 로드)"""
+    global _local_llm
+    with _local_lock:
+        if _local_llm is None:
+            _local_llm = LocalLLM(
+                os.getenv("LOCAL_LLM_MODEL", DEFAULT_LOCAL_MODEL),
+                max_batch=int(os.getenv("LOCAL_LLM_MAX_BATCH", "4")),
+                batch_wait_ms=float(os.getenv("LOCAL_LLM_BATCH_WAIT_MS", "20")),
+                max_context_tokens=int(os.getenv("LOCAL_LLM_MAX_CONTEXT_TOKENS", "4096")),
+                max_batch_tokens=int(os.getenv("LOCAL_LLM_MAX_BATCH_TOKENS", "8192")),
+                threads=int(os.getenv("LOCAL_LLM_THREADS", "0")),
+            )
+        return _local_llm
+
+def is_local_warmup_enabled() -> bool:
+    return os.getenv("LOCAL_LLM_WARMUP", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,32 @@
+"""
+LLM 응답 파싱 유틸리티
+
+모델이 요청한 JSON 외에 설명 문장이나 코드 펜스를 덧붙이는 경우가 많으므로
+응답에서 첫 번째 JSON 값을 찾아 파싱합니다.
+"""
+
+import json
+import re
+from typing import Any, Optional
+
+FENCED_JSON_PATTERN = re.compile(r'```(?:json)?\s*\n(.*?)```', re.DOTALL)
+
+def extract_json(text: str) -> Optional[Any]:
+    """응답 텍스트에서 JSON 객체/배열 추출 (실패 시 None)"""
+    if not text:
+        return None
+
+    candidates = [match.group(1) for match in FENCED_JSON_PATTERN.finditer(text)]
+    candidates.append(text)
+
+    decoder = json.JSONDecoder()
+    for candidate in candidates:
+        for index, char in enumerate(candidate):
+            if char not in '{[':
+                continue
+            try:
+                value, _ = decoder.raw_decode(candidate, index)
+                return value
+            except json.JSONDecodeError:
+                continue
+    return None
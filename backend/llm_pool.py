@@ -0,0 +1,248 @@
+"""
+LM Studio(OpenAI 호환) 엔드포인트 풀
+
+여러 추론 서버에 요청을 분산합니다.
+- 진행 중 요청이 가장 적은 엔드포인트 선택 (least outstanding requests)
+- 엔드포인트별 동시 요청 수 제한 (모두 가득 차면 빈 슬롯이 생길 때까지 대기)
+- 연속 실패 시 일정 시간 제외(ejection) 후 다시 시도
+- /v1/models 헬스 체크로 상태 갱신
+- 워밍업 중인 엔드포인트는 다른 엔드포인트가 있으면 피함 (llm_lifecycle)
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import requests
+from metrics import REGISTRY, llm_queue_wait
+from llm_cancel import check_cancelled
+
+DEFAULT_ENDPOINT = "http://localhost:1234"
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트 준비 상태 (모델 로드 여부)
+COLD = "cold"        # 아직 워밍업 전이거나 워밍업/요청 실패
+WARMING = "warming"  # 워밍업 요청 진행 중 (모델 로드 중일 수 있음)
+READY = "ready"      # 최근 워밍업 또는 요청 성공
+
+endpoint_requests = REGISTRY.counter(
+    "llm_endpoint_requests_total", "엔드포인트별 요청 수와 결과", ("endpoint", "result"))
+endpoint_ejections = REGISTRY.counter(
+    "llm_endpoint_ejections_total", "연속 실패로 제외된 횟수", ("endpoint",))
+
+class NoEndpointAvailable(Exception):
+    """사용 가능한 엔드포인트가 없거나 대기 시간 내에 슬롯을 얻지 못함"""
+
+class LLMEndpoint:
+    def __init__(self, base_url: str, max_concurrency: int):
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.healthy = True
+        self.warm_state = COLD
+        self.last_used = 0.0  # 마지막 요청/워밍업 완료 시각 (time.monotonic)
+        self.last_warmup_seconds: Optional[float] = None
+
+    @property
+    def chat_url(self) -> str:
+        return f"{self.base_url}/v1/chat/completions"
+
+    @property
+    def models_url(self) -> str:
+        return f"{self.base_url}/v1/models"
+
+    def is_available(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until
+
+    def status(self, now: float) -> Dict:
+        return {
+            "endpoint": self.base_url,
+            "available": self.is_available(now),
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "max_concurrency": self.max_concurrency,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected_for": max(0.0, round(self.ejected_until - now, 1)),
+            "warm_state": self.warm_state,
+            "idle_for": round(now - self.last_used, 1) if self.last_used else None,
+            "last_warmup_seconds": self.last_warmup_seconds,
+        }
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    """엔드포인트 자체의 장애인지 판단 (4xx는 요청 문제이므로 제외하지 않음)"""
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError):
+        response = getattr(exc, 'response', None)
+        return response is None or response.status_code >= 500
+    return False
+
+class EndpointPool:
+    def __init__(self, base_urls: List[str], max_concurrency: int = 4, failure_threshold: int = 3,
+                 ejection_seconds: float = 30.0, probe_timeout: float = 2.0):
+        if not base_urls:
+            raise ValueError("엔드포인트가 하나 이상 필요합니다")
+        self.endpoints = [LLMEndpoint(url, max_concurrency) for url in base_urls]
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self.probe_timeout = probe_timeout
+        self._condition = threading.Condition()
+        self._probe_thread: Optional[threading.Thread] = None
+        self._stop_probe = threading.Event()
+
+    def _select(self, now: float) -> Optional[LLMEndpoint]:
+        candidates = [
+            endpoint for endpoint in self.endpoints
+            if endpoint.is_available(now) and endpoint.outstanding < endpoint.max_concurrency
+        ]
+        if not candidates:
+            return None
+        # 워밍업 중인 엔드포인트는 후순위, 부하 비율이 같으면 앞쪽 엔드포인트 우선
+        return min(candidates, key=lambda endpoint: (endpoint.warm_state == WARMING,
+                                                     endpoint.outstanding / endpoint.max_concurrency))
+
+    def acquire(self, timeout: float = 60.0) -> LLMEndpoint:
+        """가장 한가한 엔드포인트의 슬롯 확보 (모두 사용 중이면 대기)"""
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                endpoint = self._select(now)
+                if endpoint is not None:
+                    endpoint.outstanding += 1
+                    llm_queue_wait.observe(now - started, backend="lmstudio")
+                    return endpoint
+                if not any(endpoint.is_available(now) for endpoint in self.endpoints):
+                    raise NoEndpointAvailable("모든 엔드포인트가 제외되었거나 헬스 체크에 실패했습니다")
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise NoEndpointAvailable(f"{timeout:.0f}초 내에 사용 가능한 슬롯이 없습니다")
+                # 대기 중 요청이 취소되면 슬롯을 기다리지 않음
+                check_cancelled()
+                self._condition.wait(min(remaining, 0.5))
+
+    def release(self, endpoint: LLMEndpoint, success: bool):
+        """슬롯 반환과 실패 누적 (임계값 도달 시 제외)"""
+        with self._condition:
+            endpoint.outstanding -= 1
+            endpoint.last_used = time.monotonic()
+            if success:
+                endpoint.consecutive_failures = 0
+                endpoint.warm_state = READY
+            else:
+                endpoint.warm_state = COLD
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.failure_threshold:
+                    endpoint.ejected_until = time.monotonic() + self.ejection_seconds
+                    endpoint.consecutive_failures = 0
+                    endpoint_ejections.inc(endpoint=endpoint.base_url)
+                    logger.warning("LLM endpoint ejected", extra={"endpoint": endpoint.base_url,
+                                                                  "seconds": self.ejection_seconds})
+            self._condition.notify_all()
+        endpoint_requests.inc(endpoint=endpoint.base_url, result="success" if success else "failure")
+
+    @contextmanager
+    def lease(self, timeout: float = 60.0) -> Iterator[LLMEndpoint]:
+        """with 블록 동안 엔드포인트 슬롯 점유 (엔드포인트 장애로 인한 예외만 실패로 기록)"""
+        endpoint = self.acquire(timeout)
+        try:
+            yield endpoint
+        except BaseException as exc:
+            self.release(endpoint, success=not is_endpoint_failure(exc))
+            raise
+        else:
+            self.release(endpoint, success=True)
+
+    def set_warm_state(self, endpoint: LLMEndpoint, state: str, seconds: Optional[float] = None):
+        """워밍업 진행/결과 기록 (llm_lifecycle에서 호출)"""
+        with self._condition:
+            endpoint.warm_state = state
+            if state != WARMING:
+                endpoint.last_used = time.monotonic()
+            if seconds is not None:
+                endpoint.last_warmup_seconds = round(seconds, 2)
+            self._condition.notify_all()
+
+    def all_warming(self) -> bool:
+        """사용 가능한 엔드포인트가 모두 워밍업 중인지"""
+        now = time.monotonic()
+        with self._condition:
+            available = [endpoint for endpoint in self.endpoints if endpoint.is_available(now)]
+            return bool(available) and all(endpoint.warm_state == WARMING for endpoint in available)
+
+    def probe(self):
+        """모든 엔드포인트에 /v1/models 요청으로 상태 갱신 (제외 시간은 건드리지 않음)
+
+        /v1/models는 모델 목록만 돌려주므로 응답해도 추론 요청이 성공한다는 보장이 없습니다.
+        연속 실패로 제외된 엔드포인트는 ejected_until이 지나야 다시 사용합니다.
+        """
+        for endpoint in self.endpoints:
+            try:
+                response = requests.get(endpoint.models_url, timeout=self.probe_timeout)
+                healthy = response.status_code < 500
+            except requests.exceptions.RequestException:
+                healthy = False
+            with self._condition:
+                if healthy and not endpoint.healthy:
+                    logger.info("LLM endpoint recovered", extra={"endpoint": endpoint.base_url})
+                elif not healthy and endpoint.healthy:
+                    logger.warning("LLM endpoint health check failed", extra={"endpoint": endpoint.base_url})
+                endpoint.healthy = healthy
+                self._condition.notify_all()
+
+    def start_health_probe(self, interval: float = 15.0):
+        """백그라운드 헬스 체크 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._probe_thread and self._probe_thread.is_alive():
+            return
+
+        def run():
+            while not self._stop_probe.is_set():
+                self.probe()
+                self._stop_probe.wait(interval)
+
+        self._stop_probe.clear()
+        self._probe_thread = threading.Thread(target=run, name="llm-endpoint-probe", daemon=True)
+        self._probe_thread.start()
+
+    def stop_health_probe(self):
+        self._stop_probe.set()
+
+    def status(self) -> List[Dict]:
+        now = time.monotonic()
+        with self._condition:
+            return [endpoint.status(now) for endpoint in self.endpoints]
+
+_lmstudio_pool: Optional[EndpointPool] = None
+_pool_lock = threading.Lock()
+
+def endpoints_from_env() -> List[str]:
+    """LMSTUDIO_ENDPOINTS (쉼표 구분 base URL), 미설정 시 localhost:1234"""
+    raw = os.getenv("LMSTUDIO_ENDPOINTS", DEFAULT_ENDPOINT)
+    return [url.strip() for url in raw.split(',') if url.strip()] or [DEFAULT_ENDPOINT]
+
+def get_lmstudio_pool() -> EndpointPool:
+    """환경변수 설정으로 만든 LM Studio 엔드포인트 풀 (프로세스당 하나)"""
+    global _lmstudio_pool
+    with _pool_lock:
+        if _lmstudio_pool is None:
+            _lmstudio_pool = EndpointPool(
+                endpoints_from_env(),
+                max_concurrency=int(os.getenv("LMSTUDIO_ENDPOINT_CONCURRENCY", "4")),
+                failure_threshold=int(os.getenv("LMSTUDIO_EJECT_FAILURES", "3")),
+                ejection_seconds=float(os.getenv("LMSTUDIO_EJECT_SECONDS", "30")),
+            )
+        return _lmstudio_pool
+
+def reset_lmstudio_pool():
+    """풀 재생성 (환경변수 변경 후 또는 테스트용)"""
+    global _lmstudio_pool
+    with _pool_lock:
+        if _lmstudio_pool is not None:
+            _lmstudio_pool.stop_health_probe()
+        _lmstudio_pool = None
@@ -0,0 +1,286 @@
+"""
+LLM 백엔드 장애 대응 (서킷 브레이커, 재시도 백오프, 헤지 요청, 폴백)
+
+- 백엔드별 서킷 브레이커: 연속 실패 시 일정 시간 요청을 보내지 않고 즉시 실패
+- 일시적 오류(연결 실패, 5xx)는 지수 백오프 + 지터로 재시도
+- LLM_HEDGE_AFTER_SECONDS 이후에도 응답이 없으면 두 번째 백엔드로 동시 요청 (먼저 끝난 쪽을 쓰고 나머지는 취소)
+- LLM_FALLBACK 정책: lmstudio 장애 시 openai로 전환하거나 StaticFallback으로 정적 분석 결과만 반환하도록 알림
+  (주 백엔드가 모두 워밍업 중이면 폴백 백엔드를 먼저 사용)
+"""
+
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+import openai
+import requests
+from metrics import REGISTRY
+from llm_pool import NoEndpointAvailable, is_endpoint_failure
+from llm_cancel import CancelToken, LLMCancelled, cancellable_sleep, cancelled_llm_calls, current_token, set_current_token
+from llm_lifecycle import get_lifecycle
+
+logger = logging.getLogger(__name__)
+
+circuit_transitions = REGISTRY.counter(
+    "llm_circuit_transitions_total", "서킷 브레이커 상태 전환 수", ("backend", "state"))
+circuit_rejections = REGISTRY.counter(
+    "llm_circuit_rejections_total", "서킷이 열려 즉시 실패한 요청 수", ("backend",))
+llm_retries = REGISTRY.counter(
+    "llm_retries_total", "일시적 오류로 재시도한 횟수", ("backend",))
+hedged_requests = REGISTRY.counter(
+    "llm_hedged_requests_total", "지연 임계값 초과로 보낸 헤지 요청 수와 승자", ("backend", "winner"))
+fallback_requests = REGISTRY.counter(
+    "llm_fallback_requests_total", "주 백엔드 장애로 폴백한 요청 수", ("backend", "policy"))
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않음"""
+    def __init__(self, backend: str, retry_after: float):
+        super().__init__(f"{backend} 백엔드 일시 차단 중 ({retry_after:.0f}초 후 재시도)")
+        self.backend = backend
+        self.retry_after = retry_after
+
+class StaticFallback(Exception):
+    """LLM_FALLBACK=static: 주 백엔드 장애로 LLM 결과 없이 정적 분석 결과만 제공
+
+    LLM 응답 문자열과 구분되도록 예외로 전달하며, 엔드포인트는 result()로
+    llm_analysis=None과 llm_fallback/llm_notice 필드를 응답에 넣습니다.
+    """
+    def __init__(self, backend: str, cause: BaseException):
+        super().__init__(f"LLM 백엔드({backend})를 사용할 수 없어 정적 분석 결과만 제공합니다: {cause}")
+        self.backend = backend
+
+    def result(self, key: str = "llm_analysis") -> Dict[str, Optional[str]]:
+        """LLM 결과 필드(key)는 None, 폴백 여부와 안내 문구를 담은 응답 필드"""
+        return {key: None, "llm_fallback": "static", "llm_notice": str(self)}
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, backend: str, failure_threshold: int = 3, reset_seconds: float = 30.0):
+        self.backend = backend
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str):
+        self.state = state
+        circuit_transitions.inc(backend=self.backend, state=state)
+        logger.warning("LLM circuit state changed", extra={"backend": self.backend, "state": state})
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """요청 허용 여부 (열린 상태에서 대기 시간이 지나면 시험 요청 하나만 허용)"""
+        with self._lock:
+            if self.state == self.OPEN and self.retry_after() <= 0:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def release_trial(self):
+        """결과 없이 끝난 시험 요청(취소 등) 반환"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                if self.state != self.OPEN:
+                    self._transition(self.OPEN)
+
+    def status(self) -> Dict:
+        return {"backend": self.backend, "state": self.state, "failures": self.failures,
+                "retry_after": round(self.retry_after(), 1) if self.state == self.OPEN else 0.0}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+
+def get_breaker(backend: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if backend not in _breakers:
+            _breakers[backend] = CircuitBreaker(
+                backend,
+                failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURES", "3")),
+                reset_seconds=float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30")),
+            )
+        return _breakers[backend]
+
+def reset_breakers():
+    """서킷 브레이커 초기화 (환경변수 변경 후 또는 테스트용)"""
+    with _breakers_lock:
+        _breakers.clear()
+
+def breaker_status() -> list:
+    with _breakers_lock:
+        return [breaker.status() for breaker in _breakers.values()]
+
+def is_transient_error(exc: BaseException) -> bool:
+    """재시도/서킷/폴백 대상인 백엔드 장애인지 판단 (4xx, 응답 포맷 오류는 제외)"""
+    if isinstance(exc, (CircuitOpenError, NoEndpointAvailable)):
+        return True
+    if isinstance(exc, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    return is_endpoint_failure(exc)
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter"""
+    base = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+    cap = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def call_with_retries(backend: str, call: Callable[[str], str]) -> str:
+    """서킷 브레이커를 거쳐 호출하고 일시적 오류는 백오프 후 재시도"""
+    breaker = get_breaker(backend)
+    retries = int(os.getenv("LLM_RETRIES", "2"))
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            circuit_rejections.inc(backend=backend)
+            raise CircuitOpenError(backend, breaker.retry_after())
+        try:
+            result = call(backend)
+        except LLMCancelled:
+            breaker.release_trial()
+            raise
+        except Exception as exc:
+            if not is_transient_error(exc):
+                # 백엔드는 응답했으므로 장애로 보지 않음
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            # 응답 대기 시간 초과는 재시도해도 같은 시간을 다시 기다리게 되므로 제외
+            if attempt >= retries or isinstance(exc, (requests.exceptions.ReadTimeout, openai.APITimeoutError)):
+                raise
+            delay = backoff_delay(attempt)
+            llm_retries.inc(backend=backend)
+            logger.warning("LLM transient error, retrying", extra={"backend": backend, "attempt": attempt + 1,
+                                                                   "retries": retries, "delay": round(delay, 2),
+                                                                   "error": str(exc)})
+            cancellable_sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+    raise RuntimeError("unreachable")
+
+def fallback_backend(primary: str) -> Optional[str]:
+    """LLM_FALLBACK=openai이고 API 키가 있으면 openai로 폴백"""
+    if fallback_policy() == "openai" and primary != "openai" and os.getenv("OPENAI_API_KEY"):
+        return "openai"
+    return None
+
+def fallback_policy() -> str:
+    """none(기본) / openai / static"""
+    return os.getenv("LLM_FALLBACK", "none").lower()
+
+def hedge_backend(primary: str) -> Optional[str]:
+    """헤지 요청 대상 (LLM_HEDGE_BACKEND, 미설정 시 폴백 백엔드 또는 같은 백엔드의 다른 엔드포인트)"""
+    if float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0")) <= 0:
+        return None
+    return os.getenv("LLM_HEDGE_BACKEND") or fallback_backend(primary) or primary
+
+def _call_hedged(primary: str, secondary: str, call: Callable[[str], str]) -> str:
+    """주 백엔드 응답이 늦으면 두 번째 백엔드에도 요청하고 먼저 성공한 결과 사용
+
+    요청마다 별도 CancelToken으로 실행해 승자가 정해지면 남은 요청을 취소합니다.
+    (스트리밍 응답 연결을 닫아 진 쪽의 생성도 중단됨)
+    """
+    parent = current_token()
+    tokens = {}
+    unregisters = []
+
+    def submit(backend: str):
+        # 요청 자체가 취소되면(연결 종료/데드라인) 헤지 요청도 함께 취소
+        token = CancelToken(parent.deadline if parent is not None else None)
+        if parent is not None:
+            unregisters.append(parent.on_cancel(lambda: token.cancel(parent.reason)))
+        # 워커 스레드에서는 요청별 토큰을 현재 토큰으로 사용
+        context = contextvars.copy_context()
+        context.run(set_current_token, token)
+        future = _hedge_executor.submit(context.run, call_with_retries, backend, call)
+        tokens[future] = token
+        return future
+
+    futures = {submit(primary): primary}
+    try:
+        done, _ = wait(futures, timeout=float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0")))
+        if not done:
+            logger.info("LLM slow, hedging", extra={"backend": primary, "hedge_backend": secondary})
+            futures[submit(secondary)] = secondary
+
+        errors = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if len(futures) > 1:
+                        hedged_requests.inc(backend=secondary,
+                                            winner="hedge" if futures[future] != primary else "primary")
+                    return future.result()
+                errors[futures[future]] = future.exception()
+        raise errors.get(primary) or next(iter(errors.values()))
+    finally:
+        for future, token in tokens.items():
+            if not future.done():
+                token.cancel("hedge_lost")
+                cancelled_llm_calls.inc(reason="hedge_lost")
+        for unregister in unregisters:
+            unregister()
+
+def execute_with_policy(primary: str, call: Callable[[str], str]) -> str:
+    """서킷/재시도/헤지를 적용해 call(backend) 실행, 장애 시 LLM_FALLBACK 정책 적용"""
+    fallback = fallback_backend(primary)
+    if fallback and get_lifecycle().is_warming(primary):
+        # 모델 로드를 기다리는 대신 준비된 폴백 백엔드 사용
+        fallback_requests.inc(backend=fallback, policy="warming")
+        logger.info("LLM warming up, using fallback", extra={"backend": primary, "fallback": fallback})
+        try:
+            return call_with_retries(fallback, call)
+        except Exception as exc:
+            if not is_transient_error(exc):
+                raise
+    try:
+        secondary = hedge_backend(primary)
+        if secondary:
+            return _call_hedged(primary, secondary, call)
+        return call_with_retries(primary, call)
+    except Exception as exc:
+        if not is_transient_error(exc):
+            raise
+        if fallback:
+            fallback_requests.inc(backend=fallback, policy="openai")
+            logger.warning("LLM unavailable, falling back", extra={"backend": primary, "fallback": fallback,
+                                                                   "error": str(exc)})
+            try:
+                return call_with_retries(fallback, call)
+            except Exception:
+                raise exc
+        if fallback_policy() == "static":
+            fallback_requests.inc(backend=primary, policy="static")
+            raise StaticFallback(primary, exc) from exc
+        raise
@@ -0,0 +1,72 @@
+"""
+LLM 모델 라우팅 정책
+
+입력 크기와 요청 모드(fast/detailed)에 따라 작은 모델 또는 큰 모델을 고르고,
+입력 토큰 수와 요청한 응답 섹션 수로 max_tokens를 결정합니다.
+대화형 요청은 작은 모델로 빠르게 응답하고, 큰 모델은 필요한 경우에만 사용합니다.
+max_tokens 상한은 티어가 아니라 요청 모드로 정하므로, 입력이 짧아 작은 모델로 가는
+상세 분석 요청도 기존 request_llm과 같은 2048 토큰까지 응답할 수 있습니다.
+"""
+
+import os
+from typing import NamedTuple, Optional
+from metrics import REGISTRY
+
+class RouteDecision(NamedTuple):
+    mode: str             # 'openai', 'lmstudio', 'local'
+    tier: str             # 'small', 'large'
+    model: Optional[str]  # None이면 백엔드 기본 모델 (LM Studio에 로드된 모델)
+    max_tokens: int
+    reason: str
+
+# 모드별 티어 모델 (LM Studio는 미설정 시 로드된 모델 사용, local은 LOCAL_LLM_MODEL 하나만 사용)
+TIER_MODELS = {
+    'openai': {
+        'small': lambda: os.getenv("OPENAI_SMALL_MODEL", "gpt-3.5-turbo"),
+        'large': lambda: os.getenv("OPENAI_LARGE_MODEL", "gpt-3.5-turbo"),
+    },
+    'lmstudio': {
+        'small': lambda: os.getenv("LMSTUDIO_SMALL_MODEL"),
+        'large': lambda: os.getenv("LMSTUDIO_LARGE_MODEL"),
+    },
+}
+
+# 요청 모드별 max_tokens 상한 (기존 request_llm_fast=1024, request_llm=2048과 동일)
+MODE_MAX_TOKENS = {'fast': 1024, 'detailed': 2048}
+MIN_MAX_TOKENS = 256
+
+route_decisions = REGISTRY.counter(
+    "llm_route_decisions_total", "모드/티어별 라우팅 결정 수", ("mode", "tier"))
+
+def small_prompt_tokens() -> int:
+    """이 토큰 수 이하의 입력은 작은 모델로 라우팅"""
+    return int(os.getenv("LLM_ROUTE_SMALL_PROMPT_TOKENS", "1500"))
+
+def tokens_per_section() -> int:
+    """응답 섹션 하나당 예상 출력 토큰 수"""
+    return int(os.getenv("LLM_ROUTE_TOKENS_PER_SECTION", "256"))
+
+def route_request(prompt_chars: int, fast_mode: bool = False, mode: Optional[str] = None,
+                  sections: int = 4, max_tokens_cap: Optional[int] = None) -> RouteDecision:
+    """입력 크기/모드/섹션 수로 모델과 max_tokens 결정"""
+    mode = mode or os.getenv("LLM_MODE", "openai").lower()
+    input_tokens = prompt_chars // 4
+
+    if fast_mode:
+        tier, reason = 'small', "fast_mode"
+    elif input_tokens <= small_prompt_tokens():
+        tier, reason = 'small', f"입력 {input_tokens} 토큰 <= {small_prompt_tokens()}"
+    else:
+        tier, reason = 'large', f"입력 {input_tokens} 토큰 > {small_prompt_tokens()}"
+
+    # 섹션당 기본 분량 + 입력 크기에 비례한 여유분, 요청 모드 상한으로 제한
+    max_tokens = sections * tokens_per_section() + input_tokens // 4
+    max_tokens = max(MIN_MAX_TOKENS, min(max_tokens, MODE_MAX_TOKENS['fast' if fast_mode else 'detailed']))
+    if max_tokens_cap:
+        max_tokens = min(max_tokens, max_tokens_cap)
+
+    model_for_tier = TIER_MODELS.get(mode, {}).get(tier)
+    model = model_for_tier() if model_for_tier else None
+
+    route_decisions.inc(mode=mode, tier=tier)
+    return RouteDecision(mode, tier, model, max_tokens, reason)
@@ -0,0 +1,235 @@
+"""
+엔드투엔드 부하 테스트
+
+실행 중인 서버의 리뷰/분석 라우터(/api/review, /api/js, /api/enhanced-js)에 목표 동시성으로
+요청을 보내고 시나리오별 p50/p95/p99 지연, 처리량, 오류율을 보고합니다. 입력은 합성
+eXBuilder6 화면 스크립트(exb_corpus)를 씁니다.
+
+--start-servers를 주면 모의 LLM 서버(mock_llm_server)를 띄우고 LLM_MODE=lmstudio,
+LMSTUDIO_ENDPOINTS=모의 서버로 uvicorn을 실행한 뒤 측정하므로 실제 LM Studio 없이
+동시성/캐시/스케줄링 변경을 비교할 수 있습니다.
+
+    python backend/load_harness.py --start-servers --concurrency 16 --duration 60 --latency-ms 300 --tokens-per-second 40
+    python backend/load_harness.py --base-url http://localhost:8000 --scenarios js.analyze,enhanced.analyze --requests 500
+"""
+
+import itertools
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+import requests
+from exb_corpus import generate_screen_script, parse_size
+
+class Scenario(NamedTuple):
+    name: str
+    path: str
+    payload: Callable[[str], dict]  # 코드 → 요청 본문
+    weight: int = 1
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in [
+    Scenario("review.text", "/api/review/text", lambda code: {"code": code, "fast_mode": True}),
+    Scenario("js.analyze", "/api/js/analyze", lambda code: {"code": code}, weight=2),
+    Scenario("js.detailed", "/api/js/analyze/detailed", lambda code: {"code": code, "fast_mode": True}),
+    Scenario("enhanced.analyze", "/api/enhanced-js/analyze", lambda code: {"code": code}, weight=2),
+    Scenario("enhanced.detailed", "/api/enhanced-js/analyze/detailed",
+             lambda code: {"code": code, "fast_mode": True, "llm_output": "findings"}),
+]}
+
+class Sample(NamedTuple):
+    scenario: str
+    seconds: float
+    outcome: str  # ok | http_<status> | llm_error | timeout | connection | <예외 이름>
+
+def classify(response: requests.Response) -> str:
+    """HTTP 오류와 200 응답 안의 LLM 오류([ERROR] 메시지)를 구분"""
+    if response.status_code >= 400:
+        return f"http_{response.status_code}"
+    if "[ERROR]" in response.text:
+        return "llm_error"
+    return "ok"
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """nearest-rank 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def build_inputs(sizes: List[str], distinct: int, seed: int = 0) -> List[str]:
+    """크기별로 distinct개씩 서로 다른 입력 (캐시 적중을 줄이려면 distinct를 늘림)"""
+    return [generate_screen_script(parse_size(size), seed + index) for index in range(distinct) for size in sizes]
+
+def run_load(base_url: str, scenarios: List[Scenario], inputs: List[str], concurrency: int = 8,
+             duration: Optional[float] = 30.0, total_requests: Optional[int] = None, timeout: float = 300.0) -> Dict:
+    """concurrency개 작업자가 duration초 동안(또는 total_requests개까지) 가중치 순서대로 요청"""
+    schedule = [scenario for scenario in scenarios for _ in range(scenario.weight)]
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    counter = iter(range(total_requests)) if total_requests else itertools.count()
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    def next_index() -> Optional[int]:
+        with lock:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            return next(counter, None)
+
+    def worker():
+        session = requests.Session()
+        while True:
+            index = next_index()
+            if index is None:
+                return
+            scenario = schedule[index % len(schedule)]
+            code = inputs[index % len(inputs)]
+            request_started = time.perf_counter()
+            try:
+                response = session.post(base_url.rstrip("/") + scenario.path, json=scenario.payload(code), timeout=timeout)
+                outcome = classify(response)
+            except requests.exceptions.Timeout:
+                outcome = "timeout"
+            except requests.exceptions.ConnectionError:
+                outcome = "connection"
+            except Exception as e:
+                outcome = type(e).__name__
+            sample = Sample(scenario.name, time.perf_counter() - request_started, outcome)
+            with lock:
+                samples.append(sample)
+
+    workers = [threading.Thread(target=worker, name=f"load-{index}", daemon=True) for index in range(concurrency)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started, concurrency)
+
+def summarize(samples: List[Sample], elapsed: float, concurrency: int) -> Dict:
+    """시나리오별/전체 요청 수, 처리량, 오류 종류별 수, 성공 요청의 지연 백분위수(ms)"""
+    def stats(group: List[Sample]) -> Dict:
+        latencies = [sample.seconds * 1000 for sample in group if sample.outcome == "ok"]
+        errors: Dict[str, int] = {}
+        for sample in group:
+            if sample.outcome != "ok":
+                errors[sample.outcome] = errors.get(sample.outcome, 0) + 1
+        rounded = lambda value: round(value, 1) if value is not None else None
+        return {
+            "requests": len(group),
+            "ok": len(latencies),
+            "throughput_rps": round(len(group) / elapsed, 2) if elapsed > 0 else 0.0,
+            "error_rate": round(1 - len(latencies) / len(group), 4) if group else 0.0,
+            "errors": errors,
+            "p50_ms": rounded(percentile(latencies, 50)),
+            "p95_ms": rounded(percentile(latencies, 95)),
+            "p99_ms": rounded(percentile(latencies, 99)),
+            "max_ms": rounded(max(latencies) if latencies else None),
+        }
+
+    names = sorted({sample.scenario for sample in samples})
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "concurrency": concurrency,
+        "total": stats(samples),
+        "scenarios": {name: stats([sample for sample in samples if sample.scenario == name]) for name in names},
+    }
+
+def format_report(report: Dict) -> str:
+    header = f"{'scenario':<20} {'req':>6} {'rps':>8} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  errors"
+    lines = [f"동시성 {report['concurrency']}, {report['elapsed_seconds']}초", header, "-" * len(header)]
+    rows = list(report["scenarios"].items()) + [("total", report["total"])]
+    show = lambda value: "-" if value is None else f"{value:.1f}"
+    for name, row in rows:
+        lines.append(f"{name:<20} {row['requests']:>6} {row['throughput_rps']:>8.2f} {row['error_rate'] * 100:>5.1f}% "
+                     f"{show(row['p50_ms']):>9} {show(row['p95_ms']):>9} {show(row['p99_ms']):>9}  {row['errors'] or ''}")
+    return "\n".join(lines)
+
+# ============================================================================
+# 모의 LLM 서버 + 앱 서버 실행 (--start-servers)
+# ============================================================================
+
+def start_app_server(port: int, mock_url: str, extra_env: Optional[Dict[str, str]] = None,
+                     ready_timeout: float = 60.0) -> subprocess.Popen:
+    """모의 LLM 서버를 LM Studio 엔드포인트로 쓰는 uvicorn 프로세스 실행 (준비될 때까지 대기)"""
+    env = dict(os.environ, LLM_MODE="lmstudio", LMSTUDIO_ENDPOINTS=mock_url, LLM_WARMUP="false")
+    env.update(extra_env or {})
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+    deadline = time.monotonic() + ready_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"앱 서버가 종료되었습니다 (종료 코드 {process.returncode})")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/metrics", timeout=1)
+            return process
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"앱 서버가 {ready_timeout}초 안에 준비되지 않았습니다")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import json
+    from mock_llm_server import MockLLMConfig, MockLLMServer
+
+    defaults = MockLLMConfig()
+    parser = argparse.ArgumentParser(description="리뷰/분석 엔드포인트 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="측정할 서버 (--start-servers면 무시)")
+    parser.add_argument("--scenarios", help=f"쉼표로 구분 (기본: 전체 {','.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시에 요청하는 작업자 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간(초)")
+    parser.add_argument("--requests", type=int, help="총 요청 수 (지정하면 duration 대신 사용)")
+    parser.add_argument("--code-sizes", default="2k,4k,8k", help="입력 코드 크기 (쉼표로 구분)")
+    parser.add_argument("--distinct-inputs", type=int, default=4, help="크기별 서로 다른 입력 수")
+    parser.add_argument("--timeout", type=float, default=300.0, help="요청 하나의 시간 제한(초)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    mock = parser.add_argument_group("모의 서버 (--start-servers)")
+    mock.add_argument("--start-servers", action="store_true", help="모의 LLM 서버와 앱 서버를 띄워서 측정")
+    mock.add_argument("--app-port", type=int, default=8765)
+    mock.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    mock.add_argument("--latency-jitter-ms", type=float, default=defaults.latency_jitter_ms)
+    mock.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    mock.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens)
+    mock.add_argument("--failure-rate", type=float, default=defaults.failure_rate)
+    mock.add_argument("--parallel", type=int, default=defaults.parallel, help="모의 서버 동시 생성 슬롯 수")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+    inputs = build_inputs(args.code_sizes.split(","), args.distinct_inputs)
+
+    mock_server, app_process, base_url = None, None, args.base_url
+    if args.start_servers:
+        config = MockLLMConfig(args.latency_ms, args.latency_jitter_ms, args.tokens_per_second,
+                               args.completion_tokens, args.failure_rate, args.parallel, seed=0)
+        mock_server = MockLLMServer(config).start()
+        app_process = start_app_server(args.app_port, mock_server.url)
+        base_url = f"http://127.0.0.1:{args.app_port}"
+        print(f"모의 LLM 서버 {mock_server.url}, 앱 서버 {base_url}", flush=True)
+    try:
+        report = run_load(base_url, [SCENARIOS[name] for name in names], inputs, args.concurrency,
+                          None if args.requests else args.duration, args.requests, args.timeout)
+        if mock_server is not None:
+            report["mock_llm"] = mock_server.stats()
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            app_process.wait(timeout=10)
+        if mock_server is not None:
+            mock_server.stop()
+    print(format_report(report))
+    if "mock_llm" in report:
+        print(f"모의 LLM: {report['mock_llm']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
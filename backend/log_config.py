@@ -0,0 +1,126 @@
+"""
+구조화 로깅 설정 (JSON 레코드, 레벨 제한, 필드 길이 제한, 샘플링, 비동기 출력)
+
+각 모듈은 logging.getLogger(__name__)으로 로그를 남기고, 서버 시작 시 configure_logging()이
+루트 로거에 큐 핸들러를 붙입니다.
+- 요청 스레드는 레코드를 큐에 넣기만 하고, 포맷/stdout 출력은 별도 리스너 스레드에서 수행
+- LOG_LEVEL 미만의 로그는 logger.debug(...) 호출 시점에 바로 버려짐 (프롬프트 등 큰 값은
+  extra 필드로 넘겨 포맷 비용도 없음)
+- extra 필드의 긴 문자열은 LOG_MAX_FIELD_CHARS로 잘라서 출력
+- INFO 이하 로그는 LOG_SAMPLE_RATE 비율만 출력 (WARNING 이상은 항상 출력)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from typing import Any, Optional
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 필드)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+def truncate(value: Any, max_chars: int) -> Any:
+    """긴 문자열/컬렉션을 잘라 로그 한 줄 크기 제한"""
+    if isinstance(value, str):
+        if len(value) > max_chars:
+            return f"{value[:max_chars]}...(+{len(value) - max_chars} chars)"
+        return value
+    if isinstance(value, dict):
+        return {key: truncate(item, max_chars) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [truncate(item, max_chars) for item in value]
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return truncate(str(value), max_chars)
+
+class JsonFormatter(logging.Formatter):
+    """한 줄짜리 JSON 레코드 (ts, level, logger, message + extra 필드)"""
+
+    def __init__(self, max_field_chars: int = 2000):
+        super().__init__()
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": truncate(record.getMessage(), self.max_field_chars),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = truncate(value, self.max_field_chars)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽기 쉬운 한 줄 형식 ([LOG] 메시지 key=value ...)"""
+
+    def __init__(self, max_field_chars: int = 2000):
+        super().__init__()
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{key}={truncate(value, self.max_field_chars)}" for key, value in record.__dict__.items()
+                          if key not in _RECORD_ATTRIBUTES and not key.startswith("_"))
+        line = f"[{record.levelname}] {record.name}: {truncate(record.getMessage(), self.max_field_chars)}"
+        if fields:
+            line += f" {fields}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+class SamplingFilter(logging.Filter):
+    """INFO 이하 레코드를 sample_rate 비율로만 통과 (WARNING 이상은 항상 통과)"""
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.sample_rate >= 1 or random.random() < self.sample_rate
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """호출 스레드에서는 메시지 포맷 없이 레코드만 큐에 넣음 (포맷은 리스너 스레드에서)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            # traceback 객체는 다른 스레드로 넘기지 않고 문자열로 변환
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def configure_logging():
+    """루트 로거에 비동기 큐 핸들러 설정 (여러 번 호출해도 한 번만 적용)
+
+    LOG_LEVEL(INFO), LOG_FORMAT(json/text), LOG_MAX_FIELD_CHARS(2000), LOG_SAMPLE_RATE(1.0)
+    """
+    global _listener
+    if _listener is not None:
+        return
+    max_field_chars = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+    formatter_class = TextFormatter if os.getenv("LOG_FORMAT", "json").lower() == "text" else JsonFormatter
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter_class(max_field_chars))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(float(os.getenv("LOG_SAMPLE_RATE", "1.0"))))
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -1,11 +1,34 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
 from review import router as review_router
 from js_analyzer import router as js_analyzer_router
 from enhanced_js_analyzer import router as enhanced_js_analyzer_router
+from jobs import router as jobs_router
+import os
+import yaml
+from metrics import REGISTRY, HTTPMetricsMiddleware
+from llm_pool import get_lmstudio_pool
+from llm_resilience import breaker_status
+from llm_cancel import CancellationMiddleware
+from llm_lifecycle import get_lifecycle
+from log_config import configure_logging
+from rule_profiler import get_rule_profiler
+from rule_registry import get_rule_registry, reload_rule_registry
+from memory_profiler import MemoryProfilingMiddleware, get_memory_profiler
+
+# 구조화 로그를 별도 스레드에서 stdout으로 출력 (LOG_LEVEL, LOG_FORMAT 등)
+configure_logging()
 
 app = FastAPI()
 
+# 클라이언트 연결 종료/X-Request-Timeout 초과 시 진행 중인 LLM 요청 취소
+app.add_middleware(CancellationMiddleware)
+# 요청 크기 제한(MAX_REQUEST_BYTES 또는 MEMORY_BUDGET_MB 기준)과 메모리 계측 헤더 (MEMORY_PROFILING)
+app.add_middleware(MemoryProfilingMiddleware)
+# 나중에 추가한 미들웨어가 바깥쪽이므로 CORS를 크기 제한보다 뒤에 추가해 413 응답에도 CORS 헤더를 붙임
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -13,7 +36,97 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 엔드포인트(라우트 경로)별 요청 처리 시간 히스토그램 (가장 바깥에서 측정)
+app.add_middleware(HTTPMetricsMiddleware)
 
 app.include_router(review_router, prefix="/api/review")
 app.include_router(js_analyzer_router, prefix="/api/js")
-app.include_router(enhanced_js_analyzer_router, prefix="/api/enhanced-js")
\ No newline at end of file
+app.include_router(enhanced_js_analyzer_router, prefix="/api/enhanced-js")
+app.include_router(jobs_router, prefix="/api/jobs")
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """LLM 요청 수, 프롬프트 캐시 적중 토큰 등 내부 메트릭 조회"""
+    return REGISTRY.snapshot()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Prometheus 스크레이프용 텍스트 형식 메트릭 (단계별 지연 시간 히스토그램 포함)"""
+    return PlainTextResponse(REGISTRY.render_text(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+async def start_llm_endpoint_probe():
+    """LM Studio 모드에서 엔드포인트 헬스 체크 시작"""
+    if os.getenv("LLM_MODE", "openai").lower() == "lmstudio":
+        get_lmstudio_pool().start_health_probe(float(os.getenv("LMSTUDIO_PROBE_INTERVAL", "15")))
+
+@app.on_event("startup")
+async def start_llm_lifecycle():
+    """백그라운드에서 LLM 모델 워밍업 및 유휴 시 모델 유지 (LM Studio, LOCAL_LLM_WARMUP=true인 로컬 모델)"""
+    get_lifecycle().start(os.getenv("LLM_MODE", "openai").lower())
+
+@app.on_event("shutdown")
+async def stop_llm_lifecycle():
+    get_lifecycle().stop()
+    get_lmstudio_pool().stop_health_probe()
+
+@app.get("/api/llm/endpoints")
+async def get_llm_endpoints():
+    """LM Studio 엔드포인트별 진행 중 요청 수, 헬스/제외/워밍업 상태와 백엔드별 서킷, 준비 상태 조회"""
+    return {"endpoints": get_lmstudio_pool().status(), "circuits": breaker_status(),
+            "readiness": get_lifecycle().status()}
+
+class RuleProfileToggle(BaseModel):
+    enabled: bool
+
+@app.get("/api/admin/rule-profile")
+async def get_rule_profile(limit: Optional[int] = None, analyzer: Optional[str] = None):
+    """오류 패턴 규칙별 누적 시간/검출 수/검사 바이트 (누적 시간이 큰 순서, analyzer: enhanced | basic)"""
+    profiler = get_rule_profiler()
+    return {"enabled": profiler.enabled, "rules": profiler.report(limit, analyzer)}
+
+@app.post("/api/admin/rule-profile")
+async def set_rule_profile(request: RuleProfileToggle):
+    """규칙 프로파일링 켜기/끄기 (누적값은 유지)"""
+    get_rule_profiler().enabled = request.enabled
+    return {"enabled": request.enabled}
+
+@app.delete("/api/admin/rule-profile")
+async def reset_rule_profile():
+    """규칙 프로파일 누적값 초기화"""
+    get_rule_profiler().reset()
+    return {"reset": True}
+
+class MemoryProfileToggle(BaseModel):
+    enabled: bool
+
+@app.get("/api/admin/memory-profile")
+async def get_memory_profile(limit: Optional[int] = None):
+    """최근 계측 요청의 단계별 할당 최대치, 입력 바이트당 비용과 그로부터 계산한 요청 크기 제한"""
+    return get_memory_profiler().report(limit)
+
+@app.post("/api/admin/memory-profile")
+async def set_memory_profile(request: MemoryProfileToggle):
+    """메모리 계측 켜기/끄기 (기록은 유지)"""
+    get_memory_profiler().enabled = request.enabled
+    return {"enabled": request.enabled}
+
+@app.delete("/api/admin/memory-profile")
+async def reset_memory_profile():
+    """메모리 계측 기록과 측정된 바이트당 비용 초기화"""
+    get_memory_profiler().reset()
+    return {"reset": True}
+
+@app.get("/api/admin/rules")
+async def get_rules():
+    """향상된 분석기 규칙 팩, 프로필, 규칙 목록"""
+    return get_rule_registry().describe()
+
+@app.post("/api/admin/rules/reload")
+async def reload_rules():
+    """규칙 팩 파일을 다시 읽기 (오류가 있으면 400, 기존 규칙 유지)"""
+    try:
+        registry = reload_rule_registry()
+    except (ValueError, OSError, yaml.YAMLError) as e:
+        raise HTTPException(status_code=400, detail=f"규칙 팩 로드 실패: {e}")
+    return {"packs": registry.packs, "rules": len(registry.rules), "profiles": sorted(registry.profiles)}
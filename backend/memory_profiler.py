@@ -0,0 +1,344 @@
+"""
+요청별 메모리 계측과 요청 크기 제한
+
+MEMORY_PROFILING=true로 켜거나 POST /api/admin/memory-profile {"enabled": true}로 실행 중에 켜면
+분석 요청마다
+- 분석 단계(decode, syntax, api_validation, rules, flow 등)별 tracemalloc 할당 최대치/순증가량 (단계 시작 기준)
+- 단계 밖(요청 본문 파싱, 응답 모델 검증, 직렬화)의 할당 최대치 ("other", 앞 단계 결과를 포함한 요청 시작 기준)
+- 요청 중 RSS 최대치 (단계 경계마다 샘플링)
+를 기록해 응답 헤더(X-Memory-*)와 GET /api/admin/memory-profile로 보여줍니다.
+tracemalloc은 프로세스 전체 할당을 추적하므로 한 번에 한 요청만 계측하고(나머지는
+X-Memory-Profile: busy로 계측 없이 처리), 계측 중인 요청의 분석 단계는 순서대로 실행합니다.
+계측 중에는 할당 추적 비용 때문에 분석이 2~3배 느려집니다.
+
+요청 크기 제한: 본문이 MAX_REQUEST_BYTES(미설정 시 MEMORY_BUDGET_MB / 입력 바이트당 메모리 비용)보다
+크면 413으로 거절합니다. 바이트당 비용은 계측한 큰 요청(MIN_COST_SAMPLE_BYTES 이상)이
+MIN_COST_SAMPLES개 이상이면 그 p95를, 그 전에는 합성 코퍼스로 측정한 DEFAULT_BYTES_PER_INPUT_BYTE를 씁니다.
+"""
+
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+# /api/enhanced-js/analyze에 합성 코퍼스를 보냈을 때의 (tracemalloc 최대치 / 본문 바이트):
+# 256KB 35배, 512KB 27배, 1MB 18배 (기본 분석기 /api/js/analyze는 약 11.5배). 큰 입력 기준으로 여유를 둔 값
+# 요청 JSON 파싱, 분석 단계, AnalysisIssue 생성, 응답 직렬화 포함 (python backend/memory_profiler.py로 재측정)
+DEFAULT_BYTES_PER_INPUT_BYTE = 20.0
+# 고정 비용 비중이 큰 작은 요청은 바이트당 비용 표본에서 제외
+MIN_COST_SAMPLE_BYTES = 256 * 1024
+MIN_COST_SAMPLES = 20
+RECENT_PROFILES = 50
+
+PROFILE_HEADER = "x-memory-profile"
+
+# 본문을 미리 읽지 않는 메서드
+_BODYLESS_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_current_profile: contextvars.ContextVar[Optional["RequestMemoryProfile"]] = \
+    contextvars.ContextVar("memory_profile", default=None)
+
+def current_rss_bytes() -> Optional[int]:
+    """현재 프로세스 RSS (Linux /proc, 그 외에는 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def memory_budget_bytes() -> int:
+    """요청 하나가 쓸 수 있는 메모리 (MEMORY_BUDGET_MB, 기본 256 → 기본 비용으로 약 12.8MB까지 허용)"""
+    return int(float(os.getenv("MEMORY_BUDGET_MB", "256")) * 1024 * 1024)
+
+class RequestMemoryProfile:
+    """요청 하나의 단계별 할당 기록 (tracemalloc 추적 중에만 생성)"""
+
+    def __init__(self, method: str, path: str, body_bytes: int = 0):
+        self.method = method
+        self.path = path
+        self.body_bytes = body_bytes
+        self.phases: List[Dict] = []
+        self.started = time.perf_counter()
+        self.start_current = tracemalloc.get_traced_memory()[0]
+        self.peak = 0          # 요청 시작 대비 할당 최대치
+        self.other_peak = 0    # 단계 밖에서의 할당 최대치
+        self.rss_start = current_rss_bytes()
+        self.rss_peak = self.rss_start
+        self.seconds = 0.0
+        # 여러 스레드의 단계가 겹치면 reset_peak가 서로의 최대치를 지우므로 한 번에 한 단계만 기록
+        self._lock = threading.RLock()
+        tracemalloc.reset_peak()
+
+    def _observe(self, in_phase: bool) -> int:
+        """마지막 reset_peak 이후 최대치를 요청 최대치에 반영하고 반환 (요청 시작 기준)"""
+        peak = tracemalloc.get_traced_memory()[1] - self.start_current
+        self.peak = max(self.peak, peak)
+        if not in_phase:
+            self.other_peak = max(self.other_peak, peak)
+        rss = current_rss_bytes()
+        if rss is not None:
+            self.rss_peak = max(self.rss_peak or 0, rss)
+        return peak
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        with self._lock:
+            self._observe(in_phase=False)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                self._observe(in_phase=True)
+                self.phases.append({
+                    "phase": name,
+                    "peak_bytes": max(0, peak - before),
+                    "net_bytes": current - before,
+                    "seconds": round(time.perf_counter() - started, 6),
+                })
+                tracemalloc.reset_peak()
+
+    def finish(self):
+        with self._lock:
+            self._observe(in_phase=False)
+            self.seconds = time.perf_counter() - self.started
+
+    def to_dict(self) -> Dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "body_bytes": self.body_bytes,
+            "seconds": round(self.seconds, 6),
+            "peak_bytes": self.peak,
+            "other_peak_bytes": self.other_peak,
+            "rss_start_bytes": self.rss_start,
+            "rss_peak_bytes": self.rss_peak,
+            "bytes_per_input_byte": round(self.peak / self.body_bytes, 2) if self.body_bytes else None,
+            "phases": list(self.phases),
+        }
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        """응답 헤더 (스트리밍 응답은 첫 줄을 보낼 때까지의 값)"""
+        phases = ";".join(f"{phase['phase']}={phase['peak_bytes']}" for phase in self.phases)
+        values = [
+            ("x-memory-peak-bytes", str(self.peak)),
+            ("x-memory-phases", f"{phases};other={self.other_peak}" if phases else f"other={self.other_peak}"),
+        ]
+        if self.rss_peak is not None:
+            values.append(("x-memory-rss-peak-bytes", str(self.rss_peak)))
+        return [(PROFILE_HEADER.encode(), b"on")] + [(name.encode(), value.encode()) for name, value in values]
+
+class MemoryProfiler:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self._recent: Deque[Dict] = deque(maxlen=RECENT_PROFILES)
+        self._costs: Deque[float] = deque(maxlen=1000)
+        self._started_tracing = False
+
+    def begin(self, method: str, path: str, body_bytes: int) -> Optional[RequestMemoryProfile]:
+        """계측 시작 (다른 요청을 계측 중이면 None)"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        return RequestMemoryProfile(method, path, body_bytes)
+
+    def end(self, profile: RequestMemoryProfile):
+        try:
+            profile.finish()
+            result = profile.to_dict()
+            with self._lock:
+                self._recent.appendleft(result)
+                if profile.body_bytes >= MIN_COST_SAMPLE_BYTES:
+                    self._costs.append(profile.peak / profile.body_bytes)
+        finally:
+            if self._started_tracing:
+                tracemalloc.stop()
+            self._busy.release()
+
+    def measured_cost(self) -> Optional[float]:
+        """계측한 큰 요청들의 입력 바이트당 할당 최대치 p95 (표본이 부족하면 None)"""
+        with self._lock:
+            costs = sorted(self._costs)
+        if len(costs) < MIN_COST_SAMPLES:
+            return None
+        return costs[max(0, math.ceil(0.95 * len(costs)) - 1)]
+
+    def max_request_bytes(self) -> Tuple[int, str]:
+        """(본문 크기 제한, 근거: env | measured | default)"""
+        configured = os.getenv("MAX_REQUEST_BYTES")
+        if configured:
+            return int(configured), "env"
+        measured = self.measured_cost()
+        if measured is not None:
+            return int(memory_budget_bytes() / measured), "measured"
+        return int(memory_budget_bytes() / DEFAULT_BYTES_PER_INPUT_BYTE), "default"
+
+    def report(self, limit: Optional[int] = None) -> Dict:
+        with self._lock:
+            recent = list(self._recent)
+            samples = len(self._costs)
+        phases: Dict[str, Dict] = {}
+        for profile in recent:
+            for phase in profile["phases"] + [{"phase": "other", "peak_bytes": profile["other_peak_bytes"]}]:
+                stats = phases.setdefault(phase["phase"], {"count": 0, "total_peak_bytes": 0, "max_peak_bytes": 0})
+                stats["count"] += 1
+                stats["total_peak_bytes"] += phase["peak_bytes"]
+                stats["max_peak_bytes"] = max(stats["max_peak_bytes"], phase["peak_bytes"])
+        max_bytes, source = self.max_request_bytes()
+        return {
+            "enabled": self.enabled,
+            "memory_budget_bytes": memory_budget_bytes(),
+            "max_request_bytes": max_bytes,
+            "limit_source": source,
+            "bytes_per_input_byte": {"measured_p95": self.measured_cost(), "samples": samples,
+                                     "default": DEFAULT_BYTES_PER_INPUT_BYTE},
+            "phases": {name: {"count": stats["count"], "max_peak_bytes": stats["max_peak_bytes"],
+                              "avg_peak_bytes": stats["total_peak_bytes"] // stats["count"]}
+                       for name, stats in phases.items()},
+            "requests": recent[:limit] if limit else recent,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._costs.clear()
+
+_profiler = MemoryProfiler(os.getenv("MEMORY_PROFILING", "false").lower() in ("1", "true", "yes"))
+
+def get_memory_profiler() -> MemoryProfiler:
+    return _profiler
+
+def current_memory_profile() -> Optional[RequestMemoryProfile]:
+    return _current_profile.get()
+
+@contextmanager
+def memory_phase(phase: str, analyzer: Optional[str] = None) -> Iterator[None]:
+    """계측 중인 요청이면 블록의 할당을 단계로 기록 (아니면 아무것도 하지 않음)"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    with profile.phase(f"{analyzer}.{phase}" if analyzer else phase):
+        yield
+
+class MemoryProfilingMiddleware:
+    """요청 크기 제한(413)과 계측 중 요청의 단계별 메모리 헤더 추가 (ASGI 미들웨어)
+
+    Content-Length가 없거나(chunked) 실제 본문이 더 긴 요청도 거절할 수 있도록, 본문을 앱에 넘기기 전에
+    제한까지만 읽어 세고 읽은 메시지를 앱에 다시 전달합니다. (receive 안에서 예외를 던지면 FastAPI가
+    본문 파싱 오류로 보고 400을 반환하므로 앱 호출 전에 413을 보냄)
+    """
+
+    def __init__(self, app, profiler: Optional[MemoryProfiler] = None):
+        self.app = app
+        self.profiler = profiler or get_memory_profiler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes, source = self.profiler.max_request_bytes()
+        length = None
+        for name, value in scope.get("headers", []):
+            if name.lower() == b"content-length":
+                try:
+                    length = int(value)
+                except ValueError:
+                    pass
+        if length is not None and length > max_bytes:
+            await self._reject(send, length, max_bytes, source)
+            return
+
+        received = 0
+        buffered = deque()
+        if scope.get("method") not in _BODYLESS_METHODS:
+            while True:
+                message = await receive()
+                buffered.append(message)
+                if message["type"] != "http.request":
+                    break
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    await self._reject(send, received, max_bytes, source)
+                    return
+                if not message.get("more_body", False):
+                    break
+
+        async def buffered_receive():
+            if buffered:
+                return buffered.popleft()
+            return await receive()
+
+        profile = None
+        if self.profiler.enabled and scope.get("method") == "POST":
+            profile = self.profiler.begin(scope.get("method", ""), scope.get("path", ""), length or 0)
+
+        async def wrapped_send(message):
+            if message["type"] == "http.response.start":
+                if profile is not None:
+                    message = dict(message, headers=list(message.get("headers", [])) + profile.headers())
+                elif self.profiler.enabled and scope.get("method") == "POST":
+                    message = dict(message, headers=list(message.get("headers", [])) + [(PROFILE_HEADER.encode(), b"busy")])
+            await send(message)
+
+        context_token = _current_profile.set(profile)
+        try:
+            await self.app(scope, buffered_receive, wrapped_send)
+        finally:
+            _current_profile.reset(context_token)
+            if profile is not None:
+                if not profile.body_bytes:
+                    profile.body_bytes = received
+                self.profiler.end(profile)
+
+    @staticmethod
+    async def _reject(send, size: int, max_bytes: int, source: str):
+        body = json.dumps({"detail": f"요청 본문이 너무 큽니다 ({size:,} 바이트, 제한 {max_bytes:,} 바이트). "
+                                     f"코드를 나누어 분석하거나 MAX_REQUEST_BYTES/MEMORY_BUDGET_MB를 조정하세요.",
+                           "max_request_bytes": max_bytes, "limit_source": source}, ensure_ascii=False).encode()
+        await send({"type": "http.response.start", "status": 413,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from fastapi.testclient import TestClient
+    from exb_corpus import generate_screen_script, parse_size
+    from main import app
+    # 스크립트로 실행하면 이 모듈이 __main__이므로 미들웨어가 쓰는 모듈의 프로파일러를 사용
+    from memory_profiler import get_memory_profiler
+
+    parser = argparse.ArgumentParser(description="분석 요청의 단계별 메모리와 입력 바이트당 비용 측정")
+    parser.add_argument("--sizes", default="256k,512k,1m", help="합성 코퍼스 크기 (쉼표로 구분)")
+    parser.add_argument("--paths", default="/api/enhanced-js/analyze,/api/js/analyze")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("MAX_REQUEST_BYTES", str(1 << 40))
+    profiler = get_memory_profiler()
+    profiler.enabled = True
+    client = TestClient(app)
+    for path in args.paths.split(","):
+        for size in args.sizes.split(","):
+            response = client.post(path, json={"code": generate_screen_script(parse_size(size))})
+            profile = profiler.report(limit=1)["requests"][0]
+            phases = ", ".join(f"{phase['phase']}={phase['peak_bytes'] / 1024 / 1024:.1f}MB"
+                               for phase in profile["phases"])
+            print(f"{path:<28} {size:>4} status={response.status_code} peak={profile['peak_bytes'] / 1024 / 1024:.1f}MB "
+                  f"({profile['bytes_per_input_byte']}x) other={profile['other_peak_bytes'] / 1024 / 1024:.1f}MB "
+                  f"rss_peak={(profile['rss_peak_bytes'] or 0) / 1024 / 1024:.0f}MB [{phases}]", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+프로세스 내 메트릭 레지스트리
+
+라벨별 카운터/게이지/히스토그램을 스레드 안전하게 누적합니다.
+- GET /api/metrics: JSON 스냅샷
+- GET /metrics: Prometheus 텍스트 형식 (text/plain; version=0.0.4)
+- HTTPMetricsMiddleware: 엔드포인트(라우트 경로)별 요청 시간 히스토그램
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# 초 단위 기본 버킷 (정적 분석 ms 단위부터 LLM 생성 수 분까지)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """라벨 조합별 값 증가"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합 → [버킷별 개수(누적 아님) + 초과분, 합계, 개수]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """with 블록 실행 시간(초) 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Dict[Tuple[str, ...], Tuple[List[int], float, int]]:
+        """라벨 조합별 (누적 버킷 개수, 합계, 개수)"""
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        result = {}
+        for key, (counts, total, count) in snapshot.items():
+            cumulative, running = [], 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            result[key] = (cumulative, total, count)
+        return result
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            metric = self._metrics[name]
+        if not isinstance(metric, cls):
+            raise ValueError(f"메트릭 {name}은(는) 이미 {metric.type_name}로 등록되어 있습니다")
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """카운터 조회 (없으면 생성)"""
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        """게이지 조회 (없으면 생성)"""
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """히스토그램 조회 (없으면 생성)"""
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def snapshot(self) -> Dict[str, list]:
+        """JSON 직렬화 가능한 현재 값"""
+        result = {}
+        for name, metric in list(self._metrics.items()):
+            if isinstance(metric, Histogram):
+                result[name] = [
+                    {"labels": dict(zip(metric.labelnames, key)), "count": count, "sum": total,
+                     "buckets": dict(zip([str(bound) for bound in metric.buckets] + ["+Inf"], cumulative))}
+                    for key, (cumulative, total, count) in metric.samples().items()
+                ]
+            else:
+                result[name] = [
+                    {"labels": dict(zip(metric.labelnames, key)), "value": value}
+                    for key, value in metric.samples().items()
+                ]
+        return result
+
+    def render_text(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {_escape_help(metric.help_text)}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            if isinstance(metric, Histogram):
+                bounds = [_format_value(bound) for bound in metric.buckets] + ["+Inf"]
+                for key, (cumulative, total, count) in sorted(metric.samples().items()):
+                    labels = list(zip(metric.labelnames, key))
+                    for bound, bucket_count in zip(bounds, cumulative):
+                        lines.append(f"{name}_bucket{_format_labels(labels + [('le', bound)])} {bucket_count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+            else:
+                for key, value in sorted(metric.samples().items()):
+                    lines.append(f"{name}{_format_labels(list(zip(metric.labelnames, key)))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    escape = lambda value: value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+REGISTRY = MetricsRegistry()
+
+http_request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "엔드포인트별 요청 처리 시간", ("method", "path", "status"))
+http_requests_in_flight = REGISTRY.gauge(
+    "http_requests_in_flight", "처리 중인 요청 수")
+analyzer_phase_duration = REGISTRY.histogram(
+    "analyzer_phase_seconds", "분석 단계별 실행 시간 (토큰화, 규칙, API 검증, 흐름 분석, 직렬화 등)",
+    ("analyzer", "phase"))
+llm_queue_wait = REGISTRY.histogram(
+    "llm_queue_wait_seconds", "LLM 백엔드 슬롯/배치를 기다린 시간", ("backend",))
+
+class HTTPMetricsMiddleware:
+    """요청 처리 시간을 라우트 경로(/api/jobs/{job_id} 등) 기준으로 기록 (ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def wrapped_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            http_requests_in_flight.dec()
+            http_request_duration.observe(time.perf_counter() - started,
+                                          method=scope.get("method", ""), path=route_template(scope), status=status)
+
+def route_template(scope) -> str:
+    """라우팅이 끝난 scope에서 경로 파라미터를 이름으로 바꾼 경로 (/api/jobs/abc → /api/jobs/{job_id})
+
+    매칭되지 않은 경로(404 등)는 하나로 묶어 라벨 수를 제한합니다.
+    """
+    if "route" not in scope:
+        return "unmatched"
+    names = {str(value): name for name, value in (scope.get("path_params") or {}).items()}
+    return "/".join(f"{{{names[segment]}}}" if segment in names else segment
+                    for segment in scope.get("path", "").split("/"))
@@ -0,0 +1,249 @@
+"""
+OpenAI 호환 로컬 모의 LLM 서버 (부하 테스트용)
+
+실제 LM Studio 없이 리뷰/분석 엔드포인트에 부하를 주기 위해 /v1/chat/completions와
+/v1/models를 흉내 냅니다. 첫 토큰까지의 지연(latency), 초당 생성 토큰 수, 실패율,
+동시에 생성할 수 있는 슬롯 수(넘는 요청은 대기)를 조절할 수 있어 동시성/캐시/스케줄링
+변경을 오프라인에서 비교할 수 있습니다.
+
+응답 내용은 프롬프트 종류에 맞춰 만듭니다 (content를 주면 항상 그 내용).
+- 함수 일괄 분석(review_function_batch): 함수 이름을 키로 한 JSON 객체
+- findings 모드(enhanced_findings): JSON 배열
+- 그 외: 마크다운 분석 결과
+
+    python backend/mock_llm_server.py --port 1234 --latency-ms 300 --tokens-per-second 40 --failure-rate 0.05
+    (서버 쪽) LLM_MODE=lmstudio LMSTUDIO_ENDPOINTS=http://localhost:1234 uvicorn main:app
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, NamedTuple, Optional, Tuple
+
+MOCK_MODEL = "mock-llm"
+
+class MockLLMConfig(NamedTuple):
+    latency_ms: float = 200.0        # 요청 수신(슬롯 획득)부터 첫 토큰까지 (프롬프트 처리 시간)
+    latency_jitter_ms: float = 0.0   # latency_ms에 더하는 0 ~ jitter 사이의 임의 지연
+    tokens_per_second: float = 50.0  # 0 이하면 지연 없이 한 번에 생성
+    completion_tokens: int = 120     # 마크다운 응답의 토큰 수 (요청의 max_tokens로 제한)
+    failure_rate: float = 0.0        # 이 비율의 요청에 500 응답
+    parallel: int = 4                # 동시에 생성하는 요청 수 (넘는 요청은 슬롯을 기다림)
+    seed: Optional[int] = None
+    content: Optional[Tuple[str, ...]] = None  # 프롬프트와 상관없이 보낼 고정 응답 (스트리밍 단위 목록)
+    warmup_latency_ms: Optional[float] = None  # 워밍업 요청(max_tokens=1)의 첫 토큰 지연 (None이면 latency_ms)
+    send_usage: bool = True                    # False면 usage 없이 응답 (델타 수로 토큰을 세는 경로 확인용)
+
+_BATCH_HEADER = re.compile(r'다음 \d+개 함수를 분석하세요: (.+)')
+
+def _prompt_text(messages: List[dict]) -> str:
+    return "\n".join(str(message.get("content") or "") for message in messages)
+
+def estimate_tokens(text: str) -> int:
+    """대략 4글자 = 1토큰 (llm_client의 프롬프트 길이 추정과 같은 기준)"""
+    return max(1, len(text) // 4)
+
+def build_content(messages: List[dict], completion_tokens: int) -> List[str]:
+    """프롬프트 종류에 맞는 응답을 스트리밍 단위(토큰)로 나눈 목록"""
+    prompt = _prompt_text(messages)
+    batch = _BATCH_HEADER.search(prompt)
+    if batch:
+        names = [name.strip() for name in batch.group(1).split(",") if name.strip()]
+        result = {name: {"errors": [], "warnings": ["라인 1: 모의 경고"], "suggestions": [], "flow": ["모의 실행 흐름"]}
+                  for name in names}
+        return _split_tokens(json.dumps(result, ensure_ascii=False))
+    if "JSON 배열" in prompt:
+        findings = [{"line": 1, "severity": "low", "category": "performance", "message": "모의 분석 결과"}]
+        return _split_tokens(json.dumps(findings, ensure_ascii=False))
+    words = ["## 오류 지점\n", "- 라인 1: 모의 오류\n", "## 경고 지점\n", "## 개선 제안\n", "## 실행 흐름\n"]
+    filler = ["모의", "분석", "결과", "입니다.", "\n"]
+    return words + [f"{filler[index % len(filler)]} " for index in range(max(0, completion_tokens - len(words)))]
+
+def _split_tokens(text: str, size: int = 4) -> List[str]:
+    return [text[index:index + size] for index in range(0, len(text), size)] or [""]
+
+class MockLLMServer:
+    """백그라운드 스레드에서 실행되는 모의 서버 (start/stop, 요청 수 집계)"""
+
+    def __init__(self, config: MockLLMConfig = MockLLMConfig(), host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.requests = 0
+        self.failures = 0
+        self.max_waiting = 0
+        self.payloads: List[dict] = []          # 받은 완료 요청 본문 (테스트에서 워밍업 등 확인)
+        self.aborted = threading.Event()        # 생성 중 클라이언트가 연결을 끊으면 설정
+        self._waiting = 0
+        self._slots = threading.BoundedSemaphore(max(1, config.parallel))
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures, "max_waiting": self.max_waiting}
+
+    def _should_fail(self, payload: dict) -> bool:
+        with self._lock:
+            self.requests += 1
+            self.payloads.append(payload)
+            failed = self._random.random() < self.config.failure_rate
+            self.failures += failed
+            return failed
+
+    def _first_token_delay(self, payload: dict) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.config.latency_jitter_ms)
+        latency = self.config.latency_ms
+        if payload.get("max_tokens") == 1 and self.config.warmup_latency_ms is not None:
+            latency = self.config.warmup_latency_ms
+        return (latency + jitter) / 1000
+
+    def _acquire_slot(self):
+        with self._lock:
+            self._waiting += 1
+            self.max_waiting = max(self.max_waiting, self._waiting)
+        self._slots.acquire()
+        with self._lock:
+            self._waiting -= 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/v1/models":
+                    self._send_json(200, {"object": "list", "data": [{"id": MOCK_MODEL, "object": "model"}]})
+                else:
+                    self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+                    return
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "invalid JSON"}})
+                    return
+                if server._should_fail(payload):
+                    self._send_json(500, {"error": {"message": "mock failure"}})
+                    return
+                server._acquire_slot()
+                try:
+                    self._complete(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    server.aborted.set()  # 클라이언트가 취소해 연결을 닫음
+                finally:
+                    server._slots.release()
+
+            def _complete(self, payload: dict):
+                config = server.config
+                messages = payload.get("messages") or []
+                max_tokens = int(payload.get("max_tokens") or config.completion_tokens)
+                tokens = list(config.content or build_content(messages, min(config.completion_tokens, max_tokens)))
+                usage = {"prompt_tokens": estimate_tokens(_prompt_text(messages)), "completion_tokens": len(tokens)}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                model = payload.get("model") or MOCK_MODEL
+                time.sleep(server._first_token_delay(payload))
+                interval = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+
+                if not payload.get("stream"):
+                    time.sleep(interval * len(tokens))
+                    body = {"id": "mock", "object": "chat.completion", "model": model,
+                            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                                         "finish_reason": "stop"}]}
+                    if config.send_usage:
+                        body["usage"] = usage
+                    self._send_json(200, body)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, token in enumerate(tokens):
+                    if index and interval:
+                        time.sleep(interval)
+                    self._send_event({"id": "mock", "object": "chat.completion.chunk", "model": model,
+                                      "choices": [{"index": 0, "delta": {"content": token}}]})
+                final = {"id": "mock", "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                if config.send_usage:
+                    final["usage"] = usage
+                self._send_event(final)
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+            def _send_event(self, event: dict):
+                self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    defaults = MockLLMConfig()
+    parser = argparse.ArgumentParser(description="OpenAI 호환 모의 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="첫 토큰까지의 지연")
+    parser.add_argument("--latency-jitter-ms", type=float, default=defaults.latency_jitter_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens)
+    parser.add_argument("--failure-rate", type=float, default=defaults.failure_rate, help="500 응답 비율 (0~1)")
+    parser.add_argument("--parallel", type=int, default=defaults.parallel, help="동시 생성 슬롯 수")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    config = MockLLMConfig(args.latency_ms, args.latency_jitter_ms, args.tokens_per_second,
+                           args.completion_tokens, args.failure_rate, args.parallel, args.seed)
+    server = MockLLMServer(config, args.host, args.port).start()
+    print(f"모의 LLM 서버 실행 중: {server.url} ({config})", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"종료: {server.stats()}")
+
+if __name__ == "__main__":
+    main()
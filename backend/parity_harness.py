@@ -0,0 +1,272 @@
+"""
+기본 분석기(js_analyzer)와 향상된 분석기(enhanced_js_analyzer) 비교 하네스
+
+같은 코퍼스(파일/디렉토리의 .js 또는 합성 eXBuilder6 스크립트)에 두 엔진을 실행해 파일별 시간,
+처리량(줄/초)과 발견 사항 차이를 보고합니다. 두 엔진은 메시지 형식이 달라 그대로 비교할 수 없으므로
+(카테고리, 라인) 또는 API 항목은 (api, 메서드/속성 이름)으로 정규화해 비교합니다.
+기본 분석기만 찾은 항목이 향상된 분석기로 일원화할 때 잃게 되는 발견 사항입니다.
+
+기본 분석기의 check_errors는 라인 없이 메시지만 돌려주므로 같은 규칙을 다시 실행해 첫 매치 라인을 붙이고,
+카테고리는 향상된 분석기 규칙 팩(rule_registry)에 같은 메시지가 있으면 그 카테고리를, 없으면 키워드로 추정합니다.
+
+    python backend/parity_harness.py test_example.js src/
+    python backend/parity_harness.py --sizes 1k,10k,100k --json parity.json --fail-on-missing
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from exb_corpus import DEFAULT_SEED, format_size, generate_screen_script, parse_size
+
+DEFAULT_SIZES = ("1k", "10k", "100k")
+# 보고서에 카테고리별로 보여줄 누락 예시 수
+EXAMPLES_PER_CATEGORY = 3
+
+class Finding(NamedTuple):
+    """정규화된 발견 사항 (라인이 없는 API 항목은 subject에 메서드/속성 이름)"""
+    category: str
+    line: Optional[int]
+    subject: Optional[str] = None
+
+    def label(self) -> str:
+        return f"{self.category}:{self.subject}" if self.subject else f"{self.category}@{self.line}"
+
+# ============================================================================
+# 정규화
+# ============================================================================
+
+# 결과가 없을 때 기본 분석기가 넣는 안내 문구
+_BASIC_PLACEHOLDERS = {"JavaScript 문법에 문제없음", "eXBuilder6 API 사용에 문제없음", "발견된 오류 없음"}
+_BASIC_LINE = re.compile(r'^라인 (\d+)(?: 위치 \d+)?: (.+)$')
+_BASIC_API = re.compile(r'존재하지 않는 (?:메서드|속성): (\w+)$')
+_ENHANCED_API = re.compile(r"'(\w+)' 메서드가")
+_PARTIAL_PREFIX = "[부분 결과]"
+
+# 규칙 팩에 같은 메시지가 없는 기본 분석기 메시지의 카테고리 추정 (위에서부터 첫 매치)
+_KEYWORD_CATEGORIES = [
+    (re.compile(r'괄호|따옴표|정의가 완료|선언이 완료|리터럴이 완료'), 'syntax'),
+    (re.compile(r'세미콜론'), 'code_style'),
+    (re.compile(r'XSS|보안'), 'xss_security'),
+    (re.compile(r'^(JSON\.|isNaN|isFinite|parse)'), 'json_parsing'),
+    (re.compile(r'배열이 null|^Array\.'), 'array_operations'),
+    (re.compile(r'^(setTimeout|setInterval|clearTimeout|clearInterval|\w*AnimationFrame|\w*EventListener) '),
+     'memory_leaks'),
+    (re.compile(r'null일 수|null/undefined|^(getElement\w*|querySelector\w*) 호출시'), 'null_reference'),
+]
+
+def _message_categories() -> Dict[str, str]:
+    from rule_registry import get_rule_registry
+    return {rule.message: rule.category for rule in get_rule_registry().rules}
+
+def categorize(message: str, known: Optional[Dict[str, str]] = None) -> str:
+    """기본 분석기 메시지를 향상된 분석기의 카테고리 이름으로 변환 (추정 불가면 'other')"""
+    known = _message_categories() if known is None else known
+    if message in known:
+        return known[message]
+    for pattern, category in _KEYWORD_CATEGORIES:
+        if pattern.search(message):
+            return category
+    return 'other'
+
+def _first_match_lines(code: str) -> Dict[str, int]:
+    """check_errors 메시지별 첫 매치 라인 (같은 메시지의 규칙이 여럿이면 가장 앞선 매치)"""
+    from js_analyzer import CHECK_ERRORS_RULES
+    lines: Dict[str, int] = {}
+    for hit in CHECK_ERRORS_RULES.scan(code, first_only=True):
+        if hit.result.spans:
+            line = code.count('\n', 0, hit.result.spans[0][0]) + 1
+            lines[hit.rule.message] = min(line, lines.get(hit.rule.message, line))
+    return lines
+
+def normalize_basic(result: Dict[str, List[str]], code: str) -> Tuple[Set[Finding], int]:
+    """run_static_analysis 결과 → (정규화된 발견 사항, 부분 결과 수)"""
+    known = _message_categories()
+    findings: Set[Finding] = set()
+    partial = 0
+    for message in result.get("javascript_issues", []):
+        match = _BASIC_LINE.match(message)
+        if match:
+            findings.add(Finding(categorize(match.group(2), known), int(match.group(1))))
+    for message in result.get("exbuilder6_apis", []):
+        match = _BASIC_API.search(message)
+        # 속성 패턴이 메서드 호출을 역추적해 잘린 이름(addRow( → addRo)으로 보고한 항목은 제외
+        if match and not re.search(rf'\.{match.group(1)}\w+\(', code):
+            findings.add(Finding('api', None, match.group(1)))
+    errors = [message for message in result.get("errors", []) if message not in _BASIC_PLACEHOLDERS]
+    partial += sum(message.startswith(_PARTIAL_PREFIX) for message in errors)
+    lines = _first_match_lines(code) if errors else {}
+    for message in errors:
+        if not message.startswith(_PARTIAL_PREFIX):
+            findings.add(Finding(categorize(message, known), lines.get(message)))
+    return findings, partial
+
+def normalize_enhanced(result: Dict) -> Tuple[Set[Finding], int]:
+    """analyze_async 결과 → (정규화된 발견 사항, 부분 결과 수)"""
+    findings: Set[Finding] = set()
+    partial = 0
+    for key in ("syntax", "apis", "errors"):
+        for issue in result.get(key, []):
+            if issue.category == 'analysis_limits':
+                partial += 1
+            elif issue.category == 'api':
+                match = _ENHANCED_API.search(issue.message)
+                findings.add(Finding('api', None, match.group(1) if match else issue.message))
+            else:
+                findings.add(Finding(issue.category, issue.line_number))
+    return findings, partial
+
+# ============================================================================
+# 실행
+# ============================================================================
+
+def _timed(run, code: str, repeat: int):
+    """repeat회 실행 중 최소 시간과 마지막 결과"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run(code)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def _engine_summary(seconds: float, lines: int, findings: Set[Finding], partial: int) -> Dict:
+    return {
+        "seconds": round(seconds, 6),
+        "lines_per_second": round(lines / seconds, 1) if seconds > 0 else None,
+        "findings": len(findings),
+        "partial": partial,
+    }
+
+def _by_category(findings: Iterable[Finding]) -> Dict[str, int]:
+    return dict(sorted(Counter(finding.category for finding in findings).items()))
+
+def compare_file(name: str, code: str, repeat: int = 1) -> Dict:
+    """한 입력에 두 엔진을 실행해 시간/처리량/발견 사항 차이를 계산"""
+    from js_analyzer import run_static_analysis
+    from enhanced_js_analyzer import PerformanceOptimizedAnalyzer
+
+    analyzer = PerformanceOptimizedAnalyzer()
+    lines = code.count("\n") + 1
+    basic_seconds, basic_result = _timed(run_static_analysis, code, repeat)
+    enhanced_seconds, enhanced_result = _timed(lambda text: asyncio.run(analyzer.analyze_async(text)), code, repeat)
+    basic, basic_partial = normalize_basic(basic_result, code)
+    enhanced, enhanced_partial = normalize_enhanced(enhanced_result)
+
+    missing = sorted(basic - enhanced, key=lambda finding: (finding.category, finding.line or 0, finding.subject or ""))
+    examples: Dict[str, List[str]] = {}
+    for finding in missing:
+        labels = examples.setdefault(finding.category, [])
+        if len(labels) < EXAMPLES_PER_CATEGORY:
+            labels.append(finding.label())
+    return {
+        "file": name,
+        "lines": lines,
+        "basic": _engine_summary(basic_seconds, lines, basic, basic_partial),
+        "enhanced": _engine_summary(enhanced_seconds, lines, enhanced, enhanced_partial),
+        "speedup": round(basic_seconds / enhanced_seconds, 2) if enhanced_seconds > 0 else None,
+        "common": len(basic & enhanced),
+        "basic_only": _by_category(missing),
+        "enhanced_only": _by_category(enhanced - basic),
+        "basic_only_examples": examples,
+    }
+
+def load_corpus(paths: List[str]) -> List[Tuple[str, str]]:
+    """파일과 디렉토리(하위의 .js 전체)를 (이름, 코드) 목록으로"""
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(".js"))
+        else:
+            files.append(path)
+    corpus = []
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            corpus.append((path, f.read()))
+    return corpus
+
+def synthetic_corpus(sizes=DEFAULT_SIZES, seed: int = DEFAULT_SEED) -> List[Tuple[str, str]]:
+    return [(f"synthetic@{format_size(size)}", generate_screen_script(size, seed))
+            for size in (parse_size(str(size)) for size in sizes)]
+
+def run_parity(corpus: List[Tuple[str, str]], repeat: int = 1, on_result=None) -> Dict:
+    """코퍼스 전체 비교 {"files": [...], "totals": {...}}"""
+    files = []
+    for name, code in corpus:
+        result = compare_file(name, code, repeat)
+        files.append(result)
+        if on_result:
+            on_result(result)
+
+    totals = {"lines": sum(result["lines"] for result in files), "common": 0,
+              "basic_only": Counter(), "enhanced_only": Counter()}
+    for engine in ("basic", "enhanced"):
+        seconds = sum(result[engine]["seconds"] for result in files)
+        totals[engine] = {
+            "seconds": round(seconds, 6),
+            "lines_per_second": round(totals["lines"] / seconds, 1) if seconds > 0 else None,
+            "findings": sum(result[engine]["findings"] for result in files),
+        }
+    for result in files:
+        totals["common"] += result["common"]
+        totals["basic_only"].update(result["basic_only"])
+        totals["enhanced_only"].update(result["enhanced_only"])
+    totals["basic_only"] = dict(sorted(totals["basic_only"].items()))
+    totals["enhanced_only"] = dict(sorted(totals["enhanced_only"].items()))
+    return {"files": files, "totals": totals}
+
+# ============================================================================
+# 출력
+# ============================================================================
+
+def _categories(counts: Dict[str, int]) -> str:
+    return ", ".join(f"{category} {count}" for category, count in counts.items()) or "-"
+
+def format_file(result: Dict) -> str:
+    basic, enhanced = result["basic"], result["enhanced"]
+    lines = [
+        f"{result['file']} ({result['lines']:,}줄)",
+        f"  기본     {basic['seconds'] * 1000:>10.1f}ms {basic['lines_per_second'] or 0:>12,.0f}줄/s  발견 {basic['findings']}",
+        f"  향상     {enhanced['seconds'] * 1000:>10.1f}ms {enhanced['lines_per_second'] or 0:>12,.0f}줄/s  "
+        f"발견 {enhanced['findings']}  (x{result['speedup'] or 0:.2f})",
+        f"  공통 {result['common']}  기본만 {sum(result['basic_only'].values())}: {_categories(result['basic_only'])}",
+        f"  향상만 {sum(result['enhanced_only'].values())}: {_categories(result['enhanced_only'])}",
+    ]
+    for category, labels in result["basic_only_examples"].items():
+        lines.append(f"    누락 예시 [{category}] {', '.join(labels)}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="기본/향상된 JavaScript 분석기 비교 (시간, 처리량, 발견 사항 차이)")
+    parser.add_argument("paths", nargs="*", help=".js 파일 또는 디렉토리 (없으면 합성 코퍼스)")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help="합성 코퍼스 크기 (쉼표로 구분)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=1, help="파일별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--fail-on-missing", action="store_true",
+                        help="기본 분석기만 찾은 항목이 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    if args.paths:
+        corpus = load_corpus(args.paths)
+    else:
+        corpus = synthetic_corpus([size.strip() for size in args.sizes.split(",") if size.strip()], args.seed)
+    report = run_parity(corpus, args.repeat, on_result=lambda result: print(format_file(result), flush=True))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    totals = report["totals"]
+    missing = sum(totals["basic_only"].values())
+    print(f"\n전체 {len(report['files'])}개 파일, {totals['lines']:,}줄: "
+          f"기본 {totals['basic']['seconds'] * 1000:.1f}ms / 향상 {totals['enhanced']['seconds'] * 1000:.1f}ms, "
+          f"공통 {totals['common']}, 기본만 {missing} ({_categories(totals['basic_only'])})")
+    return 1 if args.fail_on_missing and missing else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+"""
+분석기 최악 입력 성능 퍼저
+
+운영에서만 발견되던 느린 입력(2MB 한 줄 번들, var 선언 2만 개 등)을 재현하기 위해
+적대적인 JavaScript 형태를 크기별로 생성하고, 각 분석 진입점을 별도 프로세스에서
+시간/메모리 제한을 걸고 실행합니다. 크기를 두 배씩 늘리며 측정한 시간으로
+log(시간) / log(크기) 기울기를 구해 선형보다 빠르게 늘어나는(superlinear) 조합을 표시합니다.
+
+    python backend/perf_fuzz.py
+    python backend/perf_fuzz.py --shapes huge_line --sizes 250000,500000,1000000,2000000 --timeout 30
+    python backend/perf_fuzz.py --json perf_fuzz.json  (표시된 조합이 있으면 종료 코드 1)
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_SIZES = (25_000, 50_000, 100_000, 200_000)
+# 이 기울기를 넘으면 superlinear로 표시 (1.0 = 선형, 2.0 = 제곱)
+SUPERLINEAR_EXPONENT = 1.3
+# 이보다 짧은 측정은 잡음이 커서 기울기 계산에서 제외
+NOISE_FLOOR_SECONDS = 0.005
+
+# ============================================================================
+# 적대적 입력 생성기 (size: 대략적인 문자 수)
+# ============================================================================
+
+def _repeat_to_size(unit: Callable[[int], str], size: int) -> str:
+    parts, length, index = [], 0, 0
+    while length < size:
+        part = unit(index)
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return "".join(parts)
+
+def deep_nesting(size: int) -> str:
+    """if 블록과 콜백이 깊게 중첩된 함수"""
+    depth = max(1, size // 40)
+    opening = "".join(f"if (v{i % 7} > {i}) {{ list.forEach(function(x{i}) {{\n" for i in range(depth))
+    return f"function nested() {{\n{opening}x0 = x0 + 1;\n" + "});}\n" * depth + "}\n"
+
+def huge_line(size: int) -> str:
+    """줄바꿈 없는 압축(minify) 번들 한 줄"""
+    return _repeat_to_size(
+        lambda i: f"var a{i}=b.c(d{i % 13},e);x.push(a{i});if(a{i}){{y=a{i}+1}}"
+                  f"function f{i}(p){{return p.q(r).s}};", size)
+
+def many_identifiers(size: int) -> str:
+    """var 선언이 수만 개인 파일"""
+    return _repeat_to_size(lambda i: f"var value{i} = item{i % 97}.length + {i};\n", size)
+
+def unbalanced_braces(size: int) -> str:
+    """닫히지 않은 중괄호/소괄호가 섞인 코드"""
+    rng = random.Random(size)
+    fragments = ["function f{i}(a, b {{\n", "if (a{i} {{\n", "  call{i}(a, (b, c);\n", "}}}}\n", "  arr[{i}.push(x);\n"]
+    return _repeat_to_size(lambda i: rng.choice(fragments).format(i=i), size)
+
+def long_string(size: int) -> str:
+    """이스케이프와 코드처럼 보이는 내용이 들어 있는 긴 문자열 리터럴"""
+    body = _repeat_to_size(lambda i: 'x = x + 1; \\"function f() { eval(s); }\\" ', size)
+    return f'var text = "{body}";\nvar template = `{body[:size // 4]}`;\n'
+
+def comment_storm(size: int) -> str:
+    """주석 안에 코드가 가득한 파일"""
+    return _repeat_to_size(
+        lambda i: f"/* var a{i} = b.c(d).e; if (x) {{ */ // TODO {i}: el.innerHTML = s;\n"
+                  f"/** @param {{Object}} p{i} */\nvar k{i} = {i}; // }}\n", size)
+
+def whitespace_runs(size: int) -> str:
+    """긴 공백 구간과 빈 줄이 있는 코드 (정규식 역추적 유발)"""
+    return _repeat_to_size(lambda i: f"total = total + {i}" + " " * 200 + "\n" + "\t" * 50 + "\n", size)
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+    "deep_nesting": deep_nesting,
+    "huge_line": huge_line,
+    "many_identifiers": many_identifiers,
+    "unbalanced_braces": unbalanced_braces,
+    "long_string": long_string,
+    "comment_storm": comment_storm,
+    "whitespace_runs": whitespace_runs,
+}
+
+# ============================================================================
+# 분석 진입점 (하위 프로세스에서 지연 import)
+# ============================================================================
+
+ENTRY_POINTS = ("check_javascript_issues", "check_errors", "analyze_async", "split_code_by_functions")
+
+def _entry_point(name: str) -> Callable[[str], object]:
+    if name == "check_javascript_issues":
+        from js_analyzer import check_javascript_issues
+        return check_javascript_issues
+    if name == "check_errors":
+        from js_analyzer import check_errors
+        return check_errors
+    if name == "analyze_async":
+        from enhanced_js_analyzer import PerformanceOptimizedAnalyzer
+        return lambda code: asyncio.run(PerformanceOptimizedAnalyzer().analyze_async(code))
+    if name == "split_code_by_functions":
+        from review import split_code_by_functions
+        return split_code_by_functions
+    raise ValueError(f"알 수 없는 진입점: {name}")
+
+def _limit_memory(memory_mb: int):
+    """하위 프로세스 주소 공간 제한 (Linux, 현재 사용량 + memory_mb)"""
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        limit = current + memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, OSError, ValueError):
+        pass
+
+def _measure(entry: str, shape: str, size: int, repeat: int, memory_mb: int, trace_memory: bool, conn):
+    """하위 프로세스: 입력 생성 후 repeat회 중 최소 시간과 Python 할당 최대치 측정"""
+    try:
+        _limit_memory(memory_mb)
+        run = _entry_point(entry)
+        code = SHAPES[shape](size)
+        best = math.inf
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run(code)
+            best = min(best, time.perf_counter() - started)
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            run(code)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        conn.send({"status": "ok", "seconds": best, "peak_bytes": peak, "chars": len(code)})
+    except MemoryError:
+        conn.send({"status": "memory"})
+    except Exception as e:
+        conn.send({"status": "error", "detail": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+def run_case(entry: str, shape: str, size: int, timeout: float = 10.0, memory_mb: int = 1024,
+             repeat: int = 3, trace_memory: bool = True) -> Dict:
+    """진입점 하나를 입력 하나로 측정 (timeout 초과 시 하위 프로세스 종료)"""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure, daemon=True,
+                                      args=(entry, shape, size, repeat, memory_mb, trace_memory, sender))
+    process.start()
+    sender.close()
+    result = {"status": "timeout"}
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            # 메모리 제한 등으로 결과를 보내기 전에 종료됨
+            result = {"status": "memory"}
+    if process.is_alive():
+        process.kill()
+    process.join()
+    receiver.close()
+    result.update(entry=entry, shape=shape, size=size)
+    return result
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """log(시간) / log(크기) 최소제곱 기울기 (잡음보다 큰 측정이 2개 미만이면 None)"""
+    points = [(math.log(size), math.log(value)) for size, value in zip(sizes, seconds)
+              if value >= NOISE_FLOOR_SECONDS]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+def fuzz(shapes=None, entries=None, sizes=DEFAULT_SIZES, timeout: float = 10.0, memory_mb: int = 1024,
+         repeat: int = 3, trace_memory: bool = True, on_result: Callable[[Dict], None] = None) -> List[Dict]:
+    """형태 x 진입점 조합마다 크기를 늘리며 측정하고 scaling 판정
+
+    status: ok | superlinear | timeout | memory | error
+    """
+    if multiprocessing.get_start_method() == "fork":
+        # fork한 하위 프로세스가 import 비용 없이 시작하도록 미리 import
+        for entry in entries or ENTRY_POINTS:
+            _entry_point(entry)
+    reports = []
+    for shape in shapes or SHAPES:
+        for entry in entries or ENTRY_POINTS:
+            runs = []
+            for size in sizes:
+                run = run_case(entry, shape, size, timeout, memory_mb, repeat, trace_memory)
+                runs.append(run)
+                if run["status"] != "ok":
+                    break
+            measured = [run for run in runs if run["status"] == "ok"]
+            exponent = scaling_exponent([run["chars"] for run in measured], [run["seconds"] for run in measured])
+            status = runs[-1]["status"]
+            if status == "ok" and exponent is not None and exponent > SUPERLINEAR_EXPONENT:
+                status = "superlinear"
+            report = {
+                "shape": shape,
+                "entry": entry,
+                "status": status,
+                "exponent": round(exponent, 2) if exponent is not None else None,
+                "sizes": [run["size"] for run in runs],
+                "seconds": [round(run["seconds"], 4) for run in measured],
+                "peak_mb": [round(run["peak_bytes"] / 1024 / 1024, 1) for run in measured if run["peak_bytes"] is not None],
+                "detail": runs[-1].get("detail"),
+            }
+            reports.append(report)
+            if on_result:
+                on_result(report)
+    return reports
+
+def format_report(report: Dict) -> str:
+    mark = "✅" if report["status"] == "ok" else "❌"
+    seconds = ", ".join(f"{value * 1000:.0f}" for value in report["seconds"])
+    exponent = "-" if report["exponent"] is None else f"{report['exponent']:.2f}"
+    line = (f"{mark} {report['shape']:<18} {report['entry']:<24} {report['status']:<11} "
+            f"n^{exponent:<5} ms=[{seconds}] peak_mb={report['peak_mb']}")
+    return line + (f" ({report['detail']})" if report["detail"] else "")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="분석기 최악 입력 성능 퍼저")
+    parser.add_argument("--shapes", help=f"쉼표로 구분 (기본: 전체 {','.join(SHAPES)})")
+    parser.add_argument("--entries", help=f"쉼표로 구분 (기본: 전체 {','.join(ENTRY_POINTS)})")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="입력 크기(문자 수), 두 배씩 늘리기를 권장")
+    parser.add_argument("--timeout", type=float, default=10.0, help="측정 하나의 시간 제한(초)")
+    parser.add_argument("--memory-mb", type=int, default=1024, help="측정 하나의 추가 메모리 제한(MB, Linux)")
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    split = lambda value: [item.strip() for item in value.split(",") if item.strip()] if value else None
+    reports = fuzz(split(args.shapes), split(args.entries), [int(size) for size in split(args.sizes)],
+                   args.timeout, args.memory_mb, args.repeat, not args.no_memory,
+                   on_result=lambda report: print(format_report(report), flush=True))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    flagged = [report for report in reports if report["status"] != "ok"]
+    print(f"\n{len(reports)}개 조합 중 {len(flagged)}개 표시됨")
+    return 1 if flagged else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+프롬프트 압축 (주석/공백 제거 + 원본 라인 매핑)
+
+LLM에 보내는 코드에서 주석, JSDoc 배너, 들여쓰기를 제거해 프롬프트 토큰을 줄입니다.
+압축된 코드의 각 라인이 원본 파일의 몇 번째 라인인지 기록해 두었다가,
+LLM 응답에 포함된 라인 번호를 사용자 파일 기준으로 되돌립니다.
+"""
+
+import os
+import re
+from typing import Callable, List, NamedTuple, Optional
+from js_tokenizer import tokenize
+from llm_client import request_llm_routed
+from metrics import analyzer_phase_duration
+
+class CompactedCode(NamedTuple):
+    code: str
+    line_map: List[int]  # 압축 코드 라인(인덱스 0부터) → 원본 라인 번호
+
+# LLM 응답에서 라인 번호를 찾는 패턴 ("라인 12", "Line 12-15", "line 3~4", JSON의 "line": 12)
+LINE_REFERENCE_PATTERN = re.compile(r'(라인|[Ll]ines?(?:"\s*:)?)(\s*)(\d+)(?:(\s*[-~]\s*)(\d+))?')
+
+def is_compaction_enabled(flag: Optional[bool] = None) -> bool:
+    """요청 플래그가 없으면 환경변수 PROMPT_COMPACTION 기본값 사용"""
+    if flag is not None:
+        return flag
+    return os.getenv("PROMPT_COMPACTION", "false").lower() in ("1", "true", "yes")
+
+def compact_code(code: str, line_offset: int = 0) -> CompactedCode:
+    """주석 제거, 공백 축소, 빈 줄 제거 후 원본 라인 매핑과 함께 반환"""
+    out_lines: List[List[str]] = []
+    line_map: List[int] = []
+    current: Optional[List[str]] = None
+    pending_space = False
+
+    with analyzer_phase_duration.time(analyzer="prompt_compactor", phase="tokenize"):
+        tokens = list(tokenize(code))
+
+    for token in tokens:
+        if token.kind == 'newline':
+            current = None
+            continue
+        if token.kind == 'space' or token.kind == 'comment':
+            pending_space = True
+            # 여러 줄 주석 뒤의 코드는 주석이 끝난 라인에 속함
+            if '\n' in token.value:
+                current = None
+            continue
+
+        pieces = token.value.split('\n')
+        for index, piece in enumerate(pieces):
+            if current is None or index > 0:
+                current = []
+                out_lines.append(current)
+                line_map.append(token.line + index + line_offset)
+            elif pending_space:
+                current.append(' ')
+            current.append(piece)
+        pending_space = False
+
+    return CompactedCode('\n'.join(''.join(parts) for parts in out_lines), line_map)
+
+def restore_line_numbers(text: str, line_map: List[int]) -> str:
+    """LLM 응답의 라인 번호를 원본 파일 기준으로 변환"""
+    def to_original(number: str) -> str:
+        index = int(number) - 1
+        if 0 <= index < len(line_map):
+            return str(line_map[index])
+        return number
+
+    def replace(match: re.Match) -> str:
+        label, space, start, separator, end = match.groups()
+        restored = f"{label}{space}{to_original(start)}"
+        if end is not None:
+            restored += f"{separator}{to_original(end)}"
+        return restored
+
+    return LINE_REFERENCE_PATTERN.sub(replace, text)
+
+def request_llm_compacted(code: str, build_prompt: Callable[[str], str], fast_mode: bool = False,
+                          compact: Optional[bool] = None, line_offset: int = 0, system: Optional[str] = None,
+                          sections: int = 4, max_tokens: Optional[int] = None) -> str:
+    """압축 단계를 거쳐 LLM 요청 (비활성화 시 원본 코드 그대로 전송)"""
+    llm_call = lambda prompt: request_llm_routed(prompt, fast_mode, system=system, sections=sections,
+                                                 max_tokens_cap=max_tokens)
+    if not is_compaction_enabled(compact):
+        return llm_call(build_prompt(code))
+
+    compacted = compact_code(code, line_offset)
+    result = llm_call(build_prompt(compacted.code))
+    return restore_line_numbers(result, compacted.line_map)
@@ -0,0 +1,266 @@
+"""
+버전 관리되는 LLM 프롬프트 템플릿 레지스트리
+
+모든 템플릿은 요청마다 바뀌지 않는 시스템/지시 접두부(API 참고 정보 포함)와
+요청마다 바뀌는 짧은 헤더 + 코드로 구성됩니다. 가변 부분이 항상 프롬프트 끝에 오기 때문에
+LM Studio 프롬프트 캐시와 OpenAI 프롬프트 캐싱이 공통 접두부를 재사용할 수 있습니다.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+from metrics import REGISTRY
+from prompt_compactor import request_llm_compacted
+
+class PromptTemplate(NamedTuple):
+    name: str
+    version: int
+    system: str  # 불변 접두부 (요청 간 동일해야 캐시 적중)
+    header: str  # 코드 앞에 붙는 가변 헤더 (format 변수 사용 가능)
+    sections: int = 4  # 요청하는 응답 섹션 수 (max_tokens 산정에 사용)
+    max_tokens: Optional[int] = None  # 응답이 짧은 템플릿의 출력 토큰 상한
+
+    def render(self, code: str, api_context: Optional[str] = None, **variables) -> str:
+        """사용자 메시지 생성 (요청별 API 참고 정보는 헤더 다음, 코드는 항상 마지막)"""
+        context = f"{api_context}\n\n" if api_context else ""
+        return f"{self.header.format(**variables)}\n\n{context}```javascript\n{code}\n```"
+
+PROMPT_TEMPLATES: Dict[str, Dict[int, PromptTemplate]] = {}
+
+template_requests = REGISTRY.counter(
+    "prompt_template_requests_total", "템플릿별 LLM 요청 수", ("template", "version"))
+
+def register_template(template: PromptTemplate) -> PromptTemplate:
+    """템플릿 등록 (같은 이름의 새 버전은 기존 버전과 함께 보관)"""
+    PROMPT_TEMPLATES.setdefault(template.name, {})[template.version] = template
+    return template
+
+def get_template(name: str, version: Optional[int] = None) -> PromptTemplate:
+    """템플릿 조회 (버전 미지정 시 최신 버전)"""
+    versions = PROMPT_TEMPLATES.get(name)
+    if not versions:
+        raise KeyError(f"등록되지 않은 프롬프트 템플릿: {name}")
+    if version is None:
+        version = max(versions)
+    return versions[version]
+
+def list_templates() -> List[Dict[str, object]]:
+    """등록된 템플릿 목록 (이름, 버전, 접두부 길이)"""
+    return [
+        {"name": t.name, "version": t.version, "system_chars": len(t.system)}
+        for versions in PROMPT_TEMPLATES.values()
+        for t in versions.values()
+    ]
+
+def request_llm_template(name: str, code: str, fast_mode: bool = False, compact_prompt: Optional[bool] = None,
+                         line_offset: int = 0, version: Optional[int] = None, api_context: Optional[str] = None,
+                         **variables) -> str:
+    """템플릿으로 프롬프트를 구성해 LLM 요청
+
+    api_context: 코드에서 감지한 컨트롤/메서드에 관련된 eXBuilder6 API 참고 정보 (api_reference)
+    """
+    template = get_template(name, version)
+    template_requests.inc(template=template.name, version=str(template.version))
+    return request_llm_compacted(code, lambda code: template.render(code, api_context, **variables), fast_mode,
+                                 compact_prompt, line_offset, system=template.system,
+                                 sections=template.sections, max_tokens=template.max_tokens)
+
+# ============================================================================
+# 코드 리뷰 템플릿 (review.py)
+# ============================================================================
+
+_REVIEW_RESPONSE_FORMAT = """**응답:**
+## 1. 오류 지점
+- **라인 X**: 구체적 오류
+
+## 2. 경고 지점
+- **라인 X**: 구체적 경고
+
+## 3. 개선 제안
+- 구체적 수정 코드
+
+## 4. 실행 흐름
+- 단계별 상세 동작 과정"""
+
+register_template(PromptTemplate(
+    name="review",
+    version=1,
+    system=f"""eXBuilder6 코드 분석: 사용자가 보낸 코드를 분석하세요.
+
+**분석:**
+1. 오류 지점 (문법, 타입, API 오류)
+2. 경고 지점 (성능, 스타일, 잠재적 문제)
+3. 개선 제안 (구체적 수정 코드)
+4. 실행 흐름 (단계별 동작 과정)
+
+**중요**: 실제 발견된 문제만 언급, 라인 번호 명시
+
+{_REVIEW_RESPONSE_FORMAT}""",
+    header="다음 코드를 분석하세요.",
+))
+
+register_template(PromptTemplate(
+    name="review_chunk",
+    version=1,
+    system=f"""eXBuilder6 코드 청크 분석: 대용량 코드의 일부(청크)를 분석하세요.
+
+**분석:** 오류, 경고, 개선안, 실행흐름
+
+{_REVIEW_RESPONSE_FORMAT}""",
+    header="청크 {index}/{total}를 분석하세요.",
+))
+
+register_template(PromptTemplate(
+    name="review_function",
+    version=1,
+    system=f"""eXBuilder6 함수 분석: 사용자가 보낸 함수를 분석하세요.
+
+**분석:** 오류, 경고, 개선안, 실행흐름
+
+{_REVIEW_RESPONSE_FORMAT}""",
+    header="'{func_name}' 함수를 분석하세요.",
+))
+
+register_template(PromptTemplate(
+    name="review_function_batch",
+    version=1,
+    system="""eXBuilder6 함수 일괄 분석: 사용자가 보낸 여러 함수를 각각 분석하세요.
+각 함수는 `// === 함수: 이름 ===` 주석으로 구분됩니다.
+
+**분석:** 함수별 오류, 경고, 개선안, 실행흐름 (라인 번호는 각 함수의 첫 줄을 1로 계산)
+
+**응답:** 설명 없이 아래 형식의 JSON 객체 하나만 출력하세요. 키는 함수 이름입니다.
+{"함수이름": {"errors": ["라인 X: 구체적 오류"], "warnings": ["라인 X: 구체적 경고"], "suggestions": ["구체적 수정 코드"], "flow": ["단계별 동작"]}}
+문제가 없는 항목은 빈 배열로 두세요.""",
+    header="다음 {count}개 함수를 분석하세요: {names}",
+))
+
+# ============================================================================
+# 분석기 템플릿 (enhanced_js_analyzer.py, js_analyzer.py)
+# ============================================================================
+
+_ANALYSIS_REQUEST = """**분석 요청:**
+1. JavaScript 문법/로직 문제점 (구체적인 라인 번호와 함께)
+2. eXBuilder6 API 사용 여부 (사용된 API 목록 및 잘못된 사용 여부)
+3. 잠재적 오류 및 보안 위험 요소
+4. 실행 흐름 (단계별 상세 과정 - 스토리텔링 방식)"""
+
+register_template(PromptTemplate(
+    name="enhanced_analysis",
+    version=1,
+    system=f"""JavaScript 코드를 다음 4가지 항목으로 분석해주세요:
+
+{_ANALYSIS_REQUEST}
+
+발견된 문제가 없으면 "발견된 문제점 없음"으로 표시하세요.""",
+    header="**분석할 코드:**",
+))
+
+register_template(PromptTemplate(
+    name="enhanced_findings",
+    version=1,
+    system="""JavaScript/eXBuilder6 코드 검토: 실제 문제만 찾아 간결한 JSON 배열 하나로 답하세요.
+설명 문장, 마크다운, 코드 블록은 출력하지 마세요.
+
+형식: [{"line": 12, "severity": "high", "category": "api", "message": "80자 이내 요약"}]
+- severity: critical, high, medium, low, info 중 하나
+- category: syntax, api, security, performance, logic 중 하나
+- 문제가 없으면 []""",
+    header="**분석할 코드:**",
+    sections=1,
+    max_tokens=512,
+))
+
+register_template(PromptTemplate(
+    name="enhanced_explain_issue",
+    version=1,
+    system="""JavaScript/eXBuilder6 코드 검토 결과 설명: 지정된 이슈의 원인, 영향, 수정 코드를 설명하세요.
+
+**응답 형식:**
+## 원인
+## 영향
+## 수정 방법 (구체적 수정 코드)""",
+    header="라인 {line}: {message}",
+    sections=3,
+))
+
+register_template(PromptTemplate(
+    name="legacy_analysis",
+    version=1,
+    system=f"""JavaScript 코드를 다음 4가지 항목으로 분석해주세요:
+
+{_ANALYSIS_REQUEST}
+
+**eXBuilder6 API 참고 정보:**
+- Grid 컨트롤 (grd): addRow, deleteRow, updateRow, getRow, getData, setData, clear, refresh, getSelected, setSelected, getChecked, setChecked, getExpanded, setExpanded, scrollTo, scrollIntoView, insertRowData, removeRowData, getRowCount, getColumnCount, getSelectedRows, setSelectedRows, getCellValue, setCellValue, getCellText, setCellText, getCellStyle, setCellStyle, getColumnWidth, setColumnWidth, getRowHeight, setRowHeight, getVisibleRows, setVisibleRows, getVisibleColumns, setVisibleColumns, getSortColumn, setSortColumn, getSortOrder, setSortOrder, getFilterData, setFilterData, getGroupData, setGroupData, getSummaryData, setSummaryData, getPagingData, setPagingData, getPageSize, setPageSize, getCurrentPage, setCurrentPage, getTotalCount, setTotalCount, getPageCount, setPageCount, getPageInfo, setPageInfo
+
+- Button 컨트롤 (button, btn): setText, getText, enable, disable, show, hide, focus, blur, click, setIcon, getIcon, setIconAlign, getIconAlign, setButtonType, getButtonType, setImage, getImage, setImageAlign, getImageAlign, setTooltip, getTooltip
+
+- Calendar 컨트롤 (calendar, cal): setDate, getDate, setValue, getValue, enable, disable, show, hide, focus, blur, setMinDate, getMinDate, setMaxDate, getMaxDate, setFirstDayOfWeek, getFirstDayOfWeek, setCalendarType, getCalendarType, setDateFormat, getDateFormat, setTimeFormat, getTimeFormat, setShowTime, getShowTime, setShowToday, getShowToday, setShowWeekNumbers, getShowWeekNumbers
+
+- ComboBox 컨트롤 (cmb): addItem, deleteItem, updateItem, getItem, getData, setData, clear, refresh, getSelected, setSelected, getChecked, setChecked, enable, disable, show, hide, focus, blur, openDropdown, closeDropdown, getSelectedIndex, setSelectedIndex, getSelectedValue, setSelectedValue, getSelectedText, setSelectedText, getItemCount, getItemText, setItemText, getItemValue, setItemValue, getItemData, setItemData, getItemIndex, setItemIndex, getItemByValue, getItemByText, getItemByIndex
+
+- CheckBox 컨트롤 (cbx): setChecked, getChecked, setText, getText, enable, disable, show, hide, focus, blur, setCheckType, getCheckType, setTextAlign, getTextAlign, setGroupName, getGroupName
+
+- Tree 컨트롤 (tre): addNode, deleteNode, updateNode, getNode, getData, setData, clear, refresh, getSelected, setSelected, getChecked, setChecked, getExpanded, setExpanded, scrollTo, scrollIntoView, enable, disable, show, hide, focus, blur, expandAll, collapseAll, getRootNode, getChildNodes, getParentNode, getSiblingNodes, getNodeByText, getNodeByValue, getNodeByIndex, getNodePath, setNodePath, getNodeLevel, setNodeLevel, getNodeIcon, setNodeIcon, getNodeTooltip, setNodeTooltip
+
+- InputBox 컨트롤 (ipb): setValue, getValue, setText, getText, enable, disable, show, hide, focus, blur, setMaxLength, getMaxLength, setPlaceholder, getPlaceholder, setInputType, getInputType, setPattern, getPattern, setRequired, getRequired, setReadOnly, getReadOnly, setAutoComplete, getAutoComplete, setAutoFocus, getAutoFocus, setSpellCheck, getSpellCheck
+
+- TextArea 컨트롤 (txa): setValue, getValue, setText, getText, enable, disable, show, hide, focus, blur, setMaxLength, getMaxLength, setPlaceholder, getPlaceholder, setRows, getRows, setCols, getCols, setWrap, getWrap, setResize, getResize, setSpellCheck, getSpellCheck
+
+**공통 API (모든 컨트롤에서 사용 가능):**
+- 메서드: setValue, getValue, setText, getText, enable, disable, show, hide, focus, blur, setVisible, getVisible, setEnabled, getEnabled, setReadOnly, getReadOnly, setWidth, getWidth, setHeight, getHeight, setStyle, getStyle, setData, getData, refresh, clear, reset, validate, isValid, getParent, getChild, getChildren, getSibling, getSiblings, getRoot, getAncestor, getDescendant, getFirstChild, getLastChild, getNextSibling, getPreviousSibling, addChild, removeChild, insertChild
+
+- 속성: text, value, visible, enabled, readOnly, width, height, style, data, name, id, className, tagName, parentNode, childNodes, firstChild, lastChild, nextSibling, previousSibling, nodeType, nodeValue, nodeName, attributes
+
+- 이벤트: onLoad, onUnload, onClick, onDoubleClick, onRightClick, onMouseDown, onMouseUp, onMouseOver, onMouseOut, onMouseMove, onMouseEnter, onMouseLeave, onFocus, onBlur, onKeyDown, onKeyUp, onKeyPress, onChange, onSelect, onInput, onInvalid, onReset, onSubmit, onError, onAbort, onLoad, onUnload, onResize, onScroll, onContextMenu
+
+**메시지 API:**
+- showMessage, showConfirm, showAlert, showError, showWarning, showInfo, showSuccess, showQuestion, showInput, showSelect, showFileDialog, showColorDialog, showFontDialog, openPopup, closePopup, showPopup, hidePopup, setPopupPosition, getPopupPosition, setPopupSize, getPopupSize, setPopupTitle, getPopupTitle, setPopupContent, getPopupContent
+
+**데이터 API:**
+- getData, setData, getJsonData, setJsonData, getXmlData, setXmlData, getCsvData, setCsvData, loadData, saveData, exportData, importData, validateData, transformData, filterData, sortData, groupData, aggregateData, calculateData, mergeData, splitData, cloneData
+
+**응답 형식:**
+## 1. JavaScript 문법/로직 문제점
+- **라인 X**: 구체적 문제점
+
+## 2. eXBuilder6 API 사용 여부
+- 사용된 API: this.form.setValue, this.grid.addRow 등
+- 잘못된 API 사용: 존재하지 않는 메서드/속성
+
+## 3. 오류 검사
+- **라인 X**: 구체적 오류
+
+## 4. 실행 흐름
+- 단계별 상세 동작 과정 (스토리텔링 방식)
+
+발견된 문제가 없으면 "발견된 문제점 없음"으로 표시하세요.""",
+    header="**분석할 코드:**",
+))
+
+# v2: 전체 API 목록 대신 코드에서 사용된 컨트롤/메서드에 관련된 참고 정보만 요청별로 전달 (api_reference)
+register_template(PromptTemplate(
+    name="legacy_analysis",
+    version=2,
+    system=f"""JavaScript 코드를 다음 4가지 항목으로 분석해주세요:
+
+{_ANALYSIS_REQUEST}
+
+eXBuilder6 API는 함께 전달되는 API 참고 정보를 기준으로 판단하세요.
+
+**응답 형식:**
+## 1. JavaScript 문법/로직 문제점
+- **라인 X**: 구체적 문제점
+
+## 2. eXBuilder6 API 사용 여부
+- 사용된 API: this.form.setValue, this.grid.addRow 등
+- 잘못된 API 사용: 존재하지 않는 메서드/속성
+
+## 3. 오류 검사
+- **라인 X**: 구체적 오류
+
+## 4. 실행 흐름
+- 단계별 상세 동작 과정 (스토리텔링 방식)
+
+발견된 문제가 없으면 "발견된 문제점 없음"으로 표시하세요.""",
+    header="**분석할 코드:**",
+))
@@ -0,0 +1,206 @@
+"""
+정규식 규칙 실행 시간 제한 (ReDoS 방지)
+
+업로드된 코드에 규칙을 그대로 finditer 하면 역참조(\\1)나 겹치는 반복(\\s*\\n\\s*)이 있는
+규칙이 긴 공백/식별자 입력에서 수 초 이상 워커를 점유할 수 있습니다. 파이썬 re는 실행 중에
+중단할 수 없으므로 GuardedPattern은
+- 긴 입력을 창(WINDOW_CHARS + WINDOW_OVERLAP_CHARS) 단위로 검사해 한 번의 re 호출 비용을 제한하고,
+  창/검출 사이마다 규칙별 시간 예산(REGEX_RULE_BUDGET_MS + 입력 1MB당 REGEX_RULE_BUDGET_MS_PER_MB)을
+  확인합니다. 창 안에서 시작하는 검출이 없으면 같은 위치에서 창을 MAX_WINDOW_CHARS까지 두 배씩 넓혀
+  다시 검사하고(창보다 긴 검출이 잘리지 않도록), 그래도 없으면 창만큼 건너뜁니다. 창 끝에 닿은
+  검출만 전체 문자열 기준으로 다시 매칭해 끝 위치를 확정합니다.
+  창 안에서 일부도 매칭되지 않는 검출은 WINDOW_OVERLAP_CHARS보다 길면서 넓힌 창 경계에 걸치거나,
+  같은 창의 더 짧은 검출보다 앞에서 시작할 때만 빠질 수 있고, 그 밖에는 finditer와 같은 결과입니다.
+- 예산을 넘으면 선형 시간 대체 구현이 있는 규칙은 남은 부분을 대체 구현으로 검사하고
+  (DEMOTE_AFTER회 초과한 규칙은 이후 항상 대체 구현 사용), 없는 규칙은 검사한 위치까지의
+  부분 결과(partial)를 반환합니다.
+- 끝 앵커($, \\Z)가 있어 창으로 나눌 수 없는 규칙은 대체 구현이 있으면 항상 대체 구현을 씁니다.
+"""
+
+import os
+import re
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from metrics import REGISTRY
+
+WINDOW_CHARS = 1024
+WINDOW_OVERLAP_CHARS = 256
+MAX_WINDOW_CHARS = 8192  # 검출 없는 창을 넓히는 상한 (re 호출 한 번이 검사하는 길이의 상한)
+DEMOTE_AFTER = 3
+
+Span = Tuple[int, int]
+
+regex_guard_events = REGISTRY.counter(
+    "regex_guard_events_total", "규칙 시간 예산 초과/대체 구현 사용/부분 결과 수", ("rule", "event"))
+
+def rule_budget_ms(chars: int = 0) -> float:
+    """규칙 하나가 요청 하나에서 쓸 수 있는 시간 (ms)
+
+    입력에 비례해 시간이 드는 보통 규칙이 큰 파일에서도 끝까지 검사하도록
+    기본 예산에 입력 1MB당 REGEX_RULE_BUDGET_MS_PER_MB를 더합니다.
+    """
+    per_mb = float(os.getenv("REGEX_RULE_BUDGET_MS_PER_MB", "500"))
+    return float(os.getenv("REGEX_RULE_BUDGET_MS", "50")) + per_mb * chars / 1_000_000
+
+class ScanResult(NamedTuple):
+    spans: List[Span]
+    partial: bool  # 시간 예산 초과로 scanned 이후를 검사하지 못함
+    scanned: int   # 검사를 마친 위치 (전체를 검사했으면 len(code))
+    engine: str    # regex | linear | regex+linear
+
+# ============================================================================
+# 선형 시간 대체 구현 (원래 정규식의 finditer와 같은 검출 위치를 반환)
+# ============================================================================
+
+_WORD_RUN = re.compile(r'\w*')
+_SPACE_RUN = re.compile(r'\s*')
+_SPACES = re.compile(r'\s+')
+_EQUALS = re.compile(r'=')
+_IDENTIFIER_START = re.compile(r'[a-zA-Z_$]')
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+def _self_assignment_spans(code: str, pos: int = 0) -> List[Span]:
+    r"""(\w+)\s*=\s*\1\s*[+\-*/]
+
+    그룹은 '=' 왼쪽 단어의 끝에서 끝나고 오른쪽 단어 전체와 같아야 하므로,
+    '='마다 양쪽 단어만 비교합니다.
+    """
+    spans, last_end = [], pos
+    for equals in _EQUALS.finditer(code, pos):
+        left_end = equals.start()
+        while left_end > last_end and code[left_end - 1].isspace():
+            left_end -= 1
+        left_start = left_end
+        while left_start > last_end and _is_word(code[left_start - 1]):
+            left_start -= 1
+        right_start = _SPACE_RUN.match(code, equals.end()).end()
+        right_end = _WORD_RUN.match(code, right_start).end()
+        name = code[right_start:right_end]
+        if not name or left_end - left_start < len(name) or code[left_end - len(name):left_end] != name:
+            continue
+        operator = _SPACE_RUN.match(code, right_end).end()
+        if operator < len(code) and code[operator] in '+-*/':
+            spans.append((left_end - len(name), operator + 1))
+            last_end = operator + 1
+    return spans
+
+def _missing_semicolon_spans(code: str, pos: int = 0) -> List[Span]:
+    r"""([^;{}])\s*\n\s*([a-zA-Z_$])
+
+    줄바꿈을 포함한 공백 구간마다, 구간 바로 뒤가 식별자 시작 문자일 때
+    구간 앞 문자(또는 구간 안의 공백)에서 시작하는 검출 하나를 만듭니다.
+    """
+    spans, last_end = [], pos
+    for space in _SPACES.finditer(code, pos):
+        start, end = space.span()
+        if end >= len(code) or not _IDENTIFIER_START.match(code, end):
+            continue
+        last_newline = code.rfind('\n', start, end)
+        if last_newline < 0:
+            continue
+        if start - 1 >= last_end and code[start - 1] not in ';{}':
+            match_start = start - 1
+        else:
+            match_start = max(start, last_end)
+            if match_start >= last_newline:
+                continue
+        spans.append((match_start, end + 1))
+        last_end = end + 1
+    return spans
+
+def _trailing_semicolon_spans(code: str, pos: int = 0) -> List[Span]:
+    r"""[^;]\s*$ (MULTILINE 없음: 코드 끝의 공백을 제외한 마지막 문자만 확인)"""
+    content_end = len(code)
+    while content_end > pos and code[content_end - 1].isspace():
+        content_end -= 1
+    if content_end > pos and code[content_end - 1] != ';':
+        return [(content_end - 1, len(code))]
+    if content_end < len(code):
+        return [(content_end, len(code))]
+    return []
+
+# 정규식 원문 → 대체 구현 (같은 원문의 규칙은 자동으로 대체 구현을 사용)
+LINEAR_REWRITES: Dict[str, Callable[[str, int], List[Span]]] = {
+    r'(\w+)\s*=\s*\1\s*[+\-*/]': _self_assignment_spans,
+    r'([^;{}])\s*\n\s*([a-zA-Z_$])': _missing_semicolon_spans,
+    r'[^;]\s*$': _trailing_semicolon_spans,
+}
+
+# ============================================================================
+# 시간 예산 적용 실행
+# ============================================================================
+
+class GuardedPattern:
+    def __init__(self, name: str, pattern: str, flags: int = 0):
+        self.name = name
+        self.pattern = pattern
+        self.regex = re.compile(pattern, flags)
+        self.linear = LINEAR_REWRITES.get(pattern) if flags == 0 else None
+        # 창 끝을 문자열 끝으로 보면 결과가 달라지는 규칙은 창으로 나누지 않음
+        self.windowable = not re.search(r'(?<!\\)\$|\\Z', pattern)
+        self.overruns = 0
+
+    @property
+    def demoted(self) -> bool:
+        return self.linear is not None and self.overruns >= DEMOTE_AFTER
+
+    def scan(self, code: str, budget_ms: Optional[float] = None, first_only: bool = False) -> ScanResult:
+        """검출 위치 목록 (first_only면 re.search처럼 첫 검출만)"""
+        if self.linear is not None and (self.demoted or not self.windowable):
+            spans = self.linear(code, 0)
+            return ScanResult(spans[:1] if first_only else spans, False,
+                              spans[0][1] if first_only and spans else len(code), "linear")
+
+        budget = rule_budget_ms(len(code)) if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget / 1000
+        spans: List[Span] = []
+        size = WINDOW_CHARS if self.windowable else len(code)
+        pos = 0  # 아직 검출이 없다고 확정하지 못한 첫 위치
+        while pos <= len(code):
+            endpos = min(len(code), pos + size + WINDOW_OVERLAP_CHARS)
+            match = self.regex.search(code, pos, endpos)
+            if match is None or (endpos < len(code) and match.start() >= pos + size):
+                if endpos >= len(code):
+                    break
+                if time.perf_counter() > deadline:
+                    return self._overrun(code, spans, pos, first_only)
+                # 창 안에서 시작하는 검출이 없음: 창보다 긴 검출이 잘렸을 수 있으므로 MAX_WINDOW_CHARS까지는
+                # 같은 위치에서 창을 넓혀 다시 검사하고, 그래도 없으면 창만큼 건너뜀
+                if size < MAX_WINDOW_CHARS:
+                    size *= 2
+                else:
+                    pos += size
+                    size = WINDOW_CHARS
+                continue
+            if endpos < len(code) and match.end() == endpos:
+                # 창 끝에서 잘렸을 수 있으므로 전체 문자열 기준으로 다시 매칭
+                full = self.regex.match(code, match.start())
+                if full is None:
+                    pos = match.start() + 1
+                    size = WINDOW_CHARS
+                    continue
+                match = full
+            start, end = match.span()
+            spans.append((start, end))
+            if first_only:
+                return ScanResult(spans, False, end, "regex")
+            pos = end if end > start else start + 1
+            size = WINDOW_CHARS if self.windowable else len(code)
+            if time.perf_counter() > deadline:
+                return self._overrun(code, spans, pos, first_only)
+        return ScanResult(spans, False, len(code), "regex")
+
+    def _overrun(self, code: str, spans: List[Span], resume: int, first_only: bool) -> ScanResult:
+        """시간 예산 초과: 대체 구현으로 나머지를 검사하거나 부분 결과 반환"""
+        self.overruns += 1
+        regex_guard_events.inc(rule=self.name, event="budget_exceeded")
+        if self.linear is not None:
+            regex_guard_events.inc(rule=self.name, event="linear_fallback")
+            rest = self.linear(code, resume)
+            if first_only and rest:
+                return ScanResult(rest[:1], False, rest[0][1], "regex+linear")
+            return ScanResult(spans + rest, False, len(code), "regex+linear")
+        regex_guard_events.inc(rule=self.name, event="partial")
+        return ScanResult(spans, True, resume, "regex")
@@ -1,133 +1,195 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel
-from typing import Optional
-from llm_client import request_llm, request_llm_fast
+from typing import Callable, Dict, List, NamedTuple, Optional
+from functools import partial
+import asyncio
+import logging
+import os
+from llm_output import extract_json
+from prompt_compactor import compact_code, is_compaction_enabled, restore_line_numbers
+from prompt_templates import PROMPT_TEMPLATES, request_llm_template
+from enhanced_js_analyzer import build_api_reference, detect_file_controls
+from memory_profiler import memory_phase
+from llm_resilience import StaticFallback
 
 router = APIRouter()
 
-PROMPT_TEMPLATE = """
-eXBuilder6 코드 분석: 다음 코드를 분석하세요.
-
-**분석:**
-1. 오류 지점 (문법, 타입, API 오류)
-2. 경고 지점 (성능, 스타일, 잠재적 문제)
-3. 개선 제안 (구체적 수정 코드)
-4. 실행 흐름 (단계별 동작 과정)
-
-**중요**: 실제 발견된 문제만 언급, 라인 번호 명시
-
-```javascript
-{code}
-```
-
-**응답:**
-## 1. 오류 지점
-- **라인 X**: 구체적 오류
-
-## 2. 경고 지점  
-- **라인 X**: 구체적 경고
-
-## 3. 개선 제안
-- 구체적 수정 코드
-
-## 4. 실행 흐름
-- 단계별 상세 동작 과정
-"""
+logger = logging.getLogger(__name__)
 
 class ReviewRequest(BaseModel):
     code: str
     fast_mode: bool = False  # 빠른 모드 (토큰 수 제한)
     ui_framework: str = "generic"  # UI 프레임워크 타입 (generic, nexacro, etc.)
+    compact_prompt: Optional[bool] = None  # 주석/공백 제거 후 전송 (None이면 PROMPT_COMPACTION 환경변수)
+    batch_functions: bool = False  # 대용량 코드의 작은 함수들을 하나의 프롬프트로 묶어 분석
+
+# 함수 묶음 분석 설정 (프롬프트당 코드 토큰 예산, 최대 함수 수)
+BATCH_TOKEN_BUDGET = int(os.getenv("REVIEW_BATCH_TOKEN_BUDGET", "2500"))
+BATCH_MAX_FUNCTIONS = int(os.getenv("REVIEW_BATCH_MAX_FUNCTIONS", "10"))
+
+# 묶음 응답 JSON의 항목 → 기존 마크다운 섹션 제목
+BATCH_RESULT_SECTIONS = [
+    ("errors", "오류 지점"),
+    ("warnings", "경고 지점"),
+    ("suggestions", "개선 제안"),
+    ("flow", "실행 흐름"),
+]
+
+class ReviewUnit(NamedTuple):
+    label: str                    # 진행 상황 표시용 (청크/함수 이름)
+    run: Callable[[], List[str]]  # LLM 요청 후 결과 섹션 목록 반환 (블로킹)
 
 @router.post("/text")
 async def review_code(request: ReviewRequest):
-    print(f"[LOG] /api/review/text called (ui_framework: {request.ui_framework})")
-    
+    logger.debug("Review requested", extra={"ui_framework": request.ui_framework, "code_chars": len(request.code)})
+    sections = []
+    try:
+        for unit in plan_review(request):
+            sections.extend(await asyncio.to_thread(unit.run))
+    except StaticFallback as e:
+        # 리뷰는 LLM 결과뿐이므로 결과 없이 폴백 안내만 반환
+        return e.result("result")
+    logger.debug("Review finished", extra={"sections": len(sections)})
+    return {"result": "\n\n".join(sections)}
+
+def plan_review(request: ReviewRequest) -> List[ReviewUnit]:
+    """리뷰를 LLM 요청 단위로 분할 (작업 API는 단위마다 진행률/부분 결과를 보고)"""
     # 코드 길이 확인 및 분할 처리
     code_length = len(request.code)
     estimated_tokens = code_length // 4
     
     if estimated_tokens > 3000:  # 3000 토큰 이상이면 분할 처리
-        print(f"[LOG] Large code detected ({estimated_tokens} tokens), splitting...")
-        return await review_large_code(request)
+        logger.info("Large code detected, splitting", extra={"estimated_tokens": estimated_tokens})
+        return plan_large_review(request)
     
-    # UI 프레임워크별 프롬프트 커스터마이징
-    if request.ui_framework.lower() == "nexacro":
-        prompt = PROMPT_TEMPLATE.replace("특정 UI 솔루션", "Nexacro Platform").format(code=request.code)
-    elif request.ui_framework.lower() == "exbuilder":
-        prompt = PROMPT_TEMPLATE.format(code=request.code)
-    else:
-        prompt = PROMPT_TEMPLATE.format(code=request.code)
+    # UI 프레임워크별 템플릿 (review_<framework>가 등록되어 있으면 사용)
+    template_name = f"review_{request.ui_framework.lower()}"
+    if template_name not in PROMPT_TEMPLATES:
+        template_name = "review"
     
-    print(f"[LOG] Prompt generated. Calling LLM... (fast_mode: {request.fast_mode})")
-    result = request_llm_fast(prompt) if request.fast_mode else request_llm(prompt)
-    print("[LOG] LLM call finished. Returning result.")
-    return {"result": result}
+    return [ReviewUnit("전체 코드", lambda: [
+        request_llm_template(template_name, request.code, request.fast_mode, request.compact_prompt,
+                             api_context=build_api_reference(request.code))
+    ])]
 
-async def review_large_code(request: ReviewRequest):
-    """대용량 코드를 함수별로 분할하여 분석"""
+def plan_large_review(request: ReviewRequest) -> List[ReviewUnit]:
+    """대용량 코드를 함수별(불가능하면 줄 단위)로 분할"""
     code = request.code
     
     # 함수별로 분할
     functions = split_code_by_functions(code)
+    # 파일 전체의 app.lookup 선언은 한 번만 찾아 모든 분할 단위가 공유
+    file_controls = detect_file_controls(code)
     
     if len(functions) <= 1:
         # 함수로 분할할 수 없으면 줄 단위로 분할
-        chunks = split_code_by_lines(code, max_lines=100)
-        results = []
-        for i, chunk in enumerate(chunks):
-            prompt = f"""eXBuilder6 코드 청크 분석: 청크 {i+1}/{len(chunks)}를 분석하세요.
-
-**분석:** 오류, 경고, 개선안, 실행흐름
-
-```javascript
-{chunk}
-```
-
-**응답:**
-## 오류 지점
-- **라인 X**: 구체적 오류
-
-## 경고 지점  
-- **라인 X**: 구체적 경고
-
-## 개선 제안
-- 구체적 수정 코드
-
-## 실행 흐름
-- 단계별 상세 동작 과정"""
-            result = request_llm_fast(prompt) if request.fast_mode else request_llm(prompt)
-            results.append(f"## 청크 {i+1}\n{result}")
+        max_lines = 100
+        chunks = split_code_by_lines(code, max_lines=max_lines)
+        
+        def review_chunk(i: int, chunk: str) -> List[str]:
+            # 압축 시 청크 시작 라인을 더해 원본 파일 기준 라인 번호로 복원
+            result = request_llm_template("review_chunk", chunk, request.fast_mode, request.compact_prompt,
+                                          line_offset=i * max_lines, index=i + 1, total=len(chunks),
+                                          api_context=build_api_reference(chunk, file_controls))
+            return [f"## 청크 {i+1}\n{result}"]
         
-        return {"result": "\n\n".join(results)}
+        return [ReviewUnit(f"청크 {i+1}/{len(chunks)}", partial(review_chunk, i, chunk))
+                for i, chunk in enumerate(chunks)]
+    elif request.batch_functions:
+        # 작은 함수들을 토큰 예산 내에서 묶어 분석
+        def review_batch(batch: Dict[str, str]) -> List[str]:
+            batch_results = review_function_batch(batch, request, file_controls)
+            return [f"## 함수: {func_name}\n{batch_results[func_name]}" for func_name in batch]
+        
+        return [ReviewUnit(f"함수 묶음: {', '.join(batch)}", partial(review_batch, batch))
+                for batch in pack_functions(functions, BATCH_TOKEN_BUDGET, BATCH_MAX_FUNCTIONS)]
     else:
         # 함수별로 분석
-        results = []
-        for func_name, func_code in functions.items():
-            prompt = f"""eXBuilder6 함수 분석: '{func_name}' 함수를 분석하세요.
-
-**분석:** 오류, 경고, 개선안, 실행흐름
-
-```javascript
-{func_code}
-```
-
-**응답:**
-## 오류 지점
-- **라인 X**: 구체적 오류
-
-## 경고 지점  
-- **라인 X**: 구체적 경고
-
-## 개선 제안
-- 구체적 수정 코드
-
-## 실행 흐름
-- 단계별 상세 동작 과정"""
-            result = request_llm_fast(prompt) if request.fast_mode else request_llm(prompt)
-            results.append(f"## 함수: {func_name}\n{result}")
+        def review_function(func_name: str, func_code: str) -> List[str]:
+            result = request_llm_template("review_function", func_code, request.fast_mode, request.compact_prompt,
+                                          api_context=build_api_reference(func_code, file_controls), func_name=func_name)
+            return [f"## 함수: {func_name}\n{result}"]
         
-        return {"result": "\n\n".join(results)}
+        return [ReviewUnit(f"함수: {func_name}", partial(review_function, func_name, func_code))
+                for func_name, func_code in functions.items()]
+
+def pack_functions(functions: Dict[str, str], token_budget: int, max_functions: int) -> List[Dict[str, str]]:
+    """함수들을 순서대로 토큰 예산(1토큰 ≈ 4글자) 안에서 묶음으로 분할"""
+    batches = []
+    current: Dict[str, str] = {}
+    current_tokens = 0
+    
+    for func_name, func_code in functions.items():
+        func_tokens = len(func_code) // 4
+        if current and (current_tokens + func_tokens > token_budget or len(current) >= max_functions):
+            batches.append(current)
+            current = {}
+            current_tokens = 0
+        current[func_name] = func_code
+        current_tokens += func_tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+def review_function_batch(batch: Dict[str, str], request: ReviewRequest,
+                          file_controls: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """함수 묶음을 한 번에 분석하고 함수별 결과로 분리 (파싱 실패한 함수는 개별 재시도)
+
+    file_controls: 파일 전체의 app.lookup 선언 (없으면 request.code에서 찾음)
+    """
+    if file_controls is None:
+        file_controls = detect_file_controls(request.code)
+    if len(batch) == 1:
+        func_name, func_code = next(iter(batch.items()))
+        return {func_name: request_llm_template("review_function", func_code, request.fast_mode,
+                                                request.compact_prompt, func_name=func_name,
+                                                api_context=build_api_reference(func_code, file_controls))}
+    
+    # 라인 번호를 함수 기준으로 복원할 수 있도록 함수별로 압축
+    compact = is_compaction_enabled(request.compact_prompt)
+    line_maps = {}
+    sections = []
+    for func_name, func_code in batch.items():
+        if compact:
+            compacted = compact_code(func_code)
+            func_code = compacted.code
+            line_maps[func_name] = compacted.line_map
+        sections.append(f"// === 함수: {func_name} ===\n{func_code}")
+    
+    response = request_llm_template("review_function_batch", "\n\n".join(sections), request.fast_mode, False,
+                                    api_context=build_api_reference("\n\n".join(batch.values()), file_controls),
+                                    count=len(batch), names=", ".join(batch))
+    if response.startswith("[ERROR]"):
+        # 백엔드 오류는 개별 재시도해도 같은 결과이므로 그대로 전달
+        return {func_name: response for func_name in batch}
+    
+    parsed = extract_json(response)
+    results = {}
+    for func_name, func_code in batch.items():
+        entry = parsed.get(func_name) if isinstance(parsed, dict) else None
+        if not isinstance(entry, dict):
+            logger.warning("Batch result missing, retrying individually", extra={"function": func_name})
+            results[func_name] = request_llm_template("review_function", func_code, request.fast_mode,
+                                                      request.compact_prompt, func_name=func_name,
+                                                      api_context=build_api_reference(func_code, file_controls))
+            continue
+        text = format_function_result(entry)
+        if func_name in line_maps:
+            text = restore_line_numbers(text, line_maps[func_name])
+        results[func_name] = text
+    return results
+
+def format_function_result(entry: Dict[str, List[str]]) -> str:
+    """묶음 응답의 함수별 JSON을 기존 마크다운 형식으로 변환"""
+    blocks = []
+    for key, title in BATCH_RESULT_SECTIONS:
+        items = entry.get(key) or []
+        if isinstance(items, str):
+            items = [items]
+        lines = [f"- {item}" for item in items] or ["- 없음"]
+        blocks.append(f"## {title}\n" + "\n".join(lines))
+    return "\n\n".join(blocks)
 
 def split_code_by_functions(code: str):
     """코드를 함수별로 분할"""
@@ -157,16 +219,20 @@ def split_code_by_lines(code: str, max_lines: int = 100):
     return chunks
 
 @router.post("/file")
-async def review_file(file: UploadFile = File(...), fast_mode: bool = False):
-    print(f"[LOG] /api/review/file called (fast_mode: {fast_mode})")
+async def review_file(file: UploadFile = File(...), fast_mode: bool = False,
+                      compact_prompt: Optional[bool] = None):
+    logger.debug("File review requested", extra={"filename": file.filename, "fast_mode": fast_mode})
     if not file.filename.endswith('.js'):
-        print("[LOG] File extension not allowed.")
         raise HTTPException(status_code=400, detail=".js 파일만 업로드 가능합니다.")
-    code = (await file.read()).decode("utf-8")
-    prompt = PROMPT_TEMPLATE.format(code=code)
-    print(f"[LOG] Prompt generated from file. Calling LLM... (fast_mode: {fast_mode})")
-    result = request_llm_fast(prompt) if fast_mode else request_llm(prompt)
-    print("[LOG] LLM call finished. Returning result.")
+    content = await file.read()
+    with memory_phase("decode"):
+        code = content.decode("utf-8")
+    try:
+        result = await asyncio.to_thread(request_llm_template, "review", code, fast_mode, compact_prompt,
+                                         api_context=build_api_reference(code))
+    except StaticFallback as e:
+        return e.result("result")
+    logger.debug("File review finished", extra={"filename": file.filename})
     return {"result": result}
 
 @router.post("/file/fast")
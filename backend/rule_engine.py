@@ -0,0 +1,217 @@
+"""
+정규식 규칙 엔진 (기본/향상된 분석기 공용)
+
+규칙 목록을 모듈 로드 시 한 번만 GuardedPattern으로 컴파일해 두고, 요청마다 같은 규칙 집합을 실행합니다.
+- 원문이 같은 규칙(같은 정규식을 다른 카테고리/메시지로 등록한 경우)은 요청 하나에서 한 번만 검사하고
+  결과를 공유합니다.
+- 시간 예산(regex_guard)과 규칙별 프로파일링(rule_profiler)을 모든 규칙에 같은 방식으로 적용합니다.
+- 검출 위치 → 라인 번호는 LineIndex로 줄바꿈 위치를 한 번만 구해 이진 탐색합니다
+  (검출마다 code[:start].count('\\n')로 앞부분을 다시 세지 않음).
+
+토큰 규칙(tokens)은 토큰 경계를 지키는 정규식으로 바꿔 같은 방식으로 검사한 뒤 문자열/주석 안의 검출을 버립니다.
+
+리터럴 사전 필터: 규칙 집합을 만들 때 정규식마다 모든 검출에 반드시 들어가는 리터럴(예: \.innerHTML\s*= → .innerHTML)을
+추출해 두고, 요청마다 규칙 집합 전체의 서로 다른 리터럴이 코드에 있는지 한 번씩만 확인합니다. requires 또는 추출한
+리터럴이 하나라도 없는 규칙은 정규식을 실행하지 않습니다 (RULE_PREFILTER=false면 추출한 리터럴은 쓰지 않음).
+
+결과는 규칙 순서대로의 RuleHit 목록이며, 각 분석기가 자기 응답 형식(AnalysisIssue / 문자열)으로 변환합니다.
+"""
+
+import bisect
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from js_tokenizer import literal_spans
+from metrics import REGISTRY
+from regex_guard import GuardedPattern, ScanResult
+from rule_profiler import get_rule_profiler
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+rule_category_duration = REGISTRY.histogram(
+    "analyzer_rule_seconds", "오류 패턴 카테고리별 검사 시간", ("category",))
+rule_category_matches = REGISTRY.counter(
+    "analyzer_rule_matches_total", "오류 패턴 카테고리별 검출 수", ("category",))
+rule_prefilter_skips = REGISTRY.counter(
+    "analyzer_rule_prefilter_skipped_total", "필요한 리터럴이 코드에 없어 실행하지 않은 규칙 수", ("analyzer",))
+
+class Rule(NamedTuple):
+    name: str             # 프로파일러/시간 예산 메트릭에 쓰는 이름 (예: xss_security.eval, errors[3])
+    pattern: str          # 토큰 규칙이면 token_pattern(tokens)
+    message: str
+    category: str = "errors"
+    severity: Any = None
+    suggestion: Optional[str] = None
+    tokens: Tuple[str, ...] = ()    # 토큰 규칙: 문자열/주석 밖에서 이 토큰들이 연속으로 나올 때만 검출
+    requires: Tuple[str, ...] = ()  # 코드에 모두 있어야 검사하는 리터럴
+    pack: str = ""
+
+class RuleHit(NamedTuple):
+    rule: Rule
+    guard: GuardedPattern
+    result: ScanResult
+
+_SKIPPED = "skipped"
+
+# 거의 모든 코드에 있는 한 글자 리터럴((, =, . 등)은 거르는 효과가 없어 추출하지 않음
+_MIN_LITERAL_LENGTH = 2
+
+def rule_prefilter_enabled() -> bool:
+    """정규식에서 추출한 리터럴로 규칙을 건너뛸지 (RULE_PREFILTER)"""
+    return os.getenv("RULE_PREFILTER", "true").lower() in ("1", "true", "yes")
+
+def _collect_literals(items, runs: List[str], current: List[str]) -> None:
+    """파싱된 정규식 시퀀스에서 연속된 리터럴 구간을 runs에 모음 (선택적인 부분은 구간을 끊고 건너뜀)"""
+    def flush():
+        if len(current) >= _MIN_LITERAL_LENGTH:
+            runs.append(''.join(current))
+        current.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, _, sub = av
+            if add_flags & re.IGNORECASE:
+                flush()
+            else:
+                _collect_literals(sub, runs, current)
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            _collect_literals(av, runs, current)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None)):
+            flush()
+            minimum, _, sub = av
+            if minimum >= 1:
+                _collect_literals(sub, runs, current)
+                flush()
+        else:
+            # 문자 클래스, 분기, 역참조, 경계/전후방 탐색 등은 고정된 문자열이 아니므로 구간을 끊음
+            flush()
+
+def required_literals(pattern: str) -> Tuple[str, ...]:
+    """정규식의 모든 검출에 반드시 들어가는 리터럴 목록 (분기/대소문자 무시 등으로 알 수 없으면 빈 튜플)"""
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & re.IGNORECASE:
+        return ()
+    runs: List[str] = []
+    current: List[str] = []
+    _collect_literals(parsed, runs, current)
+    if len(current) >= _MIN_LITERAL_LENGTH:
+        runs.append(''.join(current))
+    return tuple(dict.fromkeys(runs))
+
+def _literals_present(literals: Tuple[str, ...], code: str, present: Dict[str, bool]) -> bool:
+    """리터럴이 모두 코드에 있는지 (present에 리터럴별 결과를 기록해 규칙 간에 재사용)"""
+    for literal in literals:
+        found = present.get(literal)
+        if found is None:
+            found = present[literal] = literal in code
+        if not found:
+            return False
+    return True
+
+def token_pattern(tokens: Sequence[str]) -> str:
+    """연속된 토큰 목록 → 사이 공백을 허용하고 식별자 경계를 지키는 정규식"""
+    if not tokens:
+        raise ValueError("토큰 규칙에는 토큰이 하나 이상 필요합니다")
+    pattern = r'\s*'.join(re.escape(token) for token in tokens)
+    if re.match(r'[\w$]', tokens[0]):
+        pattern = r'(?<![\w$])' + pattern
+    if re.search(r'[\w$]$', tokens[-1]):
+        pattern += r'(?![\w$])'
+    return pattern
+
+def _outside_literals(spans: List[Tuple[int, int]], literals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """문자열/주석 구간 밖에서 시작하는 검출만 (literals는 시작 위치 순서)"""
+    starts = [start for start, _ in literals]
+    kept = []
+    for span in spans:
+        index = bisect.bisect_right(starts, span[0]) - 1
+        if index < 0 or literals[index][1] <= span[0]:
+            kept.append(span)
+    return kept
+
+class LineIndex:
+    """문자 위치 → 라인 번호/열 (줄바꿈 위치를 한 번만 계산)"""
+
+    def __init__(self, code: str):
+        self.newlines = [match.start() for match in re.finditer('\n', code)]
+
+    def line(self, offset: int) -> int:
+        """offset이 속한 라인 번호 (1부터, code.count('\\n', 0, offset) + 1과 같음)"""
+        return bisect.bisect_left(self.newlines, offset) + 1
+
+    def column(self, offset: int) -> int:
+        """offset의 라인 안 위치 (0부터)"""
+        line = self.line(offset)
+        return offset if line == 1 else offset - self.newlines[line - 2] - 1
+
+class RuleSet:
+    """한 번 컴파일해 재사용하는 규칙 집합
+
+    category_metrics가 켜져 있으면 카테고리별 검사 시간(analyzer_rule_seconds)과
+    검출 수(analyzer_rule_matches_total)를 기록합니다. guards를 넘기면 같은 원문의 컴파일된 규칙을
+    여러 규칙 집합(프로필별 선택 등)이 공유합니다.
+    """
+
+    def __init__(self, analyzer: str, rules: Iterable[Rule], category_metrics: bool = False,
+                 guards: Optional[Dict[str, GuardedPattern]] = None):
+        self.analyzer = analyzer
+        self.rules = list(rules)
+        self.category_metrics = category_metrics
+        guards = {} if guards is None else guards
+        for rule in self.rules:
+            if rule.pattern not in guards:
+                guards[rule.pattern] = GuardedPattern(rule.name, rule.pattern)
+        self._guards = [guards[rule.pattern] for rule in self.rules]
+        self._extracted = [required_literals(rule.pattern) for rule in self.rules]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def scan(self, code: str, first_only: bool = False) -> List[RuleHit]:
+        """규칙 순서대로 검사 결과 (first_only면 규칙마다 re.search처럼 첫 검출만)"""
+        profiler = get_rule_profiler()
+        prefilter = rule_prefilter_enabled()
+        present: Dict[str, bool] = {}
+        skipped = 0
+        results: Dict[Tuple[int, bool], ScanResult] = {}
+        literals: Optional[List[Tuple[int, int]]] = None
+        hits: List[RuleHit] = []
+        seconds: Dict[str, float] = {}
+        matches: Dict[str, int] = {}
+        for rule, guard, extracted in zip(self.rules, self._guards, self._extracted):
+            started = time.perf_counter()
+            if not (_literals_present(rule.requires, code, present)
+                    and (not prefilter or _literals_present(extracted, code, present))):
+                result = ScanResult([], False, len(code), _SKIPPED)
+                skipped += 1
+            else:
+                key = (id(guard), bool(rule.tokens))
+                result = results.get(key)
+                if result is None:
+                    if rule.tokens:
+                        # 문자열/주석 안의 검출을 버린 뒤 첫 검출을 골라야 하므로 전체를 검사
+                        result = profiler.scan(self.analyzer, guard, code)
+                        if literals is None:
+                            literals = literal_spans(code)
+                        spans = _outside_literals(result.spans, literals)
+                        result = result._replace(spans=spans[:1] if first_only else spans)
+                    else:
+                        result = profiler.scan(self.analyzer, guard, code, first_only=first_only)
+                    results[key] = result
+            hits.append(RuleHit(rule, guard, result))
+            if self.category_metrics:
+                seconds[rule.category] = seconds.get(rule.category, 0.0) + time.perf_counter() - started
+                matches[rule.category] = matches.get(rule.category, 0) + len(result.spans) + result.partial
+        if skipped:
+            rule_prefilter_skips.inc(skipped, analyzer=self.analyzer)
+        for category, elapsed in seconds.items():
+            rule_category_duration.observe(elapsed, category=category)
+            if matches[category]:
+                rule_category_matches.inc(matches[category], category=category)
+        return hits
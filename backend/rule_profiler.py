@@ -0,0 +1,146 @@
+"""
+오류 패턴(정규식) 규칙별 비용 프로파일러
+
+RULE_PROFILING=true로 켜거나 POST /api/admin/rule-profile {"enabled": true}로 실행 중에 켜면
+PerformanceOptimizedAnalyzer(규칙 팩)와 js_analyzer.check_errors의 규칙마다
+누적 시간, 호출 수, 검출 수, 검사한 글자 수를 요청 간에 누적합니다.
+꺼져 있으면 기존과 같은 경로로 검사합니다 (시간 측정 없음).
+
+- GET /api/admin/rule-profile: 누적 시간이 큰 순서의 규칙 목록
+- DELETE /api/admin/rule-profile: 누적값 초기화
+- CLI: python backend/rule_profiler.py test_example.js --repeat 20
+       python backend/rule_profiler.py --server http://localhost:8000
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from regex_guard import GuardedPattern, ScanResult
+
+class RuleStats:
+    __slots__ = ("analyzer", "rule", "pattern", "calls", "seconds", "max_seconds", "matches", "chars_scanned")
+
+    def __init__(self, analyzer: str, rule: str, pattern: str):
+        self.analyzer = analyzer
+        self.rule = rule
+        self.pattern = pattern
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.matches = 0
+        self.chars_scanned = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "analyzer": self.analyzer,
+            "rule": self.rule,
+            "pattern": self.pattern,
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "avg_ms": round(self.seconds / self.calls * 1000, 4) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 4),
+            "matches": self.matches,
+            "chars_scanned": self.chars_scanned,
+            # 100만 글자를 검사하는 데 걸리는 시간 (입력 크기와 무관하게 규칙끼리 비교)
+            "ms_per_mchar": round(self.seconds * 1000 / (self.chars_scanned / 1_000_000), 3) if self.chars_scanned else 0.0,
+        }
+
+class RuleProfiler:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stats: Dict[tuple, RuleStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, analyzer: str, rule: str, pattern: str, seconds: float, matches: int, chars_scanned: int):
+        key = (analyzer, rule)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RuleStats(analyzer, rule, pattern)
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.matches += matches
+            stats.chars_scanned += chars_scanned
+
+    def scan(self, analyzer: str, rule: GuardedPattern, code: str, first_only: bool = False) -> ScanResult:
+        """시간 예산을 적용한 규칙 검사 (프로파일링 중이면 시간/검출 수/검사한 글자 수 기록)
+
+        규칙마다 code를 잘라 UTF-8로 인코딩하면 입력 크기 x 규칙 수만큼 복사가 생기므로
+        바이트 대신 정규식이 실제로 다루는 단위인 글자 수를 기록합니다.
+        """
+        if not self.enabled:
+            return rule.scan(code, first_only=first_only)
+        started = time.perf_counter()
+        result = rule.scan(code, first_only=first_only)
+        self.record(analyzer, rule.name, rule.pattern, time.perf_counter() - started,
+                    len(result.spans), result.scanned)
+        return result
+
+    def report(self, limit: Optional[int] = None, analyzer: Optional[str] = None) -> List[Dict]:
+        """누적 시간이 큰 순서의 규칙별 통계"""
+        with self._lock:
+            rows = [stats.to_dict() for stats in self._stats.values()
+                    if analyzer is None or stats.analyzer == analyzer]
+        rows.sort(key=lambda row: row["seconds"], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+def format_report(rows: List[Dict]) -> str:
+    """CLI 출력용 표"""
+    header = f"{'analyzer':<9} {'rule':<24} {'calls':>6} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'matches':>8} {'ms/Mchar':>9}  pattern"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(f"{row['analyzer']:<9} {row['rule']:<24} {row['calls']:>6} {row['seconds'] * 1000:>10.2f} "
+                     f"{row['avg_ms']:>8.3f} {row['max_ms']:>8.3f} {row['matches']:>8} {row['ms_per_mchar']:>9.1f}  {row['pattern']}")
+    return "\n".join(lines)
+
+_profiler = RuleProfiler(os.getenv("RULE_PROFILING", "false").lower() in ("1", "true", "yes"))
+
+def get_rule_profiler() -> RuleProfiler:
+    return _profiler
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="오류 패턴 규칙별 비용 보고서")
+    parser.add_argument("files", nargs="*", help="분석할 JavaScript 파일 (두 분석기의 오류 검사를 실행해 측정)")
+    parser.add_argument("--repeat", type=int, default=10, help="파일마다 반복 실행 횟수")
+    parser.add_argument("--server", help="실행 중인 서버의 누적 통계 조회 (예: http://localhost:8000)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 규칙 수 (0이면 전체)")
+    args = parser.parse_args(argv)
+
+    if args.server:
+        import requests
+        response = requests.get(f"{args.server.rstrip('/')}/api/admin/rule-profile", timeout=10)
+        response.raise_for_status()
+        body = response.json()
+        if not body["enabled"]:
+            print("⚠️ 서버의 규칙 프로파일링이 꺼져 있습니다 (RULE_PROFILING=true 또는 POST /api/admin/rule-profile)")
+        rows = body["rules"][:args.top or None]
+    else:
+        if not args.files:
+            parser.error("분석할 파일 또는 --server를 지정하세요")
+        from enhanced_js_analyzer import PerformanceOptimizedAnalyzer
+        from js_analyzer import check_errors
+        # 스크립트로 실행하면 이 모듈이 __main__이므로 분석기가 쓰는 모듈의 프로파일러를 사용
+        from rule_profiler import get_rule_profiler
+
+        profiler = get_rule_profiler()
+        profiler.enabled = True
+        analyzer = PerformanceOptimizedAnalyzer()
+        for path in args.files:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+            for _ in range(args.repeat):
+                analyzer.check_errors_optimized(code)
+                check_errors(code)
+        rows = profiler.report(limit=args.top or None)
+    print(format_report(rows))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+선언형 규칙 팩 레지스트리 (향상된 분석기 오류 패턴)
+
+config/rules/*.yaml 규칙 팩을 프로세스당 한 번 읽어 Rule로 만들고, 같은 원문의 규칙은
+GuardedPattern 하나를 모든 선택(프로필/요청별 규칙 집합)이 공유합니다. 요청은 프로필과
+rules/disabled_rules 선택자로 실행할 규칙만 고르며, 고른 결과는 RuleSet으로 캐시합니다.
+
+- 선택자: 규칙 id, 카테고리, 팩 이름 (카테고리/팩은 enabled: false 규칙을 포함하지 않음)
+- 프로필: include(없으면 기본 활성 규칙 전체)에서 exclude를 뺀 규칙
+- 요청: rules가 있으면 프로필 대신 그 규칙만, disabled_rules는 결과에서 제외
+- RULE_PACKS_DIR: 규칙 팩 디렉토리 (기본 backend/config/rules)
+- RULE_PROFILE: 요청에 rule_profile이 없을 때 쓰는 프로필 (기본 default)
+- POST /api/admin/rules/reload: 파일 수정 후 재시작 없이 다시 로드
+"""
+
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import yaml
+from rule_engine import Rule, RuleSet, required_literals, token_pattern
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_DIR = Path(__file__).parent / "config" / "rules"
+DEFAULT_PROFILE = "default"
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+
+# 선택 결과 캐시 상한 (요청마다 다른 조합이 들어와도 메모리가 늘지 않도록)
+_SELECTION_CACHE_SIZE = 128
+
+def rule_packs_dir() -> Path:
+    """규칙 팩 디렉토리 (RULE_PACKS_DIR)"""
+    return Path(os.getenv("RULE_PACKS_DIR") or DEFAULT_RULES_DIR)
+
+def default_rule_profile() -> str:
+    """요청에 프로필이 없을 때 쓰는 프로필 (RULE_PROFILE)"""
+    return os.getenv("RULE_PROFILE") or DEFAULT_PROFILE
+
+def _string_list(value: Any, field: str, owner: str) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+        raise ValueError(f"{owner}: {field}는 문자열 목록이어야 합니다")
+    return tuple(value)
+
+def _compile_rule(entry: Dict[str, Any], pack: str, suggestions: Dict[str, str]) -> Rule:
+    """규칙 팩 항목 하나 → Rule (필드 검증 포함)"""
+    rule_id = entry.get("id")
+    if not isinstance(rule_id, str) or not rule_id:
+        raise ValueError(f"{pack}: id가 없는 규칙이 있습니다")
+    owner = f"{pack}:{rule_id}"
+    for field in ("category", "message"):
+        if not isinstance(entry.get(field), str) or not entry[field]:
+            raise ValueError(f"{owner}: {field}가 필요합니다")
+    severity = entry.get("severity")
+    if severity not in SEVERITIES:
+        raise ValueError(f"{owner}: severity는 {', '.join(SEVERITIES)} 중 하나여야 합니다")
+    if ("pattern" in entry) == ("tokens" in entry):
+        raise ValueError(f"{owner}: pattern과 tokens 중 하나만 지정해야 합니다")
+    tokens = _string_list(entry.get("tokens"), "tokens", owner)
+    pattern = token_pattern(tokens) if tokens else entry["pattern"]
+    try:
+        re.compile(pattern)
+    except re.error as error:
+        raise ValueError(f"{owner}: 정규식 오류 ({error})") from error
+    category = entry["category"]
+    return Rule(
+        name=rule_id,
+        pattern=pattern,
+        message=entry["message"],
+        category=category,
+        severity=severity,
+        suggestion=entry.get("suggestion") or suggestions.get(category),
+        tokens=tokens,
+        requires=_string_list(entry.get("requires"), "requires", owner),
+        pack=pack,
+    )
+
+class RuleRegistry:
+    """규칙 팩 전체와 프로필 (선택 결과 RuleSet을 캐시)"""
+
+    def __init__(self, packs: Iterable[Dict[str, Any]], analyzer: str = "enhanced"):
+        self.analyzer = analyzer
+        self.rules: List[Rule] = []
+        self.disabled: Set[str] = set()  # enabled: false (id로 지정할 때만 실행)
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self.packs: Dict[str, int] = {}
+        for document in packs:
+            self._add_pack(document)
+        self._by_id = {rule.name: rule for rule in self.rules}
+        self._categories = {rule.category for rule in self.rules}
+        self._guards: Dict[str, Any] = {}
+        self._selections: Dict[Tuple[str, ...], RuleSet] = {}
+        self._lock = threading.Lock()
+        # 모든 규칙을 한 번 컴파일해 두고 이후 선택은 컴파일된 규칙을 공유
+        RuleSet(analyzer, self.rules, guards=self._guards)
+
+    @classmethod
+    def from_directory(cls, path: Optional[Path] = None) -> "RuleRegistry":
+        path = Path(path) if path is not None else rule_packs_dir()
+        files = sorted(path.glob("*.yaml"))
+        if not files:
+            raise ValueError(f"규칙 팩이 없습니다: {path}")
+        documents = []
+        for file in files:
+            with open(file, "r", encoding="utf-8") as f:
+                document = yaml.safe_load(f) or {}
+            document.setdefault("pack", file.stem)
+            documents.append(document)
+        registry = cls(documents)
+        logger.info("Rule packs loaded", extra={"rules": len(registry.rules), "packs": len(files), "path": str(path)})
+        return registry
+
+    def _add_pack(self, document: Dict[str, Any]) -> None:
+        pack = document.get("pack")
+        if not isinstance(pack, str) or not pack:
+            raise ValueError("규칙 팩에는 pack 이름이 필요합니다")
+        if pack in self.packs:
+            raise ValueError(f"중복된 규칙 팩: {pack}")
+        suggestions = document.get("suggestions") or {}
+        ids = {rule.name for rule in self.rules}
+        entries = document.get("rules") or []
+        for entry in entries:
+            rule = _compile_rule(entry, pack, suggestions)
+            if rule.name in ids:
+                raise ValueError(f"중복된 규칙 id: {rule.name}")
+            ids.add(rule.name)
+            self.rules.append(rule)
+            if entry.get("enabled", True) is False:
+                self.disabled.add(rule.name)
+        self.packs[pack] = len(entries)
+        for name, profile in (document.get("profiles") or {}).items():
+            if name in self.profiles:
+                raise ValueError(f"중복된 프로필: {name}")
+            profile = profile or {}
+            self.profiles[name] = {
+                "description": profile.get("description", ""),
+                "include": _string_list(profile.get("include"), "include", f"profile {name}"),
+                "exclude": _string_list(profile.get("exclude"), "exclude", f"profile {name}"),
+                "pack": pack,
+            }
+
+    def resolve(self, selectors: Iterable[str]) -> Set[str]:
+        """선택자 목록 → 규칙 id 집합 (알 수 없는 선택자는 ValueError)"""
+        names: Set[str] = set()
+        for selector in selectors:
+            if selector in self._by_id:
+                names.add(selector)
+            elif selector in self._categories or selector in self.packs:
+                names.update(rule.name for rule in self.rules
+                             if selector in (rule.category, rule.pack) and rule.name not in self.disabled)
+            else:
+                raise ValueError(f"알 수 없는 규칙 선택자: {selector}")
+        return names
+
+    def selected_names(self, profile: Optional[str] = None, rules: Optional[Iterable[str]] = None,
+                       disabled: Optional[Iterable[str]] = None) -> Set[str]:
+        """프로필/요청 선택자로 실행할 규칙 id 집합"""
+        profile = profile or default_rule_profile()
+        if profile not in self.profiles and profile != DEFAULT_PROFILE:
+            raise ValueError(f"알 수 없는 규칙 프로필: {profile}")
+        if rules:
+            names = self.resolve(rules)
+        else:
+            settings = self.profiles.get(profile, {})
+            if settings.get("include"):
+                names = self.resolve(settings["include"])
+            else:
+                names = {rule.name for rule in self.rules if rule.name not in self.disabled}
+            names -= self.resolve(settings.get("exclude", ()))
+        if disabled:
+            names -= self.resolve(disabled)
+        return names
+
+    def select(self, profile: Optional[str] = None, rules: Optional[Iterable[str]] = None,
+               disabled: Optional[Iterable[str]] = None) -> RuleSet:
+        """선택한 규칙만 담은 RuleSet (같은 조합은 캐시된 RuleSet 재사용)"""
+        names = self.selected_names(profile, rules, disabled)
+        key = tuple(rule.name for rule in self.rules if rule.name in names)
+        with self._lock:
+            rule_set = self._selections.get(key)
+            if rule_set is None:
+                if len(self._selections) >= _SELECTION_CACHE_SIZE:
+                    self._selections.clear()
+                rule_set = RuleSet(self.analyzer, [self._by_id[name] for name in key],
+                                   category_metrics=True, guards=self._guards)
+                self._selections[key] = rule_set
+            return rule_set
+
+    def describe(self) -> Dict[str, Any]:
+        """관리 API용 요약 (팩, 프로필, 규칙 목록)"""
+        return {
+            "directory": str(rule_packs_dir()),
+            "default_profile": default_rule_profile(),
+            "packs": dict(self.packs),
+            "profiles": {
+                name: {key: list(value) if isinstance(value, tuple) else value for key, value in profile.items()}
+                for name, profile in self.profiles.items()
+            },
+            "rules": [
+                {
+                    "id": rule.name,
+                    "pack": rule.pack,
+                    "category": rule.category,
+                    "severity": rule.severity,
+                    "message": rule.message,
+                    "matcher": "tokens" if rule.tokens else "pattern",
+                    "requires": list(rule.requires),
+                    "literals": list(required_literals(rule.pattern)),
+                    "enabled": rule.name not in self.disabled,
+                }
+                for rule in self.rules
+            ],
+        }
+
+_registry: Optional[RuleRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_rule_registry() -> RuleRegistry:
+    """규칙 팩 레지스트리 (프로세스당 한 번 로드)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RuleRegistry.from_directory()
+        return _registry
+
+def reload_rule_registry() -> RuleRegistry:
+    """규칙 팩을 다시 읽어 교체 (읽기/검증에 실패하면 기존 레지스트리 유지)"""
+    global _registry
+    registry = RuleRegistry.from_directory()
+    with _registry_lock:
+        _registry = registry
+    return registry
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+eXBuilder6 API 참고 정보 검색 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from api_reference import estimate_tokens, get_api_reference
+import review
+from enhanced_js_analyzer import _shared_api_validator, build_api_reference, detect_file_controls
+from prompt_templates import get_template
+
+TEST_CODE = """function onSearch() {
+    var grid = app.lookup("grdList");
+    var btn = app.lookup("btnSave");
+    grid.adRow();
+    grid.getCellValue(0, "name");
+    btn.setText("저장");
+    app.showMessage("완료");
+}
+"""
+
+def test_relevant_subset():
+    """감지된 컨트롤/메서드에 관련된 부분만 포함하는지 테스트"""
+    context = build_api_reference(TEST_CODE)
+    print(context)
+
+    assert "grd.adRow: 존재하지 않는 메서드 (유사: addRow" in context
+    assert "Grid 컨트롤 (grd) 메서드: getCellValue, addRow" in context
+    assert "Button 컨트롤 (btn) 메서드: setText" in context
+    assert "메시지 API: showMessage" in context
+    # 사용하지 않은 컨트롤은 포함하지 않음
+    assert "ComboBox" not in context and "데이터 API" not in context
+    print("✅ 관련 API만 선택 성공")
+
+def test_token_budget():
+    """토큰 예산을 넘지 않고 우선순위가 높은 항목을 남기는지 테스트"""
+    full = get_api_reference().render({"grd": ["adRow"], "btn": ["setText"]}, budget_tokens=2000)
+    small = get_api_reference().render({"grd": ["adRow"], "btn": ["setText"]}, budget_tokens=120)
+    print(small)
+
+    assert estimate_tokens(small) <= 120 < estimate_tokens(full)
+    assert "grd.adRow" in small
+    # 같은 우선순위의 컨트롤 메서드 목록은 예산을 나눠 가짐
+    assert "Grid 컨트롤 (grd) 메서드" in small and "Button 컨트롤 (btn) 메서드" in small
+    assert get_api_reference().render({"grd": []}, budget_tokens=0) is None
+    assert build_api_reference("var total = items.push(1);") is None
+    print("✅ 토큰 예산 적용 성공")
+
+def test_partial_code_uses_file_declarations():
+    """함수 단위 리뷰에서도 파일의 app.lookup 선언으로 컨트롤 타입을 찾는지 테스트"""
+    source = 'var combo = app.lookup("cmbType");\nfunction onChange() {\n    combo.getSelectedValue();\n}\n'
+    func_code = source.split("\n", 1)[1]
+    assert build_api_reference(func_code) is None
+    context = build_api_reference(func_code, detect_file_controls(source))
+    assert "ComboBox 컨트롤 (cmb) 메서드: getSelectedValue" in context
+    print("✅ 전체 코드 선언 참조 성공")
+
+def test_large_review_scans_file_once():
+    """분할 리뷰에서 파일 전체의 app.lookup 선언은 한 번만 찾는지 테스트"""
+    source = 'var combo = app.lookup("cmbType");\n' + "".join(
+        f"function f{i}() {{\n    combo.getSelectedValue({i});\n{'    // 주석' * 40}\n}}\n" for i in range(40))
+    validator = _shared_api_validator()
+    scanned = []
+    original_detect, original_request = validator.detect_usage, review.request_llm_template
+    validator.detect_usage = lambda code: scanned.append(len(code)) or original_detect(code)
+    contexts = []
+    review.request_llm_template = lambda *args, api_context=None, **kwargs: contexts.append(api_context) or "ok"
+    try:
+        for batch_functions in (False, True):
+            scanned.clear()
+            contexts.clear()
+            request = review.ReviewRequest(code=source, batch_functions=batch_functions)
+            for unit in review.plan_review(request):
+                unit.run()
+            assert scanned.count(len(source)) == 1 and len(scanned) > 1
+            assert contexts and all("ComboBox 컨트롤 (cmb) 메서드: getSelectedValue" in context
+                                    for context in contexts)
+    finally:
+        validator.detect_usage, review.request_llm_template = original_detect, original_request
+    print("✅ 분할 리뷰 전체 코드 선언 1회 검색 성공")
+
+def test_prompt_layout():
+    """참고 정보는 헤더 다음, 코드는 마지막에 위치하는지 테스트"""
+    prompt = get_template("enhanced_analysis").render("grid.addRow();", "**eXBuilder6 API 참고**")
+    assert prompt.index("**분석할 코드:**") < prompt.index("**eXBuilder6 API 참고**") < prompt.index("```javascript")
+    assert "Grid 컨트롤" not in get_template("legacy_analysis").system
+    print("✅ 프롬프트 구성 성공")
+
+if __name__ == "__main__":
+    test_relevant_subset()
+    test_token_budget()
+    test_partial_code_uses_file_declarations()
+    test_large_review_scans_file_once()
+    test_prompt_layout()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+합성 코퍼스 생성기와 분석기 벤치마크 테스트 스크립트 (작은 크기로 하네스 동작만 확인)
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from exb_corpus import generate_screen_script, parse_size, format_size
+from benchmark import PATHS, compare, run_benchmarks
+
+def test_corpus_generator():
+    """크기/재현성/eXBuilder6 구문 포함 여부 테스트"""
+    assert parse_size("1k") == 1024 and parse_size("10MB") == 10 * 1024 * 1024 and parse_size("500") == 500
+    assert format_size(1024 * 1024) == "1MB" and format_size(1500) == "1500B"
+    code = generate_screen_script(20 * 1024, seed=1)
+    assert len(code) >= 20 * 1024
+    assert code == generate_screen_script(20 * 1024, seed=1)
+    assert code != generate_screen_script(20 * 1024, seed=2)
+    for snippet in ("app.lookup(", "function ", ".send()", "_onCellClick", "_onSelectionChanged"):
+        assert snippet in code, snippet
+    print("✅ 코퍼스 생성기 성공")
+
+def test_run_benchmarks():
+    """모든 경로가 작은 입력에서 실행되고 처리량/메모리를 기록하는지 테스트"""
+    report = run_benchmarks(sizes=["2k"], repeat=1)
+    assert set(result["path"] for result in report["results"].values()) == set(PATHS)
+    for result in report["results"].values():
+        assert result["lines"] > 0 and result["lines_per_second"] > 0
+        assert result["peak_mb"] is not None
+    assert report["calibration_seconds"] > 0
+    print("✅ 벤치마크 실행 성공")
+
+def test_compare_baseline():
+    """보정된 처리량 비교와 회귀/잡음 판정 테스트"""
+    def report(calibration, **results):
+        return {"calibration_seconds": calibration, "results": {
+            key: {"seconds": seconds, "lines_per_second": 1000 / seconds, "peak_mb": peak}
+            for key, (seconds, peak) in results.items()}}
+
+    baseline = report(0.01, fast=(0.1, 10.0), slow=(0.1, 10.0), fat=(0.1, 10.0), tiny=(0.001, 1.0))
+    # 기계가 두 배 느려져(보정 시간 2배) 모든 측정이 두 배가 됨 → slow만 실제 회귀
+    current = report(0.02, fast=(0.2, 10.0), slow=(0.4, 10.0), fat=(0.2, 20.0), tiny=(0.01, 1.0))
+    rows = {row["key"]: row for row in compare(current, baseline)}
+    assert set(rows) == {"fast", "slow", "fat"}
+    assert not rows["fast"]["regression"] and abs(rows["fast"]["throughput_change"]) < 0.01
+    assert rows["slow"]["regression"] and rows["slow"]["throughput_change"] == -0.5
+    assert rows["fat"]["regression"] and rows["fat"]["memory_change"] == 1.0
+    print("✅ 기준선 비교 성공")
+
+if __name__ == "__main__":
+    test_corpus_generator()
+    test_run_benchmarks()
+    test_compare_baseline()
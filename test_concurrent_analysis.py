@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+정적 분석/LLM 동시 실행 및 스트리밍 응답 테스트 스크립트 (로컬 스텁 LLM 서버 사용)
+"""
+
+import sys
+import os
+import asyncio
+import json
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+import llm_pool
+import llm_resilience
+from main import app
+from enhanced_js_analyzer import JavaScriptAnalysisRequest, analyze_javascript_detailed_stream
+from mock_llm_server import MockLLMConfig, MockLLMServer
+
+TEST_CODE = """
+function onLoad() {
+    var grid = app.lookup("grd1");
+    eval("grid.refresh()");
+}
+"""
+
+def run_with_stub(delay: float, test):
+    """응답까지 delay초 걸리는 모의 LLM 서버를 띄우고 test(client, server) 실행"""
+    server = MockLLMServer(MockLLMConfig(latency_ms=delay * 1000, tokens_per_second=0, content=("LLM 분석 결과",))).start()
+    os.environ["LLM_MODE"] = "lmstudio"
+    os.environ["LMSTUDIO_ENDPOINTS"] = server.url
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+    try:
+        test(TestClient(app), server)
+    finally:
+        os.environ.pop("LLM_MODE", None)
+        os.environ.pop("LMSTUDIO_ENDPOINTS", None)
+        llm_pool.reset_lmstudio_pool()
+        server.stop()
+
+def test_legacy_analyze_llm_opt_in():
+    """기본 /api/js/analyze는 LLM을 호출하지 않고, include_llm=true일 때만 호출하는지 테스트"""
+    def check(client, server):
+        quick = client.post("/api/js/analyze", json={"code": TEST_CODE}).json()
+        assert server.stats()["requests"] == 0
+        assert quick["llm_analysis"] is None
+
+        full = client.post("/api/js/analyze", json={"code": TEST_CODE, "include_llm": True}).json()
+        assert server.stats()["requests"] == 1
+        assert full["llm_analysis"] == "LLM 분석 결과"
+        assert full["errors"] == quick["errors"]
+        print("✅ 레거시 /analyze LLM 선택 호출 성공")
+
+    run_with_stub(0, check)
+
+def test_detailed_stream_static_first():
+    """스트리밍 상세 분석이 LLM 응답 전에 정적 분석 결과를 보내는지 테스트"""
+    async def read_stream():
+        # TestClient는 스트리밍 응답을 모아서 반환하므로 응답 본문을 직접 읽어 도착 시각 측정
+        started = time.perf_counter()
+        response = await analyze_javascript_detailed_stream(JavaScriptAnalysisRequest(code=TEST_CODE))
+        return [(time.perf_counter() - started, json.loads(chunk)) async for chunk in response.body_iterator]
+
+    def check(client, _):
+        (static_at, static_part), (llm_at, llm_part) = asyncio.run(read_stream())
+        print(f"정적 분석 {static_at:.2f}s, LLM {llm_at:.2f}s")
+        assert static_part["phase"] == "static" and static_part["llm_analysis"] is None
+        assert llm_part["phase"] == "llm" and llm_part["llm_analysis"] == "LLM 분석 결과"
+        assert static_at < 0.5 <= llm_at
+        assert static_part["statistics"]["total_issues"] > 0
+        print("✅ 정적 분석 결과 우선 스트리밍 성공")
+
+    run_with_stub(0.6, check)
+
+def test_detailed_runs_concurrently():
+    """상세 분석 응답 시간이 LLM 지연과 비슷한지(정적 분석과 합산되지 않는지) 테스트"""
+    def check(client, _):
+        started = time.perf_counter()
+        result = client.post("/api/enhanced-js/analyze/detailed", json={"code": TEST_CODE}).json()
+        elapsed = time.perf_counter() - started
+        assert result["llm_analysis"] == "LLM 분석 결과"
+        assert elapsed < 0.9
+        print(f"✅ 상세 분석 동시 실행 ({elapsed:.2f}s)")
+
+    run_with_stub(0.6, check)
+
+if __name__ == "__main__":
+    test_legacy_analyze_llm_opt_in()
+    test_detailed_stream_static_first()
+    test_detailed_runs_concurrently()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+비동기 작업 API 테스트 스크립트 (로컬 스텁 LLM 서버 사용)
+"""
+
+import sys
+import os
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+import llm_pool
+import llm_resilience
+from main import app
+from mock_llm_server import MockLLMConfig, MockLLMServer
+
+def start_stub_server(delay: float = 0.0) -> MockLLMServer:
+    """고정 리뷰 응답("문제 없음")을 delay초 뒤에 보내는 모의 LLM 서버"""
+    config = MockLLMConfig(latency_ms=delay * 1000, tokens_per_second=0, parallel=16, content=("문제 없음",))
+    return MockLLMServer(config).start()
+
+def large_code(functions: int) -> str:
+    """함수별 분할 대상이 되는 3000 토큰 이상의 코드"""
+    body = "    var value = app.lookup('grd1').getValue(0, 'COLUMN_NAME_' + index);\n" * 40
+    return "\n".join(f"function handler{i}(index) {{\n{body}}}\n" for i in range(functions))
+
+def wait_for(client: TestClient, job_id: str, statuses: tuple, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"작업 상태가 {statuses}가 되지 않았습니다: {job}")
+
+def setup_llm(url: str):
+    os.environ["LLM_MODE"] = "lmstudio"
+    os.environ["LMSTUDIO_ENDPOINTS"] = url
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+
+def teardown_llm(server):
+    os.environ.pop("LLM_MODE", None)
+    os.environ.pop("LMSTUDIO_ENDPOINTS", None)
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+    server.stop()
+
+def test_review_job_progress():
+    """리뷰 작업이 함수 단위 진행률과 최종 결과를 보고하는지 테스트"""
+    server = start_stub_server(delay=0.05)
+    setup_llm(server.url)
+    try:
+        with TestClient(app) as client:
+            created = client.post("/api/jobs", json={"kind": "review", "payload": {"code": large_code(6)}})
+            assert created.status_code == 200
+            job_id = created.json()["job_id"]
+
+            running = wait_for(client, job_id, ("running", "completed"))
+            print(f"진행 상황: {running['progress']}")
+
+            job = wait_for(client, job_id, ("completed",))
+            assert job["progress"] == {"done": 6, "total": 6, "current": None}
+            assert job["result"]["result"].count("## 함수: handler") == 6
+            print("✅ 리뷰 작업 완료 및 진행률 보고 성공")
+    finally:
+        teardown_llm(server)
+
+def test_cancel_job():
+    """실행 중인 작업 취소 시 부분 결과가 남는지 테스트"""
+    server = start_stub_server(delay=0.2)
+    setup_llm(server.url)
+    try:
+        with TestClient(app) as client:
+            job_id = client.post("/api/jobs", json={"kind": "review", "payload": {"code": large_code(10)}}).json()["job_id"]
+            job = wait_for(client, job_id, ("running",))
+            while job["progress"]["done"] < 1:
+                time.sleep(0.05)
+                job = client.get(f"/api/jobs/{job_id}").json()
+            client.delete(f"/api/jobs/{job_id}")
+            job = wait_for(client, job_id, ("cancelled",))
+            assert job["error"] == "job_cancelled"
+            assert "## 함수: handler0" in job["partial_result"]["result"]
+            assert job["progress"]["done"] < 10
+            print(f"✅ 작업 취소 성공 (완료 {job['progress']['done']}/10)")
+    finally:
+        teardown_llm(server)
+
+def test_unknown_job():
+    """지원하지 않는 작업 종류와 없는 작업 ID 처리 테스트"""
+    with TestClient(app) as client:
+        assert client.post("/api/jobs", json={"kind": "unknown", "payload": {}}).status_code == 400
+        assert client.get("/api/jobs/missing").status_code == 404
+        print("✅ 잘못된 작업 요청 처리 성공")
+
+if __name__ == "__main__":
+    test_review_job_progress()
+    test_cancel_job()
+    test_unknown_job()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+LLM 요청 취소(데드라인/연결 종료) 테스트 스크립트 (스트리밍 스텁 서버 사용)
+"""
+
+import sys
+import os
+import threading
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+import llm_pool
+import llm_resilience
+from llm_cancel import CancelToken, LLMCancelled, _current_token
+from llm_client import request_llm
+from mock_llm_server import MockLLMConfig, MockLLMServer
+from main import app
+
+def start_streaming_server(chunks: int, delay: float) -> MockLLMServer:
+    """토큰 chunks개를 delay초 간격으로 스트리밍하는 모의 LLM 서버 (연결이 끊기면 server.aborted 설정)"""
+    config = MockLLMConfig(latency_ms=0, tokens_per_second=1 / delay if delay else 0,
+                           content=tuple(f"토큰{index} " for index in range(chunks)))
+    return MockLLMServer(config).start()
+
+def use_endpoint(url: str):
+    os.environ["LMSTUDIO_ENDPOINTS"] = url
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+
+def test_streaming_response():
+    """스트리밍 응답을 하나의 결과로 합치는지 테스트"""
+    server = start_streaming_server(chunks=3, delay=0)
+    use_endpoint(server.url)
+    try:
+        assert request_llm("ping", mode="lmstudio") == "토큰0 토큰1 토큰2"
+        print("✅ 스트리밍 응답 병합 성공")
+    finally:
+        server.stop()
+
+def test_cancel_aborts_generation():
+    """토큰 취소 시 스트림을 닫아 생성이 중단되는지 테스트"""
+    server = start_streaming_server(chunks=200, delay=0.02)
+    use_endpoint(server.url)
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel, args=("client_disconnected",)).start()
+    context_token = _current_token.set(token)
+    started = time.perf_counter()
+    try:
+        request_llm("ping", mode="lmstudio")
+        assert False, "LLMCancelled 예외가 발생해야 합니다"
+    except LLMCancelled as e:
+        assert e.reason == "client_disconnected"
+    finally:
+        _current_token.reset(context_token)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 1.0
+    assert server.aborted.wait(2.0), "스텁 서버가 연결 종료를 감지하지 못했습니다"
+    assert llm_pool.get_lmstudio_pool().status()[0]["outstanding"] == 0
+    print(f"✅ 취소 후 생성 중단 ({elapsed:.2f}s)")
+    server.stop()
+
+def test_request_deadline_header():
+    """X-Request-Timeout 초과 시 504를 반환하는지 테스트"""
+    server = start_streaming_server(chunks=200, delay=0.02)
+    use_endpoint(server.url)
+    os.environ["LLM_MODE"] = "lmstudio"
+    try:
+        client = TestClient(app)
+        started = time.perf_counter()
+        response = client.post("/api/review/text", json={"code": "var a = 1;"},
+                               headers={"X-Request-Timeout": "0.3"})
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 504
+        assert elapsed < 2.0
+        assert server.aborted.wait(2.0)
+        cancelled = client.get("/api/metrics").json()["http_requests_cancelled_total"]
+        assert any(sample["labels"]["reason"] == "deadline" for sample in cancelled)
+        print(f"✅ 데드라인 초과 시 504 ({elapsed:.2f}s)")
+    finally:
+        os.environ.pop("LLM_MODE", None)
+        os.environ.pop("LMSTUDIO_ENDPOINTS", None)
+        llm_pool.reset_lmstudio_pool()
+        llm_resilience.reset_breakers()
+        server.stop()
+
+if __name__ == "__main__":
+    test_streaming_response()
+    test_cancel_aborts_generation()
+    test_request_deadline_header()
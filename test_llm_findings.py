@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+LLM findings 응답 파싱/병합과 /analyze/explain 엔드포인트 테스트 스크립트 (LLM 호출은 가짜 함수로 대체)
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+import enhanced_js_analyzer
+from enhanced_js_analyzer import IssueSeverity, PerformanceOptimizedAnalyzer, merge_llm_issues, parse_llm_findings
+from main import app
+
+def test_parse_llm_findings():
+    """코드 블록 JSON, 잘못된 JSON, 알 수 없는 심각도 처리를 테스트"""
+    text = """분석 결과입니다.
+```json
+[
+  {"line": 3, "severity": "HIGH", "category": "security", "message": "eval 사용"},
+  {"line": 0, "severity": "urgent", "message": "알 수 없는 심각도"},
+  {"line": "7", "severity": "low", "category": "style"},
+  "문자열 항목"
+]
+```"""
+    issues = parse_llm_findings(text)
+    assert [(issue.line_number, issue.severity, issue.category, issue.priority) for issue in issues] == [
+        (3, IssueSeverity.HIGH, "security", "HIGH"),
+        (None, IssueSeverity.MEDIUM, "llm", "MEDIUM"),
+    ]
+    assert all(issue.source == "llm" for issue in issues)
+    # {"findings": [...]} 형태도 허용
+    wrapped = parse_llm_findings('{"findings": [{"line": 2, "severity": "critical", "message": "x"}]}')
+    assert [(issue.line_number, issue.severity) for issue in wrapped] == [(2, IssueSeverity.CRITICAL)]
+    for broken in ('[{"line": 1, "message": "잘린 응답"', "이슈 없음", "", '"문자열"'):
+        assert parse_llm_findings(broken) == [], broken
+    print("✅ LLM findings 파싱 성공")
+
+def test_merge_llm_issues():
+    """정적 분석과 같은 라인/카테고리의 LLM 이슈를 제외하고 병합하는지 테스트 (정적 분석 카테고리는 LLM 카테고리로 매핑)"""
+    code = "var total = 0;\neval(input);\nif (ready = true) { run(); }\n"
+    static = PerformanceOptimizedAnalyzer().check_errors_optimized(code)
+    assert {(issue.line_number, issue.category) for issue in static} >= {(2, "xss_security"), (3, "comparison_issues")}
+    llm = parse_llm_findings("""[
+      {"line": 2, "severity": "high", "category": "security", "message": "eval 중복"},
+      {"line": 3, "severity": "medium", "category": "logic", "message": "할당 비교 중복"},
+      {"line": 2, "severity": "low", "category": "performance", "message": "같은 줄 다른 카테고리"},
+      {"line": 1, "severity": "low", "category": "security", "message": "새 이슈"},
+      {"line": 1, "severity": "low", "category": "security", "message": "LLM 내 중복"}
+    ]""")
+    merged = merge_llm_issues(static, llm)
+    assert merged[:len(static)] == static
+    assert [issue.message for issue in merged[len(static):]] == ["같은 줄 다른 카테고리", "새 이슈"]
+    assert merge_llm_issues(static, []) == static
+    print("✅ LLM 이슈 병합 성공")
+
+def test_explain_endpoint():
+    """/analyze/explain이 전체 설명/이슈별 설명 템플릿으로 요청하는지 테스트"""
+    calls = []
+
+    def fake_request(name, code, fast_mode=False, compact_prompt=None, **variables):
+        calls.append((name, variables.get("line"), variables.get("message")))
+        return f"{name} 설명"
+
+    original = enhanced_js_analyzer.request_llm_template
+    enhanced_js_analyzer.request_llm_template = fake_request
+    try:
+        client = TestClient(app)
+        code = "eval(input);\n"
+        response = client.post("/api/enhanced-js/analyze/explain", json={"code": code})
+        assert response.status_code == 200
+        assert response.json() == {"llm_analysis": "enhanced_analysis 설명"}
+        issue = {"category": "security", "severity": "high", "message": "eval 사용", "line_number": 1}
+        response = client.post("/api/enhanced-js/analyze/explain", json={"code": code, "issue": issue})
+        assert response.json() == {"llm_analysis": "enhanced_explain_issue 설명"}
+        assert calls == [("enhanced_analysis", None, None), ("enhanced_explain_issue", 1, "eval 사용")]
+        assert client.post("/api/enhanced-js/analyze/explain", json={"issue": issue}).status_code == 422
+    finally:
+        enhanced_js_analyzer.request_llm_template = original
+    print("✅ LLM 설명 엔드포인트 성공")
+
+if __name__ == "__main__":
+    test_parse_llm_findings()
+    test_merge_llm_issues()
+    test_explain_endpoint()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+LLM 워밍업/유휴 유지 테스트 스크립트 (로컬 스텁 서버 사용)
+"""
+
+import sys
+import os
+import threading
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import llm_pool
+import llm_resilience
+import llm_lifecycle
+from llm_client import request_llm
+from mock_llm_server import MockLLMConfig, MockLLMServer
+
+def start_stub_server(name: str, warmup_delay: float = 0.0) -> MockLLMServer:
+    """name을 응답하고 워밍업 요청(max_tokens=1)만 warmup_delay초 늦게 응답하는 모의 LLM 서버"""
+    config = MockLLMConfig(latency_ms=0, warmup_latency_ms=warmup_delay * 1000, tokens_per_second=0, content=(name,))
+    return MockLLMServer(config).start()
+
+def warmups(server: MockLLMServer) -> list:
+    return [payload for payload in server.payloads if payload.get("max_tokens") == 1]
+
+def use_endpoints(*urls: str):
+    os.environ["LMSTUDIO_ENDPOINTS"] = ",".join(urls)
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+    llm_lifecycle.reset_lifecycle()
+
+def cleanup():
+    for name in ("LMSTUDIO_ENDPOINTS", "LLM_KEEPALIVE_SECONDS", "LMSTUDIO_SMALL_MODEL", "LMSTUDIO_LARGE_MODEL"):
+        os.environ.pop(name, None)
+    llm_lifecycle.reset_lifecycle()
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+
+def test_startup_warmup():
+    """시작 워밍업이 티어 모델마다 요청을 보내고 준비 상태를 기록하는지 테스트"""
+    server = start_stub_server("A")
+    dead_url = "http://127.0.0.1:9"  # 연결 거부
+    os.environ["LMSTUDIO_SMALL_MODEL"] = "small"
+    os.environ["LMSTUDIO_LARGE_MODEL"] = "large"
+    use_endpoints(server.url, dead_url)
+    try:
+        llm_lifecycle.get_lifecycle().warm_all("startup")
+        assert [payload["model"] for payload in warmups(server)] == ["small", "large"]
+        ready, cold = llm_pool.get_lmstudio_pool().status()
+        assert ready["warm_state"] == "ready" and ready["last_warmup_seconds"] is not None
+        assert cold["warm_state"] == "cold"
+        assert llm_lifecycle.get_lifecycle().status()["lmstudio"] == "ready"
+        print("✅ 시작 워밍업 및 준비 상태 기록 성공")
+    finally:
+        server.stop()
+        cleanup()
+
+def test_warming_endpoint_avoided():
+    """워밍업 중인 엔드포인트 대신 준비된 엔드포인트로 요청하는지 테스트"""
+    server_a = start_stub_server("A", warmup_delay=1.0)
+    server_b = start_stub_server("B")
+    use_endpoints(server_a.url, server_b.url)
+    try:
+        lifecycle = llm_lifecycle.get_lifecycle()
+        threading.Thread(target=lifecycle.warm_all, daemon=True).start()
+        time.sleep(0.3)
+        states = [status["warm_state"] for status in llm_pool.get_lmstudio_pool().status()]
+        assert states == ["warming", "ready"], states
+        # 부하가 같으면 앞쪽(A)이 선택되지만 A는 워밍업 중
+        assert request_llm("ping", mode="lmstudio") == "B"
+        print("✅ 워밍업 중인 엔드포인트 회피 성공")
+    finally:
+        server_a.stop()
+        server_b.stop()
+        cleanup()
+
+def test_idle_keepalive():
+    """유휴 시간이 지나면 워밍업 요청을 다시 보내는지 테스트"""
+    server = start_stub_server("A")
+    os.environ["LLM_KEEPALIVE_SECONDS"] = "0.4"
+    use_endpoints(server.url)
+    try:
+        lifecycle = llm_lifecycle.get_lifecycle()
+        lifecycle.start("lmstudio")
+        time.sleep(1.5)
+        lifecycle.stop()
+        # 시작 1회 + 유휴 점검으로 최소 1회 더
+        assert len(warmups(server)) >= 2, warmups(server)
+        assert request_llm("ping", mode="lmstudio") == "A"
+        # 방금 요청이 있었으므로 유휴 대상이 아님
+        assert lifecycle.due_endpoints() == []
+        print(f"✅ 유휴 유지 워밍업 {len(warmups(server))}회")
+    finally:
+        server.stop()
+        cleanup()
+
+if __name__ == "__main__":
+    test_startup_warmup()
+    test_warming_endpoint_avoided()
+    test_idle_keepalive()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+로컬 모델 동적 배칭 테스트 스크립트 (transformers/torch 대신 가짜 모델 사용)
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from llm_cancel import CancelToken, LLMCancelled, set_current_token
+from llm_local import LocalLLM, _PendingRequest
+
+class FakeTokenizer:
+    """글자 하나를 토큰 하나로 취급"""
+    def encode(self, text: str):
+        return [ord(char) for char in text]
+
+class FakeLocalLLM(LocalLLM):
+    """모델 로드/generate 대신 배치 구성만 기록"""
+    def __init__(self, **kwargs):
+        super().__init__("fake", **kwargs)
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def load(self):
+        self.model = object()
+        self.tokenizer = FakeTokenizer()
+
+    def _generate_batch(self, batch):
+        self.batches.append([len(request.input_ids) for request in batch])
+        self.release.wait(5)
+        return [f"생성 {len(request.input_ids)}" for request in batch]
+
+def enqueue(llm: LocalLLM, prompt_tokens: int, max_new_tokens: int, token: CancelToken = None) -> _PendingRequest:
+    set_current_token(token)
+    try:
+        request = _PendingRequest([0] * prompt_tokens, max_new_tokens)
+    finally:
+        set_current_token(None)
+    llm._queue.put(request)
+    return request
+
+def test_collect_batch_kv_budget():
+    """패딩 포함 KV 크기가 예산을 넘는 요청은 다음 배치의 첫 요청으로 넘기는지 테스트"""
+    llm = FakeLocalLLM(max_batch=4, batch_wait_ms=10, max_batch_tokens=1000)
+    small = [enqueue(llm, 100, 100) for _ in range(2)]
+    large = enqueue(llm, 300, 100)  # 3 x (300 + 100) = 1200 > 1000
+    last = enqueue(llm, 50, 50)
+    assert llm._collect_batch() == small
+    assert llm._carry is large
+    # 넘긴 요청부터 다음 배치 시작 (2 x 400 = 800 <= 1000)
+    assert llm._collect_batch() == [large, last]
+    assert llm._carry is None
+
+    # max_batch로도 제한
+    requests = [enqueue(llm, 10, 10) for _ in range(5)]
+    assert llm._collect_batch() == requests[:4]
+    assert llm._collect_batch() == requests[4:]
+    print("✅ KV 예산 내 배치 구성 성공")
+
+def test_collect_batch_skips_cancelled():
+    """대기 중에 취소된 요청은 배치에서 제외되는지 테스트"""
+    llm = FakeLocalLLM(max_batch=4, batch_wait_ms=10)
+    token = CancelToken()
+    first = enqueue(llm, 10, 10)
+    enqueue(llm, 10, 10, token)
+    last = enqueue(llm, 10, 10)
+    token.cancel("client_disconnected")
+    assert llm._collect_batch() == [first, last]
+    print("✅ 취소된 요청 배치 제외 성공")
+
+def test_generate_batches_and_cancels():
+    """동시 요청이 한 배치로 묶이고, 앞 배치 실행 중 대기열에서 취소된 요청은 즉시 반환되는지 테스트"""
+    llm = FakeLocalLLM(max_batch=4, batch_wait_ms=300)
+    messages = lambda size: [{"role": "user", "content": "x" * size}]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda size: llm.generate(messages(size), 16), (5, 6, 7)))
+    assert results == ["생성 5", "생성 6", "생성 7"]
+    assert [sorted(batch) for batch in llm.batches] == [[5, 6, 7]]
+
+    # 첫 배치가 끝나지 않은 동안 대기열의 요청을 취소
+    llm.release.clear()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        running = executor.submit(llm.generate, messages(8), 16)
+        while len(llm.batches) < 2:
+            threading.Event().wait(0.01)
+        token = CancelToken()
+
+        def queued():
+            set_current_token(token)
+            return llm.generate(messages(9), 16)
+
+        waiting = executor.submit(queued)
+        token.cancel("client_disconnected")
+        try:
+            waiting.result(timeout=2)
+            assert False, "LLMCancelled 예외가 발생해야 합니다"
+        except LLMCancelled as e:
+            assert e.reason == "client_disconnected"
+        llm.release.set()
+        assert running.result(timeout=2) == "생성 8"
+    # 취소된 요청은 배치로 실행되지 않음
+    assert llm.generate(messages(4), 16) == "생성 4"
+    assert llm.batches[1:] == [[8], [4]]
+    print("✅ 로컬 모델 동적 배칭/대기 중 취소 성공")
+
+if __name__ == "__main__":
+    test_collect_batch_kv_budget()
+    test_collect_batch_skips_cancelled()
+    test_generate_batches_and_cancels()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+LM Studio 엔드포인트 풀 테스트 스크립트 (로컬 스텁 서버 사용)
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import llm_pool
+import llm_resilience
+from llm_client import request_llm
+from mock_llm_server import MockLLMConfig, MockLLMServer
+
+def start_stub_server(name: str, delay: float = 0.0) -> MockLLMServer:
+    """name을 응답 내용으로 보내는 모의 LLM 서버 (응답한 엔드포인트 구분용)"""
+    return MockLLMServer(MockLLMConfig(latency_ms=delay * 1000, tokens_per_second=0, content=(name,))).start()
+
+def test_least_outstanding_balancing():
+    """동시 요청이 두 엔드포인트에 고르게 분산되는지 테스트"""
+    server_a = start_stub_server("A", delay=0.2)
+    server_b = start_stub_server("B", delay=0.2)
+    os.environ["LMSTUDIO_ENDPOINTS"] = f"{server_a.url},{server_b.url}"
+    os.environ["LMSTUDIO_ENDPOINT_CONCURRENCY"] = "2"
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: request_llm("ping", mode="lmstudio"), range(4)))
+        print(results)
+        assert sorted(results) == ["A", "A", "B", "B"]
+        assert all(status["outstanding"] == 0 for status in llm_pool.get_lmstudio_pool().status())
+        print("✅ 엔드포인트 분산 성공")
+    finally:
+        server_a.stop()
+        server_b.stop()
+        os.environ.pop("LMSTUDIO_ENDPOINTS", None)
+        os.environ.pop("LMSTUDIO_ENDPOINT_CONCURRENCY", None)
+        llm_pool.reset_lmstudio_pool()
+        llm_resilience.reset_breakers()
+
+def test_failing_endpoint_ejected():
+    """연속 실패한 엔드포인트가 제외되고 나머지로 요청되는지 테스트"""
+    server = start_stub_server("OK")
+    dead_url = "http://127.0.0.1:9"  # 연결 거부
+    os.environ["LMSTUDIO_ENDPOINTS"] = f"{dead_url},{server.url}"
+    os.environ["LMSTUDIO_EJECT_FAILURES"] = "1"
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+    try:
+        # 첫 시도는 장애 엔드포인트로 가서 실패하고, 재시도는 남은 엔드포인트로 전달됨
+        assert request_llm("ping", mode="lmstudio") == "OK"
+        assert request_llm("ping", mode="lmstudio") == "OK"
+        status = {item["endpoint"]: item for item in llm_pool.get_lmstudio_pool().status()}
+        assert status[dead_url]["available"] is False
+        print("✅ 장애 엔드포인트 제외 성공")
+    finally:
+        server.stop()
+        os.environ.pop("LMSTUDIO_ENDPOINTS", None)
+        os.environ.pop("LMSTUDIO_EJECT_FAILURES", None)
+        llm_pool.reset_lmstudio_pool()
+        llm_resilience.reset_breakers()
+
+def test_health_probe():
+    """헬스 체크 실패 엔드포인트만 있으면 요청하지 않는지 테스트"""
+    pool = llm_pool.EndpointPool(["http://127.0.0.1:9"], probe_timeout=0.5)
+    pool.probe()
+    assert pool.status()[0]["healthy"] is False
+    try:
+        pool.acquire(timeout=0.1)
+        assert False, "NoEndpointAvailable 예외가 발생해야 합니다"
+    except llm_pool.NoEndpointAvailable:
+        print("✅ 헬스 체크 실패 엔드포인트 제외 성공")
+
+def test_probe_keeps_ejection():
+    """/v1/models가 응답해도 연속 실패로 제외된 엔드포인트는 제외 시간이 끝날 때까지 쓰지 않는지 테스트"""
+    server = start_stub_server("OK")
+    try:
+        pool = llm_pool.EndpointPool([server.url], failure_threshold=1, ejection_seconds=60.0, probe_timeout=0.5)
+        endpoint = pool.acquire(timeout=0.1)
+        pool.release(endpoint, success=False)
+        pool.probe()
+        status = pool.status()[0]
+        assert status["healthy"] is True and status["available"] is False
+        assert status["ejected_for"] > 0
+        try:
+            pool.acquire(timeout=0.1)
+            assert False, "NoEndpointAvailable 예외가 발생해야 합니다"
+        except llm_pool.NoEndpointAvailable:
+            pass
+        # 제외 시간이 지나면 다시 사용
+        endpoint.ejected_until = time.monotonic()
+        pool.release(pool.acquire(timeout=0.1), success=True)
+        print("✅ 헬스 체크 후에도 제외 유지 성공")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    test_least_outstanding_balancing()
+    test_failing_endpoint_ejected()
+    test_health_probe()
+    test_probe_keeps_ejection()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+LLM 서킷 브레이커/헤지/폴백 테스트 스크립트
+"""
+
+import sys
+import os
+import threading
+import time
+import requests
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import llm_pool
+import llm_resilience
+from fastapi.testclient import TestClient
+from main import app
+from llm_cancel import CancelToken, LLMCancelled, cancellable_sleep, set_current_token
+from llm_resilience import CircuitOpenError, StaticFallback, execute_with_policy, get_breaker
+
+def down_backend(backend: str) -> str:
+    raise requests.exceptions.ConnectionError(f"{backend} down")
+
+def set_env(**values):
+    for name, value in values.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    llm_resilience.reset_breakers()
+
+def test_circuit_opens_and_fails_fast():
+    """연속 실패 후 서킷이 열려 즉시 실패하는지 테스트"""
+    set_env(LLM_RETRIES="0", LLM_CIRCUIT_FAILURES="2", LLM_FALLBACK=None, LLM_HEDGE_AFTER_SECONDS=None)
+    for _ in range(2):
+        try:
+            execute_with_policy("lmstudio", down_backend)
+        except requests.exceptions.ConnectionError:
+            pass
+    assert get_breaker("lmstudio").state == "open"
+
+    calls = []
+    started = time.perf_counter()
+    try:
+        execute_with_policy("lmstudio", lambda backend: calls.append(backend) or "ok")
+        assert False, "CircuitOpenError 예외가 발생해야 합니다"
+    except CircuitOpenError:
+        elapsed = time.perf_counter() - started
+    assert calls == []
+    assert elapsed < 0.05
+    print(f"✅ 서킷 열림 후 즉시 실패 ({elapsed * 1000:.1f}ms)")
+
+def test_static_fallback():
+    """LLM_FALLBACK=static이면 엔드포인트가 LLM 결과 없이 정적 분석 결과와 폴백 안내를 반환하는지 테스트"""
+    set_env(LLM_RETRIES="0", LLM_FALLBACK="static", LLM_HEDGE_AFTER_SECONDS=None, LLM_MODE="lmstudio",
+            LMSTUDIO_ENDPOINTS="http://127.0.0.1:9")  # 연결 거부
+    llm_pool.reset_lmstudio_pool()
+    try:
+        try:
+            execute_with_policy("lmstudio", down_backend)
+            assert False, "StaticFallback 예외가 발생해야 합니다"
+        except StaticFallback as e:
+            assert str(e).startswith("LLM 백엔드(lmstudio)를 사용할 수 없어 정적 분석 결과만 제공합니다")
+
+        client = TestClient(app)
+        code = "var total = 0;\neval(input);\n"
+        basic = client.post("/api/js/analyze", json={"code": code, "include_llm": True}).json()
+        assert basic["errors"] and basic["llm_analysis"] is None and basic["llm_fallback"] == "static"
+        assert "정적 분석 결과만 제공합니다" in basic["llm_notice"]
+        detailed = client.post("/api/js/analyze/detailed", json={"code": code}).json()
+        assert detailed["basic_analysis"]["errors"] and detailed["llm_analysis"]["llm_fallback"] == "static"
+        assert detailed["llm_analysis"]["llm_analysis"] is None
+        for llm_output in ("markdown", "findings"):
+            enhanced = client.post("/api/enhanced-js/analyze/detailed",
+                                   json={"code": code, "llm_output": llm_output}).json()
+            assert enhanced["issues"] and enhanced["llm_analysis"] is None
+            assert enhanced["llm_fallback"] == "static" and enhanced["llm_notice"]
+        review = client.post("/api/review/text", json={"code": code}).json()
+        assert review["result"] is None and review["llm_fallback"] == "static"
+        print("✅ 정적 분석 폴백 성공")
+    finally:
+        set_env(LLM_FALLBACK=None, LLM_MODE=None, LMSTUDIO_ENDPOINTS=None)
+        llm_pool.reset_lmstudio_pool()
+
+def test_openai_fallback():
+    """LLM_FALLBACK=openai이면 openai 백엔드로 재요청하는지 테스트"""
+    original_key = os.getenv("OPENAI_API_KEY")
+    set_env(LLM_RETRIES="0", LLM_FALLBACK="openai", OPENAI_API_KEY=original_key or "test-key",
+            LLM_HEDGE_AFTER_SECONDS=None)
+    result = execute_with_policy("lmstudio", lambda backend: "openai 응답" if backend == "openai" else down_backend(backend))
+    set_env(LLM_FALLBACK=None, OPENAI_API_KEY=original_key)
+    assert result == "openai 응답"
+    print("✅ openai 폴백 성공")
+
+def test_hedged_request():
+    """주 백엔드가 느리면 헤지 요청 결과를 먼저 반환하는지 테스트"""
+    set_env(LLM_FALLBACK=None, LLM_HEDGE_AFTER_SECONDS="0.05", LLM_HEDGE_BACKEND="openai")
+
+    def call(backend: str) -> str:
+        if backend == "lmstudio":
+            time.sleep(0.5)
+        return backend
+
+    started = time.perf_counter()
+    assert execute_with_policy("lmstudio", call) == "openai"
+    assert time.perf_counter() - started < 0.4
+    print("✅ 헤지 요청 성공")
+    set_env(LLM_HEDGE_AFTER_SECONDS=None, LLM_HEDGE_BACKEND=None, LLM_RETRIES=None, LLM_CIRCUIT_FAILURES=None)
+
+def test_hedge_loser_cancelled():
+    """헤지 요청이 이기면 늦은 주 백엔드 요청이 취소 토큰으로 중단되는지 테스트"""
+    set_env(LLM_RETRIES="0", LLM_FALLBACK=None, LLM_HEDGE_AFTER_SECONDS="0.05", LLM_HEDGE_BACKEND="openai")
+    stopped = threading.Event()
+    reasons = []
+
+    def call(backend: str) -> str:
+        if backend == "lmstudio":
+            try:
+                # 스트리밍 루프처럼 청크 사이마다 취소 여부 확인
+                for _ in range(50):
+                    cancellable_sleep(0.1)
+            except LLMCancelled as e:
+                reasons.append(e.reason)
+                stopped.set()
+                raise
+        return backend
+
+    assert execute_with_policy("lmstudio", call) == "openai"
+    assert stopped.wait(1.0) and reasons == ["hedge_lost"]
+    assert get_breaker("lmstudio").state == "closed"
+
+    # 요청 자체가 취소되면 두 요청 모두 취소됨
+    parent = CancelToken()
+    set_current_token(parent)
+    threading.Timer(0.1, parent.cancel, ("client_disconnected",)).start()
+    try:
+        execute_with_policy("lmstudio", lambda backend: cancellable_sleep(5) or backend)
+        assert False, "LLMCancelled 예외가 발생해야 합니다"
+    except LLMCancelled as e:
+        assert e.reason == "client_disconnected"
+    finally:
+        set_current_token(None)
+    print("✅ 헤지 패자 요청 취소 성공")
+    set_env(LLM_HEDGE_AFTER_SECONDS=None, LLM_HEDGE_BACKEND=None, LLM_RETRIES=None)
+
+if __name__ == "__main__":
+    test_circuit_opens_and_fails_fast()
+    test_static_fallback()
+    test_openai_fallback()
+    test_hedged_request()
+    test_hedge_loser_cancelled()
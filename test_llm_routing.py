@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+LLM 모델 라우팅(티어/max_tokens) 결정 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from llm_routing import MIN_MAX_TOKENS, route_request
+
+def test_route_tier():
+    """입력 크기와 fast 모드로 티어를 고르는지 테스트"""
+    os.environ["OPENAI_SMALL_MODEL"] = "small-model"
+    os.environ["OPENAI_LARGE_MODEL"] = "large-model"
+    try:
+        short = route_request(1500 * 4, mode="openai")
+        assert (short.tier, short.model) == ("small", "small-model")
+        long = route_request(1501 * 4, mode="openai")
+        assert (long.tier, long.model) == ("large", "large-model")
+        assert route_request(20000 * 4, fast_mode=True, mode="openai").tier == "small"
+        # LM Studio는 티어 모델이 없으면 로드된 모델 사용
+        assert route_request(100, mode="lmstudio").model is None
+        print("✅ 티어 라우팅 성공")
+    finally:
+        os.environ.pop("OPENAI_SMALL_MODEL", None)
+        os.environ.pop("OPENAI_LARGE_MODEL", None)
+
+def test_route_max_tokens():
+    """짧은 상세 분석 요청도 2048 상한을 유지하고 fast 모드만 1024로 제한하는지 테스트"""
+    # 입력 1200 토큰, 섹션 8개: 8 * 256 + 300 = 2348 → 상세 분석 상한 2048
+    detailed = route_request(1200 * 4, mode="openai", sections=8)
+    assert (detailed.tier, detailed.max_tokens) == ("small", 2048)
+    assert route_request(1200 * 4, mode="openai").max_tokens == 4 * 256 + 300
+    assert route_request(1200 * 4, fast_mode=True, mode="openai", sections=8).max_tokens == 1024
+    assert route_request(40, mode="openai", sections=0).max_tokens == MIN_MAX_TOKENS
+    assert route_request(1200 * 4, mode="openai", sections=8, max_tokens_cap=512).max_tokens == 512
+    print("✅ max_tokens 결정 성공")
+
+if __name__ == "__main__":
+    test_route_tier()
+    test_route_max_tokens()
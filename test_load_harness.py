@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+모의 LLM 서버와 부하 테스트 하네스 테스트 스크립트
+"""
+
+import sys
+import os
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+import llm_pool
+import llm_resilience
+from llm_client import request_llm
+from load_harness import Scenario, percentile, run_load
+from mock_llm_server import MockLLMConfig, MockLLMServer
+from main import app
+
+def use_endpoint(url: str):
+    os.environ["LMSTUDIO_ENDPOINTS"] = url
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+
+def test_mock_streams_with_latency():
+    """지연/토큰 속도 설정대로 스트리밍하고 기존 LM Studio 클라이언트로 읽히는지 테스트"""
+    server = MockLLMServer(MockLLMConfig(latency_ms=100, tokens_per_second=200, completion_tokens=20)).start()
+    use_endpoint(server.url)
+    try:
+        started = time.perf_counter()
+        content = request_llm("ping", mode="lmstudio", max_tokens=512)
+        elapsed = time.perf_counter() - started
+        assert content.startswith("## 오류 지점") and "[ERROR]" not in content
+        # 첫 토큰 0.1초 + 19개 토큰 x 5ms
+        assert 0.15 < elapsed < 2.0, elapsed
+        assert server.stats()["requests"] == 1
+        print("✅ 모의 서버 스트리밍 성공")
+    finally:
+        server.stop()
+
+def test_run_load_reports_errors_and_percentiles():
+    """실패율만큼 오류를 집계하고 성공 요청의 백분위수를 계산하는지 테스트"""
+    assert percentile([5, 1, 4, 2, 3], 50) == 3 and percentile([1, 2, 3, 4], 99) == 4 and percentile([], 50) is None
+    server = MockLLMServer(MockLLMConfig(latency_ms=5, tokens_per_second=0, failure_rate=0.3, seed=1)).start()
+    try:
+        scenario = Scenario("mock.chat", "/v1/chat/completions",
+                            lambda code: {"messages": [{"role": "user", "content": code}], "max_tokens": 16})
+        report = run_load(server.url, [scenario], ["function a() {}"], concurrency=4, duration=None, total_requests=40)
+        total = report["total"]
+        assert total["requests"] == 40 and server.stats()["requests"] == 40
+        assert total["errors"].get("http_500") == server.stats()["failures"] > 0
+        assert 0 < total["error_rate"] < 1
+        assert total["p50_ms"] <= total["p95_ms"] <= total["p99_ms"]
+        assert report["scenarios"]["mock.chat"]["requests"] == 40
+        print("✅ 부하 테스트 집계 성공")
+    finally:
+        server.stop()
+
+def test_endpoint_with_mock_findings():
+    """findings 모드 상세 분석이 모의 서버의 JSON 배열 응답을 이슈로 병합하는지 테스트"""
+    server = MockLLMServer(MockLLMConfig(latency_ms=0, tokens_per_second=0)).start()
+    use_endpoint(server.url)
+    os.environ["LLM_MODE"] = "lmstudio"
+    try:
+        response = TestClient(app).post("/api/enhanced-js/analyze/detailed", json={
+            "code": "function onLoad() { var grd = app.lookup('grdMain'); grd.addRow(); }",
+            "fast_mode": True, "llm_output": "findings"})
+        assert response.status_code == 200
+        assert any(issue.get("source") == "llm" and issue["message"] == "모의 분석 결과"
+                   for issue in response.json()["issues"])
+        print("✅ 모의 서버 엔드투엔드 성공")
+    finally:
+        os.environ.pop("LLM_MODE", None)
+        server.stop()
+
+if __name__ == "__main__":
+    test_mock_streams_with_latency()
+    test_run_load_reports_errors_and_percentiles()
+    test_endpoint_with_mock_findings()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+구조화 로깅 테스트 스크립트 (JSON 포맷, 필드 길이 제한, 레벨 제한, 샘플링, 비동기 출력)
+"""
+
+import sys
+import os
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from log_config import JsonFormatter, SamplingFilter, _DeferredQueueHandler
+
+class CountingPayload:
+    """문자열로 변환된 횟수와 스레드를 기록"""
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "x" * 5000
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+def make_logger(name: str, level: int):
+    """큐 핸들러 → 리스너 스레드 → JSON 포맷 핸들러 구성"""
+    log_queue = queue.SimpleQueue()
+    output = ListHandler()
+    output.setFormatter(JsonFormatter(max_field_chars=100))
+    listener = logging.handlers.QueueListener(log_queue, output)
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(level)
+    logger.handlers = [_DeferredQueueHandler(log_queue)]
+    listener.start()
+    return logger, listener, output
+
+def test_json_record_truncated_off_thread():
+    """extra 필드가 JSON으로 출력되고, 긴 값은 잘리며, 포맷은 리스너 스레드에서 수행되는지 테스트"""
+    logger, listener, output = make_logger("test_log_json", logging.DEBUG)
+    payload = CountingPayload()
+    logger.debug("Sending request", extra={"payload": payload, "endpoint": "http://stub"})
+    listener.stop()
+
+    record = json.loads(output.lines[0])
+    assert record["level"] == "DEBUG" and record["message"] == "Sending request"
+    assert record["endpoint"] == "http://stub"
+    assert record["payload"].endswith("...(+4900 chars)") and len(record["payload"]) < 200
+    assert payload.threads and threading.current_thread().name not in payload.threads
+    print("✅ JSON 레코드 / 필드 길이 제한 / 비동기 포맷 성공")
+
+def test_debug_payload_free_when_disabled():
+    """DEBUG가 꺼져 있으면 페이로드를 문자열로 만들지 않는지 테스트"""
+    logger, listener, output = make_logger("test_log_gated", logging.INFO)
+    payload = CountingPayload()
+    for _ in range(1000):
+        logger.debug("Sending request", extra={"payload": payload})
+    logger.info("Review finished", extra={"sections": 2})
+    listener.stop()
+
+    assert payload.threads == []
+    assert [json.loads(line)["message"] for line in output.lines] == ["Review finished"]
+    print("✅ 레벨 제한 시 페이로드 포맷 없음")
+
+def test_sampling():
+    """INFO 이하만 샘플링되고 WARNING 이상은 항상 출력되는지 테스트"""
+    sampling = SamplingFilter(0.1)
+    make = lambda level: logging.LogRecord("test", level, __file__, 0, "msg", (), None)
+    kept = sum(sampling.filter(make(logging.INFO)) for _ in range(2000))
+    assert 100 < kept < 300, kept
+    assert all(sampling.filter(make(logging.WARNING)) for _ in range(100))
+    print(f"✅ 샘플링 ({kept}/2000)")
+
+def test_exception_serialized():
+    """예외 traceback이 문자열로 변환되어 출력되는지 테스트"""
+    logger, listener, output = make_logger("test_log_exception", logging.INFO)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Job failed", extra={"job_id": "abc"})
+    listener.stop()
+
+    record = json.loads(output.lines[0])
+    assert record["job_id"] == "abc" and "ValueError: boom" in record["exception"]
+    print("✅ 예외 출력 성공")
+
+if __name__ == "__main__":
+    test_json_record_truncated_off_thread()
+    test_debug_payload_free_when_disabled()
+    test_sampling()
+    test_exception_serialized()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+요청별 메모리 계측과 요청 크기 제한 테스트 스크립트
+"""
+
+import sys
+import os
+import json
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+from memory_profiler import MIN_COST_SAMPLE_BYTES, MIN_COST_SAMPLES, MemoryProfiler, get_memory_profiler, \
+    memory_budget_bytes
+from main import app
+
+CODE = """
+function onLoad() {
+    var grdMain = app.lookup("grdMain");
+    grdMain.addRow();
+    document.getElementById("out").innerHTML = grdMain.getCellValue(0, "name");
+}
+""" * 50
+
+def test_profiled_request_headers_and_report():
+    """계측 중인 요청에 단계별 메모리 헤더가 붙고 관리 엔드포인트에 기록되는지 테스트"""
+    client = TestClient(app)
+    profiler = get_memory_profiler()
+    client.delete("/api/admin/memory-profile")
+    assert client.post("/api/admin/memory-profile", json={"enabled": True}).json() == {"enabled": True}
+    try:
+        response = client.post("/api/enhanced-js/analyze", json={"code": CODE})
+        assert response.status_code == 200
+        assert response.headers["x-memory-profile"] == "on"
+        assert int(response.headers["x-memory-peak-bytes"]) > 0
+        phases = dict(item.split("=") for item in response.headers["x-memory-phases"].split(";"))
+        assert {"enhanced.syntax", "enhanced.rules", "enhanced.flow", "other"} <= set(phases)
+
+        report = client.get("/api/admin/memory-profile", params={"limit": 1}).json()
+        assert report["enabled"] and report["requests"][0]["path"] == "/api/enhanced-js/analyze"
+        assert report["requests"][0]["body_bytes"] > len(CODE)
+        assert report["phases"]["enhanced.rules"]["count"] == 1
+    finally:
+        profiler.enabled = False
+        client.delete("/api/admin/memory-profile")
+    assert "x-memory-profile" not in client.post("/api/js/analyze", json={"code": CODE}).headers
+    print("✅ 요청별 메모리 계측 성공")
+
+def test_request_size_limit():
+    """제한보다 큰 본문은 Content-Length가 없어도 413으로 거절하는지 테스트"""
+    client = TestClient(app)
+    os.environ["MAX_REQUEST_BYTES"] = "2000"
+    try:
+        response = client.post("/api/js/analyze", json={"code": CODE})
+        assert response.status_code == 413
+        assert response.json()["limit_source"] == "env" and response.json()["max_request_bytes"] == 2000
+        # 브라우저가 413 본문을 읽을 수 있도록 CORS 헤더 포함
+        response = client.post("/api/js/analyze", json={"code": CODE}, headers={"Origin": "http://example.com"})
+        assert response.status_code == 413 and "access-control-allow-origin" in response.headers
+        assert client.post("/api/js/analyze", json={"code": "var a = 1;"}).status_code == 200
+    finally:
+        os.environ.pop("MAX_REQUEST_BYTES")
+
+    # Content-Length 없는 chunked 본문도 FastAPI의 본문 파싱 오류(400)가 아니라 413으로 거절
+    body = json.dumps({"code": CODE}).encode()
+    chunks = lambda: (body[index:index + 300] for index in range(0, len(body), 300))
+    os.environ["MAX_REQUEST_BYTES"] = "1000"
+    try:
+        for path in ("/api/js/analyze", "/api/enhanced-js/analyze"):
+            response = client.post(path, content=chunks(), headers={"content-type": "application/json"})
+            assert "content-length" not in response.request.headers
+            assert response.status_code == 413, (path, response.text)
+            assert response.json()["max_request_bytes"] == 1000
+        small = json.dumps({"code": "var a = 1;"}).encode()
+        response = client.post("/api/js/analyze", content=iter([small[:10], small[10:]]),
+                               headers={"content-type": "application/json"})
+        assert response.status_code == 200
+    finally:
+        os.environ.pop("MAX_REQUEST_BYTES")
+    print("✅ 요청 크기 제한 성공")
+
+def test_limit_derived_from_measured_cost():
+    """큰 요청 표본이 충분하면 측정된 바이트당 비용으로 제한을 계산하는지 테스트"""
+    profiler = MemoryProfiler(enabled=True)
+    assert profiler.max_request_bytes()[1] == "default"
+    for _ in range(MIN_COST_SAMPLES):
+        profile = profiler.begin("POST", "/x", MIN_COST_SAMPLE_BYTES)
+        with profile.phase("work"):
+            data = bytearray(MIN_COST_SAMPLE_BYTES * 4)
+            del data
+        profiler.end(profile)
+    cost = profiler.measured_cost()
+    assert 4 <= cost < 5, cost
+    limit, source = profiler.max_request_bytes()
+    assert source == "measured" and limit == int(memory_budget_bytes() / cost)
+    assert profiler.report()["phases"]["work"]["max_peak_bytes"] >= MIN_COST_SAMPLE_BYTES * 4
+    print("✅ 측정 기반 요청 크기 제한 성공")
+
+if __name__ == "__main__":
+    test_profiled_request_headers_and_report()
+    test_request_size_limit()
+    test_limit_derived_from_measured_cost()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Prometheus 메트릭 테스트 스크립트 (히스토그램, 텍스트 형식, 엔드포인트/단계별 시간, 첫 토큰 시간)
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+import llm_pool
+import llm_resilience
+from metrics import MetricsRegistry, REGISTRY
+from llm_client import request_llm
+from mock_llm_server import MockLLMConfig, MockLLMServer
+from main import app
+
+def test_histogram_text_format():
+    """히스토그램 버킷이 누적값으로 출력되고 _sum/_count가 포함되는지 테스트"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "데모", ("phase",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, phase="rules")
+    histogram.observe(0.5, phase="rules")
+    histogram.observe(5, phase="rules")
+    registry.counter("demo_total", "데모 카운터", ("path",)).inc(path='a"b')
+
+    text = registry.render_text()
+    print(text)
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{phase="rules",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{phase="rules",le="1"} 2' in text
+    assert 'demo_seconds_bucket{phase="rules",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{phase="rules"} 5.55' in text
+    assert 'demo_seconds_count{phase="rules"} 3' in text
+    assert 'demo_total{path="a\\"b"} 1' in text
+    assert registry.snapshot()["demo_seconds"][0]["count"] == 3
+    print("✅ 히스토그램 텍스트 형식 성공")
+
+def test_endpoint_and_phase_metrics():
+    """라우트 경로별 요청 시간과 분석 단계별 시간이 /metrics에 노출되는지 테스트"""
+    client = TestClient(app)
+    response = client.post("/api/enhanced-js/analyze", json={"code": "var grid = app.lookup('grdList');\ngrid.addRow();"})
+    assert response.status_code == 200
+    client.get("/api/jobs/does-not-exist")
+
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = metrics.text
+    assert 'http_request_duration_seconds_count{method="POST",path="/api/enhanced-js/analyze",status="200"}' in text
+    # 경로 파라미터는 라우트 템플릿으로 묶임
+    assert 'path="/api/jobs/{job_id}"' in text and "does-not-exist" not in text
+    for phase in ("syntax", "api_validation", "rules", "flow"):
+        assert f'analyzer_phase_seconds_count{{analyzer="enhanced",phase="{phase}"}}' in text
+    assert "analyzer_rule_seconds_bucket" in text
+    print("✅ 엔드포인트/단계별 시간 성공")
+
+def test_llm_stream_metrics():
+    """스트리밍 응답에서 첫 토큰 시간과 생성 토큰 수(usage 없을 때 델타 수)를 기록하는지 테스트"""
+    server = MockLLMServer(MockLLMConfig(latency_ms=0, tokens_per_second=0, content=("he", "ll", "o"),
+                                         send_usage=False)).start()
+    os.environ["LMSTUDIO_ENDPOINTS"] = server.url
+    llm_pool.reset_lmstudio_pool()
+    llm_resilience.reset_breakers()
+    snapshot = lambda name, **labels: next(
+        (entry for entry in REGISTRY.snapshot().get(name, []) if entry["labels"] == labels), None)
+    before_tokens = (snapshot("llm_completion_tokens_total", backend="lmstudio") or {"value": 0})["value"]
+    before_ttft = (snapshot("llm_time_to_first_token_seconds", backend="lmstudio") or {"count": 0})["count"]
+    try:
+        assert request_llm("ping", mode="lmstudio") == "hello"
+        assert snapshot("llm_completion_tokens_total", backend="lmstudio")["value"] == before_tokens + 3
+        assert snapshot("llm_time_to_first_token_seconds", backend="lmstudio")["count"] == before_ttft + 1
+        assert snapshot("llm_request_duration_seconds", backend="lmstudio", result="success")["count"] >= 1
+        assert snapshot("llm_queue_wait_seconds", backend="lmstudio")["count"] >= 1
+        print("✅ LLM 스트리밍 메트릭 성공")
+    finally:
+        server.stop()
+        os.environ.pop("LMSTUDIO_ENDPOINTS", None)
+        llm_pool.reset_lmstudio_pool()
+        llm_resilience.reset_breakers()
+
+if __name__ == "__main__":
+    test_histogram_text_format()
+    test_endpoint_and_phase_metrics()
+    test_llm_stream_metrics()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+기본/향상된 분석기 비교 하네스 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from parity_harness import Finding, categorize, normalize_basic, run_parity, synthetic_corpus
+
+def test_normalize_basic():
+    """기본 분석기 메시지의 라인/카테고리 정규화 테스트"""
+    code = "var a = 1;\nconsole.log(a);\nvar data = JSON.parse(text);\ngrdMain.addRow();"
+    result = {
+        "javascript_issues": ["라인 2: console.log는 프로덕션에서 제거해야 합니다", "라인 1 위치 3: 열린 괄호 '('가 닫히지 않았습니다"],
+        "exbuilder6_apis": ["존재하지 않는 메서드: fooBar", "존재하지 않는 속성: addRo"],
+        "errors": ["JSON.parse는 try-catch로 감싸야 합니다", "[부분 결과] 규칙 errors[0] 검사가 시간 제한으로 1행 이후 중단되었습니다"],
+        "execution_flow": [],
+    }
+    findings, partial = normalize_basic(result, code)
+    assert findings == {
+        Finding("performance_issues", 2), Finding("syntax", 1),
+        Finding("api", None, "fooBar"), Finding("json_parsing", 3),
+    }, findings
+    assert partial == 1
+    assert categorize("getElementById 호출시 잘못된 ID일 수 있습니다") == "null_reference"
+    assert categorize("알 수 없는 메시지") == "other"
+    print("✅ 기본 분석기 정규화 성공")
+
+def test_run_parity():
+    """합성 코퍼스에서 두 엔진의 시간/발견 사항 차이를 집계하는지 테스트"""
+    report = run_parity(synthetic_corpus(["8k"]))
+    result = report["files"][0]
+    assert result["file"] == "synthetic@8KB" and result["lines"] > 0
+    for engine in ("basic", "enhanced"):
+        assert result[engine]["seconds"] > 0 and result[engine]["findings"] > 0
+    assert result["common"] > 0
+    assert report["totals"]["common"] == result["common"]
+    assert report["totals"]["basic_only"] == result["basic_only"]
+    print("✅ 엔진 비교 집계 성공")
+
+if __name__ == "__main__":
+    test_normalize_basic()
+    test_run_parity()
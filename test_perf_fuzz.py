@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+분석기 최악 입력 성능 퍼저 테스트 스크립트 (작은 크기로 하네스 동작만 확인)
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from perf_fuzz import SHAPES, fuzz, run_case, scaling_exponent
+
+def test_shapes_reach_size():
+    """각 입력 생성기가 요청한 크기 이상의 코드를 만드는지 테스트"""
+    for name, generate in SHAPES.items():
+        code = generate(5000)
+        assert len(code) >= 5000 * 0.9, (name, len(code))
+    assert "\n" not in SHAPES["huge_line"](5000)
+    assert SHAPES["many_identifiers"](5000).count("var ") > 100
+    print("✅ 입력 생성기 성공")
+
+def test_scaling_exponent():
+    """선형/제곱 증가를 구분하고 잡음 수준의 측정은 제외하는지 테스트"""
+    sizes = [1000, 2000, 4000, 8000]
+    assert abs(scaling_exponent(sizes, [0.01, 0.02, 0.04, 0.08]) - 1.0) < 0.01
+    assert abs(scaling_exponent(sizes, [0.01, 0.04, 0.16, 0.64]) - 2.0) < 0.01
+    assert scaling_exponent(sizes, [0.001, 0.001, 0.002, 0.01]) is None
+    print("✅ 증가율 계산 성공")
+
+def test_run_case_limits():
+    """하위 프로세스 측정과 시간 제한 초과 처리 테스트"""
+    result = run_case("check_errors", "huge_line", 5000, timeout=30, repeat=1)
+    assert result["status"] == "ok" and result["chars"] >= 5000 and result["peak_bytes"] is not None
+    assert run_case("analyze_async", "comment_storm", 400_000, timeout=0.05, repeat=1)["status"] == "timeout"
+    print("✅ 측정 / 시간 제한 성공")
+
+def test_fuzz_report():
+    """조합별 보고서 형식 테스트"""
+    reports = fuzz(shapes=["deep_nesting"], entries=["split_code_by_functions"], sizes=[2000, 4000],
+                   repeat=1, trace_memory=False)
+    assert len(reports) == 1
+    report = reports[0]
+    assert report["status"] in ("ok", "superlinear") and report["sizes"] == [2000, 4000]
+    assert len(report["seconds"]) == 2 and report["peak_mb"] == []
+    print("✅ 보고서 성공")
+
+if __name__ == "__main__":
+    test_shapes_reach_size()
+    test_scaling_exponent()
+    test_run_case_limits()
+    test_fuzz_report()
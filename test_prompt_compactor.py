@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+프롬프트 압축 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from prompt_compactor import compact_code, restore_line_numbers
+
+TEST_CODE = """/**
+ * 화면 초기화 스크립트
+ */
+function onLoad() {
+    // Grid 컨트롤 찾기
+    var grid = app.lookup("grd // main");   // 문자열 내부 주석 기호 유지
+
+    /* 블록 주석 */ grid.addRow();
+    var msg = `첫 줄
+두 번째 줄`;
+}
+"""
+
+def test_compact_code():
+    """주석/공백 제거 및 라인 매핑 테스트"""
+    compacted = compact_code(TEST_CODE)
+    print(compacted.code)
+
+    assert "//" not in compacted.code.replace('"grd // main"', '')
+    assert "/*" not in compacted.code
+    assert 'app.lookup("grd // main")' in compacted.code
+    assert compacted.code.splitlines()[0] == "function onLoad() {"
+    assert compacted.line_map == [4, 6, 8, 9, 10, 11]
+    print("✅ 주석 제거 및 라인 매핑 성공")
+
+def test_regex_literals_kept():
+    """정규식 리터럴 안의 //, /*, 따옴표를 주석/문자열로 보지 않는지 테스트"""
+    code = ('var re = /^https?:\\/\\//;  // URL 검사\n'
+            'function clean(s) { return s.replace(/\\/*/g, ""); }\n'
+            'var quote = /["\']/.test(s), half = total / 2 / count;\n'
+            'function next() { return 1; }\n')
+    compacted = compact_code(code)
+    print(compacted.code)
+
+    assert compacted.code.splitlines() == [
+        'var re = /^https?:\\/\\//;',
+        'function clean(s) { return s.replace(/\\/*/g, ""); }',
+        'var quote = /["\']/.test(s), half = total / 2 / count;',
+        'function next() { return 1; }',
+    ]
+    assert compacted.line_map == [1, 2, 3, 4]
+    print("✅ 정규식 리터럴 유지 성공")
+
+def test_restore_line_numbers():
+    """LLM 응답 라인 번호 복원 테스트"""
+    compacted = compact_code(TEST_CODE)
+    restored = restore_line_numbers("- **라인 2**: 오류\n- Line 3-4: 경고\n- 라인 99: 범위 밖", compacted.line_map)
+    print(restored)
+
+    assert "**라인 6**" in restored
+    assert "Line 8-9" in restored
+    assert "라인 99" in restored
+    print("✅ 라인 번호 복원 성공")
+
+def test_line_offset():
+    """청크 시작 라인 오프셋 테스트"""
+    compacted = compact_code("a();\n\nb();", line_offset=100)
+    assert compacted.line_map == [101, 103]
+    print("✅ 라인 오프셋 적용 성공")
+
+if __name__ == "__main__":
+    test_compact_code()
+    test_regex_literals_kept()
+    test_restore_line_numbers()
+    test_line_offset()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+정규식 규칙 시간 예산 / 선형 시간 대체 구현 테스트 스크립트
+"""
+
+import sys
+import os
+import random
+import re
+import time
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from regex_guard import LINEAR_REWRITES, WINDOW_CHARS, WINDOW_OVERLAP_CHARS, GuardedPattern
+from enhanced_js_analyzer import ERROR_PATTERNS, PerformanceOptimizedAnalyzer
+from js_analyzer import check_errors
+from exb_corpus import generate_screen_script
+
+def test_linear_rewrites_match_regex():
+    """대체 구현이 원래 정규식의 finditer와 같은 위치를 반환하는지 테스트"""
+    random.seed(42)
+    alphabet = ['a', 'b', '_', '$', ' ', '\n', '=', '+', ';', '{', '}', '1', '(', ')', '\t']
+    for pattern, linear in LINEAR_REWRITES.items():
+        regex = re.compile(pattern)
+        for _ in range(3000):
+            code = ''.join(random.choice(alphabet) for _ in range(random.randint(0, 30)))
+            pos = random.randint(0, len(code))
+            assert linear(code, pos) == [match.span() for match in regex.finditer(code, pos)], (pattern, code, pos)
+    print("✅ 대체 구현 동등성 성공")
+
+def test_windowed_scan_matches_regex():
+    """긴 입력을 창으로 나눠 검사해도 결과가 같은지 테스트"""
+    with open(os.path.join(os.path.dirname(__file__), 'test_example.js'), encoding='utf-8') as f:
+        code = f.read() * 20
+    for patterns in ERROR_PATTERNS.values():
+        for pattern, _, _ in patterns:
+            rule = GuardedPattern("test", pattern)
+            expected = [match.span() for match in re.finditer(pattern, code)]
+            assert rule.scan(code, budget_ms=60_000).spans == expected, pattern
+    print("✅ 창 단위 검사 동등성 성공")
+
+def test_long_match_across_window_boundary():
+    """창 겹침(WINDOW_OVERLAP_CHARS)보다 긴 검출이 창 경계에 걸쳐 있어도 빠지지 않는지 테스트"""
+    padding = "var a = 1;\n" * 90  # 990자: 검출이 첫 창 경계(1024)와 겹침 끝(1280)에 걸침
+    cases = [
+        (r'async\s+function\s+\w+\s*\([^)]*\)\s*\{[^}]*await\s+',
+         padding + "async function load() {" + " " * 340 + "await x; }\n"),
+        (r'(\w+)\s*=\s*\1\s*[+\-*/]', padding + "total = total" + " " * 300 + "+ 1;\n"),
+        (r'/\*[^*]*\*/', padding + "/*" + "x" * 400 + "*/\n" + padding + "/* short */\n"),
+        (r'try\s*\{[^}]*\}\s*catch', padding + "try {" + " " * 2000 + "} catch (e) {}\n" * 2),
+    ]
+    for pattern, code in cases:
+        assert len(code) > WINDOW_CHARS + WINDOW_OVERLAP_CHARS
+        expected = [match.span() for match in re.finditer(pattern, code)]
+        assert expected and any(end - start > WINDOW_OVERLAP_CHARS for start, end in expected), pattern
+        result = GuardedPattern("test", pattern).scan(code, budget_ms=60_000)
+        assert result.spans == expected and not result.partial, (pattern, result)
+        assert GuardedPattern("test", pattern).scan(code, first_only=True).spans == expected[:1], pattern
+    print("✅ 창 경계의 긴 검출 성공")
+
+def test_crafted_input_bounded():
+    """역추적이 큰 입력에서도 규칙 검사가 시간 예산 근처에서 끝나는지 테스트"""
+    # 끝의 else는 리터럴 사전 필터가 else 규칙을 건너뛰지 않도록 넣음 (역추적 구간 뒤라 비용은 그대로)
+    crafted = "a" * 20000 + " " * 20000 + "x else"
+    started = time.perf_counter()
+    issues = PerformanceOptimizedAnalyzer().check_errors_optimized(crafted)
+    enhanced_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    check_errors(crafted)
+    basic_seconds = time.perf_counter() - started
+    print(f"enhanced {enhanced_seconds:.2f}s / basic {basic_seconds:.2f}s")
+    # 예산 없이 실행하면 규칙 몇 개만으로도 10초 이상 걸리는 입력
+    assert enhanced_seconds < 5 and basic_seconds < 5
+
+    partial = [issue for issue in issues if issue.category == 'analysis_limits']
+    assert partial and all("부분 결과" in issue.message for issue in partial)
+    print("✅ 시간 예산 적용 성공")
+
+def test_overrun_falls_back_to_linear():
+    """예산을 넘은 규칙은 대체 구현으로 나머지를 검사하고, 반복되면 대체 구현으로 전환되는지 테스트"""
+    rule = GuardedPattern("self_assign", r'(\w+)\s*=\s*\1\s*[+\-*/]')
+    code = "a" * 20000 + "\ncount = count + 1;"
+    for _ in range(3):
+        result = rule.scan(code, budget_ms=1)
+        assert not result.partial and result.engine == "regex+linear"
+        assert [code[start:end] for start, end in result.spans] == ["count = count +"]
+    assert rule.demoted and rule.scan(code).engine == "linear"
+
+    no_fallback = GuardedPattern("else", r'[^}]\s*else\s*\{')
+    result = no_fallback.scan(" " * 20000 + "} else {", budget_ms=1)
+    assert result.partial and result.scanned < 20000
+    print("✅ 대체 구현 전환 / 부분 결과 성공")
+
+def test_large_corpus_not_partial():
+    """보통 코드로 된 큰 파일(2MB, 10MB)은 시간 예산 안에 모든 규칙을 끝까지 검사하는지 테스트"""
+    analyzer = PerformanceOptimizedAnalyzer()
+    for size in (2_000_000, 10_000_000):
+        code = generate_screen_script(size)
+        started = time.perf_counter()
+        issues = analyzer.check_errors_optimized(code)
+        print(f"{size // 1_000_000}MB: {time.perf_counter() - started:.1f}s, {len(issues)} issues")
+        assert [issue.message for issue in issues if issue.category == 'analysis_limits'] == []
+    print("✅ 큰 파일 전체 검사 성공")
+
+if __name__ == "__main__":
+    test_linear_rewrites_match_regex()
+    test_windowed_scan_matches_regex()
+    test_long_match_across_window_boundary()
+    test_crafted_input_bounded()
+    test_overrun_falls_back_to_linear()
+    test_large_corpus_not_partial()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+함수 묶음 리뷰(pack_functions, review_function_batch) 테스트 스크립트 (LLM 호출은 가짜 함수로 대체)
+"""
+
+import sys
+import os
+import json
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import review
+from review import ReviewRequest, pack_functions, review_function_batch
+
+def test_pack_functions_budget():
+    """토큰 예산과 최대 함수 수 안에서 순서대로 묶는지 테스트"""
+    functions = {f"f{i}": "x" * (size * 4) for i, size in enumerate([40, 50, 30, 120, 10, 10, 10])}
+    batches = pack_functions(functions, token_budget=100, max_functions=2)
+    assert [list(batch) for batch in batches] == [["f0", "f1"], ["f2"], ["f3"], ["f4", "f5"], ["f6"]]
+    # 예산보다 큰 함수는 혼자 한 묶음, 나머지 묶음은 예산을 넘지 않음
+    for batch in batches:
+        tokens = sum(len(code) // 4 for code in batch.values())
+        assert tokens <= 100 or len(batch) == 1
+    assert [name for batch in batches for name in batch] == list(functions)
+    assert pack_functions({}, 100, 2) == []
+    print("✅ 함수 묶음 분할 성공")
+
+def run_batch(batch, response):
+    """가짜 LLM으로 review_function_batch 실행 후 (결과, 호출 목록) 반환"""
+    calls = []
+
+    def fake_request(name, code, fast_mode=False, compact_prompt=None, **variables):
+        calls.append((name, variables.get("func_name")))
+        if name == "review_function_batch":
+            return response
+        return f"개별 리뷰: {variables['func_name']}"
+
+    original = review.request_llm_template
+    review.request_llm_template = fake_request
+    try:
+        return review_function_batch(batch, ReviewRequest(code="\n".join(batch.values()), compact_prompt=False)), calls
+    finally:
+        review.request_llm_template = original
+
+def test_review_function_batch():
+    """묶음 응답을 함수별로 나누고, 빠진/잘못된 결과는 개별 리뷰로 대체하는지 테스트"""
+    batch = {"load": "function load() { return 1; }", "save": "function save() { return 2; }"}
+    entry = {"errors": ["1번 줄 오류"], "warnings": [], "suggestions": "const 사용", "flow": []}
+
+    results, calls = run_batch(batch, "```json\n" + json.dumps({"load": entry, "save": entry}) + "\n```")
+    assert calls == [("review_function_batch", None)]
+    assert results["load"].startswith("## 오류 지점\n- 1번 줄 오류\n\n## 경고 지점\n- 없음")
+    assert "## 개선 제안\n- const 사용" in results["save"]
+
+    # 한 함수의 결과가 빠지면 그 함수만 개별 리뷰
+    results, calls = run_batch(batch, json.dumps({"load": entry}))
+    assert calls[1:] == [("review_function", "save")] and results["save"] == "개별 리뷰: save"
+
+    # JSON이 깨지면 모든 함수를 개별 리뷰
+    results, calls = run_batch(batch, '{"load": {"errors": ["잘린 응답"')
+    assert calls[1:] == [("review_function", "load"), ("review_function", "save")]
+    assert results == {"load": "개별 리뷰: load", "save": "개별 리뷰: save"}
+
+    # 백엔드 오류는 재시도하지 않고 그대로 전달, 함수 하나면 묶음 요청 없이 개별 리뷰
+    results, calls = run_batch(batch, "[ERROR] 연결 실패")
+    assert len(calls) == 1 and set(results.values()) == {"[ERROR] 연결 실패"}
+    results, calls = run_batch({"load": batch["load"]}, "")
+    assert calls == [("review_function", "load")]
+    print("✅ 함수 묶음 리뷰 결과 분리/개별 재시도 성공")
+
+if __name__ == "__main__":
+    test_pack_functions_budget()
+    test_review_function_batch()
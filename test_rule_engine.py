@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+공용 규칙 엔진과 기본 분석기 어댑터 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from rule_engine import LineIndex, Rule, RuleSet, required_literals
+from js_tokenizer import check_structure
+from js_analyzer import check_errors, check_javascript_issues
+from enhanced_js_analyzer import PerformanceOptimizedAnalyzer
+
+def test_rule_set_shares_duplicate_patterns():
+    """같은 정규식의 규칙은 한 번만 검사하고, 라인 번호가 code.count와 같은지 테스트"""
+    code = "a = 1;\n\nb = 2; c = 3;\n"
+    rules = RuleSet("test", [
+        Rule("assign[0]", r'\w+ = \d', "할당", "comparison_issues"),
+        Rule("assign[1]", r'\w+ = \d', "할당 (중복 등록)", "comparison_issues"),
+        Rule("semicolon", r';', "세미콜론", "code_style"),
+    ])
+    hits = rules.scan(code)
+    assert [hit.rule.name for hit in hits] == ["assign[0]", "assign[1]", "semicolon"]
+    assert hits[0].result is hits[1].result
+    index = LineIndex(code)
+    for start, _ in hits[2].result.spans:
+        assert index.line(start) == code.count('\n', 0, start) + 1
+    assert [index.line(start) for start, _ in hits[0].result.spans] == [1, 3, 3]
+    assert index.column(code.index("c = 3")) == 7
+    assert len(rules.scan(code, first_only=True)[0].result.spans) == 1
+    print("✅ 규칙 엔진 성공")
+
+def test_literal_prefilter():
+    """정규식에서 필요한 리터럴을 추출하고, 리터럴이 없는 규칙은 실행하지 않는지 테스트"""
+    assert required_literals(r'\.innerHTML\s*=') == ('.innerHTML',)
+    assert required_literals(r'for\s*\(\s*var\s+\w+\s+in\s+') == ('for', 'var', 'in')
+    assert required_literals(r'(?:ab)+cd(ef)?') == ('ab', 'cd')
+    assert required_literals(r'(\w+)\s*=\s*\1') == ()
+    assert required_literals(r'foo|bar') == () and required_literals(r'(?i)JSON') == ()
+    rules = RuleSet("test", [
+        Rule("inner_html", r'\.innerHTML\s*=', "innerHTML"),
+        Rule("json_parse", r'JSON\.parse\(', "JSON.parse"),
+        Rule("assign", r'\w+\s*=', "할당"),
+    ])
+    hits = rules.scan("el.innerHTML = a;")
+    assert [hit.result.engine for hit in hits][1] == "skipped"
+    assert [len(hit.result.spans) for hit in hits] == [1, 0, 1]
+    print("✅ 리터럴 사전 필터 성공")
+
+def test_structure_ignores_strings_and_comments():
+    """문자열/주석 안의 괄호는 세지 않고, 닫히지 않은 문자열은 라인별로 보고하는지 테스트"""
+    code = 'var a = "(";  // )\nvar b = [1, 2};\nvar c = \'abc;\nfoo(`multi\nline)`);\n'
+    structure = check_structure(code)
+    assert [(issue.kind, issue.char, issue.line, issue.column) for issue in structure.brackets] == [
+        ('mismatch', '}', 2, 14)]
+    assert structure.unterminated_strings == [(3, "'")]
+    print("✅ 괄호/따옴표 단일 패스 검사 성공")
+
+REGEX_LITERAL_CODE = (
+    'function clean(s){ return s.replace(/\\/*/g, ""); }\n'
+    'var url = /^https?:\\/\\//;\n'
+    'var quote = /[\'"(]/, half = total / 2 / count;\n'
+    'function broken() {\n'
+    '    var x = [1, 2;\n'
+    '}\n'
+)
+
+def test_regex_literals_in_structure_checks():
+    """정규식 리터럴 안의 /*, //, 따옴표, 괄호가 두 분석기의 괄호/따옴표 검사를 흐리지 않는지 테스트"""
+    structure = check_structure(REGEX_LITERAL_CODE)
+    assert [(issue.kind, issue.char, issue.line) for issue in structure.brackets] == [
+        ('mismatch', '}', 6), ('unclosed', '{', 4)], structure
+    assert structure.unterminated_strings == []
+
+    assert check_javascript_issues(REGEX_LITERAL_CODE) == [
+        "라인 6 위치 1: 괄호 '}'가 라인 5 위치 13의 '['와 매칭되지 않습니다",
+        "라인 4 위치 19: 열린 괄호 '{'가 닫히지 않았습니다",
+        "라인 5: 배열 리터럴이 완료되지 않았습니다",
+    ]
+    syntax = PerformanceOptimizedAnalyzer().check_javascript_syntax(REGEX_LITERAL_CODE)
+    brackets = [(issue.line_number, issue.message) for issue in syntax if '괄호' in issue.message]
+    assert brackets == [(6, "괄호 '}'가 라인 5의 '['와 매칭되지 않습니다"), (4, "열린 괄호 '{'가 닫히지 않았습니다")]
+
+    # 토큰 규칙은 정규식 리터럴 안의 검출도 제외
+    issues = PerformanceOptimizedAnalyzer().check_errors_optimized('var re = /eval(x)/;\neval(code);\n')
+    assert [issue.line_number for issue in issues if issue.message.startswith('eval()')] == [2]
+    print("✅ 정규식 리터럴 처리 성공")
+
+def test_legacy_response_format():
+    """기본 분석기가 기존 문자열 형식과 라인 순서를 유지하는지 테스트"""
+    code = 'function f() {\n    console.log("x"); eval("y");\n    if (a == null) { while (true) {} }\n'
+    issues = check_javascript_issues(code)
+    assert issues[0] == "라인 1 위치 14: 열린 괄호 '{'가 닫히지 않았습니다", issues
+    assert issues[1:] == [
+        "라인 2: console.log는 프로덕션에서 제거해야 합니다",
+        "라인 2: eval() 사용은 보안상 위험합니다",
+        "라인 3: null 비교시 === 사용을 권장합니다",
+        "라인 3: 무한 루프 위험이 있습니다",
+    ], issues
+    assert check_javascript_issues("var a = 1;\n") == ['JavaScript 문법에 문제없음']
+    assert check_errors("el.innerHTML = html;\nel.innerHTML = more;") == ['innerHTML 사용시 XSS 위험이 있습니다']
+    print("✅ 기본 분석기 응답 형식 성공")
+
+if __name__ == "__main__":
+    test_rule_set_shares_duplicate_patterns()
+    test_literal_prefilter()
+    test_structure_ignores_strings_and_comments()
+    test_regex_literals_in_structure_checks()
+    test_legacy_response_format()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+오류 패턴 규칙별 비용 프로파일러 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+from enhanced_js_analyzer import PerformanceOptimizedAnalyzer
+from js_analyzer import check_errors
+from rule_profiler import format_report, get_rule_profiler
+from main import app
+
+TEST_CODE = """function onSave() {
+    var list = document.getElementById("list").value.split(",");
+    var data = JSON.parse(localStorage.getItem("data"));
+    list.push(data.name);
+    onSave();
+}
+"""
+
+def test_profile_both_analyzers():
+    """두 분석기의 규칙별 호출 수, 검출 수, 검사 바이트가 누적되는지 테스트"""
+    profiler = get_rule_profiler()
+    profiler.reset()
+    profiler.enabled = True
+    try:
+        analyzer = PerformanceOptimizedAnalyzer()
+        for _ in range(3):
+            issues = analyzer.check_errors_optimized(TEST_CODE)
+            errors = check_errors(TEST_CODE)
+    finally:
+        profiler.enabled = False
+
+    rows = profiler.report()
+    print(format_report(rows[:10]))
+    by_pattern = {(row["analyzer"], row["pattern"]): row for row in rows}
+    recursion = by_pattern[("enhanced", r'function\s+(\w+)\s*\([^)]*\)\s*\{[^}]*\1\s*\(')]
+    assert recursion["calls"] == 3 and recursion["matches"] == 3
+    assert recursion["chars_scanned"] == 3 * len(TEST_CODE)
+    push = by_pattern[("basic", r'\.push\([^)]*\)')]
+    assert push["calls"] == 3 and push["matches"] == 3
+    # re.search는 첫 검출 위치까지만 검사
+    assert push["chars_scanned"] < 3 * len(TEST_CODE)
+    assert [row["seconds"] for row in rows] == sorted((row["seconds"] for row in rows), reverse=True)
+    # 프로파일링 여부와 무관하게 결과는 같음
+    assert len(issues) == len(analyzer.check_errors_optimized(TEST_CODE)) and errors == check_errors(TEST_CODE)
+    print("✅ 규칙별 프로파일 누적 성공")
+
+def test_disabled_records_nothing():
+    """꺼져 있으면 통계를 남기지 않는지 테스트"""
+    profiler = get_rule_profiler()
+    profiler.reset()
+    check_errors(TEST_CODE)
+    PerformanceOptimizedAnalyzer().check_errors_optimized(TEST_CODE)
+    assert profiler.report() == []
+    print("✅ 비활성 시 기록 없음")
+
+def test_admin_endpoint():
+    """관리 API로 켜고, 조회하고, 초기화하는지 테스트"""
+    client = TestClient(app)
+    try:
+        assert client.post("/api/admin/rule-profile", json={"enabled": True}).json() == {"enabled": True}
+        client.post("/api/js/analyze", json={"code": TEST_CODE})
+        body = client.get("/api/admin/rule-profile", params={"analyzer": "basic", "limit": 5}).json()
+        assert body["enabled"] and len(body["rules"]) == 5
+        assert all(row["analyzer"] == "basic" for row in body["rules"])
+        client.delete("/api/admin/rule-profile")
+        assert client.get("/api/admin/rule-profile").json()["rules"] == []
+        print("✅ 관리 API 성공")
+    finally:
+        client.post("/api/admin/rule-profile", json={"enabled": False})
+
+if __name__ == "__main__":
+    test_profile_both_analyzers()
+    test_disabled_records_nothing()
+    test_admin_endpoint()
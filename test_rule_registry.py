@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+YAML 규칙 팩 레지스트리와 요청별 규칙 선택 테스트 스크립트
+"""
+
+import sys
+import os
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fastapi.testclient import TestClient
+from rule_registry import RuleRegistry, get_rule_registry
+from main import app
+
+PACK = {
+    "pack": "sample",
+    "suggestions": {"xss_security": "입력값을 sanitize하세요."},
+    "profiles": {"security": {"include": ["xss_security"]}},
+    "rules": [
+        {"id": "xss.eval", "tokens": ["eval", "("], "category": "xss_security", "severity": "critical",
+         "message": "eval 사용"},
+        {"id": "xss.inner_html", "pattern": r"\.innerHTML\s*=", "category": "xss_security", "severity": "high",
+         "message": "innerHTML 사용", "requires": ["innerHTML"]},
+        {"id": "style.var", "pattern": r"\bvar\s", "category": "code_style", "severity": "low",
+         "message": "var 사용", "suggestion": "let/const를 쓰세요."},
+        {"id": "style.with", "pattern": r"\bwith\s*\(", "category": "code_style", "severity": "low",
+         "message": "with 사용", "enabled": False},
+    ],
+}
+
+def test_registry_selection_and_token_rules():
+    """프로필/선택자/비활성 규칙과 토큰 규칙의 문자열·주석 제외를 테스트"""
+    registry = RuleRegistry([PACK])
+    assert [rule.name for rule in registry.select().rules] == ["xss.eval", "xss.inner_html", "style.var"]
+    assert [rule.name for rule in registry.select("security").rules] == ["xss.eval", "xss.inner_html"]
+    assert [rule.name for rule in registry.select(rules=["code_style"]).rules] == ["style.var"]
+    assert [rule.name for rule in registry.select(rules=["style.with"]).rules] == ["style.with"]
+    assert [rule.name for rule in registry.select(disabled=["sample"]).rules] == []
+    assert registry.select("security") is registry.select("security", disabled=["style.var"])
+    for bad in ({"profile": "nope"}, {"rules": ["nope"]}):
+        try:
+            registry.select(**bad)
+            assert False, bad
+        except ValueError:
+            pass
+    rules = {rule.name: rule for rule in registry.rules}
+    assert rules["xss.inner_html"].suggestion == "입력값을 sanitize하세요."
+    assert rules["style.var"].suggestion == "let/const를 쓰세요."
+
+    code = 'var s = "eval(x)"; // eval(y)\nretval(1); eval (z);\n'
+    hits = registry.select().scan(code)
+    spans = {hit.rule.name: hit.result.spans for hit in hits}
+    assert [code.count('\n', 0, start) + 1 for start, _ in spans["xss.eval"]] == [2]
+    assert spans["xss.inner_html"] == [] and hits[1].result.engine == "skipped"
+    print("✅ 규칙 팩 선택/토큰 규칙 성공")
+
+def test_request_rule_selection():
+    """요청의 rule_profile/rules/disabled_rules와 관리 엔드포인트 테스트"""
+    client = TestClient(app)
+    code = 'el.innerHTML = html;\nconsole.log(html);\n'
+    categories = lambda response: {issue["category"] for issue in response.json()["issues"]}
+
+    default = client.post("/api/enhanced-js/analyze", json={"code": code})
+    assert {"xss_security", "performance_issues"} <= categories(default)
+    security = client.post("/api/enhanced-js/analyze", json={"code": code, "rule_profile": "security"})
+    assert "xss_security" in categories(security) and "performance_issues" not in categories(security)
+    disabled = client.post("/api/enhanced-js/analyze", json={"code": code, "disabled_rules": ["xss_security"]})
+    assert "xss_security" not in categories(disabled)
+    assert client.post("/api/enhanced-js/analyze", json={"code": code, "rule_profile": "nope"}).status_code == 400
+    upload = client.post("/api/enhanced-js/analyze/file", params={"rules": "xss_security.inner_html"},
+                         files={"file": ("a.js", code.encode(), "application/javascript")})
+    assert {issue["category"] for issue in upload.json()["issues"]} & {"xss_security", "performance_issues"} == \
+        {"xss_security"}
+
+    listing = client.get("/api/admin/rules").json()
+    assert listing["packs"]["core"] == len(get_rule_registry().rules)
+    assert {"security", "essential"} <= set(listing["profiles"])
+    reloaded = client.post("/api/admin/rules/reload").json()
+    assert reloaded["rules"] == listing["packs"]["core"]
+    print("✅ 요청별 규칙 선택 성공")
+
+if __name__ == "__main__":
+    test_registry_selection_and_token_rules()
+    test_request_rule_selection()